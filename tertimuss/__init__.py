@@ -18,6 +18,7 @@ It contains the following sub-modules:
 - :mod:`.analysis`: Set of tools to analyze the result of the simulations
 - :mod:`.visualization`: Set of tools to visualize the result of the simulations
 - :mod:`.tasks_generator`: Set of tools to automatically generate task-sets
+- :mod:`.experiments`: Set of tools to execute schedulability studies in parallel
 
 The following libraries are also provided:
 
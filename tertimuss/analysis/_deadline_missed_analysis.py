@@ -1,7 +1,9 @@
 from dataclasses import dataclass
 from typing import Dict, Set, List
 
-from ..simulation_lib.simulator import RawSimulationResult, JobSectionExecution
+import numpy
+
+from ..simulation_lib.simulator import RawSimulationResult, obtain_job_sections_execution_table
 from ..simulation_lib.system_definition import TaskSet, Job, Task, PreemptiveExecution, Criticality
 
 
@@ -82,16 +84,15 @@ def obtain_deadline_misses_analysis(task_set: TaskSet, jobs: List[Job],
     # Analysis by task
     number_of_missed_deadlines_by_task: Dict[int, int] = {i.identifier: 0 for i in tasks}
 
-    for job in [i for i in jobs if i.task.preemptive_execution == PreemptiveExecution.FULLY_PREEMPTIVE]:
-        job_execution: List[JobSectionExecution] = [i for cpu_number, job_sections_execution in
-                                                    schedule_result.job_sections_execution.items() for
-                                                    i in job_sections_execution if i.job_id == job.identifier]
-
-        job_execution = sorted(job_execution, key=lambda x: x.execution_start_time)
+    # Executed cycles by job
+    job_sections_execution = obtain_job_sections_execution_table(schedule_result)
+    executed_jobs, executed_jobs_index = numpy.unique(job_sections_execution["job_id"], return_inverse=True)
+    executed_cycles = numpy.zeros(len(executed_jobs), dtype=numpy.int64)
+    numpy.add.at(executed_cycles, executed_jobs_index, job_sections_execution["number_of_executed_cycles"])
+    executed_cycles_by_job: Dict[int, int] = dict(zip(executed_jobs.tolist(), executed_cycles.tolist()))
 
-        job_executed_cycles = sum(i.number_of_executed_cycles for i in job_execution) \
-            if job.task.preemptive_execution == PreemptiveExecution.FULLY_PREEMPTIVE \
-            else (job_execution[-1].number_of_executed_cycles if len(job_execution) > 0 else 0)
+    for job in [i for i in jobs if i.task.preemptive_execution == PreemptiveExecution.FULLY_PREEMPTIVE]:
+        job_executed_cycles = executed_cycles_by_job.get(job.identifier, 0)
 
         has_missed_deadlines_by_job[job.identifier] = job.execution_time == job_executed_cycles
         delay_in_soft_real_time_by_job[job.identifier] = job.execution_time - job_executed_cycles
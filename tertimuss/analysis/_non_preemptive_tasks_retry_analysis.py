@@ -1,7 +1,9 @@
 from dataclasses import dataclass
 from typing import Dict, Set, List
 
-from ..simulation_lib.simulator import RawSimulationResult
+import numpy
+
+from ..simulation_lib.simulator import RawSimulationResult, obtain_job_sections_execution_table
 from ..simulation_lib.system_definition import TaskSet, Job, Task, PreemptiveExecution, Criticality
 
 
@@ -85,12 +87,18 @@ def obtain_non_preemptive_tasks_retries_analysis(task_set: TaskSet, jobs: List[J
     number_of_used_cycles_by_job: Dict[int, int] = {i.identifier: 0 for i in jobs if
                                                     i.task.preemptive_execution == PreemptiveExecution.NON_PREEMPTIVE}
 
+    # Sections and executed cycles by job
+    job_sections_execution = obtain_job_sections_execution_table(schedule_result)
+    executed_jobs, executed_jobs_index, executed_jobs_sections = numpy.unique(job_sections_execution["job_id"],
+                                                                              return_inverse=True, return_counts=True)
+    executed_cycles = numpy.zeros(len(executed_jobs), dtype=numpy.int64)
+    numpy.add.at(executed_cycles, executed_jobs_index, job_sections_execution["number_of_executed_cycles"])
+    number_of_tries_by_job: Dict[int, int] = dict(zip(executed_jobs.tolist(), executed_jobs_sections.tolist()))
+    executed_cycles_by_job: Dict[int, int] = dict(zip(executed_jobs.tolist(), executed_cycles.tolist()))
+
     for job in [i for i in jobs if i.task.preemptive_execution == PreemptiveExecution.NON_PREEMPTIVE]:
-        number_of_tries = sum(sum(1 for j in i if j.job_id == job.identifier) for i in
-                              schedule_result.job_sections_execution.values())
-        number_of_used_cycles = sum(
-            sum(j.number_of_executed_cycles for j in i if j.job_id == job.identifier) for i in
-            schedule_result.job_sections_execution.values())
+        number_of_tries = number_of_tries_by_job.get(job.identifier, 0)
+        number_of_used_cycles = executed_cycles_by_job.get(job.identifier, 0)
 
         number_of_retries = number_of_tries - 1 if number_of_tries > 0 else 0
 
@@ -1,7 +1,9 @@
 from dataclasses import dataclass
 from typing import Dict, List, Set
 
-from ..simulation_lib.simulator import RawSimulationResult
+import numpy
+
+from ..simulation_lib.simulator import RawSimulationResult, obtain_job_sections_execution_table
 from ..simulation_lib.system_definition import TaskSet, Job, Task, PreemptiveExecution, Criticality
 
 
@@ -105,15 +107,26 @@ def obtain_preemptions_migrations_analysis(task_set: TaskSet, jobs: List[Job],
     number_of_preemptions_by_task: Dict[int, int] = {i.identifier: 0 for i in tasks if
                                                      i.preemptive_execution == PreemptiveExecution.FULLY_PREEMPTIVE}
 
+    # Sections sorted by job, and by start time inside each job
+    job_sections_execution = obtain_job_sections_execution_table(schedule_result)
+    job_sections_execution = job_sections_execution[numpy.lexsort((job_sections_execution["execution_start_time"],
+                                                                   job_sections_execution["job_id"]))]
+    executed_jobs, executed_jobs_index, executed_jobs_sections = numpy.unique(job_sections_execution["job_id"],
+                                                                              return_inverse=True, return_counts=True)
+
+    # A migration happens when two consecutive sections of the same job are executed in different cores
+    is_migration = (job_sections_execution["job_id"][1:] == job_sections_execution["job_id"][:-1]) & (
+            job_sections_execution["cpu_id"][1:] != job_sections_execution["cpu_id"][:-1])
+    executed_jobs_migrations = numpy.zeros(len(executed_jobs), dtype=numpy.int64)
+    numpy.add.at(executed_jobs_migrations, executed_jobs_index[1:], is_migration)
+
+    number_of_sections_by_job: Dict[int, int] = dict(zip(executed_jobs.tolist(), executed_jobs_sections.tolist()))
+    number_of_migrations_by_executed_job: Dict[int, int] = dict(zip(executed_jobs.tolist(),
+                                                                    executed_jobs_migrations.tolist()))
+
     for job in [i for i in jobs if i.task.preemptive_execution == PreemptiveExecution.FULLY_PREEMPTIVE]:
-        job_execution = [(cpu_number, i.execution_start_time) for cpu_number, job_sections_execution in
-                         schedule_result.job_sections_execution.items() for i in job_sections_execution if
-                         i.job_id == job.identifier]
-
-        job_execution = sorted(job_execution, key=lambda x: x[1])
-        number_of_migrations = sum(1 for (i, j) in zip(job_execution, job_execution[1:]) if i[0] != j[0]) if len(
-            job_execution) > 1 else 0
-        number_of_preemptions = len(job_execution)
+        number_of_migrations = number_of_migrations_by_executed_job.get(job.identifier, 0)
+        number_of_preemptions = number_of_sections_by_job.get(job.identifier, 0)
 
         number_of_migrations_by_job[job.identifier] = number_of_migrations
         number_of_preemptions_by_job[job.identifier] = number_of_preemptions
@@ -24,6 +24,7 @@ Applications, CCA 2014. 2135-2140. 10.1109/CCA.2014.6981618.
 This module provides the following functions related to the thermal model:
 - :function:`.obtain_min_temperature`
 - :function:`.obtain_max_temperature`
+- :function:`.obtain_model_key`
 
 This module provides the following functions that allows the visualization of the thermal model:
 - :function:`.plot_3d_heat_map_temperature`
@@ -44,11 +45,17 @@ It also exposes the following classes:
 - :class:`.FluidEnvironment`
 - :class:`.Model`
 - :class:`.SimulationState`
+- :class:`.BatchSimulationState`
+- :class:`.StructuredGridModel`
+- :class:`.ModelCache`
 """
 
 from ._basic_types import Location, Dimensions, Cuboid, CuboidTemperature, \
     TMInternal, TMExternal, ThermalUnits, \
     PhysicalCuboid, SolidMaterial, FluidEnvironment
-from ._cubed_space import Model, SimulationState, obtain_min_temperature, obtain_max_temperature
+from ._cubed_space import Model, SimulationState, BatchSimulationState, obtain_min_temperature, \
+    obtain_max_temperature
+from ._model_cache import ModelCache, obtain_model_key
+from ._structured_grid_model import StructuredGridModel
 from ._result_plotter import plot_3d_heat_map_temperature, generate_video_3d_heat_map, plot_2d_heat_map, \
     generate_video_2d_heat_map
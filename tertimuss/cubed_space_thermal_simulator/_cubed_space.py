@@ -1,13 +1,15 @@
-import itertools
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import List, Optional, Tuple, Set, Literal, Dict
 
 import numpy
 import scipy.sparse
+import scipy.sparse.linalg
 
 from ._basic_types import Cuboid, TMExternal, TMInternal, CuboidTemperature
 from ._basic_types import SolidMaterial, FluidEnvironment, PhysicalCuboid
-from tertimuss.tcpn_simulator import SVSRungeKutta, SVariableStep, SVSEuler
+from tertimuss.tcpn_simulator import SVSRungeKutta, SVariableStep, SVSEuler, SVSExponential
+from ._reduced_order_model import ReducedOrderSimulator
 
 
 @dataclass
@@ -19,6 +21,70 @@ class SimulationState:
     """marks in places of the petri net"""
 
 
+@dataclass
+class BatchSimulationState:
+    """
+    State of the temperature in a mesh in several simulations of the same cubed space, that are simulated at once
+    """
+    places_mo_matrix: numpy.ndarray
+    """marks in places of the petri net, with one column by simulation"""
+
+
+def _create_location_places_grid(material_cubes: Dict[int, Tuple[SolidMaterial, Cuboid]],
+                                  material_cubes_places: Dict[int, numpy.ndarray]) \
+        -> Tuple[numpy.ndarray, Tuple[int, int, int]]:
+    """
+    Create a grid, indexed by [z, y, x], over the bounding box of all material cubes with the place of each
+    location, or -1 if there isn't any place in the location
+
+    :param material_cubes: Material cubes
+    :param material_cubes_places: Places of each material cube indexed by [z, y, x]
+    :return: The grid and the location of its origin (x, y, z)
+    """
+    if len(material_cubes) == 0:
+        return numpy.full((0, 0, 0), -1), (0, 0, 0)
+
+    cuboids = [i[1] for i in material_cubes.values()]
+    origin = (min(i.location.x for i in cuboids), min(i.location.y for i in cuboids),
+              min(i.location.z for i in cuboids))
+    end = (max(i.location.x + i.dimensions.x for i in cuboids), max(i.location.y + i.dimensions.y for i in cuboids),
+           max(i.location.z + i.dimensions.z for i in cuboids))
+
+    location_places_grid = numpy.full((end[2] - origin[2], end[1] - origin[1], end[0] - origin[0]), -1)
+
+    for material_cube_index, (_, cuboid) in material_cubes.items():
+        location_places_grid[cuboid.location.z - origin[2]: cuboid.location.z - origin[2] + cuboid.dimensions.z,
+                             cuboid.location.y - origin[1]: cuboid.location.y - origin[1] + cuboid.dimensions.y,
+                             cuboid.location.x - origin[0]: cuboid.location.x - origin[0] + cuboid.dimensions.x] \
+            = material_cubes_places[material_cube_index]
+
+    return location_places_grid, origin
+
+
+def _obtain_places_in_cuboid(cuboid: Cuboid, location_places_grid: numpy.ndarray,
+                             location_places_grid_origin: Tuple[int, int, int]) -> numpy.ndarray:
+    """
+    Obtain the places located inside a cuboid, ordered by z, then by y and then by x
+
+    :param cuboid: Cuboid
+    :param location_places_grid: Grid with the place of each location
+    :param location_places_grid_origin: Location of the origin of the grid
+    :return: Places inside the cuboid
+    """
+    (start_x, end_x), (start_y, end_y), (start_z, end_z) = [
+        (max(location - origin, 0), min(location - origin + dimension, grid_dimension)) for
+        location, dimension, origin, grid_dimension in
+        zip((cuboid.location.x, cuboid.location.y, cuboid.location.z),
+            (cuboid.dimensions.x, cuboid.dimensions.y, cuboid.dimensions.z),
+            location_places_grid_origin, reversed(location_places_grid.shape))]
+
+    if start_x >= end_x or start_y >= end_y or start_z >= end_z:
+        return numpy.zeros(0, dtype=int)
+
+    places = location_places_grid[start_z:end_z, start_y:end_y, start_x:end_x].reshape(-1)
+    return places[places >= 0]
+
+
 class Model(object):
     """
     Representation of a physical object by cubes
@@ -28,7 +94,8 @@ class Model(object):
                  environment_properties: Optional[FluidEnvironment] = None,
                  external_temperature_booster_points: Optional[Dict[int, TMExternal]] = None,
                  internal_temperature_booster_points: Optional[Dict[int, TMInternal]] = None,
-                 simulation_precision: Literal["LOW", "MIDDLE", "HIGH"] = "HIGH"):
+                 simulation_precision: Literal["LOW", "MIDDLE", "HIGH", "EXACT"] = "HIGH",
+                 reduced_order_modes: Optional[int] = None):
         """
         This function creates a cubedSpace
 
@@ -45,6 +112,11 @@ class Model(object):
         :param internal_temperature_booster_points: This parameter is only used with optimization purposes. If is
          not null, all the elements of internal_energy_application_points in the function apply_energy, must be in
          fixed_internal_energy_application_points.
+        :param simulation_precision: Precision in the simulation (method used to solve the model and float precision)
+        :param reduced_order_modes: If not None, the model is reduced by modal truncation to this number of modes (plus
+         a few vectors that keep the steady state exact), and simulated exactly in the reduced space. The states store
+         the reduced temperatures, and the temperature of each cube is only reconstructed when it is obtained. The
+         simulation precision is not used to simulate a reduced model
         """
         # Fill fields if are empty
         external_temperature_booster_points = external_temperature_booster_points \
@@ -56,13 +128,14 @@ class Model(object):
         # LOW: Euler and float32
         # MIDDLE: RK and float32
         # HIGH: RK and float64
+        # EXACT: Matrix exponential and float64
 
         # Select precision type
         if simulation_precision == "LOW":
             dtype = numpy.float32
         elif simulation_precision == "MIDDLE":
             dtype = numpy.float32
-        elif simulation_precision == "HIGH":
+        elif simulation_precision == "HIGH" or simulation_precision == "EXACT":
             dtype = numpy.float64
         else:
             raise Exception("Not available precision")
@@ -85,14 +158,36 @@ class Model(object):
         # +--------------------------------------------------------+
 
         # TCPN definition
-        mo_index = {}
-        material_cubes_dict = {}
-        internal_conductivity_pre = []
-        internal_conductivity_post = []
-        internal_conductivity_lambda = []
-        mo_cubes_size = []
-        places_material_mapping = []
-        location_places_mapping: Dict[Tuple[int, int, int], int] = {}
+        # The pre and post matrices are built from COO triplets (place, transition, weight) generated in bulk with index
+        # arithmetic over the places of each material cube
+        mo_index: Dict[int, int] = {}
+        material_cubes_dict: Dict[int, Tuple[SolidMaterial, Cuboid]] = {}
+        pre_arcs: Tuple[List[numpy.ndarray], List[numpy.ndarray], List[numpy.ndarray]] = ([], [], [])
+        post_arcs: Tuple[List[numpy.ndarray], List[numpy.ndarray], List[numpy.ndarray]] = ([], [], [])
+        lambda_vectors: List[numpy.ndarray] = []
+        number_of_transitions = 0
+        mo_places_size = 0
+
+        def _add_arcs(arcs: Tuple[List[numpy.ndarray], List[numpy.ndarray], List[numpy.ndarray]],
+                      places: numpy.ndarray, transitions: numpy.ndarray, weights):
+            arcs[0].append(places)
+            arcs[1].append(transitions)
+            arcs[2].append(numpy.broadcast_to(numpy.asarray(weights, dtype=dtype), places.shape))
+
+        def _add_conduction_arcs(places_a: numpy.ndarray, places_b: numpy.ndarray, weight_a_b: float,
+                                 weight_b_a: float):
+            # Each pair of places in contact is connected by two consecutive transitions, from A -> B and from B -> A
+            transitions = number_of_transitions + numpy.arange(2 * len(places_a))
+            _add_arcs(pre_arcs, numpy.stack([places_a, places_b], axis=1).reshape(-1), transitions, 1)
+            _add_arcs(post_arcs, numpy.stack([places_b, places_a], axis=1).reshape(-1), transitions,
+                      numpy.tile(numpy.asarray([weight_a_b, weight_b_a], dtype=dtype), len(places_a)))
+            return number_of_transitions + 2 * len(places_a)
+
+        # Places of each material cube, indexed by [z, y, x]
+        material_cubes_places: Dict[int, numpy.ndarray] = {}
+
+        # Convection lambda of each place (only used if there is environment)
+        places_convection_lambda: List[numpy.ndarray] = []
 
         # First create internal conductivity for each material cube
         for material_cube_index, material_cube in material_cubes.items():
@@ -112,12 +207,6 @@ class Model(object):
             # Total number of PN places
             p: int = x * y * z
 
-            # Total number of transitions -> One for each side in contact (two shared between two)
-            # t = interactions in same z (4 * p - 2 * (x + y) * amount of z levels
-            # + interactions between z levels (2 * x * y * (z - 1))
-            # t: int = (4 * p - 2 * (x + y)) * z + 2 * x * y * (z - 1)
-            t: int = 2 * (x - 1) * y * z + 2 * x * (y - 1) * z + 2 * x * y * (z - 1)
-
             # Each cube have been indexed by x, then by y and then by z
             # ie.
             # x = 3, y = 3, z = 2
@@ -127,312 +216,206 @@ class Model(object):
             # 1 2 3        10 11 12
             # 4 5 6        13 14 15
             # 7 8 9        16 17 18
-            pre = scipy.sparse.lil_matrix((p, t), dtype=dtype)
-            post = scipy.sparse.lil_matrix((p, t), dtype=dtype)
+            mo_index[material_cube_index] = mo_places_size
+            material_cubes_dict[material_cube_index] = material_cube
+            places = mo_places_size + numpy.arange(p).reshape((z, y, x))
+            material_cubes_places[material_cube_index] = places
+            mo_places_size += p
+
+            # Create conductivity with horizontal adjacent, then with vertical adjacent and then with upper and lower
+            for places_a, places_b in [(places[:, :, :-1], places[:, :, 1:]),
+                                       (places[:, :-1, :], places[:, 1:, :]),
+                                       (places[:-1, :, :], places[1:, :, :])]:
+                number_of_transitions = _add_conduction_arcs(places_a.reshape(-1), places_b.reshape(-1), 1, 1)
 
             # All lambdas are equals
-            lambda_vector = numpy.full(t, lambda_side, dtype=dtype)
-
-            # Create conductivity with horizontal adjacent
-            for actual_z in range(z):
-                for actual_y in range(y):
-                    for actual_x in range(x - 1):
-                        first_transition_index = 2 * (actual_z * y * (x - 1) + actual_y * (x - 1) + actual_x)
-                        second_transition_index = first_transition_index + 1
-
-                        # First transition
-                        pre[actual_z * y * x + actual_y * x + actual_x, first_transition_index] = 1
-                        post[actual_z * y * x + actual_y * x + actual_x + 1, first_transition_index] = 1
-
-                        # Second transition
-                        pre[actual_z * y * x + actual_y * x + actual_x + 1, second_transition_index] = 1
-                        post[actual_z * y * x + actual_y * x + actual_x, second_transition_index] = 1
-
-            # Base index for vertical transitions
-            base_transition_index_vertical = 2 * (x - 1) * y * z
-
-            # Create conductivity with vertical adjacent
-            for actual_z in range(z):
-                for actual_y in range(y - 1):
-                    for actual_x in range(x):
-                        first_transition_index = base_transition_index_vertical + 2 * (
-                                actual_z * (y - 1) * x + actual_y * x + actual_x)
-                        second_transition_index = first_transition_index + 1
-
-                        # First transition
-                        pre[actual_z * y * x + actual_y * x + actual_x, first_transition_index] = 1
-                        post[actual_z * y * x + (actual_y + 1) * x + actual_x, first_transition_index] = 1
-
-                        # Second transition
-                        pre[actual_z * y * x + (actual_y + 1) * x + actual_x, second_transition_index] = 1
-                        post[actual_z * y * x + actual_y * x + actual_x, second_transition_index] = 1
-
-            # Base index for upper/lower transitions
-            base_transition_index_upper_lower = 2 * (x - 1) * y * z + 2 * x * (y - 1) * z
-
-            # Create conductivity with vertical upper and lower
-            for actual_z in range(z - 1):
-                for actual_y in range(y):
-                    for actual_x in range(x):
-                        first_transition_index = base_transition_index_upper_lower + 2 * (
-                                actual_z * y * x + actual_y * x + actual_x)
-                        second_transition_index = first_transition_index + 1
-
-                        # First transition
-                        pre[actual_z * y * x + actual_y * x + actual_x, first_transition_index] = 1
-                        post[(actual_z + 1) * y * x + actual_y * x + actual_x, first_transition_index] = 1
-
-                        # Second transition
-                        pre[(actual_z + 1) * y * x + actual_y * x + actual_x, second_transition_index] = 1
-                        post[actual_z * y * x + actual_y * x + actual_x, second_transition_index] = 1
-
-            # Save results
-            mo_index[material_cube_index] = sum(mo_cubes_size)
-            material_cubes_dict[material_cube_index] = material_cube
-            mo_cubes_size.append(p)
-            internal_conductivity_pre.append(pre)
-            internal_conductivity_post.append(post)
-            internal_conductivity_lambda.append(lambda_vector)
-            places_material_mapping[mo_index[material_cube_index]:
-                                    mo_index[material_cube_index] +
-                                    material_cube[1].dimensions.x *
-                                    material_cube[1].dimensions.y *
-                                    material_cube[1].dimensions.z] = (material_cube[1].dimensions.x *
-                                                                      material_cube[1].dimensions.y *
-                                                                      material_cube[1].dimensions.z) * [
-                                                                         material_cube_index]
-
-            # Fill location to place mapping dict
-            for actual_z in range(z):
-                for actual_y in range(y):
-                    for actual_x in range(x):
-                        local_place = actual_z * y * x + actual_y * x + actual_x
-                        global_place = mo_index[material_cube_index] + local_place
-                        location_places_mapping[(material_cube[1].location.x + actual_x,
-                                                 material_cube[1].location.y + actual_y,
-                                                 material_cube[1].location.z + actual_z)] = global_place
+            # Total number of transitions -> One for each side in contact (two shared between two)
+            t: int = 2 * (x - 1) * y * z + 2 * x * (y - 1) * z + 2 * x * y * (z - 1)
+            lambda_vectors.append(numpy.full(t, lambda_side, dtype=dtype))
 
-        # Add interaction between cuboids
-        mo_places_size = sum(mo_cubes_size)
+            if environment_properties is not None:
+                places_convection_lambda.append(numpy.full(p, environment_properties.heatTransferCoefficient / (
+                        cube_edge_size * material_cube[0].density * material_cube[0].specificHeatCapacity)))
 
-        external_conductivity_pre = []
-        external_conductivity_post = []
-        external_conductivity_lambda = []
+        # Location to place mapping. Grid over the bounding box of all cubes with the place in each location, or -1
+        location_places_grid, location_places_grid_origin = _create_location_places_grid(material_cubes,
+                                                                                         material_cubes_places)
 
+        # Add interaction between cuboids
         # Places that touch other place
-        places_with_contact: Set[int] = set()
+        places_with_contact = numpy.zeros(mo_places_size, dtype=bool)
 
         for material_cube_a_index, material_cube_a in material_cubes.items():
             for material_cube_b_index, material_cube_b in material_cubes.items():
                 # Avoid duplicities
                 if material_cube_a_index < material_cube_b_index:
-                    places_in_touch = self.__obtain_places_in_touch(material_cube_a, mo_index[material_cube_a_index],
-                                                                    material_cube_b, mo_index[material_cube_b_index])
-                    for place_a, place_b in places_in_touch:
-                        pre = scipy.sparse.lil_matrix((mo_places_size, 2), dtype=dtype)
-                        post = scipy.sparse.lil_matrix((mo_places_size, 2), dtype=dtype)
-
-                        # Transition 1, from A -> B
-                        pre[place_a, 0] = 1
-                        post[place_b, 0] = (material_cube_a[0].density
-                                            * material_cube_a[0].specificHeatCapacity) / \
-                                           (material_cube_b[0].density
-                                            * material_cube_b[0].specificHeatCapacity)
-
-                        # Transition 2, from B -> A
-                        pre[place_b, 1] = 1
-                        post[place_a, 1] = (material_cube_b[0].density
-                                            * material_cube_b[0].specificHeatCapacity) / \
-                                           (material_cube_a[0].density
-                                            * material_cube_a[0].specificHeatCapacity)
-
-                        # All lambdas are equals
-                        lambda_vector = numpy.zeros(shape=2, dtype=dtype)
-
-                        # Calculate lambda from A -> B
-                        lambda_vector[0] = (material_cube_a[0].thermalConductivity
-                                            * material_cube_b[0].thermalConductivity) / \
-                                           (material_cube_a[0].density
-                                            * material_cube_a[0].specificHeatCapacity
-                                            * (material_cube_a[0].thermalConductivity
-                                               + material_cube_b[0].thermalConductivity)
-                                            * (cube_edge_size ** 2))
-
-                        # Calculate lambda from B -> A
-                        lambda_vector[1] = (material_cube_a[0].thermalConductivity
-                                            * material_cube_b[0].thermalConductivity) / \
-                                           (material_cube_b[0].density
-                                            * material_cube_b[0].specificHeatCapacity
-                                            * (material_cube_a[0].thermalConductivity
-                                               + material_cube_b[0].thermalConductivity)
-                                            * (cube_edge_size ** 2))
-
-                        # Append to global values
-                        external_conductivity_pre.append(pre)
-                        external_conductivity_post.append(post)
-                        external_conductivity_lambda.append(lambda_vector)
-
-                        # Add booth places to the set of places in contact
-                        places_with_contact.add(place_a)
-                        places_with_contact.add(place_b)
+                    places_a, places_b = self.__obtain_places_in_touch(material_cube_a,
+                                                                       material_cubes_places[material_cube_a_index],
+                                                                       material_cube_b,
+                                                                       material_cubes_places[material_cube_b_index])
+
+                    if len(places_a) == 0:
+                        continue
+
+                    heat_capacity_a = material_cube_a[0].density * material_cube_a[0].specificHeatCapacity
+                    heat_capacity_b = material_cube_b[0].density * material_cube_b[0].specificHeatCapacity
+                    conductivity_a = material_cube_a[0].thermalConductivity
+                    conductivity_b = material_cube_b[0].thermalConductivity
+
+                    # Transition 1, from A -> B, and transition 2, from B -> A
+                    number_of_transitions = _add_conduction_arcs(places_a, places_b,
+                                                                 heat_capacity_a / heat_capacity_b,
+                                                                 heat_capacity_b / heat_capacity_a)
+
+                    lambda_vector = numpy.zeros(shape=(len(places_a), 2), dtype=dtype)
+
+                    # Calculate lambda from A -> B
+                    lambda_vector[:, 0] = (conductivity_a * conductivity_b) / (
+                            heat_capacity_a * (conductivity_a + conductivity_b) * (cube_edge_size ** 2))
+
+                    # Calculate lambda from B -> A
+                    lambda_vector[:, 1] = (conductivity_a * conductivity_b) / (
+                            heat_capacity_b * (conductivity_a + conductivity_b) * (cube_edge_size ** 2))
+
+                    lambda_vectors.append(lambda_vector.reshape(-1))
+
+                    # Add booth places to the set of places in contact
+                    places_with_contact[places_a] = True
+                    places_with_contact[places_b] = True
 
         # Add convection
-        places_with_convection: Set[int] = set(range(mo_places_size)).difference(
-            places_with_contact) if environment_properties is not None else set()
-
-        # Return the convection lambda of a material
-        def _convection_lambda_of_material(_material_cube: Tuple[SolidMaterial, Cuboid]) -> float:
-            return environment_properties.heatTransferCoefficient / (
-                    cube_edge_size * _material_cube[0].density *
-                    _material_cube[0].specificHeatCapacity)
-
-        # This data structure store for each place in contact with the environment the heat extraction transition'
-        # lambda value
-        conv_lambda_by_place: List[Tuple[int, float]] = [
-            (i, _convection_lambda_of_material(material_cubes[places_material_mapping[i]])) for i in
-            places_with_convection]
-
-        # This data structure store for each material the places that have this material and are in contact
-        # with the environment and the associated lambda
-        conv_lambda_shared_material_places: List[Tuple[float, List[int]]] = [(k, [j[0] for j in i]) for k, i in
-                                                                             itertools.groupby(conv_lambda_by_place,
-                                                                                               key=lambda j: j[1])]
+        places_with_convection: numpy.ndarray = numpy.flatnonzero(~places_with_contact) \
+            if environment_properties is not None else numpy.zeros(0, dtype=int)
 
-        # Heat extracted to the air
-        pre_conv_1 = scipy.sparse.lil_matrix((mo_places_size, len(places_with_convection)), dtype=dtype)
-        post_conv_1 = scipy.sparse.lil_matrix((mo_places_size, len(places_with_convection)), dtype=dtype)
-        lambda_vector_conv_1 = numpy.zeros(len(places_with_convection), dtype=dtype)
+        # Heat extraction transition' lambda value of each place in contact with the environment
+        conv_lambda_by_place: numpy.ndarray = numpy.concatenate(places_convection_lambda)[places_with_convection] \
+            if environment_properties is not None else numpy.zeros(0)
 
-        for transition_index, (place, transition_lambda) in enumerate(conv_lambda_by_place):
-            pre_conv_1[place, transition_index] = 1
-            lambda_vector_conv_1[transition_index] = transition_lambda
+        # Consecutive places with the same lambda share the environment place
+        environment_place_starts = numpy.ones(len(conv_lambda_by_place), dtype=bool)
+        environment_place_starts[1:] = conv_lambda_by_place[1:] != conv_lambda_by_place[:-1]
+        environment_place_by_place = numpy.cumsum(environment_place_starts) - 1
+        environment_number_of_places = int(numpy.count_nonzero(environment_place_starts))
+
+        # Heat extracted to the air
+        conv_1_transitions = number_of_transitions + numpy.arange(len(places_with_convection))
+        _add_arcs(pre_arcs, places_with_convection, conv_1_transitions, 1)
+        lambda_vectors.append(conv_lambda_by_place.astype(dtype))
+        number_of_transitions += len(places_with_convection)
 
         # Heat acquired from the air
-        pre_conv_2 = scipy.sparse.lil_matrix(
-            (mo_places_size + len(conv_lambda_shared_material_places), len(conv_lambda_shared_material_places)),
-            dtype=dtype)
-        post_conv_2 = scipy.sparse.lil_matrix(
-            (mo_places_size + len(conv_lambda_shared_material_places), len(conv_lambda_shared_material_places)),
-            dtype=dtype)
-        lambda_vector_conv_2 = numpy.zeros(len(conv_lambda_shared_material_places), dtype=dtype)
-
-        for transition_index, (material_lambda, places) in enumerate(conv_lambda_shared_material_places):
-            lambda_vector_conv_2[transition_index] = material_lambda
-            pre_conv_2[mo_places_size + transition_index, transition_index] = 1
-            post_conv_2[mo_places_size + transition_index, transition_index] = 1
-            for place in places:
-                post_conv_2[place, transition_index] = 1
+        environment_places = mo_places_size + numpy.arange(environment_number_of_places)
+        conv_2_transitions = number_of_transitions + numpy.arange(environment_number_of_places)
+        _add_arcs(pre_arcs, environment_places, conv_2_transitions, 1)
+        _add_arcs(post_arcs, environment_places, conv_2_transitions, 1)
+        _add_arcs(post_arcs, places_with_convection, number_of_transitions + environment_place_by_place, 1)
+        lambda_vectors.append(conv_lambda_by_place[environment_place_starts].astype(dtype))
+        number_of_transitions += environment_number_of_places
 
         # Internal temperature boost
         # Store for each internal temperature boost, the first transition index and the number of transitions related
         internal_temperature_boost_transitions: Dict[int, Tuple[int, int]] = {}
-        pre_internal_gen = []
-        post_internal_gen = []
-        lambda_vector_internal_gen = []
+        internal_temperature_boost_transition_start = 0
 
         for internal_temperature_booster_point_index, internal_temperature_booster_point in \
                 internal_temperature_booster_points.items():
-            places = []
-            for actual_z in range(internal_temperature_booster_point.cuboid.dimensions.z):
-                for actual_y in range(internal_temperature_booster_point.cuboid.dimensions.y):
-                    for actual_x in range(internal_temperature_booster_point.cuboid.dimensions.x):
-                        global_z = actual_z + internal_temperature_booster_point.cuboid.location.z
-                        global_y = actual_y + internal_temperature_booster_point.cuboid.location.y
-                        global_x = actual_x + internal_temperature_booster_point.cuboid.location.x
-
-                        if location_places_mapping.__contains__((global_x, global_y, global_z)):
-                            places.append(location_places_mapping[(global_x, global_y, global_z)])
-
-            pre = scipy.sparse.lil_matrix((pre_conv_2.shape[0], len(places)), dtype=dtype)
-            post = scipy.sparse.lil_matrix((post_conv_2.shape[0], len(places)), dtype=dtype)
-            lambda_vector = numpy.zeros(len(places))
-
-            for place_index, place in enumerate(places):
-                pre[place, place_index] = 1
-                post[place, place_index] = 2
-                lambda_vector[place_index] = internal_temperature_booster_point.boostRateMultiplier
-
-            # Store matrix
-            internal_temperature_boost_transition_start = sum(
-                [i[1] for _, i in internal_temperature_boost_transitions.items()])
+            places = _obtain_places_in_cuboid(internal_temperature_booster_point.cuboid, location_places_grid,
+                                              location_places_grid_origin)
+
+            transitions = number_of_transitions + numpy.arange(len(places))
+            _add_arcs(pre_arcs, places, transitions, 1)
+            _add_arcs(post_arcs, places, transitions, 2)
+            lambda_vectors.append(numpy.full(len(places), internal_temperature_booster_point.boostRateMultiplier,
+                                              dtype=dtype))
+            number_of_transitions += len(places)
 
+            # Store transitions
             internal_temperature_boost_transitions[internal_temperature_booster_point_index] = \
                 (internal_temperature_boost_transition_start, len(places))
-
-            pre_internal_gen.append(pre)
-            post_internal_gen.append(post)
-            lambda_vector_internal_gen.append(lambda_vector)
+            internal_temperature_boost_transition_start += len(places)
 
         # External temperature boost
+        # Each external temperature boost has a place that keeps the transition enabled
         external_temperature_boost_places: Dict[int, int] = {}
-        pre_external_gen_1 = scipy.sparse.lil_matrix((post_conv_2.shape[0], len(external_temperature_booster_points)),
-                                                     dtype=dtype)
-        post_external_gen_1 = scipy.sparse.lil_matrix((post_conv_2.shape[0], len(external_temperature_booster_points)),
-                                                      dtype=dtype)
         lambda_vector_external_gen = numpy.zeros(len(external_temperature_booster_points), dtype=dtype)
 
         for transition_index, (external_temperature_booster_point_index, external_temperature_booster_point) in \
                 enumerate(external_temperature_booster_points.items()):
-            places = []
-            for actual_z in range(external_temperature_booster_point.cuboid.dimensions.z):
-                for actual_y in range(external_temperature_booster_point.cuboid.dimensions.y):
-                    for actual_x in range(external_temperature_booster_point.cuboid.dimensions.x):
-                        global_z = actual_z + external_temperature_booster_point.cuboid.location.z
-                        global_y = actual_y + external_temperature_booster_point.cuboid.location.y
-                        global_x = actual_x + external_temperature_booster_point.cuboid.location.x
-
-                        if location_places_mapping.__contains__((global_x, global_y, global_z)):
-                            places.append(location_places_mapping[(global_x, global_y, global_z)])
+            places = _obtain_places_in_cuboid(external_temperature_booster_point.cuboid, location_places_grid,
+                                              location_places_grid_origin)
 
-            for place_index, place in enumerate(places):
-                post_external_gen_1[place, transition_index] = 1
+            _add_arcs(post_arcs, places, numpy.full(len(places), number_of_transitions + transition_index), 1)
 
             lambda_vector_external_gen[transition_index] = external_temperature_booster_point.boostRate
 
             external_temperature_boost_places[external_temperature_booster_point_index] = len(
                 external_temperature_boost_places)
 
+        external_gen_places = mo_places_size + environment_number_of_places + numpy.arange(
+            len(external_temperature_booster_points))
+        external_gen_transitions = number_of_transitions + numpy.arange(len(external_temperature_booster_points))
+        _add_arcs(pre_arcs, external_gen_places, external_gen_transitions, 1)
+        _add_arcs(post_arcs, external_gen_places, external_gen_transitions, 1)
+        lambda_vectors.append(lambda_vector_external_gen)
+        number_of_transitions += len(external_temperature_booster_points)
+
         # Create global pre, post and lambda
-        # Add interaction matrix
-        pre = scipy.sparse.hstack(
-            [scipy.sparse.block_diag(internal_conductivity_pre)] + external_conductivity_pre + [pre_conv_1])
-        pre = scipy.sparse.vstack(
-            [pre, scipy.sparse.lil_matrix((len(conv_lambda_shared_material_places), pre.shape[1]), dtype=dtype)])
-        pre = scipy.sparse.hstack([pre, pre_conv_2])
-        pre = scipy.sparse.hstack([pre] + pre_internal_gen)
-        pre = scipy.sparse.vstack(
-            [pre, scipy.sparse.lil_matrix((len(external_temperature_booster_points), pre.shape[1]), dtype=dtype)])
-        pre = scipy.sparse.hstack(
-            [pre, scipy.sparse.vstack([pre_external_gen_1, scipy.sparse.eye(len(external_temperature_booster_points))])]
-        )
-        self.__pre = pre.tocsr()
-
-        post = scipy.sparse.hstack(
-            [scipy.sparse.block_diag(internal_conductivity_post)] + external_conductivity_post + [post_conv_1])
-        post = scipy.sparse.vstack(
-            [post, scipy.sparse.lil_matrix((len(conv_lambda_shared_material_places), post.shape[1]), dtype=dtype)])
-        post = scipy.sparse.hstack([post, post_conv_2])
-        post = scipy.sparse.hstack([post] + post_internal_gen)
-        post = scipy.sparse.vstack(
-            [post, scipy.sparse.lil_matrix((len(external_temperature_booster_points), post.shape[1]), dtype=dtype)])
-        post = scipy.sparse.hstack(
-            [post,
-             scipy.sparse.vstack([post_external_gen_1, scipy.sparse.eye(len(external_temperature_booster_points))])]
-        )
-        self.__post = post.tocsr()
+        matrices_shape = (mo_places_size + environment_number_of_places + len(external_temperature_booster_points),
+                          number_of_transitions)
+
+        pre = scipy.sparse.coo_matrix(
+            (numpy.concatenate(pre_arcs[2]), (numpy.concatenate(pre_arcs[0]), numpy.concatenate(pre_arcs[1]))),
+            shape=matrices_shape, dtype=dtype).tocsr()
+
+        post = scipy.sparse.coo_matrix(
+            (numpy.concatenate(post_arcs[2]), (numpy.concatenate(post_arcs[0]), numpy.concatenate(post_arcs[1]))),
+            shape=matrices_shape, dtype=dtype).tocsr()
+
+        self.__initialize(pre, post, numpy.concatenate(lambda_vectors), mo_index, material_cubes_dict,
+                          environment_number_of_places, simulation_precision, internal_temperature_boost_transitions,
+                          external_temperature_boost_places, reduced_order_modes)
+
+    def __initialize(self, pre: scipy.sparse.csr_matrix, post: scipy.sparse.csr_matrix, lambda_vector: numpy.ndarray,
+                     mo_index: Dict[int, int], material_cubes_dict: Dict[int, Tuple[SolidMaterial, Cuboid]],
+                     environment_number_of_places: int,
+                     simulation_precision: Literal["LOW", "MIDDLE", "HIGH", "EXACT"],
+                     internal_temperature_boost_transitions: Dict[int, Tuple[int, int]],
+                     external_temperature_boost_places: Dict[int, int],
+                     reduced_order_modes: Optional[int] = None,
+                     reduced_order_basis: Optional[numpy.ndarray] = None):
+        """
+        Set the TCPN of the cubed space and create its simulator
+
+        :param pre: pre matrix
+        :param post: post matrix
+        :param lambda_vector: lambda vector
+        :param mo_index: First place of each material cube
+        :param material_cubes_dict: Material cubes
+        :param environment_number_of_places: Number of places that represent the environment
+        :param simulation_precision: Precision in the simulation
+        :param internal_temperature_boost_transitions: First transition and number of transitions of each internal
+         temperature booster point (the first transition is relative to the first heat generation transition)
+        :param external_temperature_boost_places: Place of each external temperature booster point (relative to the
+         first heat generation place)
+        :param reduced_order_modes: Number of modes of the reduced model, or None to simulate the full model
+        :param reduced_order_basis: Basis of the reduced model, if it was already calculated
+        """
+        self.__pre = pre
+        self.__post = post
 
         self.__pi: scipy.sparse.csr_matrix = self.__pre.copy().transpose()
 
-        self.__lambda_vector = numpy.concatenate(
-            internal_conductivity_lambda + external_conductivity_lambda + [lambda_vector_conv_1, lambda_vector_conv_2]
-            + lambda_vector_internal_gen + [lambda_vector_external_gen])
+        self.__lambda_vector = lambda_vector
 
         self.__mo_index = mo_index
         self.__material_cubes_dict: Dict[int, Tuple[SolidMaterial, Cuboid]] = material_cubes_dict
 
-        self.__environment_number_of_places: int = len(conv_lambda_shared_material_places)
+        self.__environment_number_of_places: int = environment_number_of_places
+
+        self.__simulation_precision = numpy.float64 if simulation_precision == "HIGH" or \
+            simulation_precision == "EXACT" else numpy.float32
 
-        self.__simulation_precision = dtype
+        self.__simulation_precision_name: Literal["LOW", "MIDDLE", "HIGH", "EXACT"] = simulation_precision
 
         if simulation_precision == "HIGH" or simulation_precision == "MIDDLE":
             self.__tcpn_simulator: SVariableStep = SVSRungeKutta(
@@ -447,125 +430,162 @@ class Model(object):
                 self.__lambda_vector,
                 self.__pi, 128, True
             )
+        elif simulation_precision == "EXACT":
+            self.__tcpn_simulator: SVariableStep = SVSExponential(
+                self.__pre,
+                self.__post,
+                self.__lambda_vector,
+                self.__pi
+            )
         else:
             raise Exception("Not available precision")
 
+        # Reduced order model
+        self.__reduced_order_modes = reduced_order_modes
+        self.__reduced_order_simulator: Optional[ReducedOrderSimulator] = None
+
+        if reduced_order_modes is not None:
+            self.__reduced_order_simulator = ReducedOrderSimulator(
+                self.__pre, self.__post, self.__lambda_vector,
+                numpy.concatenate([numpy.full(j[1].dimensions.x * j[1].dimensions.y * j[1].dimensions.z,
+                                              j[0].density * j[0].specificHeatCapacity)
+                                   for j in (material_cubes_dict[i] for i in mo_index.keys())] + [numpy.zeros(0)]),
+                [(v, material_cubes_dict[i][1].dimensions.x * material_cubes_dict[i][1].dimensions.y *
+                  material_cubes_dict[i][1].dimensions.z) for i, v in mo_index.items()],
+                reduced_order_modes, basis=reduced_order_basis)
+            self.__tcpn_simulator = self.__reduced_order_simulator
+
         self.__internal_temperature_boost_transitions: Dict[
             int, Tuple[int, int]] = internal_temperature_boost_transitions
 
         self.__external_temperature_boost_places = external_temperature_boost_places
 
-        self.__activated_internal_temperature_boost_transitions: Set[int] = \
-            {i for i, _ in internal_temperature_booster_points.items()}
-        self.__activated_external_temperature_boost_transitions: Set[int] = \
-            {i for i, _ in external_temperature_booster_points.items()}
-
-    @classmethod
-    def __obtain_places_in_touch(cls, material_cube_a: Tuple[SolidMaterial, Cuboid],
-                                 material_cube_a_places_index: int,
-                                 material_cube_b: Tuple[SolidMaterial, Cuboid],
-                                 material_cube_b_places_index: int) \
-            -> List[Tuple[int, int]]:
-        # Touch in axis y
-        if material_cube_a[1].location.y + material_cube_a[1].dimensions.y == material_cube_b[1].location.y or \
-                material_cube_b[1].location.y + material_cube_b[1].dimensions.y == material_cube_a[1].location.y:
-            collision = cls.__check_rectangles_collision(
-                (material_cube_a[1].location.x, material_cube_a[1].location.z),
-                (material_cube_a[1].dimensions.x, material_cube_a[1].dimensions.z),
-                (material_cube_b[1].location.x, material_cube_b[1].location.z),
-                (material_cube_b[1].dimensions.x, material_cube_b[1].dimensions.z)
-            )
+        # Factorization of the conduction matrix of the material places by control, used to solve the steady state
+        self.__steady_state_factorizations: \
+            'OrderedDict[bytes, Tuple[scipy.sparse.linalg.SuperLU, scipy.sparse.csr_matrix]]' = OrderedDict()
 
-            y_location = (material_cube_b[1].location.y - 1, material_cube_b[1].location.y) if material_cube_a[
-                                                                                                   1].location.y + \
-                                                                                               material_cube_a[
-                                                                                                   1].dimensions.y == \
-                                                                                               material_cube_b[
-                                                                                                   1].location.y else (
-                material_cube_a[1].location.y, material_cube_a[1].location.y - 1)
-
-            collision_all_axis = [((x, x), y_location, (z, z)) for x, z in collision]
-
-        # Touch in axis x
-        elif material_cube_a[1].location.x + material_cube_a[1].dimensions.x == material_cube_b[1].location.x or \
-                material_cube_b[1].location.x + material_cube_b[1].dimensions.x == material_cube_a[1].location.x:
-            collision = cls.__check_rectangles_collision(
-                (material_cube_a[1].location.y, material_cube_a[1].location.z),
-                (material_cube_a[1].dimensions.y, material_cube_a[1].dimensions.z),
-                (material_cube_b[1].location.y, material_cube_b[1].location.z),
-                (material_cube_b[1].dimensions.y, material_cube_b[1].dimensions.z)
-            )
-
-            x_location = (material_cube_b[1].location.x - 1, material_cube_b[1].location.x) if material_cube_a[
-                                                                                                   1].location.x + \
-                                                                                               material_cube_a[
-                                                                                                   1].dimensions.x == \
-                                                                                               material_cube_b[
-                                                                                                   1].location.x else (
-                material_cube_a[1].location.x, material_cube_a[1].location.x - 1)
-
-            collision_all_axis = [(x_location, (y, y), (z, z)) for y, z in collision]
-
-        # Touch in axis z
-        elif material_cube_a[1].location.z + material_cube_a[1].dimensions.z == material_cube_b[1].location.z or \
-                material_cube_b[1].location.z + material_cube_b[1].dimensions.z == material_cube_a[1].location.z:
-            collision = cls.__check_rectangles_collision(
-                (material_cube_a[1].location.x, material_cube_a[1].location.y),
-                (material_cube_a[1].dimensions.x, material_cube_a[1].dimensions.y),
-                (material_cube_b[1].location.x, material_cube_b[1].location.y),
-                (material_cube_b[1].dimensions.x, material_cube_b[1].dimensions.y)
-            )
-
-            z_location = (material_cube_b[1].location.z - 1, material_cube_b[1].location.z) if material_cube_a[
-                                                                                                   1].location.z + \
-                                                                                               material_cube_a[
-                                                                                                   1].dimensions.z == \
-                                                                                               material_cube_b[
-                                                                                                   1].location.z else (
-                material_cube_a[1].location.z, material_cube_a[1].location.z - 1)
+        self.__activated_internal_temperature_boost_transitions: Set[int] = \
+            set(internal_temperature_boost_transitions.keys())
+        # None if the external points apply a fraction of their energy
+        self.__activated_external_temperature_boost_transitions: Optional[Set[int]] = \
+            set(external_temperature_boost_places.keys())
 
-            collision_all_axis = [((x, x), (y, y), z_location) for x, y in collision]
+    def save(self, file_path: str):
+        """
+        Save the TCPN of the cubed space in a NumPy .npz file, so it can be loaded without building it again
 
-        # No touch
-        else:
-            collision_all_axis = []
+        :param file_path: Path of the file
+        """
+        numpy.savez(file_path,
+                    pre_data=self.__pre.data, pre_indices=self.__pre.indices, pre_indptr=self.__pre.indptr,
+                    pre_shape=numpy.asarray(self.__pre.shape),
+                    post_data=self.__post.data, post_indices=self.__post.indices, post_indptr=self.__post.indptr,
+                    post_shape=numpy.asarray(self.__post.shape),
+                    lambda_vector=self.__lambda_vector,
+                    mo_index=numpy.asarray(list(self.__mo_index.items()), dtype=numpy.int64).reshape(-1, 2),
+                    environment_number_of_places=numpy.asarray(self.__environment_number_of_places),
+                    simulation_precision=numpy.asarray(self.__simulation_precision_name),
+                    internal_temperature_boost_transitions=numpy.asarray(
+                        [(i, j, k) for i, (j, k) in self.__internal_temperature_boost_transitions.items()],
+                        dtype=numpy.int64).reshape(-1, 3),
+                    external_temperature_boost_places=numpy.asarray(
+                        list(self.__external_temperature_boost_places.items()), dtype=numpy.int64).reshape(-1, 2),
+                    reduced_order_modes=numpy.asarray(
+                        self.__reduced_order_modes if self.__reduced_order_modes is not None else -1),
+                    reduced_order_basis=self.__reduced_order_simulator.basis
+                    if self.__reduced_order_simulator is not None else numpy.zeros((0, 0)))
 
-        return [(material_cube_a_places_index +
-                 (z_a - material_cube_a[1].location.z) * material_cube_a[1].dimensions.x * material_cube_a[
-                     1].dimensions.y +
-                 (y_a - material_cube_a[1].location.y) * material_cube_a[1].dimensions.x +
-                 x_a - material_cube_a[1].location.x,
-                 material_cube_b_places_index +
-                 (z_b - material_cube_b[1].location.z) * material_cube_b[1].dimensions.x * material_cube_b[
-                     1].dimensions.y +
-                 (y_b - material_cube_b[1].location.y) * material_cube_b[1].dimensions.x +
-                 x_b - material_cube_b[1].location.x)
+    @classmethod
+    def load(cls, file_path: str, material_cubes: Dict[int, Tuple[SolidMaterial, Cuboid]]) -> 'Model':
+        """
+        Load a cubed space saved with save
 
-                for (x_a, x_b), (y_a, y_b), (z_a, z_b) in collision_all_axis]
+        :param file_path: Path of the file
+        :param material_cubes: Cubes that conform the space. They must be the ones used to create the saved cubed space
+        :return: loaded cubed space
+        """
+        with numpy.load(file_path) as model_file:
+            mo_index = {int(i): int(j) for i, j in model_file["mo_index"]}
+
+            if set(mo_index.keys()) != set(material_cubes.keys()):
+                raise Exception("The material cubes are not the ones of the saved cubed space")
+
+            model = cls.__new__(cls)
+            model.__initialize(
+                pre=scipy.sparse.csr_matrix((model_file["pre_data"], model_file["pre_indices"],
+                                             model_file["pre_indptr"]), shape=tuple(model_file["pre_shape"])),
+                post=scipy.sparse.csr_matrix((model_file["post_data"], model_file["post_indices"],
+                                              model_file["post_indptr"]), shape=tuple(model_file["post_shape"])),
+                lambda_vector=model_file["lambda_vector"],
+                mo_index=mo_index,
+                material_cubes_dict=dict(material_cubes),
+                environment_number_of_places=int(model_file["environment_number_of_places"]),
+                simulation_precision=str(model_file["simulation_precision"]),
+                internal_temperature_boost_transitions={
+                    int(i): (int(j), int(k)) for i, j, k in model_file["internal_temperature_boost_transitions"]},
+                external_temperature_boost_places={
+                    int(i): int(j) for i, j in model_file["external_temperature_boost_places"]},
+                reduced_order_modes=int(model_file["reduced_order_modes"])
+                if int(model_file["reduced_order_modes"]) >= 0 else None,
+                reduced_order_basis=model_file["reduced_order_basis"]
+                if int(model_file["reduced_order_modes"]) >= 0 else None)
+
+        return model
 
     @staticmethod
-    def __check_rectangles_collision(rectangle_a_position: Tuple[int, int], rectangle_a_dimensions: Tuple[int, int],
-                                     rectangle_b_position: Tuple[int, int], rectangle_b_dimensions: Tuple[int, int]) \
-            -> List[Tuple[int, int]]:
+    def __obtain_places_in_touch(material_cube_a: Tuple[SolidMaterial, Cuboid], material_cube_a_places: numpy.ndarray,
+                                 material_cube_b: Tuple[SolidMaterial, Cuboid], material_cube_b_places: numpy.ndarray) \
+            -> Tuple[numpy.ndarray, numpy.ndarray]:
         """
-        Calculate the collision between two rectangles
-        """
-        x0 = max(rectangle_a_position[0], rectangle_b_position[0])
-        x1 = min(rectangle_a_position[0] + rectangle_a_dimensions[0],
-                 rectangle_b_position[0] + rectangle_b_dimensions[0])
+        Obtain the pairs of places of two material cubes that are in contact
 
-        y0 = max(rectangle_a_position[1], rectangle_b_position[1])
-        y1 = min(rectangle_a_position[1] + rectangle_a_dimensions[1],
-                 rectangle_b_position[1] + rectangle_b_dimensions[1])
+        :param material_cube_a: Material cube A
+        :param material_cube_a_places: Places of A indexed by [z, y, x]
+        :param material_cube_b: Material cube B
+        :param material_cube_b_places: Places of B indexed by [z, y, x]
+        :return: Places of A and places of B in contact. The place i of A touch the place i of B
+        """
+        cuboid_a = material_cube_a[1]
+        cuboid_b = material_cube_b[1]
+
+        location_a = (cuboid_a.location.x, cuboid_a.location.y, cuboid_a.location.z)
+        location_b = (cuboid_b.location.x, cuboid_b.location.y, cuboid_b.location.z)
+        dimensions_a = (cuboid_a.dimensions.x, cuboid_a.dimensions.y, cuboid_a.dimensions.z)
+        dimensions_b = (cuboid_b.dimensions.x, cuboid_b.dimensions.y, cuboid_b.dimensions.z)
+
+        # Touch in axis y, then in axis x and then in axis z
+        for touch_axis in [1, 0, 2]:
+            a_before_b = location_a[touch_axis] + dimensions_a[touch_axis] == location_b[touch_axis]
+            b_before_a = location_b[touch_axis] + dimensions_b[touch_axis] == location_a[touch_axis]
+
+            if a_before_b or b_before_a:
+                # Slices of each cube (in the order x, y, z) that are in contact
+                slices_a = []
+                slices_b = []
+                for axis in range(3):
+                    if axis == touch_axis:
+                        slices_a.append(dimensions_a[axis] - 1 if a_before_b else 0)
+                        slices_b.append(0 if a_before_b else dimensions_b[axis] - 1)
+                    else:
+                        start = max(location_a[axis], location_b[axis])
+                        end = min(location_a[axis] + dimensions_a[axis], location_b[axis] + dimensions_b[axis])
+                        if start >= end:
+                            return numpy.zeros(0, dtype=int), numpy.zeros(0, dtype=int)
+                        slices_a.append(slice(start - location_a[axis], end - location_a[axis]))
+                        slices_b.append(slice(start - location_b[axis], end - location_b[axis]))
+
+                # The places are indexed by [z, y, x], and the contact surface is traversed in the order x, y, z
+                return material_cube_a_places[tuple(reversed(slices_a))].transpose().reshape(-1), \
+                    material_cube_b_places[tuple(reversed(slices_b))].transpose().reshape(-1)
 
-        if x0 < x1 and y0 < y1:
-            return [(i, j) for i in range(x0, x1) for j in range(y0, y1)]
-        else:
-            return []
+        # No touch
+        return numpy.zeros(0, dtype=int), numpy.zeros(0, dtype=int)
 
     def apply_energy(self, actual_state: SimulationState, amount_of_time: float,
                      external_energy_application_points: Optional[Set[int]] = None,
-                     internal_energy_application_points: Optional[Set[int]] = None) -> SimulationState:
+                     internal_energy_application_points: Optional[Set[int]] = None,
+                     external_energy_application_points_usage: Optional[Dict[int, float]] = None) \
+            -> SimulationState:
         """
         Apply energy over the cubedSpace and return the transformed cubedSpaceState
 
@@ -577,6 +597,9 @@ class Model(object):
          will be applied, however the energy transfer between cubes will be simulated. Each cube will have defined its
          dimensions in unit units, it's position in units, and the amount of energy to be applied.
         :param amount_of_time: Amount of time in seconds while the energy is being applied
+        :param external_energy_application_points_usage: Fraction of the amount of time that each external point
+         applies energy. The points not included don't apply energy. If it isn't None, it is used instead of
+         external_energy_application_points, and each point applies its average power during all the amount of time
         :return cubed space resultant of the application of energy over a previous state
         """
         # Fill fields if null
@@ -587,34 +610,231 @@ class Model(object):
 
         mo = actual_state.places_mo_vector
 
-        if self.__activated_external_temperature_boost_transitions != external_energy_application_points:
+        if external_energy_application_points_usage is not None:
+            # Modify control for external points with the fraction of energy applied
+            number_of_external_temperature_boost_places = len(self.__external_temperature_boost_places)
+            self.__activated_external_temperature_boost_transitions = None
+            control = numpy.zeros(number_of_external_temperature_boost_places, dtype=self.__simulation_precision)
+            for i, j in external_energy_application_points_usage.items():
+                if self.__external_temperature_boost_places.__contains__(i):
+                    control[self.__external_temperature_boost_places[i]] = j
+            if number_of_external_temperature_boost_places > 0:
+                mo[-number_of_external_temperature_boost_places:] = control
+
+        elif self.__activated_external_temperature_boost_transitions != external_energy_application_points:
             # Modify control for external points
             number_of_external_temperature_boost_places = len(self.__external_temperature_boost_places)
             self.__activated_external_temperature_boost_transitions = external_energy_application_points
-            control = numpy.zeros(number_of_external_temperature_boost_places)
+            control = numpy.zeros(number_of_external_temperature_boost_places, dtype=self.__simulation_precision)
             for i in external_energy_application_points:
                 if self.__external_temperature_boost_places.__contains__(i):
                     control[self.__external_temperature_boost_places[i]] = 1.0
             mo[-number_of_external_temperature_boost_places:] = control
 
+        self.__set_internal_energy_application_points(internal_energy_application_points)
+
+        mo_next = self.__tcpn_simulator.simulate_step(mo, amount_of_time)
+        return SimulationState(mo_next)
+
+    def __set_internal_energy_application_points(self, internal_energy_application_points: Set[int]):
+        """
+        Set the control of the TCPN simulator to activate only the internal energy application points given
+
+        :param internal_energy_application_points: Internal points where the energy is applied
+        """
         if self.__activated_internal_temperature_boost_transitions != internal_energy_application_points:
             # Modify control for internal points
-            number_of_external_temperature_boost_places = len(self.__external_temperature_boost_places)
-            number_of_internal_temperature_boost_places = sum(
-                [i for _, (_, i) in self.__internal_temperature_boost_transitions.items()])
             self.__activated_internal_temperature_boost_transitions = internal_energy_application_points
-            control = numpy.zeros(number_of_internal_temperature_boost_places)
-            for i in internal_energy_application_points:
-                if self.__internal_temperature_boost_transitions.__contains__(i):
-                    (start_transition, number_of_transitions) = self.__internal_temperature_boost_transitions[i]
-                    control[start_transition: start_transition + number_of_transitions] = 1.0
-            self.__tcpn_simulator.set_control(
-                numpy.concatenate(
-                    [numpy.ones(self.__pre.shape[1] - len(control) - number_of_external_temperature_boost_places),
-                     control, numpy.ones(number_of_external_temperature_boost_places)]))
+            self.__tcpn_simulator.set_control(self.__obtain_control(internal_energy_application_points))
+
+    def __obtain_control(self, internal_energy_application_points: Set[int]) -> numpy.ndarray:
+        """
+        Obtain the control of the TCPN that activates only the internal energy application points given
+
+        :param internal_energy_application_points: Internal points where the energy is applied
+        :return: control
+        """
+        number_of_external_temperature_boost_places = len(self.__external_temperature_boost_places)
+        number_of_internal_temperature_boost_places = sum(
+            [i for _, (_, i) in self.__internal_temperature_boost_transitions.items()])
+        control = numpy.zeros(number_of_internal_temperature_boost_places)
+        for i in internal_energy_application_points:
+            if self.__internal_temperature_boost_transitions.__contains__(i):
+                (start_transition, number_of_transitions) = self.__internal_temperature_boost_transitions[i]
+                control[start_transition: start_transition + number_of_transitions] = 1.0
+        return numpy.concatenate(
+            [numpy.ones(self.__pre.shape[1] - len(control) - number_of_external_temperature_boost_places),
+             control, numpy.ones(number_of_external_temperature_boost_places)])
+
+    def solve_steady_state(self, actual_state: SimulationState,
+                           external_energy_application_points: Optional[Set[int]] = None,
+                           internal_energy_application_points: Optional[Set[int]] = None,
+                           external_energy_application_points_usage: Optional[Dict[int, float]] = None) \
+            -> SimulationState:
+        """
+        Obtain the equilibrium temperature of the cubed space if the energy is applied indefinitely. It solves the
+        linear system of the TCPN directly instead of simulating it. The factorization of the system is cached by
+        internal energy application points, so the next queries with the same internal points only solve two
+        triangular systems
+
+        :param actual_state: Actual state. Only the temperature of the environment is used
+        :param external_energy_application_points: Points where the energy is applied
+        :param internal_energy_application_points: Points where the energy is applied
+        :param external_energy_application_points_usage: Fraction of the time that each external point applies energy.
+         The points not included don't apply energy. If it isn't None, it is used instead of
+         external_energy_application_points
+        :return: state with the equilibrium temperature
+        """
+        if self.__environment_number_of_places == 0:
+            raise Exception("The steady state requires an environment, otherwise the cubed space never reaches it")
+
+        external_energy_application_points = external_energy_application_points \
+            if external_energy_application_points is not None else set()
+        internal_energy_application_points = internal_energy_application_points \
+            if internal_energy_application_points is not None else set()
+
+        if external_energy_application_points_usage is None:
+            external_energy_application_points_usage = {i: 1.0 for i in external_energy_application_points}
+
+        mo = self.__reduced_order_simulator.expand_marking(actual_state.places_mo_vector) \
+            if self.__reduced_order_simulator is not None else actual_state.places_mo_vector
+
+        number_of_material_places = self.__material_number_of_places()
+        number_of_external_temperature_boost_places = len(self.__external_temperature_boost_places)
+
+        # Marks of the constant places (environment and external temperature booster points)
+        mo_constant = numpy.array(mo[number_of_material_places:], dtype=numpy.float64, copy=True)
+        if number_of_external_temperature_boost_places > 0:
+            mo_constant[-number_of_external_temperature_boost_places:] = 0.0
+            for i, j in external_energy_application_points_usage.items():
+                if self.__external_temperature_boost_places.__contains__(i):
+                    mo_constant[len(mo_constant) - number_of_external_temperature_boost_places +
+                                self.__external_temperature_boost_places[i]] = j
+
+        a_xx_lu, a_xr = self.__obtain_steady_state_factorization(
+            self.__obtain_control(internal_energy_application_points), number_of_material_places)
+
+        # In the equilibrium A_xx * x + A_xr * r = 0
+        mo_material = a_xx_lu.solve(-a_xr.dot(mo_constant))
+
+        # The energy application points of the state are modified, so they are updated in the next step
+        self.__activated_external_temperature_boost_transitions = None
+
+        mo_next = numpy.concatenate([mo_material, mo_constant]).astype(mo.dtype)
+
+        return SimulationState(self.__reduced_order_simulator.reduce_marking(mo_next)
+                               if self.__reduced_order_simulator is not None else mo_next)
+
+    def __obtain_steady_state_factorization(self, control: numpy.ndarray, number_of_material_places: int) \
+            -> Tuple[scipy.sparse.linalg.SuperLU, scipy.sparse.csr_matrix]:
+        """
+        Obtain the factorization of the conduction matrix of the material places for a control
+
+        :param control: control
+        :param number_of_material_places: number of places of the material cubes
+        :return: factorization of the matrix A of the material places, and matrix A of the constant places (only the
+         rows of the material places)
+        """
+        key = control.tobytes()
+        factorization = self.__steady_state_factorizations.get(key)
+
+        if factorization is not None:
+            self.__steady_state_factorizations.move_to_end(key)
+            return factorization
+
+        c = (self.__post - self.__pre).tocsr()
+        a = c.dot(scipy.sparse.diags(self.__lambda_vector.astype(numpy.float64) * control)).dot(
+            self.__pi.astype(numpy.float64)).tocsr()
+
+        # The pattern of the matrix is symmetric, so a symmetric ordering reduces the fill-in of the factorization
+        factorization = (scipy.sparse.linalg.splu(a[:number_of_material_places, :number_of_material_places].tocsc(),
+                                                  permc_spec="MMD_AT_PLUS_A"),
+                         a[:number_of_material_places, number_of_material_places:].tocsr())
+
+        self.__steady_state_factorizations[key] = factorization
+        if len(self.__steady_state_factorizations) > 8:
+            self.__steady_state_factorizations.popitem(last=False)
+
+        return factorization
+
+    def create_batch_state(self, states: List[SimulationState]) -> BatchSimulationState:
+        """
+        Join several states of this cubed space in a batch state, to simulate them at once
+
+        :param states: States of each simulation
+        :return: batch state with one column by simulation
+        """
+        return BatchSimulationState(numpy.stack([i.places_mo_vector.reshape(-1) for i in states], axis=1))
+
+    @staticmethod
+    def split_batch_state(batch_state: BatchSimulationState) -> List[SimulationState]:
+        """
+        Obtain the state of each simulation of a batch state
+
+        :param batch_state: batch state
+        :return: state of each simulation
+        """
+        return [SimulationState(batch_state.places_mo_matrix[:, i].copy())
+                for i in range(batch_state.places_mo_matrix.shape[1])]
+
+    def apply_energy_batch(self, actual_state: BatchSimulationState, amount_of_time: float,
+                           external_energy_application_points_usage: List[Dict[int, float]],
+                           internal_energy_application_points: Optional[Set[int]] = None) -> BatchSimulationState:
+        """
+        Apply energy over all the simulations of a batch state at once. The step of all the simulations is done with
+        a single product of the TCPN matrices by the marking matrix
+
+        :param actual_state: previous batch state
+        :param amount_of_time: Amount of time in seconds while the energy is being applied
+        :param external_energy_application_points_usage: Fraction of the amount of time that each external point
+         applies energy in each simulation (one dictionary by column of the batch state). The points not included
+         don't apply energy
+        :param internal_energy_application_points: Internal points where the energy is applied. They are the same in
+         all the simulations, because they modify the TCPN
+        :return: batch state resultant of the application of energy over the previous batch state
+        """
+        internal_energy_application_points = internal_energy_application_points \
+            if internal_energy_application_points is not None else set()
+
+        mo = actual_state.places_mo_matrix
+
+        if len(external_energy_application_points_usage) != mo.shape[1]:
+            raise Exception("The energy application points must be provided for each simulation of the batch")
+
+        # Modify control for external points with the fraction of energy applied in each simulation
+        number_of_external_temperature_boost_places = len(self.__external_temperature_boost_places)
+        self.__activated_external_temperature_boost_transitions = None
+        control = numpy.zeros((number_of_external_temperature_boost_places, mo.shape[1]),
+                              dtype=self.__simulation_precision)
+        for j, simulation_usage in enumerate(external_energy_application_points_usage):
+            for i, k in simulation_usage.items():
+                if self.__external_temperature_boost_places.__contains__(i):
+                    control[self.__external_temperature_boost_places[i], j] = k
+        if number_of_external_temperature_boost_places > 0:
+            mo[-number_of_external_temperature_boost_places:, :] = control
+
+        self.__set_internal_energy_application_points(internal_energy_application_points)
 
         mo_next = self.__tcpn_simulator.simulate_step(mo, amount_of_time)
-        return SimulationState(mo_next)
+        return BatchSimulationState(mo_next.reshape(mo.shape))
+
+    def obtain_temperature_matrix(self, actual_state: BatchSimulationState) -> numpy.ndarray:
+        """
+        Obtain the temperature of the cubes of unit edge of each simulation of a batch state
+
+        :param actual_state: Actual batch state
+        :return: Temperature in kelvin of each unit cube (columns) in each simulation (rows). The unit cubes are
+         ordered as in the temperature matrices of obtain_temperature
+        """
+        material_cubes_places = numpy.concatenate(
+            [numpy.arange(v, v + self.__material_cubes_dict[i][1].dimensions.x *
+                          self.__material_cubes_dict[i][1].dimensions.y * self.__material_cubes_dict[i][1].dimensions.z)
+             for i, v in self.__mo_index.items()])
+
+        places_mo_matrix = self.__reduced_order_simulator.expand_marking(actual_state.places_mo_matrix) \
+            if self.__reduced_order_simulator is not None else actual_state.places_mo_matrix
+
+        return numpy.ascontiguousarray(places_mo_matrix[material_cubes_places, :].transpose())
 
     def obtain_temperature(self, actual_state: SimulationState) -> Dict[int, PhysicalCuboid]:
         """
@@ -625,11 +845,15 @@ class Model(object):
         """
         temperature_cubes = {}
 
+        # The temperatures of a reduced model are only reconstructed here
+        places_mo_vector = self.__reduced_order_simulator.expand_marking(actual_state.places_mo_vector) \
+            if self.__reduced_order_simulator is not None else actual_state.places_mo_vector
+
         for i, v in self.__mo_index.items():
             material_cube = self.__material_cubes_dict[i]
             number_of_occupied_places = material_cube[1].dimensions.x * material_cube[1].dimensions.y * material_cube[
                 1].dimensions.z
-            temperature_places = actual_state.places_mo_vector[v: v + number_of_occupied_places]
+            temperature_places = places_mo_vector[v: v + number_of_occupied_places]
             temperature_cubes[i] = PhysicalCuboid(
                 cuboid=Cuboid(location=material_cube[1].location, dimensions=material_cube[1].dimensions),
                 material=material_cube[0],
@@ -670,8 +894,81 @@ class Model(object):
             places_temperature.append(environment_temperature * numpy.ones(shape=(self.__environment_number_of_places),
                                                                            dtype=self.__simulation_precision))
 
-        return SimulationState(
-            numpy.concatenate(places_temperature + [numpy.ones(len(self.__external_temperature_boost_places))]))
+        # The state is created with all the energy application points activated
+        self.__activate_all_energy_application_points()
+
+        places_mo_vector = numpy.concatenate(
+            places_temperature + [numpy.ones(len(self.__external_temperature_boost_places),
+                                             dtype=self.__simulation_precision)])
+
+        return SimulationState(self.__reduced_order_simulator.reduce_marking(places_mo_vector)
+                               if self.__reduced_order_simulator is not None else places_mo_vector)
+
+    def restore_state(self, saved_state: SimulationState) -> SimulationState:
+        """
+        Create a state of this cubed space from a state obtained with another instance built from the same definition
+        (i.e. a saved checkpoint). The temperatures of the saved state are kept, and the energy application points
+        are reset to the ones of a state created with create_initial_state. If this cubed space is a reduced model, the
+        saved state can also be a state of the full model, that is projected in the reduced model
+
+        :param saved_state: State obtained with a cubed space with the same definition
+        :return: cubed space state that can be used with this cubed space
+        """
+        mo = numpy.array(saved_state.places_mo_vector, copy=True,
+                         dtype=self.__simulation_precision if self.__reduced_order_simulator is None else numpy.float64)
+        number_of_external_temperature_boost_places = len(self.__external_temperature_boost_places)
+
+        if self.__reduced_order_simulator is not None and len(mo) == self.__pre.shape[0]:
+            mo = self.__reduced_order_simulator.reduce_marking(mo)
+
+        if len(mo) != (self.__pre.shape[0] if self.__reduced_order_simulator is None else
+                       self.__pre.shape[0] - self.__material_number_of_places() +
+                       self.__reduced_order_simulator.number_of_reduced_places):
+            raise Exception("The saved state doesn't belong to a cubed space with the same definition")
+
+        # Activate all energy application points, as in a newly created state
+        if number_of_external_temperature_boost_places > 0:
+            mo[-number_of_external_temperature_boost_places:] = 1.0
+
+        self.__activate_all_energy_application_points()
+
+        return SimulationState(mo)
+
+    def obtain_reduction_error_bound(self, actual_state: SimulationState) -> float:
+        """
+        Obtain an upper bound of the error of the temperatures of a state of a reduced model, against the temperatures
+        that the full model would have obtained from the same initial state
+
+        :param actual_state: Actual state of the temperature in the mesh
+        :return: Bound of the error of the temperature of each cube of unit edge in kelvin
+        """
+        if self.__reduced_order_simulator is None:
+            raise Exception("The cubed space is not a reduced model")
+
+        return self.__reduced_order_simulator.obtain_error_bound(actual_state.places_mo_vector)
+
+    def __material_number_of_places(self) -> int:
+        """
+        Obtain the number of places of the material cubes
+
+        :return: number of places
+        """
+        return sum(i[1].dimensions.x * i[1].dimensions.y * i[1].dimensions.z
+                   for i in self.__material_cubes_dict.values())
+
+    def __activate_all_energy_application_points(self):
+        """
+        Set the control of the TCPN simulator to the one of a state created with create_initial_state (all the energy
+        application points activated). It allows to reuse the cubed space in other simulation
+        """
+        all_internal_energy_application_points = set(self.__internal_temperature_boost_transitions.keys())
+        all_external_energy_application_points = set(self.__external_temperature_boost_places.keys())
+
+        if self.__activated_internal_temperature_boost_transitions != all_internal_energy_application_points:
+            self.__tcpn_simulator.set_control(numpy.ones(self.__pre.shape[1]))
+
+        self.__activated_internal_temperature_boost_transitions = all_internal_energy_application_points
+        self.__activated_external_temperature_boost_transitions = all_external_energy_application_points
 
 
 def obtain_min_temperature(heatmap_cube_list: Dict[int, PhysicalCuboid]) -> Dict[int, float]:
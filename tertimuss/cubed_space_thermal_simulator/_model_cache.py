@@ -0,0 +1,151 @@
+import hashlib
+import os
+import uuid
+import weakref
+from collections import OrderedDict
+from typing import Dict, Tuple, Optional, Literal
+
+from ._basic_types import SolidMaterial, Cuboid, FluidEnvironment, TMExternal, TMInternal
+from ._cubed_space import Model
+
+# Models of the caches of this process by cache identifier. It allows the copies of a cache sent to other processes
+# (i.e. inside the simulation configuration) to share the models in each process. The copies of the cache keep the
+# models alive, and the entry is removed when the last copy in the process is collected
+_process_caches_models: 'weakref.WeakValueDictionary[str, OrderedDict[str, Model]]' = weakref.WeakValueDictionary()
+
+# Version of the construction of the models. It is part of the key of the models, so it must be increased each time
+# the construction of the pre, post or lambda matrices changes to not load models stored by previous versions
+_MODEL_FORMAT_VERSION = 1
+
+
+def obtain_model_key(material_cubes: Dict[int, Tuple[SolidMaterial, Cuboid]], cube_edge_size: float,
+                     environment_properties: Optional[FluidEnvironment] = None,
+                     external_temperature_booster_points: Optional[Dict[int, TMExternal]] = None,
+                     internal_temperature_booster_points: Optional[Dict[int, TMInternal]] = None,
+                     simulation_precision: Literal["LOW", "MIDDLE", "HIGH", "EXACT"] = "HIGH",
+                     reduced_order_modes: Optional[int] = None) -> str:
+    """
+    Obtain a hash of the definition of a cubed space. Two definitions with the same hash produce the same cubed space
+
+    The hash includes the version of the construction of the models, so the models stored by previous versions aren't
+    reused
+
+    The parameters are the ones of the Model constructor
+
+    :return: SHA-256 hash of the definition in hexadecimal
+    """
+    definition = repr((_MODEL_FORMAT_VERSION, list(material_cubes.items()), cube_edge_size, environment_properties,
+                       list(external_temperature_booster_points.items())
+                       if external_temperature_booster_points is not None else [],
+                       list(internal_temperature_booster_points.items())
+                       if internal_temperature_booster_points is not None else [],
+                       simulation_precision) + ((reduced_order_modes,) if reduced_order_modes is not None else ()))
+
+    return hashlib.sha256(definition.encode()).hexdigest()
+
+
+class ModelCache(object):
+    """
+    Cache of cubed spaces keyed by the hash of their definition. The models are kept in memory with a least recently
+    used policy, and optionally stored in a directory as .npz files to be reused by other processes or executions.
+
+    The cached models are shared, so a model obtained from the cache must not be used in two simulations at the same
+    time. A simulation must start creating its state with create_initial_state or restore_state, that reset the
+    energy application points of the model.
+
+    When the cache is pickled (i.e. sent to other process), the models aren't copied. All the copies of the cache in
+    a process share the same models.
+    """
+
+    def __init__(self, max_size: int = 8, storage_directory: Optional[str] = None):
+        """
+        Create a cache
+
+        :param max_size: Maximum number of models kept in memory
+        :param storage_directory: If not None, the models are stored in this directory and loaded from it when they
+         aren't in memory
+        """
+        if max_size < 1:
+            raise Exception("The cache must be able to store at least one model")
+
+        self.__max_size = max_size
+        self.__storage_directory = storage_directory
+        self.__cache_id = uuid.uuid4().hex
+        self.__models: 'OrderedDict[str, Model]' = _process_caches_models.setdefault(self.__cache_id, OrderedDict())
+
+        self.number_of_hits = 0
+        """Number of models obtained from memory"""
+
+        self.number_of_loads = 0
+        """Number of models loaded from the storage directory"""
+
+        self.number_of_misses = 0
+        """Number of models built"""
+
+    def __getstate__(self):
+        return self.__max_size, self.__storage_directory, self.__cache_id
+
+    def __setstate__(self, state):
+        self.__max_size, self.__storage_directory, self.__cache_id = state
+        self.__models = _process_caches_models.setdefault(self.__cache_id, OrderedDict())
+        self.number_of_hits = 0
+        self.number_of_loads = 0
+        self.number_of_misses = 0
+
+    def obtain_model(self, material_cubes: Dict[int, Tuple[SolidMaterial, Cuboid]], cube_edge_size: float,
+                     environment_properties: Optional[FluidEnvironment] = None,
+                     external_temperature_booster_points: Optional[Dict[int, TMExternal]] = None,
+                     internal_temperature_booster_points: Optional[Dict[int, TMInternal]] = None,
+                     simulation_precision: Literal["LOW", "MIDDLE", "HIGH", "EXACT"] = "HIGH",
+                     reduced_order_modes: Optional[int] = None) -> Model:
+        """
+        Obtain the cubed space of a definition. It is only built if it isn't in the cache
+
+        The parameters are the ones of the Model constructor
+
+        :return: cubed space
+        """
+        key = obtain_model_key(material_cubes, cube_edge_size, environment_properties,
+                               external_temperature_booster_points, internal_temperature_booster_points,
+                               simulation_precision, reduced_order_modes)
+
+        model = self.__models.get(key)
+
+        if model is not None:
+            self.__models.move_to_end(key)
+            self.number_of_hits += 1
+            return model
+
+        model_file_path = os.path.join(self.__storage_directory, key + ".npz") \
+            if self.__storage_directory is not None else None
+
+        if model_file_path is not None and os.path.exists(model_file_path):
+            model = Model.load(model_file_path, material_cubes)
+            self.number_of_loads += 1
+        else:
+            model = Model(material_cubes=material_cubes, cube_edge_size=cube_edge_size,
+                          environment_properties=environment_properties,
+                          external_temperature_booster_points=external_temperature_booster_points,
+                          internal_temperature_booster_points=internal_temperature_booster_points,
+                          simulation_precision=simulation_precision, reduced_order_modes=reduced_order_modes)
+            self.number_of_misses += 1
+
+            if model_file_path is not None:
+                os.makedirs(self.__storage_directory, exist_ok=True)
+                # Write in a temporal file first, so other processes never read a partially written model
+                temporal_file_path = os.path.join(self.__storage_directory, key + "." + uuid.uuid4().hex + ".npz")
+                model.save(temporal_file_path)
+                os.replace(temporal_file_path, model_file_path)
+
+        self.__models[key] = model
+
+        if len(self.__models) > self.__max_size:
+            self.__models.popitem(last=False)
+
+        return model
+
+    def clear(self):
+        """
+        Remove all the models kept in memory. The models in the storage directory are kept
+        """
+        self.__models.clear()
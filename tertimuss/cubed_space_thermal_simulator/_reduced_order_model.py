@@ -0,0 +1,271 @@
+from collections import OrderedDict
+from typing import List, Tuple, Optional
+
+import numpy
+import scipy.linalg
+import scipy.sparse
+import scipy.sparse.linalg
+import scipy.special
+
+from tertimuss.tcpn_simulator import SVariableStep
+
+
+class ReducedOrderSimulator(SVariableStep):
+    """
+    Simulator of the TCPN of a cubed space reduced by modal truncation.
+
+    The places of the material cubes (variable places) evolve as x' = A x + B r, where r are the marks of the places
+    that represent the environment and the external temperature booster points (constant places). A is self-adjoint
+    with the inner product weighted by the heat capacity of each place (M), so it has real modes orthogonal in that
+    inner product. The temperatures are approximated as x = V z, where the columns of V are:
+
+    - The slowest modes of A (obtained with shift-invert Lanczos)
+    - The steady-state response to each constant place (static correction), so the steady state is exact
+    - The indicator of each material cube, so the initial states with a temperature by cube are exact
+
+    The reduced system z' = V^T M A V z + V^T M B r is simulated with its exact solution in the modal basis of its
+    matrix, for any step size.
+
+    The reduced marking is [z, error bound, r]. The error bound is an upper bound of the M-norm of the error of the
+    reduced temperatures against the temperatures of the full model. It is the integral of the norm of the residual of
+    the reduced solution in the full system (evaluated with the trapezoidal rule in each step), amplified by the
+    maximum growth rate of the full system
+    """
+
+    def __init__(self, pre: scipy.sparse.csr_matrix, post: scipy.sparse.csr_matrix, lambda_vector: numpy.ndarray,
+                 places_heat_capacity: numpy.ndarray, material_cubes_places: List[Tuple[int, int]],
+                 number_of_modes: int, max_number_of_controls: int = 16, basis: Optional[numpy.ndarray] = None):
+        """
+        Build the reduced model of the TCPN of a cubed space
+
+        :param pre: pre matrix
+        :param post: post matrix
+        :param lambda_vector: lambda vector
+        :param places_heat_capacity: Heat capacity by volume of each variable place. The variable places are the
+         first ones of the TCPN
+        :param material_cubes_places: First place and number of places of each material cube
+        :param number_of_modes: Number of slowest modes of the full model kept in the reduced model
+        :param max_number_of_controls: Maximum number of controls whose reduced system is stored. The least recently
+         used are removed first
+        :param basis: Basis of the reduced model returned by the property basis of a simulator built with the same
+         parameters. If None, it is calculated
+        """
+        # The reduced model is always simulated in float64
+        self.__c: scipy.sparse.csr_matrix = (post - pre).astype(numpy.float64).tocsr()
+        self.__pi: scipy.sparse.csr_matrix = pre.transpose().astype(numpy.float64).tocsr()
+        self.__lambda_vector = numpy.asarray(lambda_vector, dtype=numpy.float64)
+        self.__m = numpy.asarray(places_heat_capacity, dtype=numpy.float64)
+        self.__max_number_of_controls = max_number_of_controls
+
+        number_of_variable_places = len(self.__m)
+        self.__number_of_variable_places = number_of_variable_places
+
+        self.__control = numpy.ones(len(lambda_vector))
+        a_xx, a_xr = self.__calculate_a(self.__control)
+
+        if basis is not None:
+            self.__v = basis
+        elif number_of_modes + a_xr.shape[1] + len(material_cubes_places) >= number_of_variable_places:
+            # The reduced model would be as big as the full one, use all the places
+            self.__v = numpy.diag(1 / numpy.sqrt(self.__m))
+        else:
+            self.__v = self.__calculate_basis(a_xx, a_xr, material_cubes_places, number_of_modes)
+
+        # Reduced systems by control, in least recently used order
+        self.__reduced_systems: 'OrderedDict[bytes, Tuple[numpy.ndarray, ...]]' = OrderedDict()
+        self.__reduced_system = self.__obtain_reduced_system(self.__control)
+
+    @property
+    def basis(self) -> numpy.ndarray:
+        """
+        Basis of the reduced model, with a vector by column
+        """
+        return self.__v
+
+    @property
+    def number_of_reduced_places(self) -> int:
+        """
+        Number of elements of the reduced marking before the constant places (reduced temperatures and error bound)
+        """
+        return self.__v.shape[1] + 1
+
+    def __calculate_a(self, control: numpy.ndarray) -> Tuple[scipy.sparse.csr_matrix, scipy.sparse.csr_matrix]:
+        """
+        Calculate the A matrix of the TCPN, split in the columns of the variable places and of the constant places
+
+        :param control: control
+        :return: A of the variable places and A of the constant places (only the rows of the variable places)
+        """
+        a = self.__c.dot(scipy.sparse.diags(self.__lambda_vector * control)).dot(self.__pi).tocsr()
+        return a[:self.__number_of_variable_places, :self.__number_of_variable_places].tocsr(), \
+            a[:self.__number_of_variable_places, self.__number_of_variable_places:].tocsr()
+
+    def __calculate_basis(self, a_xx: scipy.sparse.csr_matrix, a_xr: scipy.sparse.csr_matrix,
+                          material_cubes_places: List[Tuple[int, int]], number_of_modes: int) -> numpy.ndarray:
+        """
+        Calculate the basis of the reduced model, orthonormal with the inner product weighted by M
+
+        :return: basis with a vector by column
+        """
+        m_diagonal = scipy.sparse.diags(self.__m)
+
+        # M A is symmetric, it is symmetrized to remove the rounding errors
+        k = m_diagonal.dot(a_xx)
+        k = ((k + k.transpose()) / 2).tocsc()
+
+        # The shift avoids the singularity of A when there isn't convection
+        shift = -1e-6 * float(numpy.abs(a_xx.diagonal()).max())
+        # The matrix is symmetric, so a symmetric ordering reduces the fill-in of the factorization
+        shifted_k_lu = scipy.sparse.linalg.splu((k - shift * m_diagonal).tocsc(), permc_spec="MMD_AT_PLUS_A")
+
+        _, modes = scipy.sparse.linalg.eigsh(k, k=number_of_modes, M=m_diagonal, sigma=shift, which="LM",
+                                             OPinv=scipy.sparse.linalg.LinearOperator(k.shape,
+                                                                                      matvec=shifted_k_lu.solve))
+
+        # Steady-state response to each constant place
+        static_correction = shifted_k_lu.solve(m_diagonal.dot(a_xr).toarray()) if a_xr.shape[1] > 0 \
+            else numpy.zeros((self.__number_of_variable_places, 0))
+
+        indicators = numpy.zeros((self.__number_of_variable_places, len(material_cubes_places)))
+        for i, (first_place, number_of_places) in enumerate(material_cubes_places):
+            indicators[first_place:first_place + number_of_places, i] = 1
+
+        # Orthonormalization with the inner product weighted by M, removing the linearly dependent vectors
+        m_sqrt = numpy.sqrt(self.__m).reshape((-1, 1))
+        w = m_sqrt * numpy.concatenate([modes, static_correction, indicators], axis=1)
+        w_norm = numpy.linalg.norm(w, axis=0)
+        w = w[:, w_norm > 0] / w_norm[w_norm > 0]
+
+        q, r, _ = scipy.linalg.qr(w, mode="economic", pivoting=True)
+        rank = int(numpy.count_nonzero(numpy.abs(numpy.diag(r)) > 1e-10))
+
+        return q[:, :rank] / m_sqrt
+
+    def __obtain_reduced_system(self, control: numpy.ndarray) -> Tuple[numpy.ndarray, ...]:
+        """
+        Obtain the reduced system of a control
+
+        :param control: control
+        :return: eigenvalues of the reduced matrix, its eigenvectors, input matrix in the modal basis, matrix of the
+         norm of the residual and maximum growth rate of the full system
+        """
+        key = numpy.asarray(control, dtype=numpy.float64).tobytes()
+        reduced_system = self.__reduced_systems.get(key)
+
+        if reduced_system is not None:
+            self.__reduced_systems.move_to_end(key)
+            return reduced_system
+
+        a_xx, a_xr = self.__calculate_a(control)
+        m = self.__m.reshape((-1, 1))
+
+        a_v = a_xx.dot(self.__v)
+        a_r = a_xr.toarray()
+
+        k_r = self.__v.transpose().dot(m * a_v)
+        k_r = (k_r + k_r.transpose()) / 2
+        b_r = self.__v.transpose().dot(m * a_r)
+
+        eigenvalues, eigenvectors = scipy.linalg.eigh(k_r)
+
+        # Residual of the reduced solution in the full system, as a function of [z, r]
+        residual = numpy.concatenate([a_v - self.__v.dot(k_r), a_r - self.__v.dot(b_r)], axis=1)
+        residual_norm_matrix = residual.transpose().dot(m * residual)
+
+        # Gershgorin bound of the maximum eigenvalue of A, that bounds the growth of the error
+        a_xx_diagonal = a_xx.diagonal()
+        max_growth_rate = max(0.0, float((a_xx_diagonal + abs(a_xx).sum(axis=1).A1 - numpy.abs(a_xx_diagonal)).max()))
+
+        reduced_system = (eigenvalues, eigenvectors, eigenvectors.transpose().dot(b_r), residual_norm_matrix,
+                          max_growth_rate)
+
+        self.__reduced_systems[key] = reduced_system
+        if len(self.__reduced_systems) > self.__max_number_of_controls:
+            self.__reduced_systems.popitem(last=False)
+
+        return reduced_system
+
+    def set_control(self, control: numpy.ndarray):
+        """
+        Apply a control action over transitions firing in the TCPN
+
+        :param control: control
+        """
+        self.__control = control
+        self.__reduced_system = self.__obtain_reduced_system(control)
+
+    def __residual_norm(self, z: numpy.ndarray, r: numpy.ndarray) -> numpy.ndarray:
+        """
+        M-norm of the residual of the reduced solution in the full system
+
+        :param z: reduced temperatures (one column by marking)
+        :param r: marks of the constant places (one column by marking)
+        :return: norm of the residual of each marking
+        """
+        w = numpy.concatenate([z, r], axis=0)
+        return numpy.sqrt(numpy.maximum(numpy.sum(w * self.__reduced_system[3].dot(w), axis=0), 0))
+
+    def simulate_step(self, mo: numpy.ndarray, dt: float) -> numpy.ndarray:
+        """
+        Simulate one step
+
+        :param mo: actual reduced marking, or a matrix with one reduced marking by column to simulate several markings
+         at once
+        :param dt: time to advance
+        :return: next reduced marking, or next reduced markings if mo is a matrix
+        """
+        eigenvalues, eigenvectors, modal_b, _, max_growth_rate = self.__reduced_system
+        number_of_reduced_temperatures = self.__v.shape[1]
+
+        mo_matrix = mo.reshape((len(mo), -1))
+        z = mo_matrix[:number_of_reduced_temperatures, :]
+        error_bound = mo_matrix[number_of_reduced_temperatures, :]
+        r = mo_matrix[number_of_reduced_temperatures + 1:, :]
+
+        # Exact solution of each mode with constant input: q(dt) = e^(l dt) q(0) + dt exprel(l dt) b
+        q = eigenvectors.transpose().dot(z)
+        q_next = numpy.exp(eigenvalues * dt).reshape((-1, 1)) * q + \
+            (dt * scipy.special.exprel(eigenvalues * dt)).reshape((-1, 1)) * modal_b.dot(r)
+        z_next = eigenvectors.dot(q_next)
+
+        error_bound_next = numpy.exp(max_growth_rate * dt) * (
+                error_bound + (dt / 2) * (self.__residual_norm(z, r) + self.__residual_norm(z_next, r)))
+
+        mo_next = numpy.concatenate([z_next, error_bound_next.reshape((1, -1)), r], axis=0)
+
+        return mo_next.reshape(-1) if len(mo.shape) == 1 or mo.shape[1] == 1 else mo_next
+
+    def reduce_marking(self, mo: numpy.ndarray) -> numpy.ndarray:
+        """
+        Obtain the reduced marking of a marking of the full TCPN. The error bound is initialized with the error of the
+        projection
+
+        :param mo: marking of the full TCPN
+        :return: reduced marking
+        """
+        x = mo[:self.__number_of_variable_places]
+        z = self.__v.transpose().dot(self.__m * x)
+        projection_error = x - self.__v.dot(z)
+        return numpy.concatenate([z, [numpy.sqrt(numpy.sum(self.__m * projection_error ** 2))],
+                                  mo[self.__number_of_variable_places:]])
+
+    def expand_marking(self, mo: numpy.ndarray) -> numpy.ndarray:
+        """
+        Obtain the marking of the full TCPN of a reduced marking
+
+        :param mo: reduced marking, or a matrix with one reduced marking by column
+        :return: marking of the full TCPN, or a matrix with one marking by column
+        """
+        number_of_reduced_temperatures = self.__v.shape[1]
+        return numpy.concatenate([self.__v.dot(mo[:number_of_reduced_temperatures]),
+                                  mo[number_of_reduced_temperatures + 1:]], axis=0)
+
+    def obtain_error_bound(self, mo: numpy.ndarray) -> float:
+        """
+        Obtain the upper bound of the error of the temperature of each place of a reduced marking
+
+        :param mo: reduced marking
+        :return: error bound in kelvin
+        """
+        # The M-norm bounds the error of each place weighted by the square root of its heat capacity
+        return float(mo[self.__v.shape[1]]) / float(numpy.sqrt(self.__m.min()))
@@ -0,0 +1,605 @@
+import math
+from typing import Dict, Tuple, Optional, Literal, Set, List, Union
+
+import numpy
+import scipy.sparse
+
+from ._basic_types import SolidMaterial, Cuboid, FluidEnvironment, TMExternal, TMInternal, PhysicalCuboid, \
+    CuboidTemperature
+from ._cubed_space import SimulationState, BatchSimulationState, _create_location_places_grid, \
+    _obtain_places_in_cuboid
+
+
+class StructuredGridModel(object):
+    """
+    Representation of a physical object by cubes, simulated over a structured grid.
+
+    It simulates the same thermal model as :class:`.Model`, but instead of building a TCPN, the bounding box of all the
+    material cubes is represented as a dense 3D array, and the conduction between adjacent cubes is computed with
+    stencil operations (slice arithmetic) over it. The coefficients of the stencil are uniform inside each material
+    cube (they are stored as scalars if they are uniform in the whole grid), so it is specially fast with fine meshes of
+    few rectangular material cubes, like the default processor (cores over a board).
+
+    The states have the same places as the ones of a :class:`.Model` with the same definition, so they can be used
+    with both models.
+
+    The model is integrated with the explicit Runge-Kutta-Chebyshev method, whose stability interval grows with the
+    square of its number of stages, so each step needs far less evaluations of the stencil than other explicit
+    methods. The number of stages of each step is the minimum that keeps the integration stable:
+
+    - LOW: First order Runge-Kutta-Chebyshev and float32, in a single step
+    - MIDDLE: Second order Runge-Kutta-Chebyshev and float32, with steps of estimated error lower than 0.01 K
+    - HIGH: Second order Runge-Kutta-Chebyshev and float64, with steps of estimated error lower than 0.0001 K
+
+    The material cubes can't overlap, and the EXACT precision isn't available
+    """
+
+    def __init__(self, material_cubes: Dict[int, Tuple[SolidMaterial, Cuboid]], cube_edge_size: float,
+                 environment_properties: Optional[FluidEnvironment] = None,
+                 external_temperature_booster_points: Optional[Dict[int, TMExternal]] = None,
+                 internal_temperature_booster_points: Optional[Dict[int, TMInternal]] = None,
+                 simulation_precision: Literal["LOW", "MIDDLE", "HIGH"] = "HIGH"):
+        """
+        Create the structured grid of a cubed space
+
+        The parameters are the ones of the :class:`.Model` constructor
+        """
+        external_temperature_booster_points = external_temperature_booster_points \
+            if external_temperature_booster_points is not None else dict()
+        internal_temperature_booster_points = internal_temperature_booster_points \
+            if internal_temperature_booster_points is not None else dict()
+
+        if simulation_precision == "LOW" or simulation_precision == "MIDDLE":
+            self.__dtype = numpy.float32
+        elif simulation_precision == "HIGH":
+            self.__dtype = numpy.float64
+        else:
+            raise Exception("Not available precision in the structured grid model")
+
+        self.__integration_order = 1 if simulation_precision == "LOW" else 2
+
+        # Maximum error estimated in each step, in kelvin. With LOW precision the error isn't controlled
+        self.__tolerance: Optional[float] = {"LOW": None, "MIDDLE": 1e-2, "HIGH": 1e-4}[simulation_precision]
+
+        # Places of each material cube, indexed by [z, y, x], numbered as in Model
+        self.__mo_index: Dict[int, int] = {}
+        self.__material_cubes_dict: Dict[int, Tuple[SolidMaterial, Cuboid]] = dict(material_cubes)
+        material_cubes_places: Dict[int, numpy.ndarray] = {}
+        number_of_material_places = 0
+
+        for material_cube_index, (_, cuboid) in material_cubes.items():
+            p = cuboid.dimensions.x * cuboid.dimensions.y * cuboid.dimensions.z
+            self.__mo_index[material_cube_index] = number_of_material_places
+            material_cubes_places[material_cube_index] = number_of_material_places + numpy.arange(p).reshape(
+                (cuboid.dimensions.z, cuboid.dimensions.y, cuboid.dimensions.x))
+            number_of_material_places += p
+
+        location_places_grid, location_places_grid_origin = _create_location_places_grid(material_cubes,
+                                                                                         material_cubes_places)
+
+        if numpy.count_nonzero(location_places_grid >= 0) != number_of_material_places:
+            raise Exception("The material cubes of a structured grid model can't overlap")
+
+        self.__grid_shape: Tuple[int, int, int] = location_places_grid.shape
+        self.__number_of_material_places = number_of_material_places
+
+        # Location in the flattened grid of each place
+        occupied_locations = numpy.flatnonzero(location_places_grid >= 0)
+        self.__places_locations = numpy.zeros(number_of_material_places, dtype=int)
+        self.__places_locations[location_places_grid.reshape(-1)[occupied_locations]] = occupied_locations
+
+        # Properties of each location of the grid (0 if empty)
+        material_cube_grid = numpy.full(self.__grid_shape, -1)
+        heat_capacity_grid = numpy.zeros(self.__grid_shape)
+        conductivity_grid = numpy.zeros(self.__grid_shape)
+
+        for material_cube_index, (material, cuboid) in material_cubes.items():
+            cuboid_slice = self.__obtain_cuboid_slice(cuboid, location_places_grid_origin)
+            material_cube_grid[cuboid_slice] = material_cube_index
+            heat_capacity_grid[cuboid_slice] = material.density * material.specificHeatCapacity
+            conductivity_grid[cuboid_slice] = material.thermalConductivity
+
+        # Conduction coefficients of the faces between adjacent locations in each axis (z, y, x). For each face, the
+        # first coefficient multiplies the temperature difference in the derivative of the lower location, and the
+        # second one in the derivative of the upper location
+        self.__faces_coefficients: List[Tuple[Union[float, numpy.ndarray], Union[float, numpy.ndarray]]] = []
+
+        # Locations in contact with a location of other material cube
+        locations_with_contact = numpy.zeros(self.__grid_shape, dtype=bool)
+
+        # Sum of the conduction coefficients of each location, used to obtain the stable step
+        outgoing_coefficients = numpy.zeros(self.__grid_shape)
+
+        for axis in range(3):
+            lower = tuple(slice(None, -1) if i == axis else slice(None) for i in range(3))
+            upper = tuple(slice(1, None) if i == axis else slice(None) for i in range(3))
+
+            both_occupied = (material_cube_grid[lower] >= 0) & (material_cube_grid[upper] >= 0)
+            same_cube = both_occupied & (material_cube_grid[lower] == material_cube_grid[upper])
+            different_cube = both_occupied & ~same_cube
+
+            heat_capacity_lower = numpy.where(both_occupied, heat_capacity_grid[lower], 1)
+            heat_capacity_upper = numpy.where(both_occupied, heat_capacity_grid[upper], 1)
+            conductivity_lower = conductivity_grid[lower]
+            conductivity_upper = conductivity_grid[upper]
+
+            # Inside a cube the coefficient is k / (rho * cp * edge^2), and between cubes A and B it is
+            # kA * kB / (rho * cp * (kA + kB) * edge^2), with the heat capacity of the location that receives the heat
+            contact_conductivity = numpy.where(different_cube, conductivity_lower * conductivity_upper / numpy.where(
+                different_cube, conductivity_lower + conductivity_upper, 1), 0)
+
+            coefficient_lower = numpy.where(same_cube, conductivity_lower, contact_conductivity) / (
+                    heat_capacity_lower * (cube_edge_size ** 2))
+            coefficient_upper = numpy.where(same_cube, conductivity_upper, contact_conductivity) / (
+                    heat_capacity_upper * (cube_edge_size ** 2))
+
+            outgoing_coefficients[lower] += coefficient_lower
+            outgoing_coefficients[upper] += coefficient_upper
+
+            locations_with_contact[lower] |= different_cube
+            locations_with_contact[upper] |= different_cube
+
+            self.__faces_coefficients.append((self.__compact_coefficients(coefficient_lower),
+                                              self.__compact_coefficients(coefficient_upper)))
+
+        # Convection of the places without contact with other cube, as in Model. The environment places are shared by
+        # consecutive places with the same convection coefficient
+        locations_with_convection = (material_cube_grid >= 0) & ~locations_with_contact \
+            if environment_properties is not None else numpy.zeros(self.__grid_shape, dtype=bool)
+
+        convection_grid = numpy.where(locations_with_convection, environment_properties.heatTransferCoefficient / (
+                cube_edge_size * numpy.where(locations_with_convection, heat_capacity_grid, 1)), 0) \
+            if environment_properties is not None else numpy.zeros(self.__grid_shape)
+
+        places_with_convection = numpy.flatnonzero(locations_with_convection.reshape(-1)[self.__places_locations])
+        conv_lambda_by_place = convection_grid.reshape(-1)[self.__places_locations[places_with_convection]]
+
+        environment_place_starts = numpy.ones(len(conv_lambda_by_place), dtype=bool)
+        environment_place_starts[1:] = conv_lambda_by_place[1:] != conv_lambda_by_place[:-1]
+
+        self.__environment_number_of_places = int(numpy.count_nonzero(environment_place_starts))
+        self.__convection_locations = self.__places_locations[places_with_convection]
+        self.__convection_environment_places = number_of_material_places + numpy.cumsum(environment_place_starts) - 1
+        self.__convection_coefficients = self.__compact_coefficients(convection_grid)
+
+        outgoing_coefficients += convection_grid
+
+        # Internal temperature boost. Rate multiplier of each location by point
+        self.__internal_temperature_boost_locations: Dict[int, Tuple[numpy.ndarray, float]] = {}
+
+        for i, j in internal_temperature_booster_points.items():
+            places = _obtain_places_in_cuboid(j.cuboid, location_places_grid, location_places_grid_origin)
+            self.__internal_temperature_boost_locations[i] = (self.__places_locations[places], j.boostRateMultiplier)
+
+        # External temperature boost. Matrix with the rate of each location (rows) by point (columns)
+        self.__external_temperature_boost_places: Dict[int, int] = {}
+        external_boost_locations: List[numpy.ndarray] = []
+        external_boost_rates: List[numpy.ndarray] = []
+
+        for i, j in external_temperature_booster_points.items():
+            places = _obtain_places_in_cuboid(j.cuboid, location_places_grid, location_places_grid_origin)
+            external_boost_locations.append(self.__places_locations[places])
+            external_boost_rates.append(numpy.full(len(places), j.boostRate))
+            self.__external_temperature_boost_places[i] = len(self.__external_temperature_boost_places)
+
+        number_of_external_points = len(self.__external_temperature_boost_places)
+        self.__external_temperature_boost_matrix: scipy.sparse.csr_matrix = scipy.sparse.coo_matrix(
+            (numpy.concatenate(external_boost_rates + [numpy.zeros(0)]),
+             (numpy.concatenate(external_boost_locations + [numpy.zeros(0, dtype=int)]),
+              numpy.concatenate([numpy.full(len(j), i) for i, j in enumerate(external_boost_locations)] +
+                                [numpy.zeros(0, dtype=int)]))),
+            shape=(location_places_grid.size, number_of_external_points)).tocsr()
+
+        # Bound of the spectral radius of the system. By Gershgorin, the eigenvalues are in
+        # [-2 * max outgoing coefficient, 0] (without internal boost)
+        self.__spectral_radius = 2 * float(outgoing_coefficients.max()) if outgoing_coefficients.size > 0 else 0.0
+
+        # Step size selected in the last step, used as the first step size of the next simulation
+        self.__last_step_size = math.inf
+
+        # Coefficients of the Runge-Kutta-Chebyshev method by number of stages
+        self.__integration_coefficients: Dict[int, Tuple[float, List[Tuple[float, float, float, float, float]]]] = {}
+
+        # Activated internal points and their rate multiplier grid
+        self.__activated_internal_temperature_boost_points: Optional[Set[int]] = None
+        self.__internal_temperature_boost_grid: Union[float, numpy.ndarray] = 0.0
+        self.__set_internal_energy_application_points(set(internal_temperature_booster_points.keys()))
+
+    @staticmethod
+    def __obtain_cuboid_slice(cuboid: Cuboid, origin: Tuple[int, int, int]) -> Tuple[slice, slice, slice]:
+        """
+        Obtain the slice of the grid, indexed by [z, y, x], occupied by a cuboid
+
+        :param cuboid: Cuboid
+        :param origin: Location of the origin of the grid
+        :return: slice of the cuboid
+        """
+        return (slice(cuboid.location.z - origin[2], cuboid.location.z - origin[2] + cuboid.dimensions.z),
+                slice(cuboid.location.y - origin[1], cuboid.location.y - origin[1] + cuboid.dimensions.y),
+                slice(cuboid.location.x - origin[0], cuboid.location.x - origin[0] + cuboid.dimensions.x))
+
+    def __compact_coefficients(self, coefficients: numpy.ndarray) -> Union[float, numpy.ndarray]:
+        """
+        Convert the coefficients to the precision of the simulation. If they are uniform, a scalar is returned
+
+        :param coefficients: coefficients of each location
+        :return: coefficients
+        """
+        if coefficients.size > 0 and numpy.all(coefficients == coefficients.flat[0]):
+            return float(coefficients.flat[0])
+        return coefficients.astype(self.__dtype)
+
+    def __set_internal_energy_application_points(self, internal_energy_application_points: Set[int]):
+        """
+        Set the internal points where the energy is applied
+
+        :param internal_energy_application_points: Internal points where the energy is applied
+        """
+        if self.__activated_internal_temperature_boost_points != internal_energy_application_points:
+            self.__activated_internal_temperature_boost_points = internal_energy_application_points
+            internal_temperature_boost_grid = numpy.zeros(int(numpy.prod(self.__grid_shape)))
+            for i in internal_energy_application_points:
+                if self.__internal_temperature_boost_locations.__contains__(i):
+                    locations, boost_rate_multiplier = self.__internal_temperature_boost_locations[i]
+                    numpy.add.at(internal_temperature_boost_grid, locations, boost_rate_multiplier)
+            self.__internal_temperature_boost_grid = self.__compact_coefficients(
+                internal_temperature_boost_grid.reshape(self.__grid_shape))
+
+    def __obtain_number_of_stages(self, step_spectral_radius: float) -> Optional[int]:
+        """
+        Obtain the minimum number of stages of the Runge-Kutta-Chebyshev method that keeps the integration stable
+
+        :param step_spectral_radius: Step size multiplied by the spectral radius of the system
+        :return: number of stages, or None if more than the maximum number of stages (128) are required
+        """
+        number_of_stages = 2
+
+        while number_of_stages <= 128:
+            if number_of_stages not in self.__integration_coefficients:
+                self.__integration_coefficients[number_of_stages] = self.__calculate_integration_coefficients(
+                    number_of_stages, self.__integration_order)
+
+            # The stability interval is reduced a 10% to tolerate the error of the bound of the spectral radius
+            if 0.9 * self.__integration_coefficients[number_of_stages][0] >= step_spectral_radius:
+                return number_of_stages
+
+            number_of_stages += 1 if number_of_stages < 16 else 8
+
+        return None
+
+    @staticmethod
+    def __calculate_integration_coefficients(number_of_stages: int, order: int) \
+            -> Tuple[float, List[Tuple[float, float, float, float, float]]]:
+        """
+        Calculate the coefficients of the damped Runge-Kutta-Chebyshev method (Verwer, Sommeijer and Hundsdorfer,
+        2004)
+
+        :param number_of_stages: number of stages
+        :param order: order of the method (1 or 2)
+        :return: Length of the real stability interval (in units of step size) and, for each stage, the coefficients
+         mu, nu, mu~, gamma~ and the coefficient of Y_0 (1 - mu - nu)
+        """
+        s = number_of_stages
+        w_0 = 1 + (2 / 13 if order == 2 else 0.05) / (s ** 2)
+
+        # Chebyshev polynomials of the first kind and their derivatives evaluated in w_0
+        t = [1.0, w_0]
+        t_d = [0.0, 1.0]
+        t_dd = [0.0, 0.0]
+        for _ in range(2, s + 1):
+            t.append(2 * w_0 * t[-1] - t[-2])
+            t_d.append(2 * t[-2] + 2 * w_0 * t_d[-1] - t_d[-2])
+            t_dd.append(4 * t_d[-2] + 2 * w_0 * t_dd[-1] - t_dd[-2])
+
+        if order == 2:
+            w_1 = t_d[s] / t_dd[s]
+            b = [t_dd[j] / (t_d[j] ** 2) for j in range(2, s + 1)]
+            b = [b[0], b[0]] + b
+        else:
+            w_1 = t[s] / t_d[s]
+            b = [1 / t[j] for j in range(s + 1)]
+
+        a = [1 - b[j] * t[j] for j in range(s + 1)]
+
+        # First stage only uses mu~
+        coefficients = [(0.0, 0.0, b[1] * w_1 if order == 2 else w_1 / w_0, 0.0, 0.0)]
+
+        for j in range(2, s + 1):
+            mu = 2 * b[j] * w_0 / b[j - 1]
+            nu = -b[j] / b[j - 2]
+            mu_tilde = 2 * b[j] * w_1 / b[j - 1]
+            gamma_tilde = -a[j - 1] * mu_tilde if order == 2 else 0.0
+            coefficients.append((mu, nu, mu_tilde, gamma_tilde, 1 - mu - nu))
+
+        return (1 + w_0) / w_1, coefficients
+
+    def __integration_step(self, y_0: numpy.ndarray, f_0: numpy.ndarray, h: float, number_of_stages: int,
+                           heat_sources: numpy.ndarray, linear_coefficients: Union[float, numpy.ndarray]) \
+            -> numpy.ndarray:
+        """
+        Simulate a step of the Runge-Kutta-Chebyshev method
+
+        :param y_0: Temperatures at the start of the step
+        :param f_0: Derivative of the temperatures at the start of the step
+        :param h: Step size
+        :param number_of_stages: Number of stages
+        :param heat_sources: Heat received of the environment and the external points
+        :param linear_coefficients: Internal boost minus convection coefficients of each location
+        :return: Temperatures at the end of the step
+        """
+        stages_coefficients = self.__integration_coefficients[number_of_stages][1]
+
+        # Y_j = (1 - mu_j - nu_j) Y_0 + mu_j Y_j-1 + nu_j Y_j-2 + mu~_j h F(Y_j-1) + gamma~_j h F(Y_0)
+        y_previous, y_actual = y_0, y_0 + self.__dtype(stages_coefficients[0][2] * h) * f_0
+
+        for mu, nu, mu_tilde, gamma_tilde, y_0_coefficient in stages_coefficients[1:]:
+            f_actual = self.__derivative(y_actual, heat_sources, linear_coefficients)
+            y_next = self.__dtype(mu) * y_actual + self.__dtype(nu) * y_previous + \
+                self.__dtype(mu_tilde * h) * f_actual
+            if y_0_coefficient != 0:
+                y_next += self.__dtype(y_0_coefficient) * y_0
+            if gamma_tilde != 0:
+                y_next += self.__dtype(gamma_tilde * h) * f_0
+            y_previous, y_actual = y_actual, y_next
+
+        return y_actual
+
+    def __derivative(self, temperatures: numpy.ndarray, heat_sources: numpy.ndarray,
+                     linear_coefficients: Union[float, numpy.ndarray]) -> numpy.ndarray:
+        """
+        Obtain the derivative of the temperatures
+
+        :param temperatures: Temperatures of each location, indexed by [simulation, z, y, x]
+        :param heat_sources: Heat received of the environment and the external points
+        :param linear_coefficients: Internal boost minus convection coefficients of each location
+        :return: derivative of the temperatures
+        """
+        derivative = linear_coefficients * temperatures + heat_sources
+
+        # Stencil with the faces of the axis z, y and x
+        for axis, (coefficient_lower, coefficient_upper) in enumerate(self.__faces_coefficients):
+            lower = (Ellipsis,) + tuple(slice(None, -1) if i == axis else slice(None) for i in range(3))
+            upper = (Ellipsis,) + tuple(slice(1, None) if i == axis else slice(None) for i in range(3))
+            difference = temperatures[upper] - temperatures[lower]
+            derivative[lower] += coefficient_lower * difference
+            derivative[upper] -= coefficient_upper * difference
+
+        return derivative
+
+    def __simulate(self, mo: numpy.ndarray, amount_of_time: float, external_points_usage: numpy.ndarray) \
+            -> numpy.ndarray:
+        """
+        Simulate the grid during an amount of time
+
+        :param mo: marks of the places, with one column by simulation
+        :param amount_of_time: Amount of time in seconds
+        :param external_points_usage: Usage of each external point (rows) in each simulation (columns)
+        :return: marks of the places after the amount of time
+        """
+        number_of_simulations = mo.shape[1]
+        grid_size = int(numpy.prod(self.__grid_shape))
+
+        temperatures = numpy.zeros((number_of_simulations, grid_size), dtype=self.__dtype)
+        temperatures[:, self.__places_locations] = mo[:self.__number_of_material_places, :].transpose()
+
+        # Heat sources are constant during the step
+        heat_sources = numpy.zeros((number_of_simulations, grid_size))
+        if len(self.__convection_locations) > 0:
+            heat_sources[:, self.__convection_locations] = mo[self.__convection_environment_places, :].transpose()
+        heat_sources = self.__convection_coefficients * heat_sources.reshape((-1,) + self.__grid_shape)
+        heat_sources += self.__external_temperature_boost_matrix.dot(external_points_usage).transpose().reshape(
+            (-1,) + self.__grid_shape)
+        heat_sources = heat_sources.astype(self.__dtype)
+
+        temperatures = temperatures.reshape((-1,) + self.__grid_shape)
+        linear_coefficients = self.__internal_temperature_boost_grid - self.__convection_coefficients
+
+        f_0 = self.__derivative(temperatures, heat_sources, linear_coefficients)
+        remaining_time = amount_of_time
+        h = min(amount_of_time, self.__last_step_size) if self.__tolerance is not None else amount_of_time
+
+        while remaining_time > 1e-12 * amount_of_time:
+            step_size = min(h, remaining_time)
+            number_of_stages = self.__obtain_number_of_stages(step_size * self.__spectral_radius)
+
+            # Steps with more stages than the maximum are split
+            if number_of_stages is None:
+                h = step_size / 2
+                continue
+
+            next_temperatures = self.__integration_step(temperatures, f_0, step_size, number_of_stages,
+                                                        heat_sources, linear_coefficients)
+            next_f_0 = self.__derivative(next_temperatures, heat_sources, linear_coefficients)
+
+            if self.__tolerance is not None:
+                # Error estimation of the second order Runge-Kutta-Chebyshev method, and next step size
+                error = float(numpy.abs(0.8 * (temperatures - next_temperatures) +
+                                        (0.4 * step_size) * (f_0 + next_f_0)).max()) / self.__tolerance
+                h = step_size * (min(10.0, max(0.1, 0.8 * error ** (-1 / 3))) if error > 0 else 10.0)
+
+                if error > 1:
+                    continue
+
+                # The last step of the simulation is usually shortened to the remaining time
+                if step_size < remaining_time:
+                    self.__last_step_size = h
+
+            remaining_time -= step_size
+            temperatures, f_0 = next_temperatures, next_f_0
+
+        mo_next = numpy.array(mo, copy=True)
+        mo_next[:self.__number_of_material_places, :] = temperatures.reshape((number_of_simulations, -1))[
+                                                        :, self.__places_locations].transpose()
+        return mo_next
+
+    def __obtain_external_points_usage(self, external_energy_application_points_usage: List[Dict[int, float]]) \
+            -> numpy.ndarray:
+        """
+        Obtain the matrix with the usage of each external point (rows) in each simulation (columns)
+        """
+        usage = numpy.zeros((len(self.__external_temperature_boost_places),
+                             len(external_energy_application_points_usage)))
+        for j, simulation_usage in enumerate(external_energy_application_points_usage):
+            for i, k in simulation_usage.items():
+                if self.__external_temperature_boost_places.__contains__(i):
+                    usage[self.__external_temperature_boost_places[i], j] = k
+        return usage
+
+    def apply_energy(self, actual_state: SimulationState, amount_of_time: float,
+                     external_energy_application_points: Optional[Set[int]] = None,
+                     internal_energy_application_points: Optional[Set[int]] = None,
+                     external_energy_application_points_usage: Optional[Dict[int, float]] = None) \
+            -> SimulationState:
+        """
+        Apply energy over the cubedSpace and return the transformed cubedSpaceState
+
+        The parameters are the ones of :meth:`.Model.apply_energy`
+
+        :return cubed space resultant of the application of energy over a previous state
+        """
+        external_energy_application_points_usage = external_energy_application_points_usage \
+            if external_energy_application_points_usage is not None else \
+            {i: 1.0 for i in (external_energy_application_points if external_energy_application_points is not None
+                              else set())}
+
+        self.__set_internal_energy_application_points(internal_energy_application_points
+                                                      if internal_energy_application_points is not None else set())
+
+        mo = actual_state.places_mo_vector.reshape((-1, 1))
+        usage = self.__obtain_external_points_usage([external_energy_application_points_usage])
+
+        # The external points usage is stored in the state, as in Model
+        number_of_external_temperature_boost_places = len(self.__external_temperature_boost_places)
+        if number_of_external_temperature_boost_places > 0:
+            mo[-number_of_external_temperature_boost_places:, :] = usage
+
+        return SimulationState(self.__simulate(mo, amount_of_time, usage).reshape(-1))
+
+    def create_batch_state(self, states: List[SimulationState]) -> BatchSimulationState:
+        """
+        Join several states of this cubed space in a batch state, to simulate them at once
+
+        :param states: States of each simulation
+        :return: batch state with one column by simulation
+        """
+        return BatchSimulationState(numpy.stack([i.places_mo_vector.reshape(-1) for i in states], axis=1))
+
+    @staticmethod
+    def split_batch_state(batch_state: BatchSimulationState) -> List[SimulationState]:
+        """
+        Obtain the state of each simulation of a batch state
+
+        :param batch_state: batch state
+        :return: state of each simulation
+        """
+        return [SimulationState(batch_state.places_mo_matrix[:, i].copy())
+                for i in range(batch_state.places_mo_matrix.shape[1])]
+
+    def apply_energy_batch(self, actual_state: BatchSimulationState, amount_of_time: float,
+                           external_energy_application_points_usage: List[Dict[int, float]],
+                           internal_energy_application_points: Optional[Set[int]] = None) -> BatchSimulationState:
+        """
+        Apply energy over all the simulations of a batch state at once
+
+        The parameters are the ones of :meth:`.Model.apply_energy_batch`
+
+        :return: batch state resultant of the application of energy over the previous batch state
+        """
+        mo = actual_state.places_mo_matrix
+
+        if len(external_energy_application_points_usage) != mo.shape[1]:
+            raise Exception("The energy application points must be provided for each simulation of the batch")
+
+        self.__set_internal_energy_application_points(internal_energy_application_points
+                                                      if internal_energy_application_points is not None else set())
+
+        usage = self.__obtain_external_points_usage(external_energy_application_points_usage)
+
+        number_of_external_temperature_boost_places = len(self.__external_temperature_boost_places)
+        if number_of_external_temperature_boost_places > 0:
+            mo[-number_of_external_temperature_boost_places:, :] = usage
+
+        return BatchSimulationState(self.__simulate(mo, amount_of_time, usage))
+
+    def obtain_temperature_matrix(self, actual_state: BatchSimulationState) -> numpy.ndarray:
+        """
+        Obtain the temperature of the cubes of unit edge of each simulation of a batch state
+
+        :param actual_state: Actual batch state
+        :return: Temperature in kelvin of each unit cube (columns) in each simulation (rows). The unit cubes are
+         ordered as in the temperature matrices of obtain_temperature
+        """
+        return numpy.ascontiguousarray(
+            actual_state.places_mo_matrix[:self.__number_of_material_places, :].transpose())
+
+    def obtain_temperature(self, actual_state: SimulationState) -> Dict[int, PhysicalCuboid]:
+        """
+        This function return the temperature in each cube of unit edge that conform the cubedSpace
+
+        :param actual_state: Actual state of the temperature in the mesh
+        :return: List of temperature blocks in kelvin
+        """
+        temperature_cubes = {}
+
+        for i, v in self.__mo_index.items():
+            material, cuboid = self.__material_cubes_dict[i]
+            number_of_occupied_places = cuboid.dimensions.x * cuboid.dimensions.y * cuboid.dimensions.z
+            temperature_cubes[i] = PhysicalCuboid(
+                cuboid=Cuboid(location=cuboid.location, dimensions=cuboid.dimensions),
+                material=material,
+                temperature=CuboidTemperature(actual_state.places_mo_vector[v: v + number_of_occupied_places])
+            )
+
+        return temperature_cubes
+
+    def create_initial_state(self, default_temperature: float,
+                             material_cubes_temperatures: Optional[Dict[int, float]] = None,
+                             environment_temperature: Optional[float] = None) -> SimulationState:
+        """
+        Create initial cubed space state
+
+        :param default_temperature: default temperature for the cubed space
+        :param material_cubes_temperatures: List of [material cube id, material cube temperature (Kelvin)]
+        :param environment_temperature: Environment temperature (Kelvin)
+        :return: created cubed space state
+        """
+        places_temperature = []
+        for i in self.__mo_index.keys():
+            cuboid = self.__material_cubes_dict[i][1]
+            places_temperature.append(numpy.full(
+                cuboid.dimensions.x * cuboid.dimensions.y * cuboid.dimensions.z,
+                material_cubes_temperatures[i] if material_cubes_temperatures is not None and
+                material_cubes_temperatures.__contains__(i) else default_temperature))
+
+        environment_temperature = environment_temperature if environment_temperature is not None \
+            else default_temperature
+
+        places_temperature.append(numpy.full(self.__environment_number_of_places, environment_temperature))
+
+        # The state is created with all the energy application points activated
+        self.__set_internal_energy_application_points(set(self.__internal_temperature_boost_locations.keys()))
+
+        return SimulationState(
+            numpy.concatenate(places_temperature + [numpy.ones(len(self.__external_temperature_boost_places))]))
+
+    def restore_state(self, saved_state: SimulationState) -> SimulationState:
+        """
+        Create a state of this cubed space from a state obtained with another instance built from the same definition
+        (i.e. a saved checkpoint), or with a :class:`.Model` built from the same definition
+
+        :param saved_state: State obtained with a cubed space with the same definition
+        :return: cubed space state that can be used with this cubed space
+        """
+        mo = numpy.array(saved_state.places_mo_vector, copy=True)
+        number_of_external_temperature_boost_places = len(self.__external_temperature_boost_places)
+
+        if len(mo) != self.__number_of_material_places + self.__environment_number_of_places + \
+                number_of_external_temperature_boost_places:
+            raise Exception("The saved state doesn't belong to a cubed space with the same definition")
+
+        if number_of_external_temperature_boost_places > 0:
+            mo[-number_of_external_temperature_boost_places:] = 1.0
+
+        self.__set_internal_energy_application_points(set(self.__internal_temperature_boost_locations.keys()))
+
+        return SimulationState(mo)
@@ -0,0 +1,20 @@
+"""
+==================
+Experiments runner
+==================
+
+Execute schedulability studies. An experiment evaluates a set of schedulers with automatically generated task sets
+for each combination of utilization and number of tasks. The runs are distributed over a pool of processes.
+
+This module provides the following functions:
+- :function:`.generate_experiment_runs`
+- :function:`.execute_experiment_run`
+- :function:`.execute_experiment`
+
+It also exposes the following classes related with the previous functions:
+- :class:`.ExperimentGrid`
+- :class:`.ExperimentRun`
+- :class:`.ExperimentRunResult`
+"""
+from ._experiment_definition import ExperimentGrid, ExperimentRun, ExperimentRunResult
+from ._experiment_runner import generate_experiment_runs, execute_experiment_run, execute_experiment
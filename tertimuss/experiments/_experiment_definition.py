@@ -0,0 +1,107 @@
+from dataclasses import dataclass, field
+from typing import List, Dict, Callable, Type, Optional, Literal
+
+from tertimuss.simulation_lib.schedulers_definition import CentralizedScheduler
+from tertimuss.simulation_lib.simulator import SimulationConfiguration
+from tertimuss.tasks_generator.periodic_tasks import PeriodicTaskGenerator
+from tertimuss.tasks_generator.periodic_tasks.implicit_deadlines import PTGUUniFastDiscard
+
+
+@dataclass
+class ExperimentGrid:
+    """
+    Definition of a schedulability study. Each scheduler is evaluated with number_of_task_sets task sets for each
+    combination of utilization and number of tasks. All schedulers are evaluated with the same task sets
+    """
+    utilizations: List[float]
+    """Utilizations of the generated task sets (sum of the utilization of all tasks)"""
+
+    numbers_of_tasks: List[int]
+    """Number of tasks of the generated task sets"""
+
+    schedulers: Dict[str, Callable[[], CentralizedScheduler]]
+    """Schedulers to evaluate by name. Each value must create a new scheduler instance and must be picklable
+    (i.e. functools.partial(SGEDF, False)), because the runs are executed in other processes"""
+
+    number_of_task_sets: int
+    """Number of task sets generated for each combination of utilization and number of tasks"""
+
+    number_of_cores: int
+    """Number of cores of the processor"""
+
+    processor_frequency: int = 1000
+    """Frequency of the cores in Hz"""
+
+    min_deadline: float = 2
+    """Minimum deadline of the generated tasks in seconds"""
+
+    max_deadline: float = 12
+    """Maximum deadline of the generated tasks in seconds"""
+
+    major_cycle: float = 24
+    """Major cycle of the generated task sets in seconds. The deadlines are divisors of it"""
+
+    task_generator: Type[PeriodicTaskGenerator] = PTGUUniFastDiscard
+    """Algorithm used to generate the tasks execution time"""
+
+    simulation_options: SimulationConfiguration = field(
+        default_factory=lambda: SimulationConfiguration(id_debug=False))
+    """Options of the simulations"""
+
+    seed: int = 0
+    """Base seed. The seed of each task set is derived from it"""
+
+
+@dataclass
+class ExperimentRun:
+    """
+    Simulation of one scheduler with one task set
+    """
+    run_id: int
+    """Identifier of the run"""
+
+    scheduler_name: str
+    """Name of the scheduler in the experiment grid"""
+
+    utilization: float
+    """Utilization of the task set"""
+
+    number_of_tasks: int
+    """Number of tasks of the task set"""
+
+    task_set_index: int
+    """Index of the task set among the ones with the same utilization and number of tasks"""
+
+    seed: int
+    """Seed used to generate the task set"""
+
+
+@dataclass
+class ExperimentRunResult:
+    """
+    Summary of a run
+    """
+    run: ExperimentRun
+    """Run summarized"""
+
+    status: Literal["OK", "ERROR", "TIMEOUT", "CRASH"]
+    """OK if the simulation have finished, ERROR if it raised an exception, TIMEOUT if it exceeded the time limit and
+    CRASH if the process executing it died"""
+
+    have_been_scheduled: Optional[bool]
+    """True if the scheduler accepted the task set"""
+
+    number_of_missed_deadlines: Optional[int]
+    """Number of missed deadlines"""
+
+    number_of_preemptions: Optional[int]
+    """Number of preemptions"""
+
+    number_of_migrations: Optional[int]
+    """Number of migrations"""
+
+    wall_time: float
+    """Time in seconds spent in the run"""
+
+    error_message: Optional[str]
+    """Reason of the failure if the status is not OK"""
@@ -0,0 +1,299 @@
+import csv
+import itertools
+import os
+import random
+import signal
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, fields
+from typing import List, Optional, Dict, Tuple
+
+import numpy
+
+from tertimuss.analysis import obtain_deadline_misses_analysis, obtain_preemptions_migrations_analysis
+from tertimuss.simulation_lib.simulator import execute_scheduler_simulation_simple
+from tertimuss.simulation_lib.system_definition import PeriodicTask, PreemptiveExecution, Criticality, TaskSet
+from tertimuss.simulation_lib.system_definition.utils import generate_default_cpu, default_environment_specification
+from tertimuss.tasks_generator.deadline_generator import UniformIntegerDeadlineGenerator
+
+from ._experiment_definition import ExperimentGrid, ExperimentRun, ExperimentRunResult
+
+
+class _RunTimeoutException(BaseException):
+    """
+    Raised by the SIGALRM handler when a run exceeds its time limit. It derives from BaseException so a scheduler that
+    catches Exception doesn't swallow it
+    """
+
+
+def _raise_run_timeout(signum, frame):
+    raise _RunTimeoutException()
+
+
+def generate_experiment_runs(experiment_grid: ExperimentGrid) -> List[ExperimentRun]:
+    """
+    Generate the runs of an experiment grid
+
+    :param experiment_grid: Definition of the experiment
+    :return: List of runs. The runs with the same seed use the same task set
+    """
+    task_sets = itertools.product(experiment_grid.utilizations, experiment_grid.numbers_of_tasks,
+                                  range(experiment_grid.number_of_task_sets))
+
+    return [ExperimentRun(run_id=run_id, scheduler_name=scheduler_name, utilization=utilization,
+                          number_of_tasks=number_of_tasks, task_set_index=task_set_index,
+                          seed=experiment_grid.seed + task_set_number)
+            for run_id, ((task_set_number, (utilization, number_of_tasks, task_set_index)), scheduler_name) in
+            enumerate(itertools.product(enumerate(task_sets), experiment_grid.schedulers.keys()))]
+
+
+def _generate_task_set(experiment_grid: ExperimentGrid, experiment_run: ExperimentRun) -> TaskSet:
+    """
+    Generate the task set of a run
+
+    :param experiment_grid: Definition of the experiment
+    :param experiment_run: Run
+    :return: Task set
+    """
+    random.seed(experiment_run.seed)
+    numpy.random.seed(experiment_run.seed)
+
+    deadlines = UniformIntegerDeadlineGenerator.generate(number_of_tasks=experiment_run.number_of_tasks,
+                                                         min_deadline=experiment_grid.min_deadline,
+                                                         max_deadline=experiment_grid.max_deadline,
+                                                         major_cycle=experiment_grid.major_cycle)
+
+    generated_tasks = experiment_grid.task_generator.generate(utilization=experiment_run.utilization,
+                                                              tasks_deadlines=deadlines,
+                                                              processor_frequency=experiment_grid.processor_frequency)
+
+    return TaskSet(periodic_tasks=[PeriodicTask(identifier=i,
+                                                worst_case_execution_time=j.worst_case_execution_time,
+                                                relative_deadline=j.deadline,
+                                                best_case_execution_time=None,
+                                                execution_time_distribution=None,
+                                                memory_footprint=None,
+                                                priority=None,
+                                                preemptive_execution=PreemptiveExecution.FULLY_PREEMPTIVE,
+                                                deadline_criteria=Criticality.HARD,
+                                                energy_consumption=None,
+                                                phase=None,
+                                                period=j.deadline) for i, j in enumerate(generated_tasks)],
+                   aperiodic_tasks=[], sporadic_tasks=[])
+
+
+def execute_experiment_run(experiment_grid: ExperimentGrid, experiment_run: ExperimentRun,
+                           run_timeout: Optional[float] = None) -> ExperimentRunResult:
+    """
+    Generate the task set of a run, simulate it and analyze the result
+
+    :param experiment_grid: Definition of the experiment
+    :param experiment_run: Run to execute
+    :param run_timeout: Maximum time in seconds of the run. It only can be enforced in the main thread of a process in
+     platforms with SIGALRM
+    :return: Summary of the run
+    """
+    use_timeout = run_timeout is not None and hasattr(signal, "SIGALRM")
+
+    # Handler of SIGALRM before the run, restored at the end of it
+    previous_handler = None
+    handler_installed = False
+
+    start_time = time.perf_counter()
+    try:
+        if use_timeout:
+            previous_handler = signal.signal(signal.SIGALRM, _raise_run_timeout)
+            handler_installed = True
+            signal.setitimer(signal.ITIMER_REAL, run_timeout)
+
+        task_set = _generate_task_set(experiment_grid, experiment_run)
+
+        simulation_result, jobs, _ = execute_scheduler_simulation_simple(
+            tasks=task_set,
+            aperiodic_tasks_jobs=[],
+            sporadic_tasks_jobs=[],
+            processor_definition=generate_default_cpu(experiment_grid.number_of_cores,
+                                                      {experiment_grid.processor_frequency}),
+            environment_specification=default_environment_specification(),
+            simulation_options=experiment_grid.simulation_options,
+            scheduler=experiment_grid.schedulers[experiment_run.scheduler_name]()
+        )
+
+        number_of_missed_deadlines = None
+        number_of_preemptions = None
+        number_of_migrations = None
+
+        if simulation_result.have_been_scheduled:
+            deadline_misses_analysis = obtain_deadline_misses_analysis(task_set, jobs, simulation_result)
+            preemptions_migrations_analysis = obtain_preemptions_migrations_analysis(task_set, jobs,
+                                                                                     simulation_result)
+            number_of_missed_deadlines = deadline_misses_analysis.number_of_missed_deadlines
+            number_of_preemptions = preemptions_migrations_analysis.number_of_preemptions
+            number_of_migrations = preemptions_migrations_analysis.number_of_migrations
+
+        return ExperimentRunResult(run=experiment_run, status="OK",
+                                   have_been_scheduled=simulation_result.have_been_scheduled,
+                                   number_of_missed_deadlines=number_of_missed_deadlines,
+                                   number_of_preemptions=number_of_preemptions,
+                                   number_of_migrations=number_of_migrations,
+                                   wall_time=time.perf_counter() - start_time, error_message=None)
+
+    except _RunTimeoutException:
+        return ExperimentRunResult(run=experiment_run, status="TIMEOUT", have_been_scheduled=None,
+                                   number_of_missed_deadlines=None, number_of_preemptions=None,
+                                   number_of_migrations=None, wall_time=time.perf_counter() - start_time,
+                                   error_message="time limit of " + str(run_timeout) + " seconds exceeded")
+
+    except Exception as e:
+        return ExperimentRunResult(run=experiment_run, status="ERROR", have_been_scheduled=None,
+                                   number_of_missed_deadlines=None, number_of_preemptions=None,
+                                   number_of_migrations=None, wall_time=time.perf_counter() - start_time,
+                                   error_message=repr(e))
+
+    finally:
+        if handler_installed:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler if previous_handler is not None else signal.SIG_DFL)
+
+
+def _execute_experiment_runs_chunk(experiment_grid: ExperimentGrid, experiment_runs: List[ExperimentRun],
+                                   run_timeout: Optional[float], progress_file_path: str) -> List[ExperimentRunResult]:
+    """
+    Execute a chunk of runs
+
+    :param experiment_grid: Definition of the experiment
+    :param experiment_runs: Runs of the chunk
+    :param run_timeout: Maximum time in seconds of each run
+    :param progress_file_path: The position in the chunk of the run being executed is written in this file, and the
+     file is removed when the chunk finishes, so the run that was being executed is known if the process dies
+    :return: Summary of each run
+    """
+    experiment_run_results = []
+
+    for position, experiment_run in enumerate(experiment_runs):
+        with open(progress_file_path, "w") as progress_file:
+            progress_file.write(str(position))
+
+        experiment_run_results.append(execute_experiment_run(experiment_grid, experiment_run, run_timeout))
+
+    os.remove(progress_file_path)
+
+    return experiment_run_results
+
+
+def _obtain_chunk_progress(progress_file_path: str) -> Optional[int]:
+    """
+    Obtain the position of the run that was being executed in a chunk whose process died, and remove its progress file
+
+    :param progress_file_path: Progress file of the chunk
+    :return: Position of the run, or None if the chunk wasn't being executed
+    """
+    if not os.path.exists(progress_file_path):
+        return None
+
+    with open(progress_file_path) as progress_file:
+        progress = progress_file.read()
+
+    os.remove(progress_file_path)
+
+    return int(progress) if len(progress) > 0 else None
+
+
+def _experiment_run_result_to_row(experiment_run_result: ExperimentRunResult) -> Dict[str, object]:
+    row = asdict(experiment_run_result.run)
+    row.update({i: j for i, j in asdict(experiment_run_result).items() if i != "run"})
+    return row
+
+
+def execute_experiment(experiment_grid: ExperimentGrid, summary_file_path: Optional[str] = None,
+                       max_workers: Optional[int] = None, chunk_size: int = 8,
+                       run_timeout: Optional[float] = None) -> List[ExperimentRunResult]:
+    """
+    Execute all the runs of an experiment grid in a pool of processes.
+
+    A run that raises an exception or exceeds the time limit doesn't stop the experiment. If a process dies, the pool
+    stops. The runs that were being executed at that moment are executed again, each one in its own process, to find
+    the one that made it crash. The rest of the unfinished runs are executed again in a new pool
+
+    :param experiment_grid: Definition of the experiment
+    :param summary_file_path: If not None, a CSV file is written in this path with one row by run. The rows are
+     written as the runs finish
+    :param max_workers: Number of processes. If None, the number of processors of the machine is used
+    :param chunk_size: Number of runs sent to a process at once
+    :param run_timeout: Maximum time in seconds of each run
+    :return: Summary of each run, sorted by run identifier
+    """
+    experiment_runs = generate_experiment_runs(experiment_grid)
+    chunks = [experiment_runs[i:i + chunk_size] for i in range(0, len(experiment_runs), chunk_size)]
+
+    experiment_run_results: List[ExperimentRunResult] = []
+
+    summary_file = open(summary_file_path, "w", newline="") if summary_file_path is not None else None
+    summary_writer = csv.DictWriter(summary_file, fieldnames=[i.name for i in fields(ExperimentRun)] + [
+        i.name for i in fields(ExperimentRunResult) if i.name != "run"]) if summary_file is not None else None
+
+    if summary_writer is not None:
+        summary_writer.writeheader()
+
+    def record_results(results: List[ExperimentRunResult]):
+        experiment_run_results.extend(results)
+        if summary_writer is not None:
+            summary_writer.writerows(_experiment_run_result_to_row(i) for i in results)
+            summary_file.flush()
+
+    try:
+        # Runs that were being executed by a process that died
+        suspect_runs: List[ExperimentRun] = []
+
+        with tempfile.TemporaryDirectory() as progress_directory:
+            while len(chunks) > 0:
+                broken_chunks: List[Tuple[str, List[ExperimentRun]]] = []
+
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    futures: Dict = {executor.submit(_execute_experiment_runs_chunk, experiment_grid, j, run_timeout,
+                                                     os.path.join(progress_directory, str(i))):
+                                     (os.path.join(progress_directory, str(i)), j) for i, j in enumerate(chunks)}
+                    for future in as_completed(futures):
+                        try:
+                            record_results(future.result())
+                        except BrokenProcessPool:
+                            broken_chunks.append(futures[future])
+
+                chunks = []
+                suspect_runs_before = len(suspect_runs)
+
+                for progress_file_path, chunk in broken_chunks:
+                    position = _obtain_chunk_progress(progress_file_path)
+
+                    if position is None:
+                        chunks.append(chunk)
+                    else:
+                        suspect_runs.append(chunk[position])
+                        if len(chunk) > 1:
+                            chunks.append(chunk[:position] + chunk[position + 1:])
+
+                if len(suspect_runs) == suspect_runs_before:
+                    # The processes died without executing any run
+                    suspect_runs.extend(i for j in chunks for i in j)
+                    chunks = []
+
+        # Each suspect run is executed isolated
+        for experiment_run in suspect_runs:
+            start_time = time.perf_counter()
+            try:
+                with ProcessPoolExecutor(max_workers=1) as executor:
+                    record_results([executor.submit(execute_experiment_run, experiment_grid, experiment_run,
+                                                    run_timeout).result()])
+            except BrokenProcessPool:
+                record_results([ExperimentRunResult(run=experiment_run, status="CRASH", have_been_scheduled=None,
+                                                    number_of_missed_deadlines=None, number_of_preemptions=None,
+                                                    number_of_migrations=None,
+                                                    wall_time=time.perf_counter() - start_time,
+                                                    error_message="the process executing the run died")])
+    finally:
+        if summary_file is not None:
+            summary_file.close()
+
+    return sorted(experiment_run_results, key=lambda x: x.run.run_id)
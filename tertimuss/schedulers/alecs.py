@@ -17,13 +17,13 @@ from ortools.linear_solver import pywraplp
 import ortools
 
 from ..simulation_lib.math_utils import list_float_lcm, list_int_gcd
-from ..simulation_lib.schedulers_definition import CentralizedScheduler
+from ..simulation_lib.schedulers_definition import CyclicExecutiveScheduler, CyclicExecutiveTable
 from ..simulation_lib.system_definition import Processor, Environment, TaskSet, \
     PreemptiveExecution
 from ..simulation_lib.system_definition.utils import calculate_major_cycle
 
 
-class SALECS(CentralizedScheduler):
+class SALECS(CyclicExecutiveScheduler):
     """
     Implements the Allocation and Execution Control Scheduler (ALECS)
 
@@ -43,7 +43,7 @@ class SALECS(CentralizedScheduler):
         super().__init__(activate_debug)
 
         # Declare class variables
-        self.__scheduling_points: Dict[int, Dict[int, int]] = {}
+        self.__scheduling_table: CyclicExecutiveTable = CyclicExecutiveTable({}, 0, 0)
         self.__major_cycle: float = 0
         self.__task_to_job: Dict[int, int] = {}
 
@@ -157,13 +157,13 @@ class SALECS(CentralizedScheduler):
             print('The solver could not solve the problem.')
             return None
 
-    def get_scheduling_points(self) -> Dict[int, Dict[int, int]]:
+    def get_scheduling_table(self) -> CyclicExecutiveTable:
         """
-        Return the calculated scheduling points
+        Return the table with the calculated scheduling points
 
-        :return: scheduling points
+        :return: scheduling table
         """
-        return self.__scheduling_points
+        return self.__scheduling_table
 
     def check_schedulability(self, processor_definition: Processor,
                              environment_specification: Environment, task_set: TaskSet) \
@@ -371,7 +371,7 @@ class SALECS(CentralizedScheduler):
             if interval_have_ended_this_cycle or previous_tasks_being_executed != tasks_being_executed:
                 scheduling_points[i] = {i: index_to_id[j] for i, j in enumerate(tasks_being_executed) if j != -1}
 
-        self.__scheduling_points = scheduling_points
+        self.__scheduling_table = CyclicExecutiveTable(scheduling_points, m, round(major_cycle * f_star_hz))
         self.__major_cycle = major_cycle
 
         # Only used for debug purposes
@@ -414,10 +414,9 @@ class SALECS(CentralizedScheduler):
         """
         actual_execution_cycle = round(global_time * cores_frequency) % round(self.__major_cycle * cores_frequency)
 
-        next_scheduling_point = next(i for i in sorted(self.__scheduling_points.keys()) +
-                                     [round(self.__major_cycle * cores_frequency)] if i > actual_execution_cycle)
+        assignation, next_scheduling_point = self.__scheduling_table.obtain_assignation(actual_execution_cycle)
 
-        return ({k: self.__task_to_job[v] for k, v in self.__scheduling_points[actual_execution_cycle].items()},
+        return ({k: self.__task_to_job[v] for k, v in assignation.items()},
                 next_scheduling_point - actual_execution_cycle, None)
 
     def on_jobs_activation(self, global_time: float, activation_time: float,
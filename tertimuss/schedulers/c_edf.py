@@ -0,0 +1,325 @@
+"""
+===================================================
+Clustered Earliest Deadline First Scheduler (C-EDF)
+===================================================
+
+This module provides the following class:
+- :class:`SCEDF`
+"""
+
+import heapq
+from typing import Dict, Optional, Set, List, Tuple
+
+from .calecs import AbstractBPPBasedPartitionAlgorithm, BestFitDescendantBPPBasedPartitionAlgorithm
+from .calecs._task import ImplicitDeadlineTask
+from ..simulation_lib.schedulers_definition import CentralizedScheduler
+from ..simulation_lib.system_definition import Processor, Environment, TaskSet, PreemptiveExecution
+
+
+class _EDFCluster(object):
+    """
+    Cluster of CPUs where the jobs of its tasks are scheduled by EDF
+    """
+
+    def __init__(self, cpus: List[int]):
+        """
+        Create a cluster
+
+        :param cpus: CPUs of the cluster
+        """
+        self.cpus: List[int] = cpus
+
+        # Heap of (absolute deadline, activation order, job id) of the jobs that aren't in execution. Jobs that have
+        # finished or missed its deadline are removed when they reach the head
+        self.waiting_jobs_heap: List[Tuple[float, int, int]] = []
+
+        # Jobs selected for execution in the last invocation
+        self.running_jobs: Set[int] = set()
+
+    def schedule(self, jobs_being_executed_id: Dict[int, int], active_jobs_priority: Dict[int, Tuple[float, int]]) \
+            -> Dict[int, int]:
+        """
+        Select the jobs to execute in the cluster
+
+        :param jobs_being_executed_id: Jobs in execution in the CPUs of the cluster. The dictionary has as key the CPU
+         id, and as value the job id
+        :param active_jobs_priority: Absolute deadline and activation order of the active jobs
+        :return: Jobs CPU assignation of the CPUs of the cluster
+        """
+        # Jobs in execution that are still active. The ones preempted since the last invocation wait again
+        running_jobs = {i for i in jobs_being_executed_id.values() if i in active_jobs_priority}
+
+        for i in self.running_jobs - running_jobs:
+            if i in active_jobs_priority:
+                heapq.heappush(self.waiting_jobs_heap, (*active_jobs_priority[i], i))
+
+        # Max heap of the jobs in execution
+        running_jobs_heap = [(-active_jobs_priority[i][0], -active_jobs_priority[i][1], i) for i in running_jobs]
+        heapq.heapify(running_jobs_heap)
+
+        # Jobs that start its execution in this invocation, by priority
+        jobs_to_start: List[int] = []
+
+        while True:
+            # Remove the jobs that have finished, missed its deadline or are in execution from the head of the heap
+            while len(self.waiting_jobs_heap) > 0 and (self.waiting_jobs_heap[0][2] not in active_jobs_priority or
+                                                       self.waiting_jobs_heap[0][2] in running_jobs):
+                heapq.heappop(self.waiting_jobs_heap)
+
+            if len(self.waiting_jobs_heap) == 0:
+                break
+
+            deadline, activation_order, job_id = self.waiting_jobs_heap[0]
+
+            if len(running_jobs) < len(self.cpus):
+                # Execute it in a free CPU
+                heapq.heappop(self.waiting_jobs_heap)
+                heapq.heappush(running_jobs_heap, (-deadline, -activation_order, job_id))
+            elif deadline < -running_jobs_heap[0][0]:
+                # Preempt the job in execution with the latest deadline. Between jobs with the same deadline, the one
+                # in execution is kept
+                heapq.heappop(self.waiting_jobs_heap)
+                _, _, preempted_job_id = heapq.heapreplace(running_jobs_heap, (-deadline, -activation_order, job_id))
+                running_jobs.remove(preempted_job_id)
+                heapq.heappush(self.waiting_jobs_heap, (*active_jobs_priority[preempted_job_id], preempted_job_id))
+            else:
+                break
+
+            running_jobs.add(job_id)
+            jobs_to_start.append(job_id)
+
+        self.running_jobs = running_jobs
+
+        # Do affinity to avoid preemptions
+        jobs_running = {i: j for (i, j) in jobs_being_executed_id.items() if j in running_jobs}
+
+        remaining_cpus = [i for i in self.cpus if i not in jobs_running.keys()]
+
+        jobs_running.update({i: j for (i, j) in zip(remaining_cpus, jobs_to_start)})
+
+        return jobs_running
+
+
+class SCEDF(CentralizedScheduler):
+    """
+    Implements the Clustered Earliest Deadline First Scheduler (C-EDF)
+
+    The CPUs are grouped in clusters of consecutive CPUs with the same size, and the tasks are partitioned between the
+    clusters with a bin packing based partition algorithm, using the density of each task. The jobs of each cluster are
+    scheduled by global EDF inside it, with a heap of waiting jobs by cluster. Only the clusters with events since the
+    last invocation are scheduled again, so each decision costs O(c log(n)) with c CPUs and n active jobs in the
+    clusters with events.
+
+    The partition only checks that the density of the tasks of each cluster doesn't exceed its number of CPUs, that is
+    a sufficient schedulability condition only with clusters of one CPU (partitioned EDF)
+    """
+
+    def __init__(self, activate_debug: bool, cluster_size: int,
+                 partition_algorithm: Optional[AbstractBPPBasedPartitionAlgorithm] = None):
+        """
+        Create a clustered EDF scheduler instance
+
+        :param activate_debug:  True if want to communicate the scheduler to be in debug mode
+        :param cluster_size: Number of CPUs of each cluster. It must divide the number of CPUs
+        :param partition_algorithm: Algorithm used to partition the tasks between the clusters. If None, the best fit
+         descendant algorithm is used
+        """
+        super().__init__(activate_debug)
+        self.__cluster_size = cluster_size
+        self.__partition_algorithm = partition_algorithm if partition_algorithm is not None \
+            else BestFitDescendantBPPBasedPartitionAlgorithm()
+
+        self.__clusters: List[_EDFCluster] = []
+        self.__tasks_cluster: Dict[int, int] = {}
+        self.__tasks_relative_deadline: Dict[int, float] = {}
+        self.__active_jobs_priority: Dict[int, Tuple[float, int]] = {}
+        self.__jobs_cluster: Dict[int, int] = {}
+
+        # Number of jobs activated, used to order the jobs with the same deadline by activation
+        self.__number_of_activated_jobs = 0
+
+        # Clusters with events since the last invocation
+        self.__clusters_to_schedule: Set[int] = set()
+
+    def __obtain_partition(self, processor_definition: Processor, task_set: TaskSet) -> Optional[List[Set[int]]]:
+        """
+        Partition the tasks between the clusters at the max available frequency
+
+        :param processor_definition: Specification of the cpu
+        :param task_set: Tasks in the system
+        :return: ID of the tasks of each cluster, or None if the tasks can't be partitioned
+        """
+        frequency = max(Set.intersection(*[i.core_type.available_frequencies for i
+                                           in processor_definition.cores_definition.values()]))
+
+        tasks_density: Dict[int, ImplicitDeadlineTask] = {
+            i.identifier: ImplicitDeadlineTask(i.worst_case_execution_time,
+                                               round(min(i.relative_deadline, i.period) * frequency))
+            for i in task_set.periodic_tasks}
+
+        tasks_density.update({
+            i.identifier: ImplicitDeadlineTask(i.worst_case_execution_time,
+                                               round(min(i.relative_deadline, i.minimum_interarrival_time) * frequency))
+            for i in task_set.sporadic_tasks})
+
+        number_of_clusters = len(processor_definition.cores_definition) // self.__cluster_size
+
+        if len(tasks_density) == 0:
+            return [set() for _ in range(number_of_clusters)]
+
+        packs = self.__partition_algorithm.do_bin_packing(tasks_density, number_of_clusters, self.__cluster_size)
+
+        return packs + [set() for _ in range(number_of_clusters - len(packs))] if packs is not None else None
+
+    def check_schedulability(self, processor_definition: Processor,
+                             environment_specification: Environment, task_set: TaskSet) \
+            -> [bool, Optional[str]]:
+        """
+        Return true if the scheduler can be able to schedule the system. In negative case, it can return a reason.
+        In example, an scheduler that only can work with periodic tasks with phase=0, can return
+         [false, "Only can schedule tasks with phase=0"]
+
+        :param environment_specification: Specification of the environment
+        :param processor_definition: Specification of the cpu
+        :param task_set: Tasks in the system
+        :return CPU frequency
+        """
+        only_fully_preemptive = all(i.preemptive_execution == PreemptiveExecution.FULLY_PREEMPTIVE
+                                    for i in task_set.periodic_tasks + task_set.sporadic_tasks)
+
+        if len(task_set.aperiodic_tasks) != 0 or not only_fully_preemptive:
+            return False, "Error: Only fully preemptive periodic and sporadic tasks are allowed"
+
+        if self.__cluster_size < 1 or len(processor_definition.cores_definition) % self.__cluster_size != 0:
+            return False, "Error: The cluster size must divide the number of CPUs"
+
+        if self.__obtain_partition(processor_definition, task_set) is None:
+            return False, "Error: The tasks can't be partitioned between the clusters"
+
+        return True, None
+
+    def offline_stage(self, processor_definition: Processor,
+                      environment_specification: Environment, task_set: TaskSet) -> int:
+        """
+        Method to implement with the offline stage scheduler tasks
+
+        :param environment_specification: Specification of the environment
+        :param processor_definition: Specification of the cpu
+        :param task_set: Tasks in the system
+        :return CPU frequency
+        """
+        clock_available_frequencies = Set.intersection(*[i.core_type.available_frequencies for i
+                                                         in processor_definition.cores_definition.values()])
+
+        partition = self.__obtain_partition(processor_definition, task_set)
+
+        self.__clusters = [_EDFCluster(list(range(i * self.__cluster_size, (i + 1) * self.__cluster_size)))
+                           for i in range(len(partition))]
+
+        self.__tasks_cluster = {j: i for i, tasks in enumerate(partition) for j in tasks}
+
+        self.__tasks_relative_deadline = {i.identifier: i.relative_deadline for i in
+                                          task_set.periodic_tasks + task_set.sporadic_tasks}
+
+        return max(clock_available_frequencies)
+
+    def schedule_policy(self, global_time: float, active_jobs_id: Set[int],
+                        jobs_being_executed_id: Dict[int, int], cores_frequency: int,
+                        cores_max_temperature: Optional[Dict[int, float]]) \
+            -> Tuple[Dict[int, int], Optional[int], Optional[int]]:
+        """
+        Method to implement with the actual scheduler police
+
+        :param global_time: Time in seconds since the simulation starts
+        :param jobs_being_executed_id: Ids of the jobs that are currently executed on the system. The dictionary has as
+         key the CPU id (it goes from 0 to number of CPUs - 1), and as value the job id.
+        :param active_jobs_id: Identifications of the jobs that are currently active
+         (look in :ref:..system_definition.DeadlineCriteria for more info) and can be executed.
+        :param cores_frequency: Frequencies of cores on the scheduler invocation in Hz.
+        :param cores_max_temperature: Max temperature of each core. The dictionary has as
+         key the CPU id, and as value the temperature in Kelvin degrees.
+        :return: Tuple of [
+         Jobs CPU assignation. The dictionary has as key the CPU id, and as value the job id,
+         Cycles to execute until the next invocation of the scheduler. If None, it won't be executed until a system
+         event trigger its invocation,
+         CPU frequency. If None, it will maintain the last used frequency (cores_frequency)
+        ]
+        """
+        # The clusters without events keep its jobs in execution
+        jobs_running = {i: j for (i, j) in jobs_being_executed_id.items()
+                        if i // self.__cluster_size not in self.__clusters_to_schedule}
+
+        for i in self.__clusters_to_schedule:
+            cluster = self.__clusters[i]
+            jobs_running.update(cluster.schedule({j: jobs_being_executed_id[j] for j in cluster.cpus
+                                                  if j in jobs_being_executed_id}, self.__active_jobs_priority))
+
+        self.__clusters_to_schedule = set()
+
+        return jobs_running, None, None
+
+    def on_major_cycle_start(self, global_time: float) -> bool:
+        """
+        On new major cycle start event
+
+        :param global_time: Time in seconds since the simulation starts
+        :return: true if want to immediately call the scheduler (schedule_policy method), false otherwise
+        """
+        return False
+
+    def on_jobs_activation(self, global_time: float, activation_time: float,
+                           jobs_id_tasks_ids: List[Tuple[int, int]]) -> bool:
+        """
+        Method to implement with the actual on job activation scheduler police.
+        This method is the recommended place to detect the arrival of an aperiodic or sporadic task.
+
+        :param jobs_id_tasks_ids: List[Identification of the job that have been activated,
+         Identification of the task which job have been activated]
+        :param global_time: Actual time in seconds since the simulation starts
+        :param activation_time: Time where the activation was produced (It can be different from the global_time in the
+         case that it doesn't adjust to a cycle end)
+        :return: true if want to immediately call the scheduler (schedule_policy method), false otherwise
+        """
+        for i, j in jobs_id_tasks_ids:
+            cluster_id = self.__tasks_cluster[j]
+            self.__active_jobs_priority[i] = (self.__tasks_relative_deadline[j] + activation_time,
+                                              self.__number_of_activated_jobs)
+            self.__jobs_cluster[i] = cluster_id
+            heapq.heappush(self.__clusters[cluster_id].waiting_jobs_heap, (*self.__active_jobs_priority[i], i))
+            self.__clusters_to_schedule.add(cluster_id)
+            self.__number_of_activated_jobs += 1
+        return True
+
+    def __remove_jobs(self, jobs_id: List[int]):
+        """
+        Remove jobs that are no longer active
+
+        :param jobs_id: Identification of the jobs
+        """
+        for i in jobs_id:
+            cluster_id = self.__jobs_cluster.pop(i)
+            del self.__active_jobs_priority[i]
+            self.__clusters[cluster_id].running_jobs.discard(i)
+            self.__clusters_to_schedule.add(cluster_id)
+
+    def on_jobs_deadline_missed(self, global_time: float, jobs_id: List[int]) -> bool:
+        """
+         Method to implement with the actual on aperiodic arrive scheduler police
+
+         :param jobs_id: Identification of the jobs that have missed the deadline
+         :param global_time: Time in seconds since the simulation starts
+         :return: true if want to immediately call the scheduler (schedule_policy method), false otherwise
+         """
+        self.__remove_jobs(jobs_id)
+        return True
+
+    def on_job_execution_finished(self, global_time: float, jobs_id: List[int]) -> bool:
+        """
+        Method to implement with the actual on aperiodic arrive scheduler police
+
+        :param jobs_id: Identification of the job that have finished its execution
+        :param global_time: Time in seconds since the simulation starts
+        :return: true if want to immediately call the scheduler (schedule_policy method), false otherwise
+        """
+        self.__remove_jobs(jobs_id)
+        return True
@@ -5,6 +5,16 @@ Clustered Allocation and Execution Control Scheduler (CALECS)
 
 This module provides the following class:
 - :class:`CALECSScheduler`
+
+It also exposes the bin packing based partition algorithms used by the scheduler:
+- :class:`AbstractBPPBasedPartitionAlgorithm`
+- :class:`WorstFitBPPBasedPartitionAlgorithm`
+- :class:`WorstFitDescendantBPPBasedPartitionAlgorithm`
+- :class:`BestFitBPPBasedPartitionAlgorithm`
+- :class:`BestFitDescendantBPPBasedPartitionAlgorithm`
 """
 
+from ._bpp_based_algorithms import AbstractBPPBasedPartitionAlgorithm, WorstFitBPPBasedPartitionAlgorithm, \
+    WorstFitDescendantBPPBasedPartitionAlgorithm, BestFitBPPBasedPartitionAlgorithm, \
+    BestFitDescendantBPPBasedPartitionAlgorithm
 from ._scheduler_definition import SCALECS
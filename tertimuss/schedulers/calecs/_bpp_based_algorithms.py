@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from typing import Dict, Set, Tuple, List
+from typing import Dict, Set, Tuple, List, Optional
 
 from ._task import ImplicitDeadlineTask
 from ...simulation_lib.math_utils import list_int_lcm
@@ -54,6 +54,26 @@ class AbstractBPPBasedPartitionAlgorithm(object):
 
         return clusters
 
+    def do_bin_packing(self, task_set: Dict[int, ImplicitDeadlineTask], number_of_bins: int,
+                       cpus_per_bin: int) -> Optional[List[Set[int]]]:
+        """
+        Pack the task set in bins with the capacity of a number of cpus
+        :param task_set: Task set to pack
+        :param number_of_bins: Max number of bins
+        :param cpus_per_bin: Number of cpus of each bin
+        :return: ID of the tasks in each non empty bin, or None if the task set doesn't fit in the bins
+        """
+        if any(i.c > i.d for i in task_set.values()):
+            return None
+
+        major_cycle = list_int_lcm([i.d for i in task_set.values()])
+
+        packs: List[Set[int]] = [i for i in self._do_bpp_strategy({i: j.c * (major_cycle // j.d)
+                                                                     for i, j in task_set.items()},
+                                                                    major_cycle * cpus_per_bin) if len(i) > 0]
+
+        return packs if len(packs) <= number_of_bins else None
+
     @abstractmethod
     def _do_bpp_strategy(self, objects_size: Dict[int, int], bin_size: int) -> List[Set[int]]:
         """
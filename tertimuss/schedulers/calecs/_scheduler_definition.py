@@ -4,14 +4,14 @@ from ._bpp_based_algorithms import BestFitDescendantBPPBasedPartitionAlgorithm
 from ._edf import obtain_edf_cyclic_executive
 from ._task import ImplicitDeadlineTask
 from tertimuss.simulation_lib.math_utils import list_int_lcm
-from tertimuss.simulation_lib.schedulers_definition import CentralizedScheduler
+from tertimuss.simulation_lib.schedulers_definition import CyclicExecutiveScheduler, CyclicExecutiveTable
 from tertimuss.simulation_lib.system_definition import Processor, Environment, TaskSet, \
     Core, CoreModel, PreemptiveExecution
 from ..alecs import SALECS
 from ...simulation_lib.system_definition.utils import calculate_major_cycle
 
 
-class SCALECS(CentralizedScheduler):
+class SCALECS(CyclicExecutiveScheduler):
     """
        Implements the Clustered Allocation and Execution Control Scheduler (CALECS)
 
@@ -30,7 +30,7 @@ class SCALECS(CentralizedScheduler):
         super().__init__(activate_debug)
 
         # Declare class variables
-        self.__scheduling_points: Dict[int, Dict[int, int]] = {}
+        self.__scheduling_table: CyclicExecutiveTable = CyclicExecutiveTable({}, 0, 0)
         self.__major_cycle: float = 0
         self.__task_to_job: Dict[int, int] = {}
 
@@ -45,6 +45,14 @@ class SCALECS(CentralizedScheduler):
         """
         return self.__clusters_obtained
 
+    def get_scheduling_table(self) -> CyclicExecutiveTable:
+        """
+        Return the table with the calculated scheduling points
+
+        :return: scheduling table
+        """
+        return self.__scheduling_table
+
     def check_schedulability(self, processor_definition: Processor,
                              environment_specification: Environment, task_set: TaskSet) -> [bool,
                                                                                             Optional[str]]:
@@ -212,6 +220,8 @@ class SCALECS(CentralizedScheduler):
 
         last_scheduling_point = [{} for _ in range(len(clusters_scheduling_points))]
 
+        scheduling_points: Dict[int, Dict[int, int]] = {}
+
         for i in sorted(scheduling_points_global):
             # Update last scheduling points
             for j, k in enumerate(clusters_scheduling_points):
@@ -223,7 +233,9 @@ class SCALECS(CentralizedScheduler):
             for j in last_scheduling_point:
                 actual_scheduling_point.update(j)
 
-            self.__scheduling_points[i] = actual_scheduling_point
+            scheduling_points[i] = actual_scheduling_point
+
+        self.__scheduling_table = CyclicExecutiveTable(scheduling_points, m, round(major_cycle * f_star_hz))
 
         return f_star_hz
 
@@ -251,10 +263,9 @@ class SCALECS(CentralizedScheduler):
         """
         actual_execution_cycle = round(global_time * cores_frequency) % round(self.__major_cycle * cores_frequency)
 
-        next_scheduling_point = next(i for i in sorted(self.__scheduling_points.keys()) +
-                                     [round(self.__major_cycle * cores_frequency)] if i > actual_execution_cycle)
+        assignation, next_scheduling_point = self.__scheduling_table.obtain_assignation(actual_execution_cycle)
 
-        return ({k: self.__task_to_job[v] for k, v in self.__scheduling_points[actual_execution_cycle].items()},
+        return ({k: self.__task_to_job[v] for k, v in assignation.items()},
                 next_scheduling_point - actual_execution_cycle, None)
 
     def on_jobs_activation(self, global_time: float, activation_time: float,
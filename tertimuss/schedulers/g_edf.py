@@ -7,6 +7,7 @@ This module provides the following class:
 - :class:`GEDFScheduler`
 """
 
+import heapq
 from typing import Dict, Optional, Set, List, Tuple
 
 from ..simulation_lib.schedulers_definition import CentralizedScheduler
@@ -16,6 +17,10 @@ from ..simulation_lib.system_definition import Processor, Environment, TaskSet
 class SGEDF(CentralizedScheduler):
     """
     Implements the Global Earliest Deadline First Scheduler (G-EDF)
+
+    The jobs that aren't in execution are kept in a heap ordered by absolute deadline (and activation order between
+    jobs with the same deadline), updated in each event. In each invocation the jobs in execution are only replaced by
+    the ones in the head of the heap, so each decision costs O(m log(n)) with m CPUs and n active jobs
     """
 
     def __init__(self, activate_debug: bool):
@@ -26,7 +31,17 @@ class SGEDF(CentralizedScheduler):
         super().__init__(activate_debug)
         self.__m = 0
         self.__tasks_relative_deadline: Dict[int, float] = {}
-        self.__active_jobs_priority: Dict[int, float] = {}
+        self.__active_jobs_priority: Dict[int, Tuple[float, int]] = {}
+
+        # Number of jobs activated, used to order the jobs with the same deadline by activation
+        self.__number_of_activated_jobs = 0
+
+        # Heap of (absolute deadline, activation order, job id) of the jobs that aren't in execution. Jobs that have
+        # finished or missed its deadline are removed when they reach the head
+        self.__waiting_jobs_heap: List[Tuple[float, int, int]] = []
+
+        # Jobs selected for execution in the last invocation
+        self.__running_jobs: Set[int] = set()
 
     def check_schedulability(self, processor_definition: Processor,
                              environment_specification: Environment, task_set: TaskSet) \
@@ -88,45 +103,59 @@ class SGEDF(CentralizedScheduler):
          CPU frequency. If None, it will maintain the last used frequency (cores_frequency)
         ]
         """
-        # The priority of the tasks must be inverse to the deadline
-        tasks_that_can_be_executed: List[Tuple[int, float]] = sorted([i for i in self.__active_jobs_priority.items()],
-                                                                     key=lambda j: j[1])
-
-        if len(tasks_that_can_be_executed) <= self.__m:
-            # All tasks will be executed
-            tasks_to_execute = [i for (i, j) in tasks_that_can_be_executed]
-        else:
-            # Tasks that will be executed because have height priority
-            tasks_to_execute_height_priority = [i for (i, j) in tasks_that_can_be_executed if
-                                                j < tasks_that_can_be_executed[self.__m - 1][1]]
-
-            # Tasks with middle priority to execute
-            tasks_to_execute_middle_priority = [i for (i, j) in tasks_that_can_be_executed if
-                                                j == tasks_that_can_be_executed[self.__m - 1][
-                                                    1] and i in jobs_being_executed_id.values()]
-
-            # Tasks with lowest priority to execute
-            tasks_to_execute_lowest_priority = [i for (i, j) in tasks_that_can_be_executed if
-                                                j == tasks_that_can_be_executed[self.__m - 1][
-                                                    1] and i not in jobs_being_executed_id.values()]
-
-            if len(tasks_to_execute_height_priority) + len(tasks_to_execute_middle_priority) <= self.__m:
-                tasks_to_execute = tasks_to_execute_height_priority + tasks_to_execute_middle_priority \
-                                   + tasks_to_execute_lowest_priority[0: self.__m -
-                                                                         (len(tasks_to_execute_height_priority) +
-                                                                          len(tasks_to_execute_middle_priority))]
+        # Jobs in execution that are still active. The ones preempted since the last invocation wait again
+        running_jobs = {i for i in jobs_being_executed_id.values() if i in self.__active_jobs_priority}
+
+        for i in self.__running_jobs - running_jobs:
+            if i in self.__active_jobs_priority:
+                heapq.heappush(self.__waiting_jobs_heap, (*self.__active_jobs_priority[i], i))
+
+        # Max heap of the jobs in execution
+        running_jobs_heap = [(-self.__active_jobs_priority[i][0], -self.__active_jobs_priority[i][1], i)
+                             for i in running_jobs]
+        heapq.heapify(running_jobs_heap)
+
+        # Jobs that start its execution in this invocation, by priority
+        jobs_to_start: List[int] = []
+
+        while True:
+            # Remove the jobs that have finished, missed its deadline or are in execution from the head of the heap
+            while len(self.__waiting_jobs_heap) > 0 and (
+                    self.__waiting_jobs_heap[0][2] not in self.__active_jobs_priority or
+                    self.__waiting_jobs_heap[0][2] in running_jobs):
+                heapq.heappop(self.__waiting_jobs_heap)
+
+            if len(self.__waiting_jobs_heap) == 0:
+                break
+
+            deadline, activation_order, job_id = self.__waiting_jobs_heap[0]
+
+            if len(running_jobs) < self.__m:
+                # Execute it in a free CPU
+                heapq.heappop(self.__waiting_jobs_heap)
+                heapq.heappush(running_jobs_heap, (-deadline, -activation_order, job_id))
+            elif deadline < -running_jobs_heap[0][0]:
+                # Preempt the job in execution with the latest deadline. Between jobs with the same deadline, the one
+                # in execution is kept
+                heapq.heappop(self.__waiting_jobs_heap)
+                _, _, preempted_job_id = heapq.heapreplace(running_jobs_heap, (-deadline, -activation_order, job_id))
+                running_jobs.remove(preempted_job_id)
+                heapq.heappush(self.__waiting_jobs_heap, (*self.__active_jobs_priority[preempted_job_id],
+                                                          preempted_job_id))
             else:
-                tasks_to_execute = tasks_to_execute_height_priority + tasks_to_execute_middle_priority[
-                                                                      0: self.__m - len(
-                                                                          tasks_to_execute_height_priority)]
+                break
+
+            running_jobs.add(job_id)
+            jobs_to_start.append(job_id)
+
+        self.__running_jobs = running_jobs
 
         # Do affinity to avoid preemptions (migrations not taking in count)
-        jobs_running = {i: j for (i, j) in jobs_being_executed_id.items() if j in tasks_to_execute}
+        jobs_running = {i: j for (i, j) in jobs_being_executed_id.items() if j in running_jobs}
 
-        remaining_tasks_to_execute = [i for i in tasks_to_execute if i not in jobs_running.values()]
         remaining_cpus = [i for i in range(self.__m) if i not in jobs_running.keys()]
 
-        jobs_running.update({i: j for (i, j) in zip(remaining_cpus, remaining_tasks_to_execute)})
+        jobs_running.update({i: j for (i, j) in zip(remaining_cpus, (k for k in jobs_to_start if k in running_jobs))})
 
         return jobs_running, None, None
 
@@ -152,8 +181,11 @@ class SGEDF(CentralizedScheduler):
          case that it doesn't adjust to a cycle end)
         :return: true if want to immediately call the scheduler (schedule_policy method), false otherwise
         """
-        self.__active_jobs_priority.update(
-            {i: self.__tasks_relative_deadline[j] + activation_time for i, j in jobs_id_tasks_ids})
+        for i, j in jobs_id_tasks_ids:
+            self.__active_jobs_priority[i] = (self.__tasks_relative_deadline[j] + activation_time,
+                                              self.__number_of_activated_jobs)
+            heapq.heappush(self.__waiting_jobs_heap, (*self.__active_jobs_priority[i], i))
+            self.__number_of_activated_jobs += 1
         return True
 
     def on_jobs_deadline_missed(self, global_time: float, jobs_id: List[int]) -> bool:
@@ -166,6 +198,7 @@ class SGEDF(CentralizedScheduler):
          """
         for i in jobs_id:
             del self.__active_jobs_priority[i]
+            self.__running_jobs.discard(i)
         return True
 
     def on_job_execution_finished(self, global_time: float, jobs_id: List[int]) -> bool:
@@ -178,4 +211,5 @@ class SGEDF(CentralizedScheduler):
         """
         for i in jobs_id:
             del self.__active_jobs_priority[i]
+            self.__running_jobs.discard(i)
         return True
@@ -8,7 +8,7 @@ import scipy.sparse.linalg
 import scipy.linalg
 import scipy.optimize
 
-from tertimuss.tcpn_simulator import SVSRungeKutta
+from tertimuss.tcpn_simulator import SFSOperator
 from tertimuss.simulation_lib.math_utils import list_float_lcm, list_int_gcd
 from ._system_tcpn_model import ThermalModelSelector, TasksModel, ProcessorModel, ThermalModelFrequencyAware, \
     ThermalModelEnergy
@@ -44,6 +44,10 @@ class SOLDTFS(CentralizedScheduler):
         self.__tcpn_simulator = None
         self.__tcpn_mo = None
         self.__tcpn_lambda_len = None
+        self.__m_busy_places = None
+        self.__m_exec_places = None
+        self.__idle_places = None
+        self.__eta = None
 
         # Scheduler specific parameters
         self.__simulate_thermal = simulate_thermal
@@ -290,9 +294,11 @@ class SOLDTFS(CentralizedScheduler):
                                                                                           scipy.sparse.csr_matrix,
                                                                                           scipy.sparse.csr_matrix,
                                                                                           numpy.ndarray,
-                                                                                          numpy.ndarray]:
+                                                                                          numpy.ndarray, float]:
         """
         Create a TCPN model for tasks and processors
+
+        :return: pre, post, pi, lambda and initial marking of the TCPN, and eta of the processor model
         """
         # As the scheduler only accepts periodic tasks, it is not necessary to include aperiodic tasks in the TCPN
         # model of the scheduler
@@ -344,7 +350,7 @@ class SOLDTFS(CentralizedScheduler):
 
         mo = numpy.block([[tasks_model.mo_tau], [processor_model.mo_proc]])
 
-        return pre, post, pi, lambda_vector, mo
+        return pre, post, pi, lambda_vector, mo, processor_model.eta
 
     def offline_stage(self, cpu_specification: Processor,
                       environment_specification: Environment, task_set: TaskSet) -> int:
@@ -392,16 +398,29 @@ class SOLDTFS(CentralizedScheduler):
         deadline_set = numpy.union1d(deadline_set, [0])
 
         # TCPN processor and tasks simulator that the scheduler needs to work
-        tcpn_pre, tcpn_post, tcpn_pi, tcpn_lambda, tcpn_mo = self.__obtain_tasks_processors_tcpn_model(
+        tcpn_pre, tcpn_post, tcpn_pi, tcpn_lambda, tcpn_mo, eta = self.__obtain_tasks_processors_tcpn_model(
             cpu_specification, task_set, self.__simulation_precision)
 
-        self.__tcpn_simulator = SVSRungeKutta(tcpn_pre,
-                                              tcpn_post,
-                                              tcpn_lambda,
-                                              tcpn_pi,
-                                              True)
+        # The control is constant during each cycle, and each cycle advances one quantum in the TCPN. The operator
+        # that advances one cycle is only calculated once for each control pattern
+        self.__tcpn_simulator = SFSOperator(tcpn_pre,
+                                            tcpn_post,
+                                            tcpn_lambda,
+                                            tcpn_pi,
+                                            quantum,
+                                            "EXPONENTIAL",
+                                            True)
         self.__tcpn_lambda_len = tcpn_lambda.shape[0]
 
+        # Places of the marks m_busy and m_exec of each task-processor pair
+        self.__m_busy_places = numpy.concatenate([numpy.arange(2 * n + (2 * n + 1) * i, 2 * n + (2 * n + 1) * i + n)
+                                                  for i in range(m)])
+        self.__m_exec_places = self.__m_busy_places + n
+
+        # Place of the idle mark of each processor
+        self.__idle_places = numpy.asarray([2 * n + (2 * n + 1) * i + 2 * n for i in range(m)])
+        self.__eta = eta
+
         # Set of deadlines
         self.__set_of_deadlines = deadline_set[1:]
 
@@ -419,6 +438,112 @@ class SOLDTFS(CentralizedScheduler):
 
         return max(common_core_specification.available_frequencies)
 
+    def __obtain_sliding_surface(self, mo: numpy.ndarray, time: float) -> numpy.ndarray:
+        """
+        Obtain the sliding surface of each task-processor pair
+
+        :param mo: marking of the TCPN
+        :param time: actual time
+        :return: sliding surface
+        """
+        # Obtain the thermal fluid execution error
+        e_i_fsc_j = self.__j_fsc_i * time - mo[self.__m_exec_places]
+
+        # Change of variable
+        x1 = e_i_fsc_j
+        x2 = mo[self.__m_busy_places]
+
+        # Sliding surface
+        return x1 - x2 + self.__j_fsc_i
+
+    def __obtain_sliding_surface_sign(self, mo: numpy.ndarray, time: float) -> numpy.ndarray:
+        """
+        Obtain the sign of the sliding surface of each task-processor pair
+
+        :param mo: marking of the TCPN
+        :param time: actual time
+        :return: sign of the sliding surface
+        """
+        return numpy.sign(self.__obtain_sliding_surface(mo, time))
+
+    def __obtain_cycles_with_sign_kept(self, mo: numpy.ndarray, sliding_surface_sign: numpy.ndarray, time: float,
+                                       cores_frequency: int) -> float:
+        """
+        Obtain a number of cycles after the actual one where the sign of the sliding surface is sure to be kept with
+        the control of the sign, without simulating them.
+
+        With a constant control, the mark of the idle place of each processor goes monotonically from its actual
+        value to its equilibrium, so it is bounded by the largest of both. In each cycle m_exec + m_busy of a pair
+        increases between 0 and eta * w_alloc * quantum times that bound, while J * t increases J / f. The sliding
+        surface of each pair can't reach zero before it has changed by its actual value
+
+        :param mo: marking of the TCPN
+        :param sliding_surface_sign: sign of the sliding surface that gives the control
+        :param time: actual time
+        :param cores_frequency: frequency of the cores
+        :return: number of cycles, infinite if the sign is kept for ever
+        """
+        sliding_surface = self.__obtain_sliding_surface(mo, time)
+
+        # Control for each task-processor pair, and by processor
+        w_alloc = (self.__j_fsc_i * sliding_surface_sign + self.__j_fsc_i) / 2
+        w_processor = w_alloc.reshape(self.__m, self.__n).sum(axis=1)
+
+        # The idle mark plus eta times the busy marks of a processor is constant
+        idle = mo[self.__idle_places]
+        idle_invariant = idle + self.__eta * mo[self.__m_busy_places].reshape(self.__m, self.__n).sum(axis=1)
+        idle_equilibrium = idle_invariant / (1 + self.__eta * w_processor)
+        idle_bound = numpy.repeat(numpy.maximum(idle, idle_equilibrium), self.__n)
+
+        # Maximum decrease and increase of the sliding surface in a cycle
+        max_decrease = self.__eta * w_alloc * self.__quantum * idle_bound - self.__j_fsc_i / cores_frequency
+        max_increase = self.__j_fsc_i / cores_frequency
+
+        speed_to_zero = numpy.where(sliding_surface > 0, max_decrease,
+                                    numpy.where(sliding_surface < 0, max_increase,
+                                                numpy.maximum(max_decrease, max_increase)))
+
+        cycles = numpy.full(sliding_surface.shape, numpy.inf)
+        approaching = speed_to_zero > 0
+        cycles[approaching] = numpy.ceil(numpy.abs(sliding_surface[approaching]) / speed_to_zero[approaching]) - 1
+
+        return max(numpy.min(cycles), 0) if len(cycles) > 0 else numpy.inf
+
+    def __simulate_while_sign_is_kept(self, mo: numpy.ndarray, sliding_surface_sign: numpy.ndarray, time: float,
+                                      cores_frequency: int, max_steps: int) -> Tuple[int, numpy.ndarray]:
+        """
+        Simulate the TCPN with the actual control until the sign of the sliding surface changes, which is the next
+        cycle where the control changes.
+
+        The cycles where the sign is sure to be kept are simulated at once, and the sign is checked in every other
+        cycle, so a sign that changes and recovers is also found
+
+        :param mo: marking of the TCPN at the start of the interval
+        :param sliding_surface_sign: sign of the sliding surface at the start of the interval
+        :param time: time at the start of the interval
+        :param cores_frequency: frequency of the cores
+        :param max_steps: maximum number of cycles to simulate
+        :return: number of simulated cycles, and marking at the end of them
+        """
+        steps, mo_steps = 0, mo
+
+        while steps < max_steps:
+            cycles_with_sign_kept = self.__obtain_cycles_with_sign_kept(mo_steps, sliding_surface_sign,
+                                                                        time + steps / cores_frequency,
+                                                                        cores_frequency)
+
+            # The sign after the last cycle doesn't matter
+            steps_to_simulate = int(min(max(cycles_with_sign_kept, 1), max_steps - steps))
+            mo_steps = self.__tcpn_simulator.simulate_steps(mo_steps, steps_to_simulate)
+            steps += steps_to_simulate
+
+            if steps < max_steps and not numpy.array_equal(
+                    self.__obtain_sliding_surface_sign(mo_steps, time + steps / cores_frequency),
+                    sliding_surface_sign):
+                return steps, mo_steps
+
+        return steps, mo_steps
+
     def schedule_policy(self, global_time: float, active_jobs_id: Set[int],
                         jobs_being_executed_id: Dict[int, int], cores_frequency: int,
                         cores_max_temperature: Optional[Dict[int, float]]) \
@@ -433,45 +558,29 @@ class SOLDTFS(CentralizedScheduler):
         # Sliding mode control
         steps_in_quantum = int(round(self.__quantum * cores_frequency))
 
-        for q_time in range(steps_in_quantum):
-            # Obtain m_busy mark
-            m_busy = numpy.concatenate([
-                self.__tcpn_mo[
-                2 * self.__n + (2 * self.__n + 1) * i: 2 * self.__n + (2 * self.__n + 1) * i + self.__n].reshape(-1) for
-                i in range(self.__m)])
-
-            # Obtain m_exec mark
-            m_exec = numpy.concatenate([
-                self.__tcpn_mo[
-                2 * self.__n + (2 * self.__n + 1) * i + self.__n: 2 * self.__n + (
-                        2 * self.__n + 1) * i + 2 * self.__n].reshape(-1) for i in range(self.__m)])
-
-            # Obtain the thermal fluid execution error
-            e_i_fsc_j = self.__j_fsc_i * (global_time + (q_time / cores_frequency)) - m_exec
-
-            # Change of variable
-            x1 = e_i_fsc_j
-            x2 = m_busy
-
-            # Sliding surface
-            s = x1 - x2 + self.__j_fsc_i
+        q_time = 0
+        while q_time < steps_in_quantum:
+            # The control is constant until the sign of the sliding surface changes
+            sliding_surface_sign = self.__obtain_sliding_surface_sign(self.__tcpn_mo,
+                                                                      global_time + (q_time / cores_frequency))
 
             # Control for each task-processor pair
-            w_alloc = (self.__j_fsc_i * numpy.asarray([numpy.sign(i) for i in s]) + self.__j_fsc_i) / 2
+            w_alloc = (self.__j_fsc_i * sliding_surface_sign + self.__j_fsc_i) / 2
 
-            # Simulate TCPN
             new_control = numpy.ones(self.__tcpn_lambda_len)
             new_control[self.__n:self.__n + self.__m * self.__n] = w_alloc
 
             self.__tcpn_simulator.set_control(new_control)
-            self.__tcpn_mo = self.__tcpn_simulator.simulate_step(self.__tcpn_mo, dt=self.__quantum)
+
+            steps_with_control, self.__tcpn_mo = self.__simulate_while_sign_is_kept(
+                self.__tcpn_mo, sliding_surface_sign, global_time + (q_time / cores_frequency), cores_frequency,
+                steps_in_quantum - q_time)
+
+            q_time += steps_with_control
 
         # Discretization
         # Obtain m_exec mark
-        m_exec = numpy.concatenate([
-            self.__tcpn_mo[
-            2 * self.__n + (2 * self.__n + 1) * i + self.__n: 2 * self.__n + (
-                        2 * self.__n + 1) * i + 2 * self.__n].reshape(-1) for i in range(self.__m)])
+        m_exec = self.__tcpn_mo[self.__m_exec_places]
 
         # Remaining jobs execution Re_tau(j,i) calculation
         fsc = self.__j_fsc_i * actual_deadline
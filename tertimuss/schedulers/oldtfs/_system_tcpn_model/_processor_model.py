@@ -87,3 +87,6 @@ class ProcessorModel(object):
         self.post_exec_proc: scipy.sparse.csr_matrix = post_exec.tocsr()
         self.pi_exec_proc: scipy.sparse.csr_matrix = pi_exec.tocsr()
         self.lambda_vector_exec_proc = lambda_vector_exec
+
+        # Rate of the exec transitions, and tokens of the idle place taken by each alloc transition firing
+        self.eta = eta
@@ -0,0 +1,32 @@
+"""
+=====================================================
+Partitioned Earliest Deadline First Scheduler (P-EDF)
+=====================================================
+
+This module provides the following class:
+- :class:`SPEDF`
+"""
+
+from typing import Optional
+
+from .c_edf import SCEDF
+from .calecs import AbstractBPPBasedPartitionAlgorithm
+
+
+class SPEDF(SCEDF):
+    """
+    Implements the Partitioned Earliest Deadline First Scheduler (P-EDF)
+
+    The tasks are partitioned between the CPUs with a bin packing based partition algorithm, and the jobs of each CPU
+    are scheduled by EDF without migrations. It is a clustered EDF with clusters of one CPU
+    """
+
+    def __init__(self, activate_debug: bool, partition_algorithm: Optional[AbstractBPPBasedPartitionAlgorithm] = None):
+        """
+        Create a partitioned EDF scheduler instance
+
+        :param activate_debug:  True if want to communicate the scheduler to be in debug mode
+        :param partition_algorithm: Algorithm used to partition the tasks between the CPUs. If None, the best fit
+         descendant algorithm is used
+        """
+        super().__init__(activate_debug, 1, partition_algorithm)
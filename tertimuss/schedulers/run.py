@@ -7,12 +7,13 @@ This module provides the following class:
 - :class:`RUNScheduler`
 """
 
+import heapq
 from typing import Set, Dict, Optional, Tuple, List
 
 import numpy
 
 from tertimuss.simulation_lib.math_utils import list_int_gcd, list_int_lcm
-from tertimuss.simulation_lib.schedulers_definition import CentralizedScheduler
+from tertimuss.simulation_lib.schedulers_definition import CyclicExecutiveScheduler, CyclicExecutiveTable
 from tertimuss.simulation_lib.system_definition import Processor, Environment, TaskSet, \
     PreemptiveExecution
 from tertimuss.simulation_lib.system_definition.utils import calculate_major_cycle
@@ -118,128 +119,181 @@ def _create_recursive_tree(packs: List[_RUNServer]) -> List[_RUNPack]:
         return tree_parents
 
 
-def _update_virtual_task_info(children: List[_RUNServer], actual_time_cycles: int):
-    for i in children:
-        if i.next_arrive <= actual_time_cycles:
-            # We need update the task info
-            i.pending_c = i.c
-            i.next_arrive = i.next_arrive + i.d
-            i.pending_laxity = i.laxity
-
-        if isinstance(i, _RUNPack):
-            _update_virtual_task_info(i.content, actual_time_cycles)
-
-
 def _create_tree(tasks: List[_RUNTask]) -> List[_RUNPack]:
     parents = _create_recursive_tree(tasks)
     return parents
 
 
-def _count_tree_levels(parent: _RUNPack) -> int:
+class _RUNFlattenedTree(object):
     """
-    Return the number of levels including the root
-    :param parent:
-    :return:
-    """
-    count = 1
-    actual_parent = parent
-    while not isinstance(actual_parent, _RUNTask):
-        actual_parent = actual_parent.content[0]
-        count += 1
-    return count
-
-
-def _edf_server_tasks_selection(previous_dual_selection: List[_RUNPack], selecting_servers: bool) -> List[_RUNServer]:
-    selection = []
-
-    for server in previous_dual_selection:
-        children_with_time_to_execute = [i for i in server.content if (i.pending_laxity > 0 and selecting_servers) or (
-                i.pending_c > 0 and not selecting_servers)]
-        if len(children_with_time_to_execute) != 0:
-            # Order the tasks by the EDF criteria
-            # Sort packs in ascendant order of arrive
-            children_with_time_to_execute.sort(key=lambda x: x.next_arrive, reverse=False)
-            selected_next_arrive = children_with_time_to_execute[0].next_arrive
+    Reduction tree of a root server flattened by levels.
 
-            # If there are several tasks with the same priority, the last executed is selected to decrease context
-            # changes
-            children_with_highest_priority = [i for i in children_with_time_to_execute if
-                                              i.next_arrive == selected_next_arrive]
-            # Sort packs in descendant order of last execution
-            children_with_highest_priority.sort(key=lambda x: x.last_time_executed_edf, reverse=True)
-
-            # Append to selection the highest priority task
-            selection.append(children_with_highest_priority[0])
-
-    return selection
-
-
-def _select_servers_from_level(level: int, parent: _RUNPack) -> List[_RUNServer]:
-    if level == 0:
-        return [parent]
-    else:
-        to_return = []
-        for i in parent.content:
-            if isinstance(i, _RUNPack):
-                recursive_return = _select_servers_from_level(level - 1, i)
-                to_return = to_return + recursive_return
-            else:
-                to_return = to_return + [i]
-
-        return to_return
+    The servers of each level are stored in depth first order, so the children of a server are contiguous in the next
+    level. Each server keeps a heap with its children ordered by the EDF criteria, and the tree keeps a heap with the
+    next arrival of each server, so the selection of the servers doesn't need to traverse and sort the whole tree
+    """
 
+    def __init__(self, root: _RUNPack):
+        # Servers of each level in depth first order. All the leafs of a root server are in the same level
+        self.__levels: List[List[_RUNServer]] = [[root]]
+
+        # Indexes in the next level of the children of each server of the level [first child, last child + 1)
+        self.__children_range: List[List[Tuple[int, int]]] = []
+
+        while isinstance(self.__levels[-1][0], _RUNPack):
+            next_level: List[_RUNServer] = []
+            children_range: List[Tuple[int, int]] = []
+            for server in self.__levels[-1]:
+                children_range.append((len(next_level), len(next_level) + len(server.content)))
+                next_level.extend(server.content)
+            self.__levels.append(next_level)
+            self.__children_range.append(children_range)
+
+        # Index in the previous level of the parent of each server of the level
+        self.__parents: List[List[int]] = [[]] + [[parent for parent, (first_child, last_child) in enumerate(i)
+                                                   for _ in range(first_child, last_child)]
+                                                  for i in self.__children_range]
+
+        # Each time a server changes its priority or its pending time, its version is increased, and the entries of
+        # the heaps with a previous version are discarded
+        self.__versions: List[List[int]] = [len(i) * [0] for i in self.__levels]
+
+        # Heap of each server with its children as tuples of [next arrive, - last time executed, index, version]
+        self.__edf_heaps: List[List[List[Tuple[int, int, int, int]]]] = [[[] for _ in i] for i in
+                                                                         self.__levels[:-1]]
+
+        for level in range(1, len(self.__levels)):
+            for index in range(len(self.__levels[level])):
+                self.__push_to_parent_heap(level, index)
+
+        # Heap with the next arrive of each server as tuples of [next arrive, level, index]. The root server is not
+        # included because its arrival doesn't change the selection
+        self.__arrivals_heap: List[Tuple[int, int, int]] = [(server.next_arrive, level, index) for level in
+                                                            range(1, len(self.__levels)) for index, server in
+                                                            enumerate(self.__levels[level])]
+        heapq.heapify(self.__arrivals_heap)
+
+        # Servers executed in the last selection as tuples of [server, level, index, True if its laxity is decreased
+        # (otherwise its pending c is decreased), True if it has been selected by EDF]
+        self.__executed_servers: List[Tuple[_RUNServer, int, int, bool, bool]] = []
+
+    def __push_to_parent_heap(self, level: int, index: int):
+        """
+        Push the server in the heap of its parent if it has time to execute
 
-def _dual_server_selection(level: int, parent: _RUNPack, previous_edf_selection: List[_RUNServer]) -> List[_RUNServer]:
-    servers_from_level = _select_servers_from_level(level, parent)
+        :param level: Level of the server
+        :param index: Index of the server in the level
+        """
+        server = self.__levels[level][index]
+        self.__versions[level][index] += 1
 
-    previous_edf_selection_ids = [i.server_id for i in previous_edf_selection]
+        # The tasks are selected if they have pending c, and the servers if they have pending laxity (dual c)
+        if (server.pending_c if level == len(self.__levels) - 1 else server.pending_laxity) > 0:
+            heapq.heappush(self.__edf_heaps[level - 1][self.__parents[level][index]],
+                           (server.next_arrive, -server.last_time_executed_edf, index,
+                            self.__versions[level][index]))
 
-    servers_not_selected_in_edf = [i for i in servers_from_level if i.server_id not in previous_edf_selection_ids]
+    def __edf_selection(self, level: int, dual_selection: List[int]) -> List[int]:
+        """
+        Select by EDF a child of each server
 
-    servers_with_pending_c = [i for i in servers_not_selected_in_edf if i.pending_c > 0]
+        :param level: Level of the servers selected by the dual server
+        :param dual_selection: Index of the servers selected by the dual server
+        :return: Index in the next level of the selected children
+        """
+        selection = []
+        versions = self.__versions[level + 1]
 
-    return servers_with_pending_c
+        for server in dual_selection:
+            heap = self.__edf_heaps[level][server]
 
+            # Discard the outdated entries
+            while len(heap) > 0 and heap[0][3] != versions[heap[0][2]]:
+                heapq.heappop(heap)
 
-def _select_tasks_to_execute_one_parent(parent: _RUNPack, actual_cycle: int) -> List[_RUNTask]:
-    tree_levels = _count_tree_levels(parent)
-    dual_selection = [parent]
-    for level in range(1, tree_levels - 1):
-        # Select servers by EDF
-        edf_selection = _edf_server_tasks_selection(dual_selection, True)
+            # If there are several tasks with the same priority, the last executed is selected to decrease context
+            # changes
+            if len(heap) > 0:
+                selection.append(heap[0][2])
 
-        # Decrease pending dual_c (laxity) of those servers selected by edf
-        for server in edf_selection:
-            server.pending_laxity -= 1
-            server.last_time_executed_edf = actual_cycle + 1
+        return selection
 
-        # Select servers from the set of dual servers previously selected
-        dual_selection = _dual_server_selection(level, parent, edf_selection)
+    def __update_arrivals(self, actual_cycle: int):
+        """
+        Restore the pending time of the servers that arrive in the actual cycle
 
-        # Decrease pending c of those servers selected
-        for server in dual_selection:
-            server.pending_c -= 1
-            server.last_time_executed_dual = actual_cycle + 1
+        :param actual_cycle: Actual cycle
+        """
+        while self.__arrivals_heap[0][0] <= actual_cycle:
+            _, level, index = self.__arrivals_heap[0]
+            server = self.__levels[level][index]
+            server.pending_c = server.c
+            server.next_arrive = server.next_arrive + server.d
+            server.pending_laxity = server.laxity
+            heapq.heapreplace(self.__arrivals_heap, (server.next_arrive, level, index))
+            self.__push_to_parent_heap(level, index)
+
+    def select_tasks_to_execute(self, actual_cycle: int) -> List[_RUNTask]:
+        """
+        Select the tasks to execute in the actual cycle. The selection is executed with execute_selection
 
-    # Select tasks by EDF
-    edf_selection_tasks = _edf_server_tasks_selection(dual_selection, False)
+        :param actual_cycle: Actual cycle
+        :return: Selected tasks
+        """
+        self.__update_arrivals(actual_cycle)
+        self.__executed_servers = []
+
+        dual_selection = [0]
+        for level in range(1, len(self.__levels) - 1):
+            # Select servers by EDF, their pending dual c (laxity) is decreased in the execution
+            edf_selection = self.__edf_selection(level - 1, dual_selection)
+            self.__executed_servers.extend((self.__levels[level][i], level, i, True, True) for i in edf_selection)
+
+            # Select the servers of the level not selected by EDF with pending c, their pending c is decreased
+            edf_selection_set = set(edf_selection)
+            dual_selection = [i for i, server in enumerate(self.__levels[level]) if
+                              server.pending_c > 0 and i not in edf_selection_set]
+            self.__executed_servers.extend((self.__levels[level][i], level, i, False, False) for i in dual_selection)
+
+        # Select tasks by EDF, their pending c is decreased in the execution
+        level = len(self.__levels) - 1
+        edf_selection_tasks = self.__edf_selection(level - 1, dual_selection)
+        self.__executed_servers.extend((self.__levels[level][i], level, i, False, True) for i in edf_selection_tasks)
+
+        # In the leafs of the tree, we must have Tasks
+        return [self.__levels[level][i] for i in edf_selection_tasks]
+
+    def obtain_next_selection_change(self, actual_cycle: int) -> int:
+        """
+        Return the first cycle where the selection can change. The selection only changes when a server arrives or a
+         selected server exhausts its pending c or laxity, because between servers with the same priority EDF keeps the
+         last executed
 
-    # Decrease pending dual_c (laxity) of those servers selected by edf
-    for server in edf_selection_tasks:
-        server.pending_c -= 1
-        server.last_time_executed_edf = actual_cycle + 1
+        :param actual_cycle: Cycle of the last selection
+        :return: cycle
+        """
+        return min([self.__arrivals_heap[0][0]] +
+                   [actual_cycle + (server.pending_laxity if decrease_laxity else server.pending_c)
+                    for server, _, _, decrease_laxity, _ in self.__executed_servers])
 
-    # In the leafs of the tree, we must have Tasks
-    return [i for i in edf_selection_tasks if isinstance(i, _RUNTask)]
+    def execute_selection(self, actual_cycle: int, number_of_cycles: int):
+        """
+        Execute the last selection during a number of cycles
 
+        :param actual_cycle: Cycle of the first execution
+        :param number_of_cycles: Number of cycles to execute
+        """
+        for server, level, index, decrease_laxity, selected_by_edf in self.__executed_servers:
+            if decrease_laxity:
+                server.pending_laxity -= number_of_cycles
+            else:
+                server.pending_c -= number_of_cycles
 
-def _select_tasks_to_execute(parents: List[_RUNPack], actual_cycle: int) -> List[_RUNTask]:
-    _update_virtual_task_info(parents, actual_cycle)
-    tasks_to_execute = []
-    for parent in parents:
-        actual_tasks = _select_tasks_to_execute_one_parent(parent, actual_cycle)
-        tasks_to_execute += actual_tasks
-    return tasks_to_execute
+            if selected_by_edf:
+                server.last_time_executed_edf = actual_cycle + number_of_cycles
+                self.__push_to_parent_heap(level, index)
+            else:
+                server.last_time_executed_dual = actual_cycle + number_of_cycles
 
 
 def _assign_tasks_to_cpu(task_set: List[_RUNTask], active_tasks: List[int], m: int) -> List[int]:
@@ -287,7 +341,7 @@ def _obtain_utilization_of_run_pack_subtree(run_pack: _RUNPack) -> float:
          run_pack.content])
 
 
-class SRUN(CentralizedScheduler):
+class SRUN(CyclicExecutiveScheduler):
     """
     Implements the Reduction to Uniprocessor Scheduler (RUN)
 
@@ -305,7 +359,7 @@ class SRUN(CentralizedScheduler):
         :param store_clusters_obtained: True if want to access later to the clusters obtained by the scheduler
         """
         super().__init__(activate_debug)
-        self.__scheduling_points: Dict[int, Dict[int, int]] = {}
+        self.__scheduling_table: CyclicExecutiveTable = CyclicExecutiveTable({}, 0, 0)
         self.__major_cycle: float = 0
         self.__task_to_job: Dict[int, int] = {}
 
@@ -319,6 +373,14 @@ class SRUN(CentralizedScheduler):
         """
         return self.__clusters_obtained
 
+    def get_scheduling_table(self) -> CyclicExecutiveTable:
+        """
+        Return the table with the calculated scheduling points
+
+        :return: scheduling table
+        """
+        return self.__scheduling_table
+
     def check_schedulability(self, processor_definition: Processor,
                              environment_specification: Environment, task_set: TaskSet) -> [bool,
                                                                                             Optional[str]]:
@@ -391,8 +453,14 @@ class SRUN(CentralizedScheduler):
 
         previous_tasks_being_executed: List[int] = m * [-1]
 
-        for actual_cycle in range(0, major_cycle_in_cycles):
-            selected_tasks = _select_tasks_to_execute(run_tree, actual_cycle)
+        # The tree is only evaluated in the cycles where the selection of servers can change (servers arrivals and
+        # exhaustion of the pending c or laxity of the selected servers), and the selection is repeated until them
+        flattened_run_tree = [_RUNFlattenedTree(i) for i in run_tree]
+
+        actual_cycle = 0
+
+        while actual_cycle < major_cycle_in_cycles:
+            selected_tasks = [j for i in flattened_run_tree for j in i.select_tasks_to_execute(actual_cycle)]
             tasks_being_executed = _assign_tasks_to_cpu(selected_tasks, previous_tasks_being_executed, m)
 
             # Mark for scheduling point
@@ -402,7 +470,17 @@ class SRUN(CentralizedScheduler):
 
             previous_tasks_being_executed = tasks_being_executed
 
-        self.__scheduling_points = scheduling_points
+            # The CPUs assignation is only kept if all the selected tasks have been assigned
+            next_cycle = min([major_cycle_in_cycles] + [i.obtain_next_selection_change(actual_cycle) for i in
+                                                        flattened_run_tree]) \
+                if len([i for i in selected_tasks if i.task_id != -1]) <= m else actual_cycle + 1
+
+            for i in flattened_run_tree:
+                i.execute_selection(actual_cycle, next_cycle - actual_cycle)
+
+            actual_cycle = next_cycle
+
+        self.__scheduling_table = CyclicExecutiveTable(scheduling_points, m, round(major_cycle * selected_frequency))
         self.__major_cycle = major_cycle
 
         return selected_frequency
@@ -430,10 +508,9 @@ class SRUN(CentralizedScheduler):
         """
         actual_execution_cycle = round(global_time * cores_frequency) % round(self.__major_cycle * cores_frequency)
 
-        next_scheduling_point = next(i for i in sorted(self.__scheduling_points.keys()) +
-                                     [round(self.__major_cycle * cores_frequency)] if i > actual_execution_cycle)
+        assignation, next_scheduling_point = self.__scheduling_table.obtain_assignation(actual_execution_cycle)
 
-        return ({k: self.__task_to_job[v] for k, v in self.__scheduling_points[actual_execution_cycle].items()},
+        return ({k: self.__task_to_job[v] for k, v in assignation.items()},
                 next_scheduling_point - actual_execution_cycle, None)
 
     def on_jobs_activation(self, global_time: float, activation_time: float,
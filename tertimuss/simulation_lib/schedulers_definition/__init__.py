@@ -7,5 +7,8 @@ Definition of the base class for schedulers. All schedulers must inherit classes
 
 This module provides the following class:
 - :class:`.CentralizedScheduler`
+- :class:`.CyclicExecutiveScheduler`
+- :class:`.CyclicExecutiveTable`
 """
-from ._abstract_scheduler import CentralizedScheduler
+from ._abstract_scheduler import CentralizedScheduler, CyclicExecutiveScheduler
+from ._cyclic_executive_table import CyclicExecutiveTable
@@ -1,5 +1,6 @@
 import abc
 
+from ._cyclic_executive_table import CyclicExecutiveTable
 from ..system_definition import Processor, TaskSet, Environment
 
 from typing import Optional, Set, Dict, Tuple, List
@@ -128,3 +129,35 @@ class CentralizedScheduler(Scheduler, metaclass=abc.ABCMeta):
         :return: true if want to immediately call the scheduler (schedule_policy method), false otherwise
         """
         return False
+
+
+class CyclicExecutiveScheduler(CentralizedScheduler, metaclass=abc.ABCMeta):
+    """
+    Base centralized scheduler whose schedule is a cyclic executive: a table of scheduling points calculated in the
+    offline stage, that is repeated in each major cycle.
+
+    Its schedule_policy must return the assignation of the table in the actual scheduling point and the cycles until
+    the next one, and its system events must not require the invocation of the scheduler (except the major cycle
+    start). In this way the simulator can expand the table instead of invoking the scheduler in each scheduling point
+    (look in cyclic_executive_fast_path of SimulationConfiguration)
+    """
+
+    @abc.abstractmethod
+    def get_scheduling_table(self) -> CyclicExecutiveTable:
+        """
+        Return the table with the scheduling points of a major cycle calculated in the offline stage
+
+        :return: scheduling table, in cycles of the frequency returned by offline_stage
+        """
+        pass
+
+    def get_scheduling_points(self) -> Dict[int, Dict[int, int]]:
+        """
+        Return the scheduling points of a major cycle calculated in the offline stage
+
+        :return: scheduling points. The dictionary has as key the cycle since the start of the major cycle (in cycles of
+         the frequency returned by offline_stage) where the scheduler is invoked, and as value the assignation until the
+         next scheduling point. The assignation has as key the CPU id, and as value the id of the task whose last
+         activated job is executed
+        """
+        return self.get_scheduling_table().to_scheduling_points()
@@ -0,0 +1,86 @@
+from typing import Dict, Tuple, List
+
+import numpy
+
+
+class CyclicExecutiveTable(object):
+    """
+    Compact table with the scheduling points of a major cycle of a cyclic executive scheduler.
+
+    The cycles of the scheduling points are stored in a sorted array, and the assignations in a matrix with a row for
+    each CPU and a column for each scheduling point, so the scheduling point of a cycle is found by binary search. The
+    matrix stores the index of each task in an array of task ids, so any integer can be a task id
+    """
+
+    def __init__(self, scheduling_points: Dict[int, Dict[int, int]], number_of_cpus: int, major_cycle: int):
+        """
+        Create the table
+
+        :param scheduling_points: Scheduling points. The dictionary has as key the cycle since the start of the major
+         cycle where the scheduler is invoked, and as value the assignation until the next scheduling point. The
+         assignation has as key the CPU id, and as value the id of the task whose last activated job is executed
+        :param number_of_cpus: Number of CPUs
+        :param major_cycle: Major cycle in cycles
+        """
+        # Cycles since the start of the major cycle of the scheduling points in ascending order
+        self.scheduling_points: numpy.ndarray = numpy.asarray(sorted(scheduling_points.keys()), dtype=numpy.int64)
+
+        # Ids of the tasks that appear in the table in ascending order
+        self.task_ids: numpy.ndarray = numpy.asarray(
+            sorted({j for i in scheduling_points.values() for j in i.values()}), dtype=numpy.int64)
+
+        # Index in task_ids of the task executed by each CPU (row) in each scheduling point (column), -1 if the CPU is
+        # idle
+        self.assignations: numpy.ndarray = numpy.full((number_of_cpus, len(self.scheduling_points)), -1,
+                                                      dtype=numpy.int64)
+
+        # Major cycle in cycles
+        self.major_cycle: int = major_cycle
+
+        # Task ids as Python integers, to build the assignations
+        self.__task_ids_list: List[int] = self.task_ids.tolist()
+
+        task_index = {j: i for i, j in enumerate(self.__task_ids_list)}
+
+        for i, point in enumerate(self.scheduling_points.tolist()):
+            for cpu_id, task_id in scheduling_points[point].items():
+                self.assignations[cpu_id, i] = task_index[task_id]
+
+    def obtain_assignation(self, cycle: int) -> Tuple[Dict[int, int], int]:
+        """
+        Return the assignation of a cycle of the major cycle
+
+        :param cycle: Cycle since the start of the major cycle
+        :return: Tuple of [
+         Assignation of the last scheduling point before or in the cycle. The dictionary has as key the CPU id, and as
+         value the task id,
+         Cycle of the next scheduling point, or the major cycle if it is the last one
+        ]
+        """
+        index = int(numpy.searchsorted(self.scheduling_points, cycle, side="right")) - 1
+
+        next_scheduling_point = int(self.scheduling_points[index + 1]) if index + 1 < len(self.scheduling_points) \
+            else self.major_cycle
+
+        if index < 0:
+            return {}, next_scheduling_point
+
+        return self.__obtain_point_assignation(index), next_scheduling_point
+
+    def to_scheduling_points(self) -> Dict[int, Dict[int, int]]:
+        """
+        Return the table as a dictionary of scheduling points
+
+        :return: scheduling points. The dictionary has as key the cycle of the scheduling point, and as value the
+         assignation. The assignation has as key the CPU id, and as value the task id
+        """
+        return {point: self.__obtain_point_assignation(k) for k, point in enumerate(self.scheduling_points.tolist())}
+
+    def __obtain_point_assignation(self, index: int) -> Dict[int, int]:
+        """
+        Return the assignation of a scheduling point
+
+        :param index: Index of the scheduling point
+        :return: Assignation. The dictionary has as key the CPU id, and as value the task id
+        """
+        return {i: self.__task_ids_list[j] for i, j in enumerate(self.assignations[:, index].tolist()) if j != -1}
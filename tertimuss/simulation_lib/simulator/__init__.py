@@ -8,15 +8,33 @@ Provide the utilities to simulate the scheduler behaviour
 This module provides the following functions:
 - :function:`.execute_scheduler_simulation_simple`
 - :function:`.execute_scheduler_simulation`
+- :function:`.resume_scheduler_simulation`
+- :function:`.execute_scheduler_simulation_batch`
+- :function:`.save_simulation_checkpoint`
+- :function:`.load_simulation_checkpoint`
+- :function:`.obtain_job_sections_execution_table`
+- :function:`.read_simulation_result_file`
 
 It also exposes the following classes related with the previous functions:
 - :class:`.JobSectionExecution`
 - :class:`.CPUUsedFrequency`
 - :class:`.SimulationStackTraceHardRTDeadlineMissed`
 - :class:`.RawSimulationResult`
+- :class:`.ColumnarJobSectionsExecution`
+- :class:`.ColumnarTemperatureMeasures`
 - :class:`.SimulationConfiguration`
+- :class:`.SimulationResultSink`
+- :class:`.InMemorySimulationResultSink`
+- :class:`.BinaryFileSimulationResultSink`
+- :class:`.AggregateSimulationResultSink`
+- :class:`.SimulationCheckpoint`
 """
+from ._simulation_checkpoint import SimulationCheckpoint, save_simulation_checkpoint, load_simulation_checkpoint
 from ._simulation_result import JobSectionExecution, CPUUsedFrequency, SimulationStackTraceHardRTDeadlineMissed, \
-    RawSimulationResult
+    RawSimulationResult, ColumnarJobSectionsExecution, ColumnarTemperatureMeasures, JOB_SECTIONS_EXECUTION_DTYPE, \
+    obtain_job_sections_execution_table
+from ._simulation_result_sink import SimulationResultSink, InMemorySimulationResultSink, \
+    BinaryFileSimulationResultSink, AggregateSimulationResultSink, read_simulation_result_file
 from ._system_simulator import SimulationConfiguration, execute_scheduler_simulation_simple, \
-    execute_scheduler_simulation
+    execute_scheduler_simulation, resume_scheduler_simulation
+from ._batch_simulator import execute_scheduler_simulation_batch
@@ -0,0 +1,214 @@
+import dataclasses
+from typing import List, Tuple, Dict, Optional, Set, Union
+
+import numpy
+
+from tertimuss.cubed_space_thermal_simulator import Model, StructuredGridModel, BatchSimulationState
+
+from ._simulation_result import RawSimulationResult, ColumnarTemperatureMeasures, \
+    obtain_job_sections_execution_table
+from ._system_simulator import SimulationConfiguration, execute_scheduler_simulation, _generate_cubed_space
+from ..math_utils import list_int_lcm
+from ..schedulers_definition import CentralizedScheduler
+from ..system_definition import Job, TaskSet, Environment, Processor
+from ..system_definition.utils import calculate_major_cycle
+
+
+def _obtain_intervals_coverage(intervals_start: numpy.ndarray, intervals_end: numpy.ndarray,
+                               steps_limits: numpy.ndarray) -> numpy.ndarray:
+    """
+    Obtain the time covered by a group of intervals in each step of a time grid
+
+    :param intervals_start: Start of each interval. The intervals must be disjoint and ordered by start
+    :param intervals_end: End of each interval
+    :param steps_limits: Limits of the steps of the grid, in increasing order
+    :return: Time covered by the intervals in each step (one less element than steps_limits)
+    """
+    if len(intervals_start) == 0:
+        return numpy.zeros(len(steps_limits) - 1)
+
+    intervals_length = intervals_end - intervals_start
+    accumulated_length = numpy.concatenate([[0.0], numpy.cumsum(intervals_length)])
+
+    # Time covered since the start of the grid until each limit
+    last_interval = numpy.searchsorted(intervals_start, steps_limits, side="right") - 1
+    last_interval_clipped = numpy.maximum(last_interval, 0)
+    covered_time = numpy.where(last_interval >= 0, accumulated_length[last_interval_clipped] +
+                               numpy.clip(steps_limits - intervals_start[last_interval_clipped], 0,
+                                          intervals_length[last_interval_clipped]), 0.0)
+
+    return numpy.diff(covered_time)
+
+
+def _obtain_energy_points_usage(simulation_result: RawSimulationResult, number_of_cpus: int,
+                                core_frequency_energy_activator: Dict[Tuple[int, int], int],
+                                steps_limits: numpy.ndarray) -> Dict[int, numpy.ndarray]:
+    """
+    Obtain the fraction of each step of a time grid that each dynamic energy point of the processor was active in a
+    simulation
+
+    :param simulation_result: Result of the simulation
+    :param number_of_cpus: Number of cores
+    :param core_frequency_energy_activator: Energy point of each core and frequency
+    :param steps_limits: Limits of the steps of the grid in seconds
+    :return: Fraction of each step that each energy point was active
+    """
+    job_sections = obtain_job_sections_execution_table(simulation_result)
+    steps_length = numpy.diff(steps_limits)
+
+    energy_points_usage: Dict[int, numpy.ndarray] = {}
+
+    for cpu_id in range(number_of_cpus):
+        cpu_sections = job_sections[job_sections["cpu_id"] == cpu_id]
+        cpu_sections = cpu_sections[numpy.argsort(cpu_sections["execution_start_time"], kind="stable")]
+
+        # The sections of the core are split by the frequency used in each one
+        for cpu_used_frequency in simulation_result.cpus_frequencies.get(cpu_id, []):
+            sections_start = numpy.maximum(cpu_sections["execution_start_time"],
+                                           cpu_used_frequency.frequency_set_time)
+            sections_end = numpy.minimum(cpu_sections["execution_end_time"], cpu_used_frequency.frequency_unset_time)
+            not_empty_sections = sections_start < sections_end
+
+            if not numpy.any(not_empty_sections):
+                continue
+
+            energy_point = core_frequency_energy_activator[(cpu_id, cpu_used_frequency.frequency_used)]
+            energy_points_usage[energy_point] = energy_points_usage.get(
+                energy_point, numpy.zeros(len(steps_length))) + _obtain_intervals_coverage(
+                sections_start[not_empty_sections], sections_end[not_empty_sections], steps_limits) / steps_length
+
+    return energy_points_usage
+
+
+def execute_scheduler_simulation_batch(simulations: List[Tuple[TaskSet, List[Job], CentralizedScheduler]],
+                                       processor_definition: Processor,
+                                       environment_specification: Environment,
+                                       simulation_options: SimulationConfiguration,
+                                       simulation_start_time: float = 0,
+                                       simulation_end_time: Optional[float] = None) -> List[RawSimulationResult]:
+    """
+    Run several simulations over the same processor and environment, and simulate the thermal behaviour of all of
+    them at once.
+
+    First the schedule of each simulation is obtained without simulating the thermal behaviour, since the schedulers
+    don't receive the temperature of the cores. Then the thermal model of the processor is simulated for all the
+    simulations together in the time grid given by the thermal measure rate of the options: in each step the
+    marking of all the simulations is advanced with a single product of the TCPN matrices by a marking matrix, applying
+    in each simulation the average power consumed by its cores during the step, as in a simulation with thermal
+    measure rate.
+
+    The thermal behaviour of all the simulations is simulated until the end of the longest one
+
+    :param simulations: Task set, jobs and scheduler of each simulation
+    :param processor_definition: Definition of the CPU to use
+    :param environment_specification: Specification of the environment
+    :param simulation_options: Options of the simulations. If the thermal behaviour is simulated, the thermal measure
+     rate is required and the thermal simulation type must be DVFS. The result sink can't be used
+    :param simulation_start_time: Time in seconds where the system start to make decisions
+    :param simulation_end_time: Time in seconds where the simulations end. If None, each simulation ends at the end of
+     the major cycle of its task set
+    :return: Result of each simulation. The temperature measures are returned as ColumnarTemperatureMeasures
+    """
+    if simulation_options.result_sink is not None:
+        raise Exception("A result sink can't be shared by several simulations")
+
+    if simulation_options.simulate_thermal_behaviour:
+        if simulation_options.thermal_measure_rate is None or simulation_options.thermal_measure_rate <= 0:
+            raise Exception("The batch thermal simulation requires a thermal measure rate greater than 0")
+
+        if simulation_options.thermal_simulation_type != "DVFS":
+            raise Exception("The batch thermal simulation only supports the DVFS thermal simulation type")
+
+    # Schedule of each simulation
+    scheduling_options = dataclasses.replace(simulation_options, simulate_thermal_behaviour=False)
+
+    simulations_end_time = [simulation_end_time if simulation_end_time is not None else calculate_major_cycle(tasks)
+                            for tasks, _, _ in simulations]
+
+    simulations_results = [execute_scheduler_simulation(jobs=jobs, tasks=tasks,
+                                                        processor_definition=processor_definition,
+                                                        environment_specification=environment_specification,
+                                                        scheduler=scheduler, simulation_options=scheduling_options,
+                                                        simulation_start_time=simulation_start_time,
+                                                        simulation_end_time=end_time)
+                           for (tasks, jobs, scheduler), end_time in zip(simulations, simulations_end_time)]
+
+    scheduled_simulations = [i for i, j in enumerate(simulations_results) if j.have_been_scheduled]
+
+    if not simulation_options.simulate_thermal_behaviour or len(scheduled_simulations) == 0:
+        return simulations_results
+
+    # Common time grid, in cycles of the base frequency as in a simulation with thermal measure rate
+    available_frequencies: Set[int] = Set.intersection(
+        *[i.core_type.available_frequencies for i in processor_definition.cores_definition.values()])
+    lcm_frequency = list_int_lcm(list(available_frequencies))
+
+    thermal_measure_period = max(1, round(lcm_frequency / simulation_options.thermal_measure_rate))
+    start_lcm_cycle = round(simulation_start_time * lcm_frequency)
+    end_lcm_cycle = round(max(simulations_end_time[i] for i in scheduled_simulations) * lcm_frequency)
+
+    steps_limits_lcm_cycles = numpy.arange(start_lcm_cycle, end_lcm_cycle, thermal_measure_period)
+    steps_limits_lcm_cycles = numpy.append(steps_limits_lcm_cycles, end_lcm_cycle)
+    steps_limits = steps_limits_lcm_cycles / lcm_frequency
+
+    # Thermal model
+    number_of_cpus = len(processor_definition.cores_definition)
+
+    cubed_space: Union[Model, StructuredGridModel]
+    cubed_space, initial_state, core_frequency_energy_activator, _ = _generate_cubed_space(
+        TaskSet(periodic_tasks=[], aperiodic_tasks=[], sporadic_tasks=[]), processor_definition,
+        environment_specification, simulation_options, number_of_cpus)
+
+    material_cubes = {i: (j.material, j.cuboid) for i, j in cubed_space.obtain_temperature(initial_state).items()}
+
+    # Fraction of each step that each energy point is active in each simulation
+    simulations_energy_points_usage = [
+        _obtain_energy_points_usage(simulations_results[i], number_of_cpus, core_frequency_energy_activator,
+                                    steps_limits) for i in scheduled_simulations]
+
+    # The leakage power energy points are always active
+    leakage_energy_points_usage = {i: 1.0 for i in range(number_of_cpus)}
+
+    batch_state = cubed_space.create_batch_state([initial_state] * len(scheduled_simulations))
+
+    # In the MAX mode only the maximum temperature of each cuboid is stored in each step
+    max_temperature_mode = simulation_options.thermal_measure_mode == "MAX"
+
+    # First column of each cuboid in the temperature matrix
+    cuboids_first_column = numpy.cumsum(
+        [0] + [i[1].dimensions.x * i[1].dimensions.y * i[1].dimensions.z for i in material_cubes.values()])
+
+    def obtain_step_temperatures(state: BatchSimulationState) -> numpy.ndarray:
+        temperature_matrix = cubed_space.obtain_temperature_matrix(state)
+        return numpy.maximum.reduceat(temperature_matrix, cuboids_first_column[:-1], axis=1) \
+            if max_temperature_mode else temperature_matrix
+
+    temperatures = numpy.empty((len(steps_limits), len(scheduled_simulations),
+                                len(material_cubes) if max_temperature_mode else int(cuboids_first_column[-1])))
+    temperatures[0] = obtain_step_temperatures(batch_state)
+
+    for step in range(len(steps_limits) - 1):
+        batch_state = cubed_space.apply_energy_batch(
+            actual_state=batch_state,
+            amount_of_time=(steps_limits_lcm_cycles[step + 1] - steps_limits_lcm_cycles[step]) / lcm_frequency,
+            external_energy_application_points_usage=[
+                {**leakage_energy_points_usage, **{i: j[step] for i, j in energy_points_usage.items()}}
+                for energy_points_usage in simulations_energy_points_usage],
+            internal_energy_application_points={i for i in range(number_of_cpus)})
+
+        temperatures[step + 1] = obtain_step_temperatures(batch_state)
+
+    # Add the temperature measures to the results
+    for batch_index, simulation_index in enumerate(scheduled_simulations):
+        if max_temperature_mode:
+            simulations_results[simulation_index] = dataclasses.replace(
+                simulations_results[simulation_index],
+                max_temperature_measures={i: dict(zip(material_cubes.keys(), j)) for i, j in
+                                          zip(steps_limits.tolist(), temperatures[:, batch_index, :].tolist())})
+        else:
+            simulations_results[simulation_index] = dataclasses.replace(
+                simulations_results[simulation_index],
+                temperature_measures=ColumnarTemperatureMeasures(steps_limits, temperatures[:, batch_index, :],
+                                                                 material_cubes))
+
+    return simulations_results
@@ -0,0 +1,83 @@
+import pickle
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from tertimuss.cubed_space_thermal_simulator import SimulationState
+
+from ..schedulers_definition import CentralizedScheduler
+
+
+@dataclass
+class SimulationCheckpoint:
+    """
+    State of the simulator at the end of a simulation. A simulation can be resumed from it with
+    resume_scheduler_simulation, using the same jobs, tasks, processor and environment
+    """
+    checkpoint_time: float
+    """Time in seconds where the simulation was stopped"""
+
+    actual_lcm_cycle: int
+    """Cycle of the base frequency where the simulation was stopped"""
+
+    lcm_frequency: int
+    """Base frequency of the simulation"""
+
+    cpu_frequency: int
+    """Frequency of the cores"""
+
+    remaining_cc_dict: Dict[int, int]
+    """Remaining cycles by job id"""
+
+    active_jobs: Set[int]
+    """Ids of the active jobs"""
+
+    jobs_being_executed_id: Dict[int, int]
+    """Job being executed by each core"""
+
+    jobs_last_cpu_used: Dict[int, int]
+    """Last core used by each job"""
+
+    next_scheduling_point: Optional[int]
+    """Cycle of the base frequency of the next scheduling point requested by the scheduler"""
+
+    activation_calendar: List[Tuple[int, List[int]]]
+    """Jobs activations not yet produced [activation base cycle, jobs ids], ordered by activation base cycle"""
+
+    deadlines_calendar: List[Tuple[int, List[int]]]
+    """Jobs deadlines not yet reached [deadline base cycle, jobs ids], ordered by deadline base cycle"""
+
+    memory_usage: int
+    """Memory used by the jobs in execution in bytes"""
+
+    thermal_state: Optional[SimulationState]
+    """Thermal state of the processor. It only takes value if the thermal behaviour has been simulated"""
+
+    scheduler: CentralizedScheduler
+    """Copy of the scheduler, with its internal state"""
+
+
+def save_simulation_checkpoint(simulation_checkpoint: SimulationCheckpoint, file_path: str):
+    """
+    Save a simulation checkpoint in a file
+
+    :param simulation_checkpoint: Checkpoint to save. The scheduler must be picklable
+    :param file_path: Path of the file
+    """
+    with open(file_path, "wb") as checkpoint_file:
+        pickle.dump(simulation_checkpoint, checkpoint_file)
+
+
+def load_simulation_checkpoint(file_path: str) -> SimulationCheckpoint:
+    """
+    Load a simulation checkpoint saved with save_simulation_checkpoint
+
+    :param file_path: Path of the file
+    :return: Loaded checkpoint
+    """
+    with open(file_path, "rb") as checkpoint_file:
+        simulation_checkpoint = pickle.load(checkpoint_file)
+
+    if not isinstance(simulation_checkpoint, SimulationCheckpoint):
+        raise Exception("The file doesn't contain a simulation checkpoint")
+
+    return simulation_checkpoint
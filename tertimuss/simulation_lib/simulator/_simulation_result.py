@@ -1,7 +1,11 @@
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Mapping, Iterator, Tuple
 
-from tertimuss.cubed_space_thermal_simulator import PhysicalCuboid
+import numpy
+
+from tertimuss.cubed_space_thermal_simulator import PhysicalCuboid, SolidMaterial, Cuboid, CuboidTemperature
+
+from ._simulation_checkpoint import SimulationCheckpoint
 
 
 @dataclass
@@ -25,6 +29,96 @@ class JobSectionExecution:
     """Number of cycles executed in this interval"""
 
 
+JOB_SECTIONS_EXECUTION_DTYPE = numpy.dtype([("cpu_id", numpy.int32),
+                                            ("job_id", numpy.int64),
+                                            ("task_id", numpy.int64),
+                                            ("execution_start_time", numpy.float64),
+                                            ("execution_end_time", numpy.float64),
+                                            ("number_of_executed_cycles", numpy.int64)])
+"""NumPy structured type of a row of a columnar job sections execution table"""
+
+
+class ColumnarJobSectionsExecution(Mapping[int, List[JobSectionExecution]]):
+    """
+    Read only view of the job sections executed by each core backed by a NumPy structured array.
+
+    Accessing a core returns its sections as a list of JobSectionExecution, built on demand
+    """
+
+    def __init__(self, sections: numpy.ndarray, cpus_ids: List[int]):
+        """
+        Create the view
+
+        :param sections: Array of type JOB_SECTIONS_EXECUTION_DTYPE with the sections in execution order
+        :param cpus_ids: Identifiers of the cores
+        """
+        # Sections are stored grouped by core, keeping the execution order inside each core
+        self.sections: numpy.ndarray = sections[numpy.argsort(sections["cpu_id"], kind="stable")]
+        """Sections of all cores of type JOB_SECTIONS_EXECUTION_DTYPE, grouped by core"""
+
+        sections_start = numpy.searchsorted(self.sections["cpu_id"], cpus_ids, side="left")
+        sections_end = numpy.searchsorted(self.sections["cpu_id"], cpus_ids, side="right")
+        self.__cpus_slices: Dict[int, Tuple[int, int]] = {i: (j, k) for i, j, k in
+                                                          zip(cpus_ids, sections_start.tolist(),
+                                                              sections_end.tolist())}
+
+    def __getitem__(self, cpu_id: int) -> List[JobSectionExecution]:
+        start, end = self.__cpus_slices[cpu_id]
+        return [JobSectionExecution(job_id, task_id, start_time, end_time, cycles) for
+                _, job_id, task_id, start_time, end_time, cycles in self.sections[start:end].tolist()]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.__cpus_slices)
+
+    def __len__(self) -> int:
+        return len(self.__cpus_slices)
+
+
+class ColumnarTemperatureMeasures(Mapping[float, Dict[int, PhysicalCuboid]]):
+    """
+    Read only view of the temperature measures backed by a time x unit cube NumPy array.
+
+    Accessing a time returns the measure as a dictionary of PhysicalCuboid, whose temperature matrices are views of
+    the array
+    """
+
+    def __init__(self, measures_times: numpy.ndarray, temperatures: numpy.ndarray,
+                 material_cubes: Dict[int, Tuple[SolidMaterial, Cuboid]]):
+        """
+        Create the view
+
+        :param measures_times: Time of each measure in absolute seconds
+        :param temperatures: Temperature in kelvin of each unit cube (columns) in each measure (rows)
+        :param material_cubes: Cuboids of the measures, in the same order as its unit cubes appear in the columns
+        """
+        self.measures_times: numpy.ndarray = measures_times
+        """Time of each measure in absolute seconds"""
+
+        self.temperatures: numpy.ndarray = temperatures
+        """Temperature in kelvin of each unit cube (columns) in each measure (rows)"""
+
+        self.__measures_index: Dict[float, int] = {j: i for i, j in enumerate(measures_times.tolist())}
+
+        self.__material_cubes_columns: Dict[int, Tuple[SolidMaterial, Cuboid, int, int]] = {}
+        first_column = 0
+        for i, (material, cuboid) in material_cubes.items():
+            number_of_columns = cuboid.dimensions.x * cuboid.dimensions.y * cuboid.dimensions.z
+            self.__material_cubes_columns[i] = (material, cuboid, first_column, first_column + number_of_columns)
+            first_column += number_of_columns
+
+    def __getitem__(self, measure_time: float) -> Dict[int, PhysicalCuboid]:
+        measure = self.temperatures[self.__measures_index[measure_time]]
+        return {i: PhysicalCuboid(temperature=CuboidTemperature(measure[start:end]), material=material,
+                                  cuboid=cuboid) for i, (material, cuboid, start, end) in
+                self.__material_cubes_columns.items()}
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.__measures_index)
+
+    def __len__(self) -> int:
+        return len(self.__measures_index)
+
+
 @dataclass
 class CPUUsedFrequency:
     """
@@ -66,8 +160,9 @@ class RawSimulationResult:
      not scheduling the task set in the provided system"""
 
     # Simulation results
-    job_sections_execution: Dict[int, List[JobSectionExecution]]
-    """This property contains the list of jobs executed by each core"""
+    job_sections_execution: Mapping[int, List[JobSectionExecution]]
+    """This property contains the list of jobs executed by each core. In a columnar simulation result it is a
+     ColumnarJobSectionsExecution"""
 
     cpus_frequencies: Dict[int, List[CPUUsedFrequency]]
     """This property contains the list of CPU frequencies used by each core"""
@@ -75,8 +170,9 @@ class RawSimulationResult:
     scheduling_points: List[float]
     """This property contains the timestamps of the dynamic component of the scheduler invocation"""
 
-    temperature_measures: Dict[float, Dict[int, PhysicalCuboid]]
-    """This property contains a list with the evolution of the processors' temperature"""
+    temperature_measures: Mapping[float, Dict[int, PhysicalCuboid]]
+    """This property contains a list with the evolution of the processors' temperature. In a columnar simulation
+     result it is a ColumnarTemperatureMeasures"""
 
     hard_real_time_deadline_missed_stack_trace: Optional[SimulationStackTraceHardRTDeadlineMissed]
     """This property only takes value if the system misses a hard real-time deadline. It contains a snapshot of the
@@ -84,3 +180,27 @@ class RawSimulationResult:
 
     memory_usage_record: Optional[Dict[float, int]]
     """This property has a record of the memory usage in bytes"""
+
+    max_temperature_measures: Optional[Dict[float, Dict[int, float]]] = None
+    """This property only takes value if the thermal measure mode is MAX. It contains the maximum temperature in
+     kelvin of each processor cuboid in each measure. In this mode temperature_measures is empty"""
+
+    simulation_checkpoint: Optional[SimulationCheckpoint] = None
+    """This property only takes value if create_simulation_checkpoint is set in the simulation configuration and no
+     hard real-time deadline has been missed. It contains the state of the simulator at the end of the simulation"""
+
+
+def obtain_job_sections_execution_table(schedule_result: RawSimulationResult) -> numpy.ndarray:
+    """
+    Obtain the job sections executed by all cores as a NumPy structured array
+
+    :param schedule_result: simulation result
+    :return: array of type JOB_SECTIONS_EXECUTION_DTYPE with the sections grouped by core
+    """
+    if isinstance(schedule_result.job_sections_execution, ColumnarJobSectionsExecution):
+        return schedule_result.job_sections_execution.sections
+
+    return numpy.array([(i, j.job_id, j.task_id, j.execution_start_time, j.execution_end_time,
+                         j.number_of_executed_cycles) for i, sections in
+                        schedule_result.job_sections_execution.items() for j in sections],
+                       dtype=JOB_SECTIONS_EXECUTION_DTYPE)
@@ -0,0 +1,471 @@
+import abc
+import array
+import struct
+from typing import List, Dict, Mapping, Tuple, Optional, BinaryIO
+
+import numpy
+
+from tertimuss.cubed_space_thermal_simulator import PhysicalCuboid, SolidMaterial, Cuboid, Location, Dimensions
+
+from ._simulation_result import JobSectionExecution, CPUUsedFrequency, ColumnarJobSectionsExecution, \
+    ColumnarTemperatureMeasures, JOB_SECTIONS_EXECUTION_DTYPE
+
+
+class SimulationResultSink(object, metaclass=abc.ABCMeta):
+    """
+    Receive the records of a simulation as they are produced by the simulator.
+
+    A sink must only be used in one simulation
+    """
+
+    def on_simulation_start(self, cpus_ids: List[int]):
+        """
+        Simulation start event
+
+        :param cpus_ids: Identifiers of the cores of the simulated processor
+        """
+        pass
+
+    @abc.abstractmethod
+    def on_job_section_execution(self, cpu_id: int, job_section_execution: JobSectionExecution):
+        """
+        A job section have finished its execution
+
+        :param cpu_id: Core where the section have been executed
+        :param job_section_execution: Section executed
+        """
+        pass
+
+    def on_job_sections_execution(self, job_sections_execution: numpy.ndarray):
+        """
+        Several job sections have finished their execution. By default, each one is sent to on_job_section_execution
+
+        :param job_sections_execution: Sections executed, as rows of JOB_SECTIONS_EXECUTION_DTYPE
+        """
+        for cpu_id, job_id, task_id, start_time, end_time, executed_cycles in job_sections_execution.tolist():
+            self.on_job_section_execution(cpu_id, JobSectionExecution(job_id, task_id, start_time, end_time,
+                                                                      executed_cycles))
+
+    @abc.abstractmethod
+    def on_cpu_frequency_used(self, cpu_id: int, cpu_used_frequency: CPUUsedFrequency):
+        """
+        A core have stopped using a frequency
+
+        :param cpu_id: Core that have used the frequency
+        :param cpu_used_frequency: Frequency used
+        """
+        pass
+
+    @abc.abstractmethod
+    def on_scheduling_point(self, scheduling_point: float):
+        """
+        The dynamic component of the scheduler have been invoked
+
+        :param scheduling_point: Time of the invocation in absolute seconds
+        """
+        pass
+
+    def on_scheduling_points(self, scheduling_points: numpy.ndarray):
+        """
+        The dynamic component of the scheduler have been invoked several times. By default, each invocation is sent to
+        on_scheduling_point
+
+        :param scheduling_points: Times of the invocations in absolute seconds
+        """
+        for i in scheduling_points.tolist():
+            self.on_scheduling_point(i)
+
+    @abc.abstractmethod
+    def on_temperature_measure(self, measure_time: float, temperature_measure: Dict[int, PhysicalCuboid]):
+        """
+        The temperature of the processor have been measured.
+
+        The temperature matrices can be views of the simulator state, so they must be copied if they are stored
+
+        :param measure_time: Time of the measure in absolute seconds
+        :param temperature_measure: Temperature of each cuboid of the processor
+        """
+        pass
+
+    def on_max_temperature_measure(self, measure_time: float, max_temperature_measure: Dict[int, float]):
+        """
+        The maximum temperature of each cuboid of the processor have been measured. It is used instead of
+        on_temperature_measure if the thermal measure mode of the simulation is MAX
+
+        :param measure_time: Time of the measure in absolute seconds
+        :param max_temperature_measure: Maximum temperature in kelvin of each cuboid of the processor
+        """
+        pass
+
+    def on_simulation_end(self):
+        """
+        Simulation end event
+        """
+        pass
+
+    def on_simulation_abort(self):
+        """
+        The simulation has been interrupted by an exception, so on_simulation_end won't be called. The sink must release
+        its resources. It can be called even if on_simulation_start hasn't been called
+        """
+        pass
+
+    def obtain_job_sections_execution(self) -> Mapping[int, List[JobSectionExecution]]:
+        """
+        :return: Job sections executed by each core to include in the simulation result
+        """
+        return {}
+
+    def obtain_cpus_frequencies(self) -> Dict[int, List[CPUUsedFrequency]]:
+        """
+        :return: Frequencies used by each core to include in the simulation result
+        """
+        return {}
+
+    def obtain_scheduling_points(self) -> List[float]:
+        """
+        :return: Scheduling points to include in the simulation result
+        """
+        return []
+
+    def obtain_temperature_measures(self) -> Mapping[float, Dict[int, PhysicalCuboid]]:
+        """
+        :return: Temperature measures to include in the simulation result
+        """
+        return {}
+
+    def obtain_max_temperature_measures(self) -> Dict[float, Dict[int, float]]:
+        """
+        :return: Maximum temperature measures to include in the simulation result
+        """
+        return {}
+
+
+class InMemorySimulationResultSink(SimulationResultSink):
+    """
+    Keep all the records of the simulation in memory, and include them in the simulation result
+    """
+
+    def __init__(self, columnar: bool = False):
+        """
+        Create the sink
+
+        :param columnar: If true, the job sections and the temperature measures are stored in NumPy arrays and
+         returned as ColumnarJobSectionsExecution and ColumnarTemperatureMeasures
+        """
+        self.__columnar = columnar
+        self.__cpus_ids: List[int] = []
+        self.__cpus_frequencies: Dict[int, List[CPUUsedFrequency]] = {}
+        self.__scheduling_points: List[float] = []
+
+        # Storage used with the default result
+        self.__job_sections_execution: Dict[int, List[JobSectionExecution]] = {}
+        self.__temperature_measures: Dict[float, Dict[int, PhysicalCuboid]] = {}
+        self.__max_temperature_measures: Dict[float, Dict[int, float]] = {}
+
+        # Storage used with the columnar result (one typed array by field)
+        self.__job_sections_execution_columns = [array.array("i"), array.array("q"), array.array("q"),
+                                                 array.array("d"), array.array("d"), array.array("q")]
+        self.__temperature_measures_times: List[float] = []
+        self.__temperature_measures_vectors: List[numpy.ndarray] = []
+        self.__material_cubes: Dict[int, Tuple[SolidMaterial, Cuboid]] = {}
+
+    def on_simulation_start(self, cpus_ids: List[int]):
+        self.__cpus_ids = cpus_ids
+        self.__job_sections_execution = {i: [] for i in cpus_ids}
+        self.__cpus_frequencies = {i: [] for i in cpus_ids}
+
+    def on_job_section_execution(self, cpu_id: int, job_section_execution: JobSectionExecution):
+        if self.__columnar:
+            for column, value in zip(self.__job_sections_execution_columns,
+                                     (cpu_id, job_section_execution.job_id, job_section_execution.task_id,
+                                      job_section_execution.execution_start_time,
+                                      job_section_execution.execution_end_time,
+                                      job_section_execution.number_of_executed_cycles)):
+                column.append(value)
+        else:
+            self.__job_sections_execution[cpu_id].append(job_section_execution)
+
+    def on_job_sections_execution(self, job_sections_execution: numpy.ndarray):
+        if self.__columnar:
+            for field_name, column in zip(JOB_SECTIONS_EXECUTION_DTYPE.names, self.__job_sections_execution_columns):
+                column.frombytes(numpy.ascontiguousarray(job_sections_execution[field_name]).tobytes())
+        else:
+            super().on_job_sections_execution(job_sections_execution)
+
+    def on_cpu_frequency_used(self, cpu_id: int, cpu_used_frequency: CPUUsedFrequency):
+        self.__cpus_frequencies[cpu_id].append(cpu_used_frequency)
+
+    def on_scheduling_point(self, scheduling_point: float):
+        self.__scheduling_points.append(scheduling_point)
+
+    def on_scheduling_points(self, scheduling_points: numpy.ndarray):
+        self.__scheduling_points.extend(scheduling_points.tolist())
+
+    def on_temperature_measure(self, measure_time: float, temperature_measure: Dict[int, PhysicalCuboid]):
+        if self.__columnar:
+            if len(self.__material_cubes) == 0:
+                self.__material_cubes = {i: (j.material, j.cuboid) for i, j in temperature_measure.items()}
+            self.__temperature_measures_times.append(measure_time)
+            self.__temperature_measures_vectors.append(
+                numpy.concatenate([j.temperature.temperatureMatrix.ravel() for j in temperature_measure.values()]))
+        else:
+            self.__temperature_measures[measure_time] = temperature_measure
+
+    def on_max_temperature_measure(self, measure_time: float, max_temperature_measure: Dict[int, float]):
+        self.__max_temperature_measures[measure_time] = max_temperature_measure
+
+    def obtain_job_sections_execution(self) -> Mapping[int, List[JobSectionExecution]]:
+        if not self.__columnar:
+            return self.__job_sections_execution
+
+        sections = numpy.empty(len(self.__job_sections_execution_columns[0]), dtype=JOB_SECTIONS_EXECUTION_DTYPE)
+        for field_name, column in zip(JOB_SECTIONS_EXECUTION_DTYPE.names, self.__job_sections_execution_columns):
+            sections[field_name] = numpy.asarray(column)
+        return ColumnarJobSectionsExecution(sections, self.__cpus_ids)
+
+    def obtain_cpus_frequencies(self) -> Dict[int, List[CPUUsedFrequency]]:
+        return self.__cpus_frequencies
+
+    def obtain_scheduling_points(self) -> List[float]:
+        return self.__scheduling_points
+
+    def obtain_temperature_measures(self) -> Mapping[float, Dict[int, PhysicalCuboid]]:
+        if not self.__columnar or len(self.__temperature_measures_times) == 0:
+            return self.__temperature_measures
+
+        return ColumnarTemperatureMeasures(numpy.asarray(self.__temperature_measures_times),
+                                           numpy.stack(self.__temperature_measures_vectors), self.__material_cubes)
+
+    def obtain_max_temperature_measures(self) -> Dict[float, Dict[int, float]]:
+        return self.__max_temperature_measures
+
+
+# Binary file records. Each record starts with a one byte tag
+_CPUS_RECORD = struct.Struct("<cI")  # Tag, number of cpus (followed by the ids as int32)
+_JOB_SECTION_RECORD = struct.Struct("<ciqqddq")  # Tag, cpu, job, task, start, end, cycles
+_CPU_FREQUENCY_RECORD = struct.Struct("<ciqdd")  # Tag, cpu, frequency, set time, unset time
+_SCHEDULING_POINT_RECORD = struct.Struct("<cd")  # Tag, time
+_CUBOIDS_LAYOUT_RECORD = struct.Struct("<cI")  # Tag, number of cuboids (followed by _CUBOID_LAYOUT)
+_CUBOID_LAYOUT = struct.Struct("<qdddqqqqqq")  # Id, density, cp, k, location x y z, dimensions x y z
+_TEMPERATURE_MEASURE_RECORD = struct.Struct("<cdI")  # Tag, time, number of values (followed by the float64 values)
+
+
+class BinaryFileSimulationResultSink(SimulationResultSink):
+    """
+    Append the records of the simulation to a binary file as they are produced. The simulation result won't contain
+    them, use read_simulation_result_file to load them.
+
+    The maximum temperature measures (thermal measure mode MAX) aren't stored
+    """
+
+    def __init__(self, file_path: str):
+        """
+        Create the sink
+
+        :param file_path: Path of the file where the records are appended
+        """
+        self.__file_path = file_path
+        self.__file: Optional[BinaryIO] = None
+        self.__simulation_start_offset = 0
+        self.__cuboids_layout_written = False
+
+    def on_simulation_start(self, cpus_ids: List[int]):
+        self.__file = open(self.__file_path, "ab")
+        self.__simulation_start_offset = self.__file.tell()
+        self.__file.write(_CPUS_RECORD.pack(b"C", len(cpus_ids)))
+        self.__file.write(numpy.asarray(cpus_ids, dtype="<i4").tobytes())
+
+    def on_job_section_execution(self, cpu_id: int, job_section_execution: JobSectionExecution):
+        self.__file.write(_JOB_SECTION_RECORD.pack(b"S", cpu_id, job_section_execution.job_id,
+                                                   job_section_execution.task_id,
+                                                   job_section_execution.execution_start_time,
+                                                   job_section_execution.execution_end_time,
+                                                   job_section_execution.number_of_executed_cycles))
+
+    def on_cpu_frequency_used(self, cpu_id: int, cpu_used_frequency: CPUUsedFrequency):
+        self.__file.write(_CPU_FREQUENCY_RECORD.pack(b"F", cpu_id, cpu_used_frequency.frequency_used,
+                                                     cpu_used_frequency.frequency_set_time,
+                                                     cpu_used_frequency.frequency_unset_time))
+
+    def on_scheduling_point(self, scheduling_point: float):
+        self.__file.write(_SCHEDULING_POINT_RECORD.pack(b"P", scheduling_point))
+
+    def on_temperature_measure(self, measure_time: float, temperature_measure: Dict[int, PhysicalCuboid]):
+        if not self.__cuboids_layout_written:
+            self.__file.write(_CUBOIDS_LAYOUT_RECORD.pack(b"L", len(temperature_measure)))
+            for i, j in temperature_measure.items():
+                self.__file.write(_CUBOID_LAYOUT.pack(i, j.material.density, j.material.specificHeatCapacity,
+                                                      j.material.thermalConductivity, j.cuboid.location.x,
+                                                      j.cuboid.location.y, j.cuboid.location.z,
+                                                      j.cuboid.dimensions.x, j.cuboid.dimensions.y,
+                                                      j.cuboid.dimensions.z))
+            self.__cuboids_layout_written = True
+
+        temperatures = numpy.concatenate([j.temperature.temperatureMatrix.ravel() for j in
+                                          temperature_measure.values()]).astype("<f8")
+        self.__file.write(_TEMPERATURE_MEASURE_RECORD.pack(b"T", measure_time, len(temperatures)))
+        self.__file.write(temperatures.tobytes())
+
+    def on_simulation_end(self):
+        self.__file.close()
+        self.__file = None
+
+    def on_simulation_abort(self):
+        # The records of the interrupted simulation are removed, so the file only contains complete simulations
+        if self.__file is not None:
+            self.__file.truncate(self.__simulation_start_offset)
+            self.__file.close()
+            self.__file = None
+
+
+def read_simulation_result_file(file_path: str) -> Tuple[ColumnarJobSectionsExecution,
+                                                         Dict[int, List[CPUUsedFrequency]], List[float],
+                                                         Optional[ColumnarTemperatureMeasures]]:
+    """
+    Load the records written by a BinaryFileSimulationResultSink. If the file contains various simulations, the
+    records of all of them are returned together
+
+    :param file_path: Path of the file
+    :return: Tuple of [
+     Job sections executed by each core,
+     Frequencies used by each core,
+     Scheduling points,
+     Temperature measures (None if the temperature haven't been simulated)
+    ]
+    """
+    with open(file_path, "rb") as file:
+        content = file.read()
+
+    cpus_ids: List[int] = []
+    job_sections: List[tuple] = []
+    cpus_frequencies: Dict[int, List[CPUUsedFrequency]] = {}
+    scheduling_points: List[float] = []
+    material_cubes: Dict[int, Tuple[SolidMaterial, Cuboid]] = {}
+    temperature_measures_times: List[float] = []
+    temperature_measures_vectors: List[numpy.ndarray] = []
+
+    offset = 0
+    while offset < len(content):
+        tag = content[offset:offset + 1]
+        if tag == b"C":
+            _, number_of_cpus = _CPUS_RECORD.unpack_from(content, offset)
+            offset += _CPUS_RECORD.size
+            for i in numpy.frombuffer(content, dtype="<i4", count=number_of_cpus, offset=offset).tolist():
+                if i not in cpus_frequencies:
+                    cpus_ids.append(i)
+                    cpus_frequencies[i] = []
+            offset += 4 * number_of_cpus
+        elif tag == b"S":
+            job_sections.append(_JOB_SECTION_RECORD.unpack_from(content, offset)[1:])
+            offset += _JOB_SECTION_RECORD.size
+        elif tag == b"F":
+            _, cpu_id, frequency, set_time, unset_time = _CPU_FREQUENCY_RECORD.unpack_from(content, offset)
+            cpus_frequencies[cpu_id].append(CPUUsedFrequency(frequency, set_time, unset_time))
+            offset += _CPU_FREQUENCY_RECORD.size
+        elif tag == b"P":
+            scheduling_points.append(_SCHEDULING_POINT_RECORD.unpack_from(content, offset)[1])
+            offset += _SCHEDULING_POINT_RECORD.size
+        elif tag == b"L":
+            _, number_of_cuboids = _CUBOIDS_LAYOUT_RECORD.unpack_from(content, offset)
+            offset += _CUBOIDS_LAYOUT_RECORD.size
+            for _ in range(number_of_cuboids):
+                i, density, cp, k, l_x, l_y, l_z, d_x, d_y, d_z = _CUBOID_LAYOUT.unpack_from(content, offset)
+                material_cubes[i] = (SolidMaterial(density=density, specificHeatCapacity=cp, thermalConductivity=k),
+                                     Cuboid(location=Location(x=l_x, y=l_y, z=l_z),
+                                            dimensions=Dimensions(x=d_x, y=d_y, z=d_z)))
+                offset += _CUBOID_LAYOUT.size
+        elif tag == b"T":
+            _, measure_time, number_of_values = _TEMPERATURE_MEASURE_RECORD.unpack_from(content, offset)
+            offset += _TEMPERATURE_MEASURE_RECORD.size
+            temperature_measures_times.append(measure_time)
+            temperature_measures_vectors.append(numpy.frombuffer(content, dtype="<f8", count=number_of_values,
+                                                                 offset=offset))
+            offset += 8 * number_of_values
+        else:
+            raise Exception("Bad simulation result file format at byte " + str(offset))
+
+    job_sections_execution = ColumnarJobSectionsExecution(numpy.array(job_sections,
+                                                                      dtype=JOB_SECTIONS_EXECUTION_DTYPE), cpus_ids)
+
+    temperature_measures = ColumnarTemperatureMeasures(numpy.asarray(temperature_measures_times),
+                                                       numpy.stack(temperature_measures_vectors), material_cubes) \
+        if len(temperature_measures_times) > 0 else None
+
+    return job_sections_execution, cpus_frequencies, scheduling_points, temperature_measures
+
+
+class AggregateSimulationResultSink(SimulationResultSink):
+    """
+    Only keep counters and extreme values of the simulation records, so the memory used doesn't depend on the
+    simulation length
+    """
+
+    def __init__(self):
+        self.number_of_job_sections: Dict[int, int] = {}
+        """Number of job sections executed by each core"""
+
+        self.number_of_executed_cycles: Dict[int, int] = {}
+        """Number of cycles executed by each core"""
+
+        self.number_of_frequencies_set: int = 0
+        """Number of times that a frequency have been set in the cores, including the initial one"""
+
+        self.min_frequency_used: Optional[int] = None
+        """Minimum frequency used in Hz"""
+
+        self.max_frequency_used: Optional[int] = None
+        """Maximum frequency used in Hz"""
+
+        self.number_of_scheduling_points: int = 0
+        """Number of invocations of the dynamic component of the scheduler"""
+
+        self.last_scheduling_point: Optional[float] = None
+        """Time of the last invocation of the dynamic component of the scheduler"""
+
+        self.number_of_temperature_measures: int = 0
+        """Number of temperature measures"""
+
+        self.__first_cpu_id: int = 0
+
+        self.min_temperature: Dict[int, float] = {}
+        """Minimum temperature measured in each cuboid in kelvin. It isn't measured in the thermal measure mode MAX"""
+
+        self.max_temperature: Dict[int, float] = {}
+        """Maximum temperature measured in each cuboid in kelvin"""
+
+    def on_simulation_start(self, cpus_ids: List[int]):
+        self.__first_cpu_id = cpus_ids[0]
+        self.number_of_job_sections = {i: 0 for i in cpus_ids}
+        self.number_of_executed_cycles = {i: 0 for i in cpus_ids}
+
+    def on_job_section_execution(self, cpu_id: int, job_section_execution: JobSectionExecution):
+        self.number_of_job_sections[cpu_id] += 1
+        self.number_of_executed_cycles[cpu_id] += job_section_execution.number_of_executed_cycles
+
+    def on_cpu_frequency_used(self, cpu_id: int, cpu_used_frequency: CPUUsedFrequency):
+        # All cores use the same frequency in a centralized simulation, so only the first core is counted
+        if cpu_id == self.__first_cpu_id:
+            self.number_of_frequencies_set += 1
+
+        self.min_frequency_used = cpu_used_frequency.frequency_used if self.min_frequency_used is None \
+            else min(self.min_frequency_used, cpu_used_frequency.frequency_used)
+        self.max_frequency_used = cpu_used_frequency.frequency_used if self.max_frequency_used is None \
+            else max(self.max_frequency_used, cpu_used_frequency.frequency_used)
+
+    def on_scheduling_point(self, scheduling_point: float):
+        self.number_of_scheduling_points += 1
+        self.last_scheduling_point = scheduling_point
+
+    def on_temperature_measure(self, measure_time: float, temperature_measure: Dict[int, PhysicalCuboid]):
+        self.number_of_temperature_measures += 1
+        for i, j in temperature_measure.items():
+            min_temperature = float(j.temperature.temperatureMatrix.min())
+            max_temperature = float(j.temperature.temperatureMatrix.max())
+            self.min_temperature[i] = min(self.min_temperature.get(i, min_temperature), min_temperature)
+            self.max_temperature[i] = max(self.max_temperature.get(i, max_temperature), max_temperature)
+
+    def on_max_temperature_measure(self, measure_time: float, max_temperature_measure: Dict[int, float]):
+        self.number_of_temperature_measures += 1
+        for i, j in max_temperature_measure.items():
+            self.max_temperature[i] = max(self.max_temperature.get(i, j), j)
@@ -1,17 +1,22 @@
+import copy
 import itertools
 from collections import deque
 from dataclasses import dataclass
-from typing import List, Tuple, Dict, Optional, Set, Literal, Union
+from typing import List, Tuple, Dict, Optional, Set, Literal, Union, Deque
 
-from tertimuss.cubed_space_thermal_simulator import PhysicalCuboid, Cuboid, Location, Dimensions, \
+import numpy
+
+from tertimuss.cubed_space_thermal_simulator import Cuboid, Location, Dimensions, \
     Model, SimulationState, TMInternal, TMExternal, \
-    obtain_max_temperature
+    obtain_max_temperature, ModelCache, StructuredGridModel
 from tertimuss.cubed_space_thermal_simulator.physics_utils import create_energy_applicator
 
+from ._simulation_checkpoint import SimulationCheckpoint
 from ._simulation_result import RawSimulationResult, JobSectionExecution, CPUUsedFrequency, \
-    SimulationStackTraceHardRTDeadlineMissed
+    SimulationStackTraceHardRTDeadlineMissed, JOB_SECTIONS_EXECUTION_DTYPE
+from ._simulation_result_sink import SimulationResultSink, InMemorySimulationResultSink
 from ..math_utils import list_int_lcm
-from ..schedulers_definition import CentralizedScheduler
+from ..schedulers_definition import CentralizedScheduler, CyclicExecutiveScheduler, CyclicExecutiveTable
 from ..system_definition import Job, TaskSet, Environment, Criticality, PreemptiveExecution, \
     Processor
 from ..system_definition.utils import calculate_major_cycle
@@ -34,33 +39,82 @@ class SimulationConfiguration:
     If you are sure that your scheduler have a good behaviour, turning it off can reduce the simulation time"""
 
     # Thermal options specification
+    thermal_model_cache: Optional[ModelCache] = None
+    """If not None, the thermal model is obtained from this cache, so simulations of the same processor,
+    environment and thermal options don't build it again. The cache can be shared by simulations executed
+    sequentially or in other processes, but not by simulations executed concurrently in the same process"""
+
     thermal_simulation_type: Literal["DVFS", "TASK_CONSUMPTION_MEASURED"] = "DVFS"
     """ Control how the energy consumed is expressed"""
 
     processor_mesh_division: int = 1
     """Number of divisions done in each unit of the processor mesh during thermal simulation"""
 
-    thermal_simulation_precision: Literal["LOW", "MIDDLE", "HIGH"] = "HIGH"
-    """Precision in the thermal simulation (method used to solve the model and float precision)"""
-
-    # minimum number of thermal measures per second
-    # TODO: Must be implemented in the simulation
-    # thermal_measure_rate: int = 1
+    thermal_simulation_precision: Literal["LOW", "MIDDLE", "HIGH", "EXACT"] = "HIGH"
+    """Precision in the thermal simulation (method used to solve the model and float precision). LOW uses the Euler
+    method, MIDDLE and HIGH the Runge-Kutta method, and EXACT the matrix exponential, that is exact for the linear
+    thermal model and is usually the fastest when the step sizes are repeated"""
+
+    thermal_simulation_engine: Literal["TCPN", "STRUCTURED_GRID"] = "TCPN"
+    """Engine used to simulate the thermal model. TCPN simulates it as a timed continuous Petri net (Model).
+    STRUCTURED_GRID simulates it with stencil operations over a dense grid (StructuredGridModel), that is much faster
+    with fine processor meshes. The structured grid doesn't support the EXACT precision, and isn't obtained from the
+    thermal model cache because it is built quickly"""
+
+    thermal_reduced_order_modes: Optional[int] = None
+    """If not None, the TCPN thermal model is reduced by modal truncation to this number of modes, and the temperatures
+    of the processor are only reconstructed when they are measured. It is much faster with fine processor meshes. The
+    simulation precision isn't used with a reduced model, because the reduced model is simulated exactly. The bound of
+    the error against the full model can be obtained with obtain_reduction_error_bound of the model"""
+
+    thermal_measure_rate: Optional[float] = None
+    """Number of temperature measures per second. If None, the temperature is measured in each step of the simulator
+    (each scheduling event). Otherwise, the thermal model is simulated with its own fixed step of
+    1 / thermal_measure_rate seconds, independent of the scheduling events, applying in each step the average power
+    consumed by the cores during it. It reduces the thermal simulation time and the measures stored. The step is
+    rounded to an integer number of cycles of the least common multiple of the available frequencies"""
+
+    thermal_measure_mode: Literal["FULL", "MAX"] = "FULL"
+    """FULL records the temperature of each unit cube of the processor in each measure (temperature_measures of the
+    simulation result). MAX only records the maximum temperature of each core and the board
+    (max_temperature_measures of the simulation result)"""
 
     simulate_memory_footprint: bool = False
     """Simulate tasks memory occupation"""
 
+    columnar_simulation_result: bool = False
+    """If true, the job sections and the temperature measures of the simulation result are stored in NumPy arrays
+    (ColumnarJobSectionsExecution and ColumnarTemperatureMeasures). It highly reduces the memory used by long
+    simulations. Only used if result_sink is None"""
+
+    result_sink: Optional[SimulationResultSink] = None
+    """Sink that receives the job sections, frequencies, scheduling points and temperature measures as they are
+    produced. The simulation result only contains the records returned by the sink. If None, an
+    InMemorySimulationResultSink is used"""
+
+    create_simulation_checkpoint: bool = False
+    """If true, the simulation result contains a checkpoint with the state of the simulator at the end of the
+    simulation (remaining cycles, active jobs, thermal state and scheduler), that can be used to resume it with
+    resume_scheduler_simulation"""
 
-def _create_deadline_arrive_dict(lcm_frequency: int, jobs: List[Job]) -> Tuple[Dict[int, List[int]],
-                                                                               Dict[int, List[int]]]:
+    cyclic_executive_fast_path: bool = True
+    """If true, the table of a CyclicExecutiveScheduler is expanded for all the major cycles of the simulation without
+    invoking the scheduler in each scheduling point. It is only used when the result is the same that invoking the
+    scheduler (without thermal and memory simulation, checkpoints, non preemptive jobs or deadline misses). Otherwise,
+    the scheduler is invoked as usual"""
+
+
+def _create_deadline_arrive_dict(lcm_frequency: int, jobs: List[Job]) -> Tuple[Deque[Tuple[int, List[int]]],
+                                                                               Deque[Tuple[int, List[int]]]]:
     """
-    Return a list ordered by arrive and by deadline of jobs containing the id of each job
+    Return the event calendars of the jobs activations and deadlines. Each calendar is ordered by the base cycle of the
+     event, so the next event is always in the head of the deque and can be consumed in O(1)
 
     :param lcm_frequency: Base frequency
     :param jobs: Jobs list
     :return:
-        Dict[activation base cycle, job id]
-        Dict[deadline base cycle, job id]
+        Deque[activation base cycle, jobs ids] ordered by activation base cycle
+        Deque[deadline base cycle, jobs ids] ordered by deadline base cycle
     """
     # Dict of activations
     activation_dict: Dict[int, List[int]] = {}
@@ -80,7 +134,63 @@ def _create_deadline_arrive_dict(lcm_frequency: int, jobs: List[Job]) -> Tuple[D
         else:
             deadlines_dict[normalized_absolute_deadline] = [i.identifier]
 
-    return activation_dict, deadlines_dict
+    return deque(sorted(activation_dict.items())), deque(sorted(deadlines_dict.items()))
+
+
+def _pop_events_until(events_calendar: Deque[Tuple[int, List[int]]], actual_lcm_cycle: int) \
+        -> List[Tuple[int, List[int]]]:
+    """
+    Remove from the head of the calendar all the events that happen before or in the actual cycle
+
+    :param events_calendar: Calendar of events ordered by base cycle
+    :param actual_lcm_cycle: Actual base cycle
+    :return: List[event base cycle, jobs ids] of the events removed
+    """
+    events = []
+    while len(events_calendar) > 0 and events_calendar[0][0] <= actual_lcm_cycle:
+        events.append(events_calendar.popleft())
+    return events
+
+
+def _record_temperature(result_sink: SimulationResultSink, cubed_space: Union[Model, StructuredGridModel],
+                        thermal_state: SimulationState, measure_time: float,
+                        thermal_measure_mode: Literal["FULL", "MAX"]):
+    """
+    Send a temperature measure of the processor to the sink
+
+    :param result_sink: Sink of the simulation
+    :param cubed_space: Thermal model of the processor
+    :param thermal_state: Actual thermal state
+    :param measure_time: Time of the measure in absolute seconds
+    :param thermal_measure_mode: Thermal measure mode of the simulation
+    """
+    cubes_temperatures = cubed_space.obtain_temperature(thermal_state)
+
+    if thermal_measure_mode == "MAX":
+        result_sink.on_max_temperature_measure(measure_time, {i: float(j) for i, j in
+                                                              obtain_max_temperature(cubes_temperatures).items()})
+    else:
+        result_sink.on_temperature_measure(measure_time, cubes_temperatures)
+
+
+def _apply_average_energy(cubed_space: Union[Model, StructuredGridModel], thermal_state: SimulationState,
+                          energy_points_cycles: Dict[int, int], step_lcm_cycles: int, lcm_frequency: int,
+                          number_of_cpus: int) -> SimulationState:
+    """
+    Simulate a step of the thermal model applying the average power of each external energy point
+
+    :param cubed_space: Thermal model of the processor
+    :param thermal_state: Actual thermal state
+    :param energy_points_cycles: Cycles of the base frequency that each external energy point has been active
+    :param step_lcm_cycles: Length of the step in cycles of the base frequency
+    :param lcm_frequency: Base frequency
+    :param number_of_cpus: Number of cores
+    :return: Thermal state after the step
+    """
+    return cubed_space.apply_energy(actual_state=thermal_state, amount_of_time=step_lcm_cycles / lcm_frequency,
+                                    external_energy_application_points_usage={
+                                        i: j / step_lcm_cycles for i, j in energy_points_cycles.items()},
+                                    internal_energy_application_points={i for i in range(number_of_cpus)})
 
 
 def execute_scheduler_simulation_simple(tasks: TaskSet,
@@ -127,28 +237,12 @@ def execute_scheduler_simulation_simple(tasks: TaskSet,
                                         simulation_options), periodic_tasks_jobs, major_cycle
 
 
-def execute_scheduler_simulation(jobs: List[Job],
-                                 tasks: TaskSet,
-                                 processor_definition: Processor,
-                                 environment_specification: Environment,
-                                 scheduler: Union[CentralizedScheduler],
-                                 simulation_options: SimulationConfiguration
-                                 = SimulationConfiguration(),
-                                 simulation_start_time: float = 0,
-                                 simulation_end_time: Optional[float] = None) -> RawSimulationResult:
+def _check_jobs_and_tasks(jobs: List[Job], tasks: TaskSet):
     """
-    Run a simulation using a centralized scheduler
+    Check that the jobs and tasks of a simulation are valid. Raise an exception otherwise
 
     :param jobs: Jobs in the system
-    :param simulation_start_time: Time in seconds where the system start to make decisions. Time 0 is the start of the
-     first major cycle
-    :param simulation_end_time: Time in seconds since the start of the first major cycle where the simulation ends.
-    :param tasks: Group of tasks in the system. If None it will be the major cycle
-    :param processor_definition: Definition of the CPU to use
-    :param environment_specification: Specification of the environment
-    :param scheduler: Centralized scheduler to use
-    :param simulation_options: Options of the simulation
-    :return: Simulation result
+    :param tasks: Group of tasks in the system
     """
     # Check jobs
     if len(jobs) == 0:
@@ -174,6 +268,36 @@ def execute_scheduler_simulation(jobs: List[Job],
     if len(tasks_ids) != len(tasks.tasks()):
         raise Exception("Tasks must have different ids")
 
+
+def execute_scheduler_simulation(jobs: List[Job],
+                                 tasks: TaskSet,
+                                 processor_definition: Processor,
+                                 environment_specification: Environment,
+                                 scheduler: Union[CentralizedScheduler],
+                                 simulation_options: SimulationConfiguration
+                                 = SimulationConfiguration(),
+                                 simulation_start_time: float = 0,
+                                 simulation_end_time: Optional[float] = None,
+                                 initial_thermal_state: Optional[SimulationState] = None) -> RawSimulationResult:
+    """
+    Run a simulation using a centralized scheduler
+
+    :param jobs: Jobs in the system
+    :param simulation_start_time: Time in seconds where the system start to make decisions. Time 0 is the start of the
+     first major cycle
+    :param simulation_end_time: Time in seconds since the start of the first major cycle where the simulation ends.
+    :param tasks: Group of tasks in the system. If None it will be the major cycle
+    :param processor_definition: Definition of the CPU to use
+    :param environment_specification: Specification of the environment
+    :param scheduler: Centralized scheduler to use
+    :param simulation_options: Options of the simulation
+    :param initial_thermal_state: Thermal state of the processor at the start of the simulation (i.e. the thermal_state
+     of a SimulationCheckpoint obtained after a warm-up). If None, the processor starts at the environment temperature.
+     Only used if the thermal behaviour is simulated
+    :return: Simulation result
+    """
+    _check_jobs_and_tasks(jobs, tasks)
+
     # Check start time
     if simulation_start_time < 0:
         raise Exception("Start time must be grater or equal than 0")
@@ -189,17 +313,56 @@ def execute_scheduler_simulation(jobs: List[Job],
     if isinstance(scheduler, CentralizedScheduler):
         return _execute_centralized_scheduler_simulation(jobs, tasks, processor_definition, environment_specification,
                                                          scheduler, simulation_options, simulation_start_time,
-                                                         simulation_end_time)
+                                                         simulation_end_time, None, initial_thermal_state)
     else:
         raise Exception("The scheduler type provided is not supported")
 
 
+def resume_scheduler_simulation(simulation_checkpoint: SimulationCheckpoint,
+                                jobs: List[Job],
+                                tasks: TaskSet,
+                                processor_definition: Processor,
+                                environment_specification: Environment,
+                                simulation_options: SimulationConfiguration
+                                = SimulationConfiguration(),
+                                simulation_end_time: Optional[float] = None) -> RawSimulationResult:
+    """
+    Resume a simulation from a checkpoint. The simulation continues from the time of the checkpoint with the scheduler,
+     remaining cycles, active jobs and thermal state of the checkpoint. The job sections being executed at the time of
+     the checkpoint are split in two sections, one in each simulation result.
+
+    The checkpoint isn't modified, so it can be resumed several times
+
+    :param simulation_checkpoint: Checkpoint obtained from a previous simulation with create_simulation_checkpoint
+    :param jobs: Jobs in the system. They must be the same of the simulation that created the checkpoint
+    :param tasks: Group of tasks in the system. They must be the same of the simulation that created the checkpoint
+    :param processor_definition: Definition of the CPU to use
+    :param environment_specification: Specification of the environment
+    :param simulation_options: Options of the simulation
+    :param simulation_end_time: Time in seconds since the start of the first major cycle where the simulation ends.
+    :return: Simulation result
+    """
+    _check_jobs_and_tasks(jobs, tasks)
+
+    # Check simulator end time
+    if simulation_end_time is None:
+        simulation_end_time = calculate_major_cycle(tasks)
+
+    if simulation_checkpoint.checkpoint_time >= simulation_end_time:
+        raise Exception("Checkpoint time must be lowest than end time")
+
+    return _execute_centralized_scheduler_simulation(jobs, tasks, processor_definition, environment_specification,
+                                                     copy.deepcopy(simulation_checkpoint.scheduler),
+                                                     simulation_options, simulation_checkpoint.checkpoint_time,
+                                                     simulation_end_time, simulation_checkpoint, None)
+
+
 def _generate_cubed_space(tasks: TaskSet,
                           processor_definition: Processor,
                           environment_specification: Environment,
                           simulation_options: SimulationConfiguration,
-                          board_thermal_id: int) -> Tuple[Model, SimulationState, Dict[Tuple[int, int], int],
-                                                          Dict[Tuple[int, int], int]]:
+                          board_thermal_id: int) -> Tuple[Union[Model, StructuredGridModel], SimulationState,
+                                                          Dict[Tuple[int, int], int], Dict[Tuple[int, int], int]]:
     """
     Generate a cubed space thermal simulator from the system specification
 
@@ -332,14 +495,29 @@ def _generate_cubed_space(tasks: TaskSet,
     else:
         external_heat_generators_dynamic_energy: Dict[int, TMExternal] = {}
 
-    cubed_space = Model(
+    model_options = {}
+
+    if simulation_options.thermal_simulation_engine == "STRUCTURED_GRID":
+        if simulation_options.thermal_reduced_order_modes is not None:
+            raise Exception("The structured grid engine doesn't support reduced order models")
+        model_constructor = StructuredGridModel
+    elif simulation_options.thermal_model_cache is not None:
+        model_constructor = simulation_options.thermal_model_cache.obtain_model
+    else:
+        model_constructor = Model
+
+    if simulation_options.thermal_reduced_order_modes is not None:
+        model_options["reduced_order_modes"] = simulation_options.thermal_reduced_order_modes
+
+    cubed_space = model_constructor(
         material_cubes=scene_definition,
         cube_edge_size=cube_edge_size,
         external_temperature_booster_points={**external_heat_generators_leakage_power,
                                              **external_heat_generators_dynamic_energy},
         internal_temperature_booster_points=internal_heat_generators_leakage_power,
         environment_properties=environment_specification.environment_properties,
-        simulation_precision=simulation_options.thermal_simulation_precision)
+        simulation_precision=simulation_options.thermal_simulation_precision,
+        **model_options)
 
     initial_state = cubed_space.create_initial_state(
         default_temperature=environment_specification.temperature,
@@ -349,6 +527,171 @@ def _generate_cubed_space(tasks: TaskSet,
     return cubed_space, initial_state, core_frequency_energy_activator_id, core_task_energy_activator_id
 
 
+def _expand_cyclic_executive_schedule(scheduling_table: CyclicExecutiveTable, jobs: List[Job],
+                                      number_of_cpus: int, lcm_frequency: int, cpu_frequency: int,
+                                      major_cycle_lcm: int, start_lcm_cycle: int, final_lcm_cycle: int) \
+        -> Optional[Tuple[numpy.ndarray, numpy.ndarray]]:
+    """
+    Expand the table of a cyclic executive scheduler for all the major cycles of the simulation, obtaining the job
+     sections and scheduling points that the simulation invoking the scheduler would obtain.
+
+    The table is only expanded when the result is the same: all the events happen in cycles of the CPU frequency, the
+     simulation starts in a major cycle, each table entry executes an active job (the last activated job of its task)
+     that isn't executed in other CPU, no job is non preemptive, and no job misses its deadline
+
+    :param scheduling_table: Table of the scheduler
+    :param jobs: Jobs in the system
+    :param number_of_cpus: Number of CPUs
+    :param lcm_frequency: Base frequency
+    :param cpu_frequency: Frequency of the CPUs
+    :param major_cycle_lcm: Major cycle in base cycles
+    :param start_lcm_cycle: Base cycle where the simulation starts
+    :param final_lcm_cycle: Base cycle where the simulation ends
+    :return: None if the table can't be expanded. Otherwise, Tuple of [
+     Job sections of type JOB_SECTIONS_EXECUTION_DTYPE, ordered by end time and CPU,
+     Times in seconds of the scheduling points
+    ]
+    """
+    # Base cycles in a CPU cycle
+    cycle_lcm = lcm_frequency // cpu_frequency
+
+    if len(jobs) == 0 or major_cycle_lcm % cycle_lcm != 0 or start_lcm_cycle % major_cycle_lcm != 0 or \
+            final_lcm_cycle % cycle_lcm != 0 or \
+            any(i.task.preemptive_execution == PreemptiveExecution.NON_PREEMPTIVE for i in jobs):
+        return None
+
+    # Table entries [point, cpu, task] in base cycles since the major cycle start
+    table_points = scheduling_table.scheduling_points
+
+    if len(table_points) == 0 or table_points[0] != 0 or table_points[-1] * cycle_lcm >= major_cycle_lcm or \
+            numpy.any(scheduling_table.assignations[number_of_cpus:] != -1):
+        return None
+
+    entries_point, entries_cpu = numpy.nonzero(scheduling_table.assignations.T != -1)
+    table_entries = numpy.stack([entries_point, entries_cpu,
+                                 scheduling_table.task_ids[scheduling_table.assignations[entries_cpu, entries_point]]],
+                                axis=1).astype(numpy.int64)
+
+    # Jobs data in base cycles
+    activation = numpy.asarray([round(i.activation_time * lcm_frequency) for i in jobs], dtype=numpy.int64)
+    deadline = numpy.asarray([round(i.absolute_deadline * lcm_frequency) for i in jobs], dtype=numpy.int64)
+    execution = numpy.asarray([i.execution_time for i in jobs], dtype=numpy.int64)
+    jobs_ids = numpy.asarray([i.identifier for i in jobs], dtype=numpy.int64)
+    tasks_ids = numpy.asarray([i.task.identifier for i in jobs], dtype=numpy.int64)
+
+    if numpy.any(activation % cycle_lcm != 0) or numpy.any(deadline % cycle_lcm != 0):
+        return None
+
+    # Scheduling points of all the major cycles, and the end of the interval that starts in each one
+    first_major_cycle = start_lcm_cycle // major_cycle_lcm
+    number_of_major_cycles = -((start_lcm_cycle - final_lcm_cycle) // major_cycle_lcm)
+    major_cycles = numpy.arange(first_major_cycle, first_major_cycle + number_of_major_cycles, dtype=numpy.int64)
+
+    points = (major_cycles[:, None] * major_cycle_lcm +
+              numpy.asarray(table_points, dtype=numpy.int64)[None, :] * cycle_lcm).reshape(-1)
+    points = points[points < final_lcm_cycle]
+    points_end = numpy.append(points[1:], final_lcm_cycle)
+
+    # Entries of all the major cycles, ordered by point
+    entries_point = (numpy.arange(number_of_major_cycles, dtype=numpy.int64)[:, None] * len(table_points) +
+                     table_entries[None, :, 0]).reshape(-1)
+    entries_cpu = numpy.tile(table_entries[:, 1], number_of_major_cycles)
+    entries_task = numpy.tile(table_entries[:, 2], number_of_major_cycles)
+
+    entries_in_simulation = entries_point < len(points)
+    entries_point = entries_point[entries_in_simulation]
+    entries_cpu = entries_cpu[entries_in_simulation]
+    entries_task = entries_task[entries_in_simulation]
+
+    # Each entry executes the last activated job of its task
+    entries_job = numpy.empty(len(entries_point), dtype=numpy.int64)
+
+    for task_id in numpy.unique(entries_task):
+        task_entries = numpy.flatnonzero(entries_task == task_id)
+        task_jobs = numpy.flatnonzero(tasks_ids == task_id)
+        task_jobs = task_jobs[numpy.argsort(activation[task_jobs], kind="stable")]
+
+        if len(task_jobs) == 0 or numpy.any(numpy.diff(activation[task_jobs]) == 0):
+            return None
+
+        last_activated = numpy.searchsorted(activation[task_jobs], points[entries_point[task_entries]],
+                                            side="right") - 1
+
+        if numpy.any(last_activated < 0):
+            return None
+
+        entries_job[task_entries] = task_jobs[last_activated]
+
+    # A job can't be executed in two CPUs at the same time
+    if len(numpy.unique(entries_point * len(jobs) + entries_job)) != len(entries_job):
+        return None
+
+    # Cycles executed by each entry, accumulating the cycles executed by the previous entries of the same job
+    entries_length = (points_end[entries_point] - points[entries_point]) // cycle_lcm
+    entries_remaining = numpy.empty(len(entries_point), dtype=numpy.int64)
+
+    if len(entries_point) > 0:
+        job_order = numpy.lexsort((entries_point, entries_job))
+        executed_before = numpy.cumsum(entries_length[job_order]) - entries_length[job_order]
+        job_first_entry = numpy.flatnonzero(numpy.diff(entries_job[job_order], prepend=-1) != 0)
+        executed_before -= numpy.repeat(executed_before[job_first_entry],
+                                        numpy.diff(numpy.append(job_first_entry, len(job_order))))
+        entries_remaining[job_order] = execution[entries_job[job_order]] - executed_before
+
+    # Finished jobs can't be executed
+    if numpy.any(entries_remaining <= 0):
+        return None
+
+    entries_executed = numpy.minimum(entries_remaining, entries_length)
+    entries_finish_job = entries_remaining <= entries_length
+
+    # Jobs end in base cycles. Not finished jobs never end, and jobs without cycles end in its activation
+    jobs_end = numpy.where(execution <= 0, activation, numpy.iinfo(numpy.int64).max)
+    jobs_end[entries_job[entries_finish_job]] = points[entries_point[entries_finish_job]] + \
+        entries_remaining[entries_finish_job] * cycle_lcm
+
+    if numpy.any((deadline < final_lcm_cycle) & (jobs_end > deadline)):
+        return None
+
+    # The scheduler is only invoked if there are active jobs. Otherwise, it isn't invoked again until the next major
+    # cycle, so no job can be activated until then
+    sorted_activation = numpy.sort(activation)
+    active_in_points = numpy.searchsorted(sorted_activation, points, side="right") - \
+        numpy.searchsorted(numpy.sort(jobs_end), points, side="right")
+    points_without_jobs = points[active_in_points <= 0]
+
+    if numpy.any(numpy.searchsorted(sorted_activation, (points_without_jobs // major_cycle_lcm + 1) * major_cycle_lcm,
+                                    side="left") >
+                 numpy.searchsorted(sorted_activation, points_without_jobs, side="right")):
+        return None
+
+    # Sections join the consecutive entries of a job in a CPU
+    cpu_order = numpy.lexsort((entries_point, entries_cpu))
+    cpu_point = entries_point[cpu_order]
+    cpu_job = entries_job[cpu_order]
+    section_start = numpy.ones(len(cpu_order), dtype=bool)
+    section_start[1:] = (entries_cpu[cpu_order][1:] != entries_cpu[cpu_order][:-1]) | \
+                        (cpu_point[1:] != cpu_point[:-1] + 1) | (cpu_job[1:] != cpu_job[:-1])
+    section_first = numpy.flatnonzero(section_start)
+    section_last = numpy.append(section_first[1:], len(cpu_order)) - 1
+
+    section_end = numpy.where(entries_finish_job[cpu_order][section_last], jobs_end[cpu_job[section_last]],
+                              points_end[cpu_point[section_last]])
+
+    sections = numpy.empty(len(section_first), dtype=JOB_SECTIONS_EXECUTION_DTYPE)
+    sections["cpu_id"] = entries_cpu[cpu_order][section_first]
+    sections["job_id"] = jobs_ids[cpu_job[section_first]]
+    sections["task_id"] = tasks_ids[cpu_job[section_first]]
+    sections["execution_start_time"] = points[cpu_point[section_first]] / lcm_frequency
+    sections["execution_end_time"] = section_end / lcm_frequency
+    sections["number_of_executed_cycles"] = numpy.add.reduceat(entries_executed[cpu_order], section_first) \
+        if len(section_first) > 0 else numpy.empty(0, dtype=numpy.int64)
+
+    sections = sections[numpy.lexsort((sections["cpu_id"], section_end))]
+
+    return sections, points[active_in_points > 0] / lcm_frequency
+
+
 def _execute_centralized_scheduler_simulation(jobs: List[Job],
                                               tasks: TaskSet,
                                               processor_definition: Processor,
@@ -356,9 +699,12 @@ def _execute_centralized_scheduler_simulation(jobs: List[Job],
                                               scheduler: CentralizedScheduler,
                                               simulation_options: SimulationConfiguration,
                                               simulation_start_time: float,
-                                              simulation_end_time: float) -> RawSimulationResult:
+                                              simulation_end_time: float,
+                                              simulation_checkpoint: Optional[SimulationCheckpoint],
+                                              initial_thermal_state: Optional[SimulationState]) -> RawSimulationResult:
     """
-    Run a simulation using a centralized scheduler
+    Run a simulation using a centralized scheduler. If the simulation is interrupted by an exception, the result sink
+    of the simulation options receives the on_simulation_abort event
 
     :param jobs: Jobs in the system
     :param simulation_start_time: Time in seconds where the system start to make decisions. Time 0 is the start of the
@@ -369,6 +715,37 @@ def _execute_centralized_scheduler_simulation(jobs: List[Job],
     :param environment_specification: Specification of the environment
     :param scheduler: Centralized scheduler to use
     :param simulation_options: Options of the simulation
+    :param simulation_checkpoint: If not None, the simulation is resumed from this checkpoint. The scheduler must be
+     the one of the checkpoint, and won't run its offline phase again
+    :param initial_thermal_state: Thermal state of the processor at the start of the simulation
+    :return: Simulation result
+    """
+    try:
+        return _run_centralized_scheduler_simulation(jobs, tasks, processor_definition, environment_specification,
+                                                     scheduler, simulation_options, simulation_start_time,
+                                                     simulation_end_time, simulation_checkpoint, initial_thermal_state)
+    except BaseException:
+        # The sink must release its resources and discard the records of the interrupted simulation
+        if simulation_options.result_sink is not None:
+            simulation_options.result_sink.on_simulation_abort()
+        raise
+
+
+def _run_centralized_scheduler_simulation(jobs: List[Job],
+                                          tasks: TaskSet,
+                                          processor_definition: Processor,
+                                          environment_specification: Environment,
+                                          scheduler: CentralizedScheduler,
+                                          simulation_options: SimulationConfiguration,
+                                          simulation_start_time: float,
+                                          simulation_end_time: float,
+                                          simulation_checkpoint: Optional[SimulationCheckpoint],
+                                          initial_thermal_state: Optional[SimulationState]) -> RawSimulationResult:
+    """
+    Run a simulation using a centralized scheduler
+
+    The parameters are the ones of _execute_centralized_scheduler_simulation
+
     :return: Simulation result
     """
     # Possible frequencies
@@ -394,6 +771,15 @@ def _execute_centralized_scheduler_simulation(jobs: List[Job],
                                    hard_real_time_deadline_missed_stack_trace=None,
                                    memory_usage_record=None)
 
+    # Thermal measure rate
+    if simulation_options.thermal_measure_rate is not None and simulation_options.thermal_measure_rate <= 0:
+        return RawSimulationResult(have_been_scheduled=False,
+                                   scheduler_acceptance_error_message="thermal measure rate must be greater than 0",
+                                   job_sections_execution={}, cpus_frequencies={},
+                                   scheduling_points=[], temperature_measures={},
+                                   hard_real_time_deadline_missed_stack_trace=None,
+                                   memory_usage_record=None)
+
     # Number of cpus
     number_of_cpus = len(processor_definition.cores_definition)
 
@@ -409,27 +795,35 @@ def _execute_centralized_scheduler_simulation(jobs: List[Job],
                                    hard_real_time_deadline_missed_stack_trace=None,
                                    memory_usage_record=None)
 
-    # Check if scheduler is capable of execute task set
-    can_schedule, error_message = scheduler.check_schedulability(processor_definition, environment_specification, tasks)
-
-    if not can_schedule:
-        return RawSimulationResult(have_been_scheduled=False,
-                                   scheduler_acceptance_error_message="the scheduler can't schedule"
-                                   if error_message is None else error_message,
-                                   job_sections_execution={}, cpus_frequencies={},
-                                   scheduling_points=[], temperature_measures={},
-                                   hard_real_time_deadline_missed_stack_trace=None,
-                                   memory_usage_record=None)
-
-    # Run scheduler offline phase
-    cpu_frequency = scheduler.offline_stage(processor_definition, environment_specification, tasks)
+    if simulation_checkpoint is None:
+        # Check if scheduler is capable of execute task set
+        can_schedule, error_message = scheduler.check_schedulability(processor_definition, environment_specification,
+                                                                     tasks)
+
+        if not can_schedule:
+            return RawSimulationResult(have_been_scheduled=False,
+                                       scheduler_acceptance_error_message="the scheduler can't schedule"
+                                       if error_message is None else error_message,
+                                       job_sections_execution={}, cpus_frequencies={},
+                                       scheduling_points=[], temperature_measures={},
+                                       hard_real_time_deadline_missed_stack_trace=None,
+                                       memory_usage_record=None)
+
+        # Run scheduler offline phase
+        cpu_frequency = scheduler.offline_stage(processor_definition, environment_specification, tasks)
+    else:
+        # The scheduler of the checkpoint has already run its offline phase
+        cpu_frequency = simulation_checkpoint.cpu_frequency
 
     # Create data structures for the simulation
     # Max frequency
     lcm_frequency = list_int_lcm(list(available_frequencies))
 
-    # Dict with activation and deadlines
-    activation_dict, deadlines_dict = _create_deadline_arrive_dict(lcm_frequency, jobs)
+    if simulation_checkpoint is not None and simulation_checkpoint.lcm_frequency != lcm_frequency:
+        raise Exception("The checkpoint was created with a processor with different frequencies")
+
+    # Calendars with activation and deadlines
+    activation_calendar, deadlines_calendar = _create_deadline_arrive_dict(lcm_frequency, jobs)
 
     # Jobs CC dict by id (this value is constant and only should be used for fast access to the original cc)
     jobs_cc_dict: Dict[int, int] = {i.identifier: i.execution_time for i in jobs}
@@ -469,12 +863,39 @@ def _execute_centralized_scheduler_simulation(jobs: List[Job],
     jobs_being_executed_id: Dict[int, int] = {}
 
     #  Raw execution result tables
-    job_sections_execution: Dict[int, List[JobSectionExecution]] = {i: [] for i in range(
-        number_of_cpus)}  # List of jobs executed by each core
-    cpus_frequencies: Dict[int, List[CPUUsedFrequency]] = {i: [] for i in range(
-        number_of_cpus)}  # List of CPU frequencies used by each core
-    scheduling_points: List[float] = []  # Points where the scheduler have made an scheduling
-    temperature_measures: Dict[float, Dict[int, PhysicalCuboid]] = {}  # Measures of temperature
+    # Jobs executed by each core, CPU frequencies used by each core, points where the scheduler have made an
+    # scheduling and measures of temperature are sent to the sink
+    result_sink: SimulationResultSink = simulation_options.result_sink if simulation_options.result_sink is not None \
+        else InMemorySimulationResultSink(simulation_options.columnar_simulation_result)
+    result_sink.on_simulation_start(list(range(number_of_cpus)))
+
+    # Cyclic executive schedulers table can be expanded for all the major cycles without invoking the scheduler
+    cyclic_executive_schedule = _expand_cyclic_executive_schedule(
+        scheduler.get_scheduling_table(), jobs, number_of_cpus, lcm_frequency, cpu_frequency, major_cycle_lcm,
+        actual_lcm_cycle, final_lcm_cycle) \
+        if simulation_options.cyclic_executive_fast_path and isinstance(scheduler, CyclicExecutiveScheduler) and \
+        simulation_checkpoint is None and not simulation_options.simulate_thermal_behaviour and \
+        not simulation_options.simulate_memory_footprint and not simulation_options.create_simulation_checkpoint and \
+        cpu_frequency in available_frequencies else None
+
+    if cyclic_executive_schedule is not None:
+        job_sections_execution, scheduling_points = cyclic_executive_schedule
+        result_sink.on_job_sections_execution(job_sections_execution)
+        result_sink.on_scheduling_points(scheduling_points)
+
+        for i in range(number_of_cpus):
+            result_sink.on_cpu_frequency_used(i, CPUUsedFrequency(cpu_frequency, simulation_start_time,
+                                                                 simulation_end_time))
+
+        result_sink.on_simulation_end()
+
+        return RawSimulationResult(have_been_scheduled=True, scheduler_acceptance_error_message=None,
+                                   job_sections_execution=result_sink.obtain_job_sections_execution(),
+                                   cpus_frequencies=result_sink.obtain_cpus_frequencies(),
+                                   scheduling_points=result_sink.obtain_scheduling_points(),
+                                   temperature_measures=result_sink.obtain_temperature_measures(),
+                                   hard_real_time_deadline_missed_stack_trace=None,
+                                   memory_usage_record=None)
 
     # Jobs being executed extra information [CPU, [start time]]
     jobs_last_section_start_time: Dict[int, float] = {i.identifier: -1 for i in jobs}
@@ -495,7 +916,7 @@ def _execute_centralized_scheduler_simulation(jobs: List[Job],
     memory_usage_record: Dict[float, int] = {}
 
     # Energy management objects
-    cubed_space: Optional[Model] = None
+    cubed_space: Optional[Union[Model, StructuredGridModel]] = None
     initial_state: Optional[SimulationState] = None
     core_frequency_energy_activator: Optional[Dict[Tuple[int, int], int]] = None
     core_task_energy_activator: Optional[Dict[Tuple[int, int], int]] = None
@@ -506,18 +927,59 @@ def _execute_centralized_scheduler_simulation(jobs: List[Job],
             tasks, processor_definition, environment_specification,
             simulation_options, board_thermal_id)
 
+        if initial_thermal_state is not None:
+            initial_state = cubed_space.restore_state(initial_thermal_state)
+
+    # Restore the state of the simulator from the checkpoint
+    if simulation_checkpoint is not None:
+        if remaining_cc_dict.keys() != simulation_checkpoint.remaining_cc_dict.keys():
+            raise Exception("The jobs of the checkpoint are not the jobs of the simulation")
+
+        actual_lcm_cycle = simulation_checkpoint.actual_lcm_cycle
+        activation_calendar = deque(simulation_checkpoint.activation_calendar)
+        deadlines_calendar = deque(simulation_checkpoint.deadlines_calendar)
+        remaining_cc_dict = simulation_checkpoint.remaining_cc_dict.copy()
+        active_jobs = simulation_checkpoint.active_jobs.copy()
+        jobs_being_executed_id = simulation_checkpoint.jobs_being_executed_id.copy()
+        jobs_last_cpu_used.update(simulation_checkpoint.jobs_last_cpu_used)
+        next_scheduling_point = simulation_checkpoint.next_scheduling_point
+        memory_usage = simulation_checkpoint.memory_usage
+
+        # The sections of the jobs in execution start again in the checkpoint
+        for i in jobs_being_executed_id.values():
+            jobs_last_section_start_time[i] = simulation_start_time
+            jobs_last_preemption_remaining_cycles[i] = remaining_cc_dict[i]
+
+        if simulation_options.simulate_thermal_behaviour:
+            if simulation_checkpoint.thermal_state is None:
+                raise Exception("The checkpoint doesn't contain a thermal state")
+            initial_state = cubed_space.restore_state(simulation_checkpoint.thermal_state)
+
+    # Thermal steps with a fixed measure rate, in cycles of the base frequency
+    thermal_measure_period: Optional[int] = max(1, round(lcm_frequency / simulation_options.thermal_measure_rate)) \
+        if simulation_options.simulate_thermal_behaviour and simulation_options.thermal_measure_rate is not None \
+        else None
+    last_thermal_measure_lcm_cycle: int = actual_lcm_cycle
+    next_thermal_measure_lcm_cycle: int = actual_lcm_cycle + (thermal_measure_period
+                                                              if thermal_measure_period is not None else 0)
+
+    # Cycles of the base frequency that each external energy point has been active since the last thermal measure
+    thermal_energy_points_cycles: Dict[int, int] = {}
+
+    if thermal_measure_period is not None:
+        _record_temperature(result_sink, cubed_space, initial_state, actual_lcm_cycle / lcm_frequency,
+                            simulation_options.thermal_measure_mode)
+
     # Main control loop
     while actual_lcm_cycle < final_lcm_cycle and not hard_rt_task_miss_deadline and \
-            len(active_jobs) + len(activation_dict) > 0:
+            len(active_jobs) + len(activation_calendar) > 0:
         # Actual time in seconds
         actual_time_seconds = actual_lcm_cycle / lcm_frequency
 
-        # Record temperature
-        if simulation_options.simulate_thermal_behaviour:
-            cubes_temperatures = cubed_space.obtain_temperature(initial_state)
-            temperature_measures[actual_time_seconds] = cubes_temperatures
-            cores_max_temperature = obtain_max_temperature(cubes_temperatures)
-            cores_max_temperature.pop(board_thermal_id)
+        # Record temperature in each step if it hasn't a fixed measure rate
+        if simulation_options.simulate_thermal_behaviour and thermal_measure_period is None:
+            _record_temperature(result_sink, cubed_space, initial_state, actual_time_seconds,
+                                simulation_options.thermal_measure_mode)
 
         # Record memory usage
         if simulation_options.simulate_memory_footprint:
@@ -528,10 +990,9 @@ def _execute_centralized_scheduler_simulation(jobs: List[Job],
             if actual_lcm_cycle % major_cycle_lcm == 0 else False
 
         # Job activation events
-        activated_this_cycle = [(i, j) for i, j in activation_dict.items() if i <= actual_lcm_cycle]
+        activated_this_cycle = _pop_events_until(activation_calendar, actual_lcm_cycle)
 
-        for i, j in activated_this_cycle:
-            activation_dict.pop(i)
+        for _, j in activated_this_cycle:
             for k in j:
                 active_jobs.add(k)
 
@@ -542,7 +1003,10 @@ def _execute_centralized_scheduler_simulation(jobs: List[Job],
         activation_event_require_scheduling = any(activation_event_require_scheduling_list)
 
         # Job end event
-        jobs_that_have_end = [i for i in active_jobs if remaining_cc_dict[i] == 0]
+        # Only the jobs in execution, or those just activated, can have reached zero remaining cycles
+        jobs_that_have_end = [i for i in itertools.chain(jobs_being_executed_id.values(),
+                                                         (k for _, j in activated_this_cycle for k in j))
+                              if remaining_cc_dict[i] == 0 and i in active_jobs]
 
         for i in jobs_that_have_end:
             active_jobs.remove(i)
@@ -551,9 +1015,10 @@ def _execute_centralized_scheduler_simulation(jobs: List[Job],
             # Remove it from executed tasks
             job_cpu_used = jobs_last_cpu_used[i]
             jobs_being_executed_id.pop(job_cpu_used)
-            job_sections_execution[job_cpu_used].append(
-                (JobSectionExecution(i, jobs_to_task_dict[i], jobs_last_section_start_time[i], actual_time_seconds,
-                                     jobs_last_preemption_remaining_cycles[i] - remaining_cc_dict[i])))
+            result_sink.on_job_section_execution(
+                job_cpu_used, JobSectionExecution(i, jobs_to_task_dict[i], jobs_last_section_start_time[i],
+                                                  actual_time_seconds,
+                                                  jobs_last_preemption_remaining_cycles[i] - remaining_cc_dict[i]))
 
             # Remove job from memory
             if simulation_options.simulate_memory_footprint:
@@ -563,10 +1028,7 @@ def _execute_centralized_scheduler_simulation(jobs: List[Job],
             if len(jobs_that_have_end) > 0 else False
 
         # Job missed deadline events
-        deadline_this_cycle = [(i, j) for i, j in deadlines_dict.items() if i <= actual_lcm_cycle]
-
-        for i, _ in deadline_this_cycle:
-            deadlines_dict.pop(i)
+        deadline_this_cycle = _pop_events_until(deadlines_calendar, actual_lcm_cycle)
 
         jobs_deadline_this_cycle: List[int] = list(itertools.chain(*[j for _, j in deadline_this_cycle]))
 
@@ -580,9 +1042,10 @@ def _execute_centralized_scheduler_simulation(jobs: List[Job],
 
             if jobs_being_executed_id.__contains__(job_cpu_used) and jobs_being_executed_id[job_cpu_used] == i:
                 jobs_being_executed_id.pop(job_cpu_used)
-                job_sections_execution[job_cpu_used].append(
-                    (JobSectionExecution(i, jobs_to_task_dict[i], jobs_last_section_start_time[i], actual_time_seconds,
-                                         jobs_last_preemption_remaining_cycles[i] - remaining_cc_dict[i])))
+                result_sink.on_job_section_execution(
+                    job_cpu_used, JobSectionExecution(i, jobs_to_task_dict[i], jobs_last_section_start_time[i],
+                                                      actual_time_seconds,
+                                                      jobs_last_preemption_remaining_cycles[i] - remaining_cc_dict[i]))
 
                 # Remove job from memory
                 if simulation_options.simulate_memory_footprint:
@@ -645,10 +1108,10 @@ def _execute_centralized_scheduler_simulation(jobs: List[Job],
             # Check if a task is preempted
             for i, j in jobs_being_executed_id.items():
                 if not jobs_being_executed_id_next.__contains__(i) or jobs_being_executed_id_next[i] != j:
-                    job_sections_execution[i].append(
-                        (JobSectionExecution(j, jobs_to_task_dict[j], jobs_last_section_start_time[j],
-                                             actual_time_seconds,
-                                             jobs_last_preemption_remaining_cycles[j] - remaining_cc_dict[j])))
+                    result_sink.on_job_section_execution(
+                        i, JobSectionExecution(j, jobs_to_task_dict[j], jobs_last_section_start_time[j],
+                                               actual_time_seconds,
+                                               jobs_last_preemption_remaining_cycles[j] - remaining_cc_dict[j]))
 
             # Check new tasks in execution
             for i, j in jobs_being_executed_id_next.items():
@@ -659,8 +1122,8 @@ def _execute_centralized_scheduler_simulation(jobs: List[Job],
             # Check if frequency have changed
             if cores_frequency_next != cpu_frequency:
                 for i in range(number_of_cpus):
-                    cpus_frequencies[i].append(
-                        CPUUsedFrequency(cores_frequency_next, last_frequency_set_time, actual_time_seconds))
+                    result_sink.on_cpu_frequency_used(
+                        i, CPUUsedFrequency(cores_frequency_next, last_frequency_set_time, actual_time_seconds))
 
                 last_frequency_set_time = actual_time_seconds
 
@@ -670,7 +1133,7 @@ def _execute_centralized_scheduler_simulation(jobs: List[Job],
                                + sum(jobs_memory_consumption[i] for i in jobs_being_executed_id_next.values())
 
             # Update RawSimulationResult tables
-            scheduling_points.append(actual_time_seconds)
+            result_sink.on_scheduling_point(actual_time_seconds)
 
             # Update frequency and executed tasks
             cpu_frequency = cores_frequency_next
@@ -681,6 +1144,11 @@ def _execute_centralized_scheduler_simulation(jobs: List[Job],
             for i, j in jobs_being_executed_id.items():
                 jobs_last_cpu_used[j] = i
 
+        # A scheduling point without active jobs is discarded. The scheduler will be invoked in the next event that
+        # requires it
+        if next_scheduling_point is not None and next_scheduling_point <= actual_lcm_cycle:
+            next_scheduling_point = None
+
         # In case that it has been missed the state of the variables must keep without alteration
         if not hard_rt_task_miss_deadline:
             # Next cycle == min(keys(activation_dict), keys(deadline_dict), remaining cycles)
@@ -690,11 +1158,14 @@ def _execute_centralized_scheduler_simulation(jobs: List[Job],
                     lcm_frequency // cpu_frequency) + actual_lcm_cycle if len(
                 jobs_being_executed_id) > 0 else next_major_cycle
 
-            next_job_deadline: int = min(deadlines_dict.keys()) if len(deadlines_dict) != 0 else next_major_cycle
+            next_job_deadline: int = deadlines_calendar[0][0] if len(deadlines_calendar) != 0 else next_major_cycle
 
-            next_job_activation: int = min(activation_dict.keys()) if len(activation_dict) != 0 else next_major_cycle
+            next_job_activation: int = activation_calendar[0][0] if len(activation_calendar) != 0 \
+                else next_major_cycle
 
-            next_lcm_cycle: int = min([next_major_cycle, next_job_end, next_job_deadline, next_job_activation] + (
+            # The simulation stops at the end time, so a checkpoint can be taken at any time
+            next_lcm_cycle: int = min([next_major_cycle, next_job_end, next_job_deadline, next_job_activation,
+                                       final_lcm_cycle] + (
                 [next_scheduling_point] if next_scheduling_point is not None else []))
 
             # This is just ceil((next_lcm_cycle - actual_lcm_cycle) / cpu_frequency) to advance an integer number
@@ -719,37 +1190,99 @@ def _execute_centralized_scheduler_simulation(jobs: List[Job],
                 else:
                     external_energy_point_execution = set()
 
-                # Apply energy
-                initial_state = cubed_space.apply_energy(actual_state=initial_state,
-                                                         amount_of_time=cc_to_advance / cpu_frequency,
-                                                         external_energy_application_points=Set.union(
-                                                             external_energy_point_execution,
-                                                             {i for i in range(number_of_cpus)}),
-                                                         internal_energy_application_points={i for i in
-                                                                                             range(number_of_cpus)})
+                if thermal_measure_period is None:
+                    # Apply energy
+                    initial_state = cubed_space.apply_energy(actual_state=initial_state,
+                                                             amount_of_time=cc_to_advance / cpu_frequency,
+                                                             external_energy_application_points=Set.union(
+                                                                 external_energy_point_execution,
+                                                                 {i for i in range(number_of_cpus)}),
+                                                             internal_energy_application_points={i for i in
+                                                                                                 range(number_of_cpus)})
+                else:
+                    # Accumulate the cycles that each energy point is active, and apply the average energy in each
+                    # thermal step that ends before the next simulation point
+                    section_start = actual_lcm_cycle
+                    next_simulation_point = actual_lcm_cycle + (lcm_frequency // cpu_frequency) * cc_to_advance
+
+                    while section_start < next_simulation_point:
+                        section_end = min(next_simulation_point, next_thermal_measure_lcm_cycle)
+
+                        for i in itertools.chain(external_energy_point_execution, range(number_of_cpus)):
+                            thermal_energy_points_cycles[i] = thermal_energy_points_cycles.get(i, 0) + \
+                                                              section_end - section_start
+
+                        section_start = section_end
+
+                        if section_end == next_thermal_measure_lcm_cycle:
+                            initial_state = _apply_average_energy(cubed_space, initial_state,
+                                                                  thermal_energy_points_cycles,
+                                                                  section_end - last_thermal_measure_lcm_cycle,
+                                                                  lcm_frequency, number_of_cpus)
+                            _record_temperature(result_sink, cubed_space, initial_state, section_end / lcm_frequency,
+                                                simulation_options.thermal_measure_mode)
+                            thermal_energy_points_cycles = {}
+                            last_thermal_measure_lcm_cycle = section_end
+                            next_thermal_measure_lcm_cycle += thermal_measure_period
 
             # Update actual_lcm_cycle
             actual_lcm_cycle += (lcm_frequency // cpu_frequency) * cc_to_advance
 
+    # Apply the energy since the last thermal measure with a fixed measure rate
+    thermal_measure_pending = thermal_measure_period is not None and \
+        actual_lcm_cycle > last_thermal_measure_lcm_cycle
+
+    if thermal_measure_pending:
+        initial_state = _apply_average_energy(cubed_space, initial_state, thermal_energy_points_cycles,
+                                              actual_lcm_cycle - last_thermal_measure_lcm_cycle, lcm_frequency,
+                                              number_of_cpus)
+
+    # Save the state of the simulator before closing the sections in execution
+    simulation_end_checkpoint: Optional[SimulationCheckpoint] = SimulationCheckpoint(
+        checkpoint_time=actual_lcm_cycle / lcm_frequency,
+        actual_lcm_cycle=actual_lcm_cycle,
+        lcm_frequency=lcm_frequency,
+        cpu_frequency=cpu_frequency,
+        remaining_cc_dict=remaining_cc_dict.copy(),
+        active_jobs=active_jobs.copy(),
+        jobs_being_executed_id=jobs_being_executed_id.copy(),
+        jobs_last_cpu_used={i: j for i, j in jobs_last_cpu_used.items() if j != -1},
+        next_scheduling_point=next_scheduling_point,
+        activation_calendar=list(activation_calendar),
+        deadlines_calendar=list(deadlines_calendar),
+        memory_usage=memory_usage,
+        thermal_state=SimulationState(initial_state.places_mo_vector.copy()) if initial_state is not None else None,
+        scheduler=copy.deepcopy(scheduler)
+    ) if simulation_options.create_simulation_checkpoint and not hard_rt_task_miss_deadline else None
+
     # In the last cycle update RawSimulationResult tables (All jobs being executed)
     for i, j in jobs_being_executed_id.items():
-        job_sections_execution[i].append(
-            (JobSectionExecution(j, jobs_to_task_dict[j], jobs_last_section_start_time[j],
-                                 actual_lcm_cycle / lcm_frequency,
-                                 jobs_last_preemption_remaining_cycles[j] - remaining_cc_dict[j])))
+        result_sink.on_job_section_execution(
+            i, JobSectionExecution(j, jobs_to_task_dict[j], jobs_last_section_start_time[j],
+                                   actual_lcm_cycle / lcm_frequency,
+                                   jobs_last_preemption_remaining_cycles[j] - remaining_cc_dict[j]))
 
     # Record temperature
-    if simulation_options.simulate_thermal_behaviour:
-        cubes_temperatures = cubed_space.obtain_temperature(initial_state)
-        temperature_measures[actual_lcm_cycle / lcm_frequency] = cubes_temperatures
+    if simulation_options.simulate_thermal_behaviour and (thermal_measure_period is None or thermal_measure_pending):
+        _record_temperature(result_sink, cubed_space, initial_state, actual_lcm_cycle / lcm_frequency,
+                            simulation_options.thermal_measure_mode)
 
     # In the last cycle update RawSimulationResult tables (Used frequencies)
     for i in range(number_of_cpus):
-        cpus_frequencies[i].append(CPUUsedFrequency(cpu_frequency, last_frequency_set_time, simulation_end_time))
+        result_sink.on_cpu_frequency_used(i, CPUUsedFrequency(cpu_frequency, last_frequency_set_time,
+                                                             simulation_end_time))
+
+    result_sink.on_simulation_end()
 
     return RawSimulationResult(have_been_scheduled=True, scheduler_acceptance_error_message=None,
-                               job_sections_execution=job_sections_execution, cpus_frequencies=cpus_frequencies,
-                               scheduling_points=scheduling_points, temperature_measures=temperature_measures,
+                               job_sections_execution=result_sink.obtain_job_sections_execution(),
+                               cpus_frequencies=result_sink.obtain_cpus_frequencies(),
+                               scheduling_points=result_sink.obtain_scheduling_points(),
+                               temperature_measures=result_sink.obtain_temperature_measures(),
                                hard_real_time_deadline_missed_stack_trace=hard_real_time_deadline_missed_stack_trace,
                                memory_usage_record=memory_usage_record if simulation_options.simulate_memory_footprint
-                               else None)
+                               else None,
+                               max_temperature_measures=result_sink.obtain_max_temperature_measures()
+                               if simulation_options.simulate_thermal_behaviour and
+                               simulation_options.thermal_measure_mode == "MAX" else None,
+                               simulation_checkpoint=simulation_end_checkpoint)
@@ -11,9 +11,13 @@ This module exposes the following classes:
 - :class:`.AbstractTCPNSimulatorFixedStep`
 - :class:`.TCPNSimulatorVariableStepEuler`
 - :class:`.TCPNSimulatorVariableStepRK`
+- :class:`.SVSExponential`
+- :class:`.SFSOperator`
 """
 
 from ._tcpn_simulator import TCPNSimulator, SVariableStep, \
     SFixedStep
 from ._tcpn_simulator_variable_step_euler import SVSEuler
 from ._tcpn_simulator_variable_step_rk import SVSRungeKutta
+from ._tcpn_simulator_variable_step_exponential import SVSExponential
+from ._tcpn_simulator_fixed_step_operator import SFSOperator
@@ -1,4 +1,5 @@
 import abc
+from typing import Tuple, Optional
 
 import numpy
 
@@ -24,31 +25,182 @@ class TCPNSimulator(object, metaclass=abc.ABCMeta):
         """
         Calculate pi
 
+        For each transition, pi selects the input place with the maximum ratio between the weight of its arc and its
+        mark (the first one if several places have the same ratio), with value the inverse of the weight in the type of
+        pre. Transitions with an empty input place don't have any entry
+
+        :param pre: pre matrix
+        :param mo: actual marking
+        :return: pi
+        """
+        pre = pre.tocsc()
+        pre.eliminate_zeros()
+        pre.sort_indices()
+
+        places, values = TCPNSimulator.__calculate_pi_entries(pre, numpy.asarray(mo).reshape(-1))
+
+        return TCPNSimulator.__build_pi(places, values, pre.shape)
+
+    @staticmethod
+    def _update_pi(pre: scipy.sparse.csr_matrix, mo: numpy.ndarray, previous_mo: numpy.ndarray,
+                   pi: scipy.sparse.csr_matrix) -> scipy.sparse.csr_matrix:
+        """
+        Update the pi calculated with a previous marking to an actual marking.
+
+        Pi only changes for the transitions with an input place whose mark changes its sign (it becomes empty, stops
+        being empty or changes between positive and negative, which changes the sign of the ratio), and for the
+        transitions with several input places (the place with the maximum ratio can change). Only those transitions
+        are recalculated
+
+        :param pre: pre matrix
+        :param mo: actual marking
+        :param previous_mo: marking used to calculate pi
+        :param pi: pi of the previous marking
+        :return: pi of the actual marking
+        """
+        mo = numpy.asarray(mo).reshape(-1)
+        previous_mo = numpy.asarray(previous_mo).reshape(-1)
+
+        pre = pre.tocsc()
+        pre.eliminate_zeros()
+        pre.sort_indices()
+
+        places_crossing_zero = numpy.flatnonzero(numpy.sign(mo) != numpy.sign(previous_mo))
+        transitions_with_several_inputs = numpy.flatnonzero(numpy.diff(pre.indptr) > 1)
+
+        if len(places_crossing_zero) == 0 and len(transitions_with_several_inputs) == 0:
+            return pi
+
+        affected_transitions = numpy.union1d(
+            transitions_with_several_inputs,
+            pre.tocsr()[places_crossing_zero, :].indices if len(places_crossing_zero) > 0 else numpy.zeros(0, int))
+
+        # Place and value of each transition in the previous pi
+        pi = pi.tocsr()
+        places = numpy.full(pre.shape[1], -1, dtype=numpy.int64)
+        values = numpy.zeros(pre.shape[1], dtype=pi.dtype)
+        transitions_with_entry = numpy.flatnonzero(numpy.diff(pi.indptr) > 0)
+        places[transitions_with_entry] = pi.indices[pi.indptr[transitions_with_entry]]
+        values[transitions_with_entry] = pi.data[pi.indptr[transitions_with_entry]]
+
+        places[affected_transitions], values[affected_transitions] = TCPNSimulator.__calculate_pi_entries(
+            pre[:, affected_transitions], mo)
+
+        return TCPNSimulator.__build_pi(places, values, pre.shape)
+
+    @staticmethod
+    def _update_a(c: scipy.sparse.csc_matrix, lambda_vector: numpy.ndarray, pi: scipy.sparse.csr_matrix,
+                  control: numpy.ndarray, previous_control: numpy.ndarray,
+                  previous_a: scipy.sparse.csr_matrix) -> scipy.sparse.csr_matrix:
+        """
+        Update the A matrix calculated with a previous control to an actual control.
+
+        A = C * diag(lambda * control) * pi, so a change in the control of a transition only adds the product of its
+        column of C and its row of pi. If few transitions change, only their contribution is added to the previous A.
+        Otherwise A is calculated again
+
+        :param c: incidence matrix (post - pre), preferably by columns
+        :param lambda_vector: lambda vector
+        :param pi: pi matrix, preferably by rows
+        :param control: actual control
+        :param previous_control: control used to calculate the previous A
+        :param previous_a: A of the previous control
+        :return: A of the actual control
+        """
+        changed_transitions = numpy.flatnonzero(control != previous_control)
+
+        if len(changed_transitions) == 0:
+            return previous_a
+
+        if len(changed_transitions) > len(control) // 8:
+            return (c.dot(scipy.sparse.diags(lambda_vector * control))).dot(pi).tocsr()
+
+        lambda_increment = lambda_vector[changed_transitions] * (control[changed_transitions] -
+                                                                 previous_control[changed_transitions])
+
+        return (previous_a + (c[:, changed_transitions].dot(scipy.sparse.diags(lambda_increment))).dot(
+            pi[changed_transitions, :])).tocsr()
+
+    @staticmethod
+    def __calculate_pi_entries(pre: scipy.sparse.csc_matrix, mo: numpy.ndarray) -> Tuple[numpy.ndarray,
+                                                                                         numpy.ndarray]:
+        """
+        Calculate the entry of pi of each transition in a single pass over the arcs of pre
+
+        :param pre: pre matrix in CSC format without explicit zeros and with sorted indices
         :param mo: actual marking
+        :return: place of the entry of each transition (-1 if the transition doesn't have entry) and value of the entry
+        """
+        number_of_transitions = pre.shape[1]
+        arcs_transition = numpy.repeat(numpy.arange(number_of_transitions), numpy.diff(pre.indptr))
+        arcs_mark = mo[pre.indices]
+
+        # Transitions with an empty input place don't have entry
+        disabled_transitions = numpy.zeros(number_of_transitions, dtype=bool)
+        disabled_transitions[arcs_transition[arcs_mark == 0]] = True
+
+        # Only the arcs with a positive ratio can be selected
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            arcs_ratio = pre.data / arcs_mark
+        valid_arcs = numpy.flatnonzero((arcs_mark != 0) & (arcs_ratio > 0) & ~disabled_transitions[arcs_transition])
+
+        # Order the arcs by transition, then by decreasing ratio and then by place, so the first arc of each
+        # transition is the selected one
+        order = valid_arcs[numpy.lexsort((pre.indices[valid_arcs], -arcs_ratio[valid_arcs],
+                                          arcs_transition[valid_arcs]))]
+        first_arcs = order[numpy.concatenate([[True], arcs_transition[order[1:]] != arcs_transition[order[:-1]]])] \
+            if len(order) > 0 else order
+
+        places = numpy.full(number_of_transitions, -1, dtype=numpy.int64)
+        values = numpy.zeros(number_of_transitions, dtype=pre.dtype)
+        places[arcs_transition[first_arcs]] = pre.indices[first_arcs]
+        values[arcs_transition[first_arcs]] = 1 / pre.data[first_arcs]
+
+        return places, values
+
+    @staticmethod
+    def __build_pi(places: numpy.ndarray, values: numpy.ndarray, pre_shape: Tuple[int, int]) \
+            -> scipy.sparse.csr_matrix:
+        """
+        Build pi from the entry of each transition
+
+        :param places: place of the entry of each transition (-1 if the transition doesn't have entry)
+        :param values: value of the entry of each transition
+        :param pre_shape: shape of pre
         :return: pi
         """
-        pi = scipy.sparse.lil_matrix((pre.shape[1], pre.shape[0]), dtype=pre.dtype)
+        transitions_with_entry = places >= 0
+        indptr = numpy.concatenate([[0], numpy.cumsum(transitions_with_entry)])
 
-        transitions_number = pre.shape[1]
-        places_number = pre.shape[0]
+        return scipy.sparse.csr_matrix((values[transitions_with_entry], places[transitions_with_entry], indptr),
+                                       shape=(pre_shape[1], pre_shape[0]))
 
-        for i in range(transitions_number):
-            max_index = -1
-            max_global = 0
-            for j in range(places_number):
-                if pre[j, i] != 0:
-                    if mo[j] != 0:
-                        max_interior = pre[j, i] / mo[j]
-                        if max_global < max_interior:
-                            max_global = max_interior
-                            max_index = j
-                    else:
-                        max_index = -1
-                        break
-            if max_index != -1:
-                pi[i, max_index] = 1 / pre[max_index, i]
 
-        return pi.tocsr()
+class _VariablePi(object):
+    """
+    Pi of the last marking simulated by a TCPN simulator without constant pi. Each new marking updates the pi of the
+    previous one incrementally
+    """
+
+    def __init__(self, pre: scipy.sparse.csr_matrix):
+        """
+        :param pre: pre matrix
+        """
+        self.__pre = pre.tocsc()
+        self.__pi: Optional[scipy.sparse.csr_matrix] = None
+        self.__mo: Optional[numpy.ndarray] = None
+
+    def obtain_pi(self, mo: numpy.ndarray) -> scipy.sparse.csr_matrix:
+        """
+        Obtain pi of a marking
+
+        :param mo: actual marking
+        :return: pi
+        """
+        self.__pi = TCPNSimulator._calculate_pi(self.__pre, mo) if self.__pi is None else \
+            TCPNSimulator._update_pi(self.__pre, mo, self.__mo, self.__pi)
+        self.__mo = numpy.array(mo, copy=True).reshape(-1)
+        return self.__pi
 
 
 class SFixedStep(TCPNSimulator, metaclass=abc.ABCMeta):
@@ -66,6 +218,18 @@ class SFixedStep(TCPNSimulator, metaclass=abc.ABCMeta):
         """
         pass
 
+    def simulate_steps(self, mo: numpy.ndarray, number_of_steps: int) -> numpy.ndarray:
+        """
+        Simulate several steps with the actual control
+
+        :param mo:  actual marking
+        :param number_of_steps: number of steps to simulate
+        :return: marking after the steps
+        """
+        for _ in range(number_of_steps):
+            mo = self.simulate_step(mo)
+        return mo
+
 
 class SVariableStep(TCPNSimulator, metaclass=abc.ABCMeta):
     """
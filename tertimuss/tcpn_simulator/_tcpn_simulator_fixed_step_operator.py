@@ -0,0 +1,184 @@
+from collections import OrderedDict
+from typing import Optional, Literal, List, Union
+
+import numpy
+import scipy.linalg
+import scipy.sparse
+import scipy.sparse.linalg
+
+from ._tcpn_simulator import SFixedStep, _VariablePi
+
+
+class SFSOperator(SFixedStep):
+    """
+    Time continuous Petri net simulator with fixed step, that precomputes the operator that advances one step.
+
+    The operator is I + A * step (Euler method) or e^(A * step) (exact solution of the TCPN with constant pi), and it
+    is only calculated when the control changes to one that hasn't been used recently. Several steps are advanced at
+    once with the powers of two of the operator (repeated squaring), so advancing k steps costs log2(k) products.
+
+    The operators are dense if the number of places is lower or equal than max_operator_size. Otherwise the sparse
+    Euler operator is applied once by step, and the exponential is applied with expm_multiply
+    """
+
+    def __init__(self, pre: scipy.sparse.csr_matrix, post: scipy.sparse.csr_matrix,
+                 lambda_vector: numpy.ndarray, pi: Optional[scipy.sparse.csr_matrix], step: float,
+                 method: Literal["EULER", "EXPONENTIAL"] = "EXPONENTIAL", constant_pi: bool = True,
+                 max_number_of_operators: int = 16, max_operator_size: int = 4096):
+        """
+        Define the TCPN
+
+        :param pre: pre matrix
+        :param post: post matrix
+        :param lambda_vector: lambda vector. Its type sets the floating point type of the simulation
+        :param pi: pi matrix
+        :param step: time advanced in each step
+        :param method: EULER uses the operator I + A * step, and EXPONENTIAL the operator e^(A * step)
+        :param constant_pi: if true, pi is only calculated once. Otherwise it is updated incrementally in each step,
+         and the operators are calculated in each step
+        :param max_number_of_operators: maximum number of controls whose operators are stored. The least recently used
+         are removed first
+        :param max_operator_size: the operators are only dense if the number of places is lower or equal than this
+         value
+        """
+        if method != "EULER" and method != "EXPONENTIAL":
+            raise Exception("Not available method")
+
+        # Integer lambda vectors are simulated in float64
+        self.__dtype = numpy.result_type(lambda_vector.dtype, numpy.float32)
+        self.__lambda_vector: numpy.ndarray = lambda_vector.astype(self.__dtype, copy=False)
+        self.__pi: Optional[scipy.sparse.csr_matrix] = pi.astype(self.__dtype) if pi is not None else None
+        self.__c: scipy.sparse.csr_matrix = (post - pre).astype(self.__dtype)
+        self.__step = step
+        self.__method = method
+        self.__constant_pi = constant_pi
+        self.__variable_pi = _VariablePi(pre)
+        self.__max_number_of_operators = max_number_of_operators
+        self.__dense = pre.shape[0] <= max_operator_size
+
+        self.__control: numpy.ndarray = numpy.ones(len(lambda_vector), dtype=self.__dtype)
+        self.__control_key: bytes = self.__control.tobytes()
+
+        # Powers of two of the operator of each control, in least recently used order
+        self.__operators: 'OrderedDict[bytes, List[Union[numpy.ndarray, scipy.sparse.csr_matrix]]]' = OrderedDict()
+
+        self.__simulated_steps = 0
+
+    @property
+    def simulated_steps(self) -> int:
+        """
+        Number of steps simulated since the creation of the simulator
+        """
+        return self.__simulated_steps
+
+    def set_control(self, control: numpy.ndarray):
+        """
+        Apply a control action over transitions firing in the TCPN
+
+        :param control: control
+        """
+        self.__control = numpy.asarray(control, dtype=self.__dtype)
+        self.__control_key = self.__control.tobytes()
+
+    def __obtain_operators(self, mo: numpy.ndarray) -> List[Union[numpy.ndarray, scipy.sparse.csr_matrix]]:
+        """
+        Obtain the powers of two of the operator of the actual control calculated until now (at least the operator)
+
+        :param mo: actual marking, only used to calculate pi if it isn't known
+        :return: operator to the power of 1, 2, 4 ...
+        """
+        operators = self.__operators.get(self.__control_key) if self.__constant_pi else None
+
+        if operators is not None:
+            self.__operators.move_to_end(self.__control_key)
+            return operators
+
+        pi = self.__pi if self.__pi is not None else \
+            self.__variable_pi.obtain_pi(mo).astype(self.__dtype, copy=False)
+
+        if self.__constant_pi:
+            self.__pi = pi
+
+        a = (self.__c.dot(scipy.sparse.diags(self.__lambda_vector * self.__control))).dot(pi).tocsr()
+
+        if self.__method == "EULER":
+            operator = (a * self.__dtype.type(self.__step) +
+                        scipy.sparse.identity(a.shape[0], dtype=self.__dtype)).tocsr()
+            operators = [operator.toarray() if self.__dense else operator]
+        elif self.__dense:
+            operators = [scipy.linalg.expm(a.toarray() * self.__step).astype(self.__dtype, copy=False)]
+        else:
+            # The exponential is only applied with expm_multiply
+            operators = [(a * self.__dtype.type(self.__step)).tocsc()]
+
+        if self.__constant_pi:
+            self.__operators[self.__control_key] = operators
+
+            if len(self.__operators) > self.__max_number_of_operators:
+                self.__operators.popitem(last=False)
+
+        return operators
+
+    def simulate_step(self, mo: numpy.ndarray) -> numpy.ndarray:
+        """
+        Simulate one step
+
+        :param mo:  actual marking, or a matrix with one marking by column to simulate several markings at once
+        :return: next marking, or next markings if mo is a matrix
+        """
+        return self.simulate_steps(mo, 1)
+
+    def simulate_steps(self, mo: numpy.ndarray, number_of_steps: int) -> numpy.ndarray:
+        """
+        Simulate several steps with the actual control
+
+        :param mo:  actual marking, or a matrix with one marking by column to simulate several markings at once
+        :param number_of_steps: number of steps to simulate
+        :return: marking after the steps, or markings if mo is a matrix
+        """
+        # A matrix with more than one column is simulated as a batch of markings
+        mo_next = mo.reshape(-1) if len(mo.shape) == 1 or mo.shape[1] == 1 else mo
+        mo_next = mo_next.astype(self.__dtype, copy=False)
+
+        if number_of_steps <= 0:
+            return mo_next
+
+        if self.__constant_pi:
+            mo_next = self.__apply_operators(self.__obtain_operators(mo_next), mo_next, number_of_steps)
+        else:
+            # The operator changes with the marking, so it is calculated in each step
+            for _ in range(number_of_steps):
+                mo_next = self.__apply_operators(self.__obtain_operators(mo_next), mo_next, 1)
+
+        self.__simulated_steps += number_of_steps
+
+        return mo_next
+
+    def __apply_operators(self, operators: List[Union[numpy.ndarray, scipy.sparse.csr_matrix]], mo: numpy.ndarray,
+                          number_of_steps: int) -> numpy.ndarray:
+        """
+        Apply the operator of a control several times
+
+        :param operators: powers of two of the operator calculated until now. New powers are added to the list
+        :param mo: actual marking, or a matrix with one marking by column
+        :param number_of_steps: number of times that the operator is applied
+        :return: marking after the steps
+        """
+        if self.__dense:
+            # Repeated squaring: the operator to the power of each bit of the number of steps is applied
+            power = 0
+            while number_of_steps > 0:
+                if power == len(operators):
+                    operators.append(operators[-1].dot(operators[-1]))
+                if number_of_steps & 1:
+                    mo = operators[power].dot(mo)
+                number_of_steps >>= 1
+                power += 1
+            return mo
+
+        if self.__method == "EULER":
+            for _ in range(number_of_steps):
+                mo = operators[0].dot(mo)
+            return mo
+
+        return scipy.sparse.linalg.expm_multiply(operators[0] * self.__dtype.type(number_of_steps), mo)
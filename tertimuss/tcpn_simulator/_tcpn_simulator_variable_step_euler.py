@@ -1,68 +1,109 @@
+from collections import OrderedDict
 from typing import Optional
 
 import numpy
 import scipy.sparse
 
-from ._tcpn_simulator import SVariableStep
+from ._tcpn_simulator import SVariableStep, _VariablePi
 
 
 class SVSEuler(SVariableStep):
     """
     Time continuous Petri net simulator based on the Euler method
+
+    The simulation is done in the floating point type of the lambda vector
     """
 
     def __init__(self, pre: scipy.sparse.csr_matrix, post: scipy.sparse.csr_matrix,
                  lambda_vector: numpy.ndarray, pi: Optional[scipy.sparse.csr_matrix], number_of_steps: int = 128,
-                 constant_pi: bool = True):
+                 constant_pi: bool = True, max_number_of_a_matrices: int = 16):
         """
         Define the TCPN
 
         :param pre: pre matrix
         :param post: post matrix
         :param pi: pi matrix
-        :param lambda_vector: lambda vector
+        :param lambda_vector: lambda vector. Its type sets the floating point type of the simulation
+        :param constant_pi: if true, pi is only calculated once. Otherwise it is updated incrementally in each step
         :param number_of_steps: number of steps in the integration
+        :param max_number_of_a_matrices: maximum number of A matrices stored (one by control). The least recently used
+         are removed first
         """
-        self.__lambda_vector: numpy.ndarray = lambda_vector
-        self.__control: numpy.ndarray = numpy.ones(len(lambda_vector))
-        self.__pi: scipy.sparse.csr_matrix = pi
+        # Integer lambda vectors are simulated in float64
+        self.__dtype = numpy.result_type(lambda_vector.dtype, numpy.float32)
+        self.__lambda_vector: numpy.ndarray = lambda_vector.astype(self.__dtype, copy=False)
+        self.__control: numpy.ndarray = numpy.ones(len(lambda_vector), dtype=self.__dtype)
+        self.__pi: scipy.sparse.csr_matrix = pi.astype(self.__dtype).tocsr() if pi is not None else None
         self.__pre = pre
-        self.__c: scipy.sparse.csr_matrix = post - pre
+
+        # C by columns and pi by rows, to update A with the transitions whose control changes
+        self.__c: scipy.sparse.csc_matrix = (post - pre).astype(self.__dtype).tocsc()
         self.__number_of_steps: int = number_of_steps
         self.__constant_pi = constant_pi
+        self.__variable_pi = _VariablePi(pre)
         self.__a = self.__calculate_a(self.__c, self.__lambda_vector, self.__pi) if pi is not None else None
 
+        # Control used to calculate A
+        self.__a_control: numpy.ndarray = self.__control
+
+        # A matrices by control, in least recently used order. Only used if pi is constant
+        self.__max_number_of_a_matrices = max_number_of_a_matrices
+        self.__a_matrices: 'OrderedDict[bytes, scipy.sparse.csr_matrix]' = OrderedDict()
+        if self.__a is not None:
+            self.__a_matrices[self.__control.tobytes()] = self.__a
+
     def set_control(self, control: numpy.ndarray):
         """
         Apply a control action over transitions firing in the TCPN
 
         :param control: control
         """
-        self.__control = control
+        self.__control = numpy.array(control, dtype=self.__dtype)
+        control_key = self.__control.tobytes()
 
-        self.__a = self.__calculate_a(self.__c, self.__lambda_vector * self.__control,
-                                      self.__pi) if self.__pi is not None else None
+        if self.__pi is None:
+            # Pi isn't known until the first step
+            self.__a = None
+        else:
+            a = self.__a_matrices.get(control_key)
+
+            if a is None:
+                # The A of the previous control is updated with the transitions whose control has changed
+                a = self.__calculate_a(self.__c, self.__lambda_vector * self.__control, self.__pi) \
+                    if self.__a is None else \
+                    self._update_a(self.__c, self.__lambda_vector, self.__pi, self.__control, self.__a_control,
+                                   self.__a)
+                self.__a_matrices[control_key] = a
+
+                if len(self.__a_matrices) > self.__max_number_of_a_matrices:
+                    self.__a_matrices.popitem(last=False)
+            else:
+                self.__a_matrices.move_to_end(control_key)
+
+            self.__a = a
+            self.__a_control = self.__control
 
     @staticmethod
-    def __calculate_a(c: scipy.sparse.csr_matrix, lambda_vector: numpy.ndarray,
+    def __calculate_a(c: scipy.sparse.csc_matrix, lambda_vector: numpy.ndarray,
                       pi: scipy.sparse.csr_matrix) -> scipy.sparse.csr_matrix:
         """
         Calculate a matrix
         """
-        return (c.dot(scipy.sparse.diags(lambda_vector.reshape(-1)))).dot(pi)
+        return (c.dot(scipy.sparse.diags(lambda_vector.reshape(-1)))).dot(pi).tocsr()
 
     def simulate_step(self, mo: numpy.ndarray, dt: float) -> numpy.ndarray:
         """
         Simulate one step
 
-        :param mo:  actual marking
+        :param mo:  actual marking, or a matrix with one marking by column to simulate several markings at once
         :param dt:  time to advance
-        :return: next marking
+        :return: next marking, or next markings if mo is a matrix
         """
         if self.__a is not None:
             a = self.__a
         else:
-            pi = self.__pi if self.__pi is not None else self._calculate_pi(self.__pre, mo)
+            pi = self.__pi if self.__pi is not None else \
+                self.__variable_pi.obtain_pi(mo).astype(self.__dtype, copy=False)
 
             a = self.__calculate_a(self.__c, self.__lambda_vector, pi) if self.__control is not None else \
                 self.__calculate_a(self.__c, self.__lambda_vector * self.__control, pi)
@@ -71,11 +112,28 @@ class SVSEuler(SVariableStep):
                 self.__pi = pi
                 self.__a = a
 
-        a_i = a * (dt / self.__number_of_steps) + scipy.sparse.identity(a.shape[0], dtype=a.dtype)
+                # The control isn't used in the calculation of a
+                self.__a_control = numpy.ones(len(self.__lambda_vector), dtype=self.__dtype)
+                self.__a_matrices[self.__a_control.tobytes()] = a
 
-        mo_next = mo
+        mo_next = mo.astype(self.__dtype, copy=False)
 
-        for i in range(self.__number_of_steps):
-            mo_next = a_i.dot(mo_next)
+        if self.__dtype == numpy.float64:
+            a_i = a * (dt / self.__number_of_steps) + scipy.sparse.identity(a.shape[0], dtype=a.dtype)
 
-        return mo_next.reshape(-1)
+            for i in range(self.__number_of_steps):
+                mo_next = a_i.dot(mo_next)
+        else:
+            # With less precision the increments of each step are small compared with the marks, so the rounding
+            # errors of the sums are compensated (Kahan summation) to avoid their accumulation
+            a_h = (a * self.__dtype.type(dt / self.__number_of_steps)).tocsr()
+            compensation = numpy.zeros_like(mo_next)
+
+            for i in range(self.__number_of_steps):
+                increment = a_h.dot(mo_next) - compensation
+                mo_sum = mo_next + increment
+                compensation = (mo_sum - mo_next) - increment
+                mo_next = mo_sum
+
+        # A matrix with more than one column is simulated as a batch of markings
+        return mo_next.reshape(-1) if len(mo.shape) == 1 or mo.shape[1] == 1 else mo_next
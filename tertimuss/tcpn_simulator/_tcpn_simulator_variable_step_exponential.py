@@ -0,0 +1,155 @@
+from collections import OrderedDict
+from typing import Optional, Dict, Tuple
+
+import numpy
+import scipy.linalg
+import scipy.sparse
+import scipy.sparse.linalg
+
+from ._tcpn_simulator import SVariableStep, _VariablePi
+
+
+class SVSExponential(SVariableStep):
+    """
+    Time continuous Petri net simulator based on the matrix exponential.
+
+    With constant pi the TCPN is the linear system m' = A m, so the marking after a step is exp(A dt) m. The product is
+    computed with scipy.sparse.linalg.expm_multiply. When a step size is used several times with the same control, its
+    propagator exp(A dt) is stored as a dense matrix, and the following steps of that size and control cost one
+    matrix-vector product. The propagators are kept when the control changes, so a schedule that repeats its pattern of
+    controls and step sizes reuses them.
+
+    A dense propagator has places^2 elements (27 MB with 1834 places in double precision), so the memory used by the
+    stored propagators is limited by max_propagators_bytes instead of by their number
+    """
+
+    def __init__(self, pre: scipy.sparse.csr_matrix, post: scipy.sparse.csr_matrix,
+                 lambda_vector: numpy.ndarray, pi: Optional[scipy.sparse.csr_matrix], constant_pi: bool = True,
+                 max_propagators_bytes: int = 128 * 1024 * 1024, max_number_of_a_matrices: int = 16,
+                 propagator_threshold: int = 8):
+        """
+        Define the TCPN
+
+        :param pre: pre matrix
+        :param post: post matrix
+        :param pi: pi matrix
+        :param lambda_vector: lambda vector
+        :param constant_pi: if true, pi is only calculated once. Otherwise it is updated incrementally in each step
+        :param max_propagators_bytes: maximum number of bytes used by the stored dense propagators (one by control and
+         step size). The least recently used are removed first. A propagator bigger than this value is never stored,
+         and 0 disables them
+        :param max_number_of_a_matrices: maximum number of sparse A matrices stored (one by control). The least
+         recently used are removed first
+        :param propagator_threshold: number of steps of a control and size simulated with expm_multiply before storing
+         its dense propagator. Computing a dense propagator costs about as much as ten calls to expm_multiply
+        """
+        self.__lambda_vector: numpy.ndarray = lambda_vector
+        self.__control: numpy.ndarray = numpy.ones(len(lambda_vector))
+        self.__pi: scipy.sparse.csr_matrix = pi
+        self.__pre = pre
+        self.__c: scipy.sparse.csr_matrix = post - pre
+        self.__constant_pi = constant_pi
+        self.__variable_pi = _VariablePi(pre)
+        self.__a = self.__calculate_a(self.__c, self.__lambda_vector, self.__pi) if pi is not None else None
+
+        # Key of the actual control
+        self.__control_key: bytes = self.__control.tobytes()
+
+        self.__max_propagators_bytes = max_propagators_bytes
+        self.__max_number_of_a_matrices = max_number_of_a_matrices
+        self.__propagator_threshold = propagator_threshold
+
+        # Dense propagators by control and step size, in least recently used order, and bytes used by them
+        self.__propagators: 'OrderedDict[Tuple[bytes, float], numpy.ndarray]' = OrderedDict()
+        self.__propagators_bytes = 0
+
+        # A matrices by control, in least recently used order. Only used if pi is constant
+        self.__a_matrices: 'OrderedDict[bytes, scipy.sparse.csr_matrix]' = OrderedDict()
+        if self.__a is not None:
+            self.__a_matrices[self.__control_key] = self.__a
+
+        # Number of times each control and step size has been used with expm_multiply
+        self.__steps_used: Dict[Tuple[bytes, float], int] = {}
+
+    def set_control(self, control: numpy.ndarray):
+        """
+        Apply a control action over transitions firing in the TCPN
+
+        :param control: control
+        """
+        self.__control = control
+        self.__control_key = numpy.asarray(control, dtype=numpy.float64).tobytes()
+
+        if self.__pi is None:
+            # Pi isn't known until the first step
+            self.__a = None
+        else:
+            self.__a = self.__a_matrices.get(self.__control_key)
+
+            if self.__a is None:
+                self.__a = self.__calculate_a(self.__c, self.__lambda_vector * self.__control, self.__pi)
+                self.__a_matrices[self.__control_key] = self.__a
+
+                if len(self.__a_matrices) > self.__max_number_of_a_matrices:
+                    self.__a_matrices.popitem(last=False)
+            else:
+                self.__a_matrices.move_to_end(self.__control_key)
+
+    @staticmethod
+    def __calculate_a(c: scipy.sparse.csr_matrix, lambda_vector: numpy.ndarray,
+                      pi: scipy.sparse.csr_matrix) -> scipy.sparse.csr_matrix:
+        """
+        Calculate a matrix
+        """
+        return (c.dot(scipy.sparse.diags(lambda_vector.reshape(-1)))).dot(pi).tocsr()
+
+    def simulate_step(self, mo: numpy.ndarray, dt: float) -> numpy.ndarray:
+        """
+        Simulate one step
+
+        :param mo:  actual marking, or a matrix with one marking by column to simulate several markings at once
+        :param dt:  time to advance
+        :return: next marking, or next markings if mo is a matrix
+        """
+        if self.__a is not None:
+            a = self.__a
+        else:
+            pi = self.__pi if self.__pi is not None else self.__variable_pi.obtain_pi(mo)
+
+            a = self.__calculate_a(self.__c, self.__lambda_vector * self.__control, pi)
+
+            if self.__constant_pi:
+                self.__pi = pi
+                self.__a = a
+                self.__a_matrices[self.__control_key] = a
+
+        # A matrix with more than one column is simulated as a batch of markings
+        mo = mo.reshape(-1) if len(mo.shape) == 1 or mo.shape[1] == 1 else mo
+
+        key = (self.__control_key, dt)
+
+        propagator = self.__propagators.get(key)
+
+        # Propagators can only be stored if A is constant
+        if propagator is None and self.__a is not None and \
+                a.dtype.itemsize * a.shape[0] * a.shape[0] <= self.__max_propagators_bytes:
+            if self.__steps_used.get(key, 0) >= self.__propagator_threshold:
+                # The control and step size are frequent, store its propagator
+                propagator = scipy.linalg.expm(a.toarray() * dt)
+                self.__propagators[key] = propagator
+                self.__propagators_bytes += propagator.nbytes
+                self.__steps_used.pop(key, None)
+
+                while self.__propagators_bytes > self.__max_propagators_bytes:
+                    self.__propagators_bytes -= self.__propagators.popitem(last=False)[1].nbytes
+            else:
+                # Avoid the growth of the counters if the step sizes are never repeated
+                if len(self.__steps_used) >= 1024:
+                    self.__steps_used.clear()
+                self.__steps_used[key] = self.__steps_used.get(key, 0) + 1
+
+        if propagator is not None:
+            self.__propagators.move_to_end(key)
+            return propagator.dot(mo)
+
+        return scipy.sparse.linalg.expm_multiply(a * dt, mo)
@@ -1,66 +1,121 @@
+from collections import OrderedDict
 from typing import Optional
 
 import numpy
 import scipy.sparse
 from scipy.integrate import solve_ivp
 
-from ._tcpn_simulator import SVariableStep
+from ._tcpn_simulator import SVariableStep, _VariablePi
 
 
 class SVSRungeKutta(SVariableStep):
     """
     Time continuous Petri net simulator based on the Runge-Kutta method
+
+    The simulation is done in the floating point type of the lambda vector. The float64 markings are integrated with
+    solve_ivp (RK45), and the markings of other types with the same method (Dormand-Prince 5(4)) implemented in this
+    class, because solve_ivp always integrates in float64
     """
 
+    # Butcher tableau of the Dormand-Prince 5(4) method, and coefficients of its error estimation
+    __rk_a = [[], [1 / 5], [3 / 40, 9 / 40], [44 / 45, -56 / 15, 32 / 9],
+              [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+              [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656]]
+    __rk_b = [35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84]
+    __rk_e = [-71 / 57600, 0, 71 / 16695, -71 / 1920, 17253 / 339200, -22 / 525, 1 / 40]
+
     def __init__(self, pre: scipy.sparse.csr_matrix, post: scipy.sparse.csr_matrix,
-                 lambda_vector: numpy.ndarray, pi: Optional[scipy.sparse.csr_matrix], constant_pi: bool = True):
+                 lambda_vector: numpy.ndarray, pi: Optional[scipy.sparse.csr_matrix], constant_pi: bool = True,
+                 rtol: float = 1e-3, atol: float = 1e-6, max_number_of_a_matrices: int = 16):
         """
         Define the TCPN
 
         :param pre: pre matrix
         :param post: post matrix
         :param pi: pi matrix
-        :param lambda_vector: lambda vector
+        :param lambda_vector: lambda vector. Its type sets the floating point type of the simulation
+        :param constant_pi: if true, pi is only calculated once. Otherwise it is updated incrementally in each step
+        :param rtol: relative tolerance of the integration
+        :param atol: absolute tolerance of the integration
+        :param max_number_of_a_matrices: maximum number of A matrices stored (one by control). The least recently used
+         are removed first
         """
-        self.__lambda_vector: numpy.ndarray = lambda_vector
-        self.__control: numpy.ndarray = numpy.ones(len(lambda_vector))
-        self.__pi: scipy.sparse.csr_matrix = pi
+        # Integer lambda vectors are simulated in float64
+        self.__dtype = numpy.result_type(lambda_vector.dtype, numpy.float32)
+        self.__lambda_vector: numpy.ndarray = lambda_vector.astype(self.__dtype, copy=False)
+        self.__control: numpy.ndarray = numpy.ones(len(lambda_vector), dtype=self.__dtype)
+        self.__pi: scipy.sparse.csr_matrix = pi.astype(self.__dtype).tocsr() if pi is not None else None
         self.__pre = pre
-        self.__c: scipy.sparse.csr_matrix = post - pre
+
+        # C by columns and pi by rows, to update A with the transitions whose control changes
+        self.__c: scipy.sparse.csc_matrix = (post - pre).astype(self.__dtype).tocsc()
+        self.__rtol = rtol
+        self.__atol = atol
         self.__constant_pi = constant_pi
+        self.__variable_pi = _VariablePi(pre)
         self.__a = self.__calculate_a(self.__c, self.__lambda_vector, self.__pi) if pi is not None else None
 
+        # Control used to calculate A
+        self.__a_control: numpy.ndarray = self.__control
+
+        # A matrices by control, in least recently used order. Only used if pi is constant
+        self.__max_number_of_a_matrices = max_number_of_a_matrices
+        self.__a_matrices: 'OrderedDict[bytes, scipy.sparse.csr_matrix]' = OrderedDict()
+        if self.__a is not None:
+            self.__a_matrices[self.__control.tobytes()] = self.__a
+
     def set_control(self, control: numpy.ndarray):
         """
         Apply a control action over transitions firing in the TCPN
 
         :param control: control
         """
-        self.__control = control
+        self.__control = numpy.array(control, dtype=self.__dtype)
+        control_key = self.__control.tobytes()
 
-        self.__a = self.__calculate_a(self.__c, self.__lambda_vector * self.__control,
-                                      self.__pi) if self.__pi is not None else None
+        if self.__pi is None:
+            # Pi isn't known until the first step
+            self.__a = None
+        else:
+            a = self.__a_matrices.get(control_key)
+
+            if a is None:
+                # The A of the previous control is updated with the transitions whose control has changed
+                a = self.__calculate_a(self.__c, self.__lambda_vector * self.__control, self.__pi) \
+                    if self.__a is None else \
+                    self._update_a(self.__c, self.__lambda_vector, self.__pi, self.__control, self.__a_control,
+                                   self.__a)
+                self.__a_matrices[control_key] = a
+
+                if len(self.__a_matrices) > self.__max_number_of_a_matrices:
+                    self.__a_matrices.popitem(last=False)
+            else:
+                self.__a_matrices.move_to_end(control_key)
+
+            self.__a = a
+            self.__a_control = self.__control
 
     @staticmethod
-    def __calculate_a(c: scipy.sparse.csr_matrix, lambda_vector: numpy.ndarray,
+    def __calculate_a(c: scipy.sparse.csc_matrix, lambda_vector: numpy.ndarray,
                       pi: scipy.sparse.csr_matrix) -> scipy.sparse.csr_matrix:
         """
         Calculate a matrix
         """
-        return (c.dot(scipy.sparse.diags(lambda_vector.reshape(-1)))).dot(pi)
+        return (c.dot(scipy.sparse.diags(lambda_vector.reshape(-1)))).dot(pi).tocsr()
 
     def simulate_step(self, mo: numpy.ndarray, dt: float) -> numpy.ndarray:
         """
         Simulate one step
 
-        :param mo:  actual marking
+        :param mo:  actual marking, or a matrix with one marking by column to simulate several markings at once
         :param dt:  time to advance
-        :return: next marking
+        :return: next marking, or next markings if mo is a matrix
         """
         if self.__a is not None:
             a = self.__a
         else:
-            pi = self.__pi if self.__pi is not None else self._calculate_pi(self.__pre, mo)
+            pi = self.__pi if self.__pi is not None else \
+                self.__variable_pi.obtain_pi(mo).astype(self.__dtype, copy=False)
 
             a = self.__calculate_a(self.__c, self.__lambda_vector, pi) if self.__control is not None else \
                 self.__calculate_a(self.__c, self.__lambda_vector * self.__control, pi)
@@ -69,6 +124,106 @@ class SVSRungeKutta(SVariableStep):
                 self.__pi = pi
                 self.__a = a
 
-        sol = solve_ivp(lambda t, m: a.dot(m), [0, dt], mo.reshape(-1), vectorized=True)
+                # The control isn't used in the calculation of a
+                self.__a_control = numpy.ones(len(self.__lambda_vector), dtype=self.__dtype)
+                self.__a_matrices[self.__a_control.tobytes()] = a
+
+        if self.__dtype != numpy.float64:
+            # A matrix with more than one column is simulated as a batch of markings
+            mo_next = self.__integrate(a, mo.reshape(-1) if len(mo.shape) == 1 or mo.shape[1] == 1 else mo, dt)
+            return mo_next.reshape(-1) if len(mo.shape) == 1 or mo.shape[1] == 1 else mo_next
+
+        if len(mo.shape) == 1 or mo.shape[1] == 1:
+            sol = solve_ivp(lambda t, m: a.dot(m), [0, dt], mo.reshape(-1), vectorized=True, rtol=self.__rtol,
+                            atol=self.__atol)
 
-        return (sol.y[:, -1]).reshape(-1)
+            return (sol.y[:, -1]).reshape(-1)
+
+        # A matrix with more than one column is simulated as a batch of markings. The solver integrates all of them
+        # flattened by rows, so each evaluation of the derivative is a single matrix-matrix product
+        places_number = mo.shape[0]
+
+        sol = solve_ivp(lambda t, m: a.dot(m.reshape(places_number, -1)).reshape(m.shape), [0, dt], mo.reshape(-1),
+                        vectorized=True, rtol=self.__rtol, atol=self.__atol)
+
+        return (sol.y[:, -1]).reshape(mo.shape)
+
+    def __error_norm(self, error: numpy.ndarray, mo: numpy.ndarray, mo_next: numpy.ndarray) -> float:
+        """
+        Root mean square of the error relative to the tolerance, as in solve_ivp
+
+        :param error: estimated error
+        :param mo: marking at the start of the step
+        :param mo_next: marking at the end of the step
+        :return: norm of the error
+        """
+        scale = self.__atol + numpy.maximum(numpy.abs(mo), numpy.abs(mo_next)) * self.__rtol
+        return float(numpy.sqrt(numpy.mean(numpy.square(error / scale, dtype=numpy.float64))))
+
+    def __integrate(self, a: scipy.sparse.csr_matrix, mo: numpy.ndarray, dt: float) -> numpy.ndarray:
+        """
+        Integrate the TCPN with the Dormand-Prince 5(4) method keeping the floating point type of the marking. The
+        step size is selected as in solve_ivp
+
+        :param a: A matrix
+        :param mo: actual marking, or a matrix with one marking by column
+        :param dt: time to advance
+        :return: next marking, or next markings if mo is a matrix
+        """
+        # As in solve_ivp, the integration fails with a non finite marking instead of reducing the step for ever
+        if not numpy.all(numpy.isfinite(mo)):
+            raise ValueError("All components of the marking must be finite")
+
+        mo = mo.astype(self.__dtype, copy=False)
+        k_0 = a.dot(mo)
+
+        if not numpy.all(numpy.isfinite(k_0)):
+            raise ValueError("The integration of the TCPN obtained a non finite marking")
+
+        # Initial step size
+        d_0 = self.__error_norm(mo, mo, mo)
+        d_1 = self.__error_norm(k_0, mo, mo)
+        h_0 = 1e-6 if d_0 < 1e-5 or d_1 < 1e-5 else 0.01 * d_0 / d_1
+        d_2 = self.__error_norm(a.dot(mo + self.__dtype.type(h_0) * k_0) - k_0, mo, mo) / h_0
+        h_1 = max(1e-6, h_0 * 1e-3) if max(d_1, d_2) <= 1e-15 else (0.01 / max(d_1, d_2)) ** (1 / 5)
+        h = min(100 * h_0, h_1)
+
+        t = 0.0
+
+        # The increments of each step are small compared with the marks, so the rounding errors of the sums are
+        # compensated (Kahan summation) to avoid their accumulation
+        compensation = numpy.zeros_like(mo)
+
+        while t < dt:
+            h = min(h, dt - t)
+
+            k = [k_0]
+            for a_row in self.__rk_a[1:]:
+                k.append(a.dot(mo + self.__dtype.type(h) * sum(self.__dtype.type(j) * k[i]
+                                                                for i, j in enumerate(a_row) if j != 0)))
+
+            increment = self.__dtype.type(h) * sum(self.__dtype.type(j) * k[i]
+                                                   for i, j in enumerate(self.__rk_b) if j != 0) - compensation
+            mo_next = mo + increment
+            k.append(a.dot(mo_next))
+
+            error_norm = self.__error_norm(self.__dtype.type(h) * sum(self.__dtype.type(j) * k[i]
+                                                                      for i, j in enumerate(self.__rk_e) if j != 0),
+                                           mo, mo_next)
+
+            if not numpy.isfinite(error_norm):
+                raise ValueError("The integration of the TCPN obtained a non finite marking")
+
+            if error_norm < 1:
+                t += h
+                compensation = (mo_next - mo) - increment
+                mo = mo_next
+                k_0 = k[-1]
+                h = h * (10 if error_norm == 0 else min(10.0, 0.9 * error_norm ** (-1 / 5)))
+            else:
+                h = h * max(0.2, 0.9 * error_norm ** (-1 / 5))
+
+                if h < 10 * numpy.spacing(t):
+                    raise ValueError("Required step size is less than spacing between numbers")
+
+        return mo
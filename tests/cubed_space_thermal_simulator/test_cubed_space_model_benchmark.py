@@ -0,0 +1,32 @@
+import time
+import unittest
+
+from tertimuss.simulation_lib.simulator import SimulationConfiguration
+from tertimuss.simulation_lib.simulator._system_simulator import _generate_cubed_space
+from tertimuss.simulation_lib.system_definition import TaskSet
+from tertimuss.simulation_lib.system_definition.utils import generate_default_cpu, default_environment_specification
+
+
+class CubedSpaceModelBenchmark(unittest.TestCase):
+    @staticmethod
+    def __run_benchmark(number_of_cores: int, processor_mesh_division: int) -> float:
+        processor_definition = generate_default_cpu(number_of_cores, {1000, 2000})
+
+        start_time = time.perf_counter()
+        _generate_cubed_space(TaskSet(periodic_tasks=[], aperiodic_tasks=[], sporadic_tasks=[]),
+                              processor_definition, default_environment_specification(),
+                              SimulationConfiguration(simulate_thermal_behaviour=True,
+                                                      processor_mesh_division=processor_mesh_division),
+                              number_of_cores)
+        return time.perf_counter() - start_time
+
+    @unittest.skip("Manual benchmark test")
+    def test_model_construction_time(self):
+        for number_of_cores in [1, 4, 16, 64]:
+            for processor_mesh_division in range(1, 9):
+                elapsed_time = self.__run_benchmark(number_of_cores, processor_mesh_division)
+                print(number_of_cores, "cores, mesh division", processor_mesh_division, ":", elapsed_time, "seconds")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,10 @@
 import unittest
 from typing import Tuple, List
 
+import numpy
+
 from tertimuss.cubed_space_thermal_simulator import Dimensions, Location, Model, obtain_min_temperature, \
-    obtain_max_temperature, Cuboid
+    obtain_max_temperature, Cuboid, TMExternal, TMInternal
 
 from tertimuss.cubed_space_thermal_simulator.materials_pack import SMCooper, SMSilicon, \
     FEAirForced, FEAirFree
@@ -366,6 +368,146 @@ class CubedSpaceThermalSimulatorTest(unittest.TestCase):
         assert all(i > system_initial_temperature - 0.1 for _, i, _ in min_max_temperatures_vector)
         assert all(i < system_initial_temperature + 0.1 for _, _, i in min_max_temperatures_vector)
 
+    def test_exact_precision_with_convection(self):
+        # Definition of the CPU shape and materials
+        scene_definition = {
+            # Cube
+            0: (SMSilicon(),
+                Cuboid(
+                    location=Location(x=0, z=0, y=0),
+                    dimensions=Dimensions(x=3, z=3, y=3))
+                )
+        }
+
+        # Core initial temperature
+        cuboid_initial_temperature = 273.15 + 65
+
+        # Board initial temperature
+        environment_temperature = 273.15 + 25
+
+        temperatures = {}
+
+        for simulation_precision in ["HIGH", "EXACT"]:
+            cubed_space = Model(
+                material_cubes=scene_definition,
+                cube_edge_size=0.001,
+                environment_properties=FEAirForced(),
+                simulation_precision=simulation_precision)
+
+            initial_state = cubed_space.create_initial_state(
+                default_temperature=environment_temperature,
+                material_cubes_temperatures={
+                    0: cuboid_initial_temperature
+                },
+                environment_temperature=environment_temperature
+            )
+
+            # The step is repeated, so the exact simulation reuses its propagator
+            for i in range(20):
+                initial_state = cubed_space.apply_energy(actual_state=initial_state, amount_of_time=0.05)
+
+            temperatures[simulation_precision] = cubed_space.obtain_temperature(actual_state=initial_state)
+
+        # The Runge-Kutta method has a relative tolerance of 1e-3, so the temperatures of each cube can differ in
+        # tenths of kelvin, but the energy in the cuboid must be the same
+        assert self.float_equal(temperatures["EXACT"][0].temperature.temperatureMatrix.mean(),
+                                temperatures["HIGH"][0].temperature.temperatureMatrix.mean(), error=0.01)
+        assert self.float_equal(min(obtain_min_temperature(temperatures["EXACT"]).values()),
+                                min(obtain_min_temperature(temperatures["HIGH"]).values()), error=1)
+        assert self.float_equal(max(obtain_max_temperature(temperatures["EXACT"]).values()),
+                                max(obtain_max_temperature(temperatures["HIGH"]).values()), error=1)
+        assert environment_temperature <= min(obtain_min_temperature(temperatures["EXACT"]).values()) \
+               <= max(obtain_max_temperature(temperatures["EXACT"]).values()) <= cuboid_initial_temperature
+
+    def test_steady_state(self):
+        # Silicon core over a copper board
+        core_cuboid = Cuboid(location=Location(x=1, y=1, z=2), dimensions=Dimensions(x=2, y=3, z=1))
+
+        scene_definition = {
+            0: (SMSilicon(), core_cuboid),
+            1: (SMCooper(), Cuboid(location=Location(x=0, y=0, z=0), dimensions=Dimensions(x=4, y=5, z=2)))
+        }
+
+        environment_temperature = 273.15 + 25
+
+        cubed_space = Model(
+            material_cubes=scene_definition,
+            cube_edge_size=0.001,
+            environment_properties=FEAirForced(),
+            external_temperature_booster_points={0: TMExternal(cuboid=core_cuboid, boostRate=20.0)},
+            internal_temperature_booster_points={0: TMInternal(cuboid=core_cuboid, boostRateMultiplier=0.001)},
+            simulation_precision="EXACT")
+
+        initial_state = cubed_space.create_initial_state(default_temperature=environment_temperature)
+
+        for external_points, internal_points in [(set(), set()), ({0}, {0}), ({0}, set()), ({0}, {0})]:
+            steady_state = cubed_space.solve_steady_state(initial_state, external_points, internal_points)
+
+            # The steady state is reached after a long simulation
+            final_state = initial_state
+            for _ in range(1000):
+                final_state = cubed_space.apply_energy(final_state, 1,
+                                                       external_energy_application_points=external_points,
+                                                       internal_energy_application_points=internal_points)
+
+            steady_temperature = cubed_space.obtain_temperature(steady_state)
+            final_temperature = cubed_space.obtain_temperature(final_state)
+
+            assert all(numpy.allclose(steady_temperature[i].temperature.temperatureMatrix,
+                                      final_temperature[i].temperature.temperatureMatrix, rtol=0, atol=1e-6)
+                       for i in final_temperature.keys())
+
+            # The steady state doesn't change when it is simulated
+            next_state = cubed_space.apply_energy(steady_state, 1.0,
+                                                  external_energy_application_points=external_points,
+                                                  internal_energy_application_points=internal_points)
+            assert numpy.allclose(next_state.places_mo_vector, steady_state.places_mo_vector, rtol=0, atol=1e-6)
+
+        # Without energy the steady state is the environment temperature
+        assert self.float_equal(min(obtain_min_temperature(cubed_space.obtain_temperature(
+            cubed_space.solve_steady_state(initial_state))).values()), environment_temperature, 1e-6)
+
+        cubed_space_without_environment = Model(material_cubes=scene_definition, cube_edge_size=0.001)
+        self.assertRaises(Exception, lambda: cubed_space_without_environment.solve_steady_state(
+            cubed_space_without_environment.create_initial_state(default_temperature=environment_temperature)))
+
+    def test_float32_precision_drift(self):
+        # Silicon core over a copper board
+        core_cuboid = Cuboid(location=Location(x=1, y=1, z=2), dimensions=Dimensions(x=2, y=3, z=1))
+
+        final_states = {}
+
+        for simulation_precision in ["LOW", "MIDDLE", "HIGH", "EXACT"]:
+            cubed_space = Model(
+                material_cubes={
+                    0: (SMSilicon(), core_cuboid),
+                    1: (SMCooper(), Cuboid(location=Location(x=0, y=0, z=0), dimensions=Dimensions(x=4, y=5, z=2)))
+                },
+                cube_edge_size=0.001,
+                environment_properties=FEAirForced(),
+                external_temperature_booster_points={0: TMExternal(cuboid=core_cuboid, boostRate=20.0)},
+                internal_temperature_booster_points={0: TMInternal(cuboid=core_cuboid, boostRateMultiplier=0.001)},
+                simulation_precision=simulation_precision)
+
+            state = cubed_space.create_initial_state(default_temperature=273.15 + 45,
+                                                     environment_temperature=273.15 + 25)
+
+            # Many short steps, where the rounding errors of the low precision could accumulate
+            for i in range(200):
+                state = cubed_space.apply_energy(state, 0.01,
+                                                 external_energy_application_points={0} if i % 3 else set(),
+                                                 internal_energy_application_points={0} if i % 2 else set())
+
+            final_states[simulation_precision] = state.places_mo_vector
+
+        # LOW and MIDDLE precisions are simulated in float32 end to end
+        assert final_states["LOW"].dtype == numpy.float32 and final_states["MIDDLE"].dtype == numpy.float32
+        assert final_states["HIGH"].dtype == numpy.float64
+
+        # The drift against the float64 reference runs is bounded
+        assert numpy.allclose(final_states["LOW"], final_states["EXACT"], rtol=0, atol=0.01)
+        assert numpy.allclose(final_states["MIDDLE"], final_states["HIGH"], rtol=0, atol=0.1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,140 @@
+import gc
+import os
+import pickle
+import tempfile
+import unittest
+import unittest.mock
+
+import numpy
+
+from tertimuss.cubed_space_thermal_simulator import Dimensions, Location, Model, Cuboid, TMExternal, TMInternal, \
+    ModelCache
+from tertimuss.cubed_space_thermal_simulator._model_cache import _process_caches_models, _MODEL_FORMAT_VERSION
+from tertimuss.cubed_space_thermal_simulator.materials_pack import SMCooper, SMSilicon, FEAirForced
+from tertimuss.simulation_lib.simulator import SimulationConfiguration, execute_scheduler_simulation_simple
+from tertimuss.simulation_lib.system_definition import PeriodicTask, PreemptiveExecution, Criticality, TaskSet
+from tertimuss.simulation_lib.system_definition.utils import generate_default_cpu, default_environment_specification
+from tertimuss.schedulers.g_edf import SGEDF
+
+
+class ModelCacheTest(unittest.TestCase):
+    @staticmethod
+    def __model_definition(simulation_precision: str):
+        return dict(
+            material_cubes={
+                0: (SMSilicon(), Cuboid(location=Location(x=1, y=1, z=1), dimensions=Dimensions(x=2, y=2, z=1))),
+                1: (SMCooper(), Cuboid(location=Location(x=0, y=0, z=0), dimensions=Dimensions(x=4, y=4, z=1)))
+            },
+            cube_edge_size=0.001,
+            environment_properties=FEAirForced(),
+            external_temperature_booster_points={
+                0: TMExternal(cuboid=Cuboid(location=Location(x=1, y=1, z=1), dimensions=Dimensions(x=2, y=2, z=1)),
+                              boostRate=10.0)
+            },
+            internal_temperature_booster_points={
+                0: TMInternal(cuboid=Cuboid(location=Location(x=1, y=1, z=1), dimensions=Dimensions(x=2, y=2, z=1)),
+                              boostRateMultiplier=0.001)
+            },
+            simulation_precision=simulation_precision)
+
+    @staticmethod
+    def __simulate(model: Model):
+        state = model.create_initial_state(default_temperature=300, environment_temperature=300)
+        state = model.apply_energy(state, 0.5, external_energy_application_points=set(),
+                                   internal_energy_application_points=set())
+        state = model.apply_energy(state, 0.5, external_energy_application_points={0},
+                                   internal_energy_application_points={0})
+        return state.places_mo_vector
+
+    def test_model_cache(self):
+        model_cache = ModelCache(max_size=1)
+
+        model = model_cache.obtain_model(**self.__model_definition("HIGH"))
+        assert model_cache.obtain_model(**self.__model_definition("HIGH")) is model
+        assert model_cache.number_of_hits == 1 and model_cache.number_of_misses == 1
+
+        # The model is reset when a new state is created
+        first_simulation_marking = self.__simulate(model)
+        assert numpy.array_equal(self.__simulate(model), first_simulation_marking)
+        assert numpy.array_equal(self.__simulate(Model(**self.__model_definition("HIGH"))), first_simulation_marking)
+
+        # Different definitions produce different models, and the least recently used is removed
+        assert model_cache.obtain_model(**self.__model_definition("LOW")) is not model
+        assert model_cache.obtain_model(**self.__model_definition("HIGH")) is not model
+        assert model_cache.number_of_misses == 3
+
+        # The pickled copies share the models in the same process
+        model_cache_copy = pickle.loads(pickle.dumps(model_cache))
+        assert model_cache_copy.obtain_model(**self.__model_definition("HIGH")) is \
+               model_cache.obtain_model(**self.__model_definition("HIGH"))
+
+    def test_model_cache_release(self):
+        model_cache = ModelCache()
+        model_cache.obtain_model(**self.__model_definition("LOW"))
+        model_cache_copy = pickle.loads(pickle.dumps(model_cache))
+
+        number_of_caches = len(_process_caches_models)
+
+        # The models are kept while a copy of the cache is alive
+        del model_cache
+        gc.collect()
+        assert len(_process_caches_models) == number_of_caches
+        assert model_cache_copy.obtain_model(**self.__model_definition("LOW")) is not None
+        assert model_cache_copy.number_of_hits == 1
+
+        del model_cache_copy
+        gc.collect()
+        assert len(_process_caches_models) == number_of_caches - 1
+
+    def test_model_cache_storage(self):
+        with tempfile.TemporaryDirectory() as temporal_directory:
+            ModelCache(storage_directory=temporal_directory).obtain_model(**self.__model_definition("HIGH"))
+            assert len([i for i in os.listdir(temporal_directory) if i.endswith(".npz")]) == 1
+
+            model_cache = ModelCache(storage_directory=temporal_directory)
+            model = model_cache.obtain_model(**self.__model_definition("HIGH"))
+            assert model_cache.number_of_loads == 1 and model_cache.number_of_misses == 0
+
+            # The models stored by other versions of the construction aren't loaded
+            with unittest.mock.patch("tertimuss.cubed_space_thermal_simulator._model_cache._MODEL_FORMAT_VERSION",
+                                     _MODEL_FORMAT_VERSION + 1):
+                new_version_model_cache = ModelCache(storage_directory=temporal_directory)
+                new_version_model_cache.obtain_model(**self.__model_definition("HIGH"))
+                assert new_version_model_cache.number_of_loads == 0 and new_version_model_cache.number_of_misses == 1
+
+        assert numpy.array_equal(self.__simulate(model), self.__simulate(Model(**self.__model_definition("HIGH"))))
+
+    def test_simulation_with_model_cache(self):
+        periodic_tasks = [PeriodicTask(identifier=i, worst_case_execution_time=j, relative_deadline=k,
+                                       best_case_execution_time=None, execution_time_distribution=None,
+                                       memory_footprint=None, priority=None,
+                                       preemptive_execution=PreemptiveExecution.FULLY_PREEMPTIVE,
+                                       deadline_criteria=Criticality.HARD, energy_consumption=None, phase=None,
+                                       period=k) for i, (j, k) in enumerate([(3000, 7.0), (4000, 7.0), (4000, 14.0)])]
+
+        model_cache = ModelCache()
+
+        simulation_results = [execute_scheduler_simulation_simple(
+            tasks=TaskSet(periodic_tasks=periodic_tasks, aperiodic_tasks=[], sporadic_tasks=[]),
+            aperiodic_tasks_jobs=[],
+            sporadic_tasks_jobs=[],
+            processor_definition=generate_default_cpu(2, {1000}),
+            environment_specification=default_environment_specification(),
+            simulation_options=SimulationConfiguration(simulate_thermal_behaviour=True,
+                                                       thermal_model_cache=thermal_model_cache),
+            scheduler=SGEDF(False)
+        )[0] for thermal_model_cache in [None, model_cache, model_cache]]
+
+        assert model_cache.number_of_misses == 1 and model_cache.number_of_hits == 1
+
+        for simulation_result in simulation_results[1:]:
+            assert list(simulation_result.temperature_measures.keys()) == \
+                   list(simulation_results[0].temperature_measures.keys())
+            assert all(numpy.array_equal(simulation_result.temperature_measures[i][j].temperature.temperatureMatrix,
+                                         simulation_results[0].temperature_measures[i][j].temperature.temperatureMatrix)
+                       for i in simulation_result.temperature_measures.keys()
+                       for j in simulation_result.temperature_measures[i].keys())
+
+
+if __name__ == '__main__':
+    unittest.main()
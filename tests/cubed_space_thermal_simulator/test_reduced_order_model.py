@@ -0,0 +1,116 @@
+import os
+import tempfile
+import unittest
+
+import numpy
+
+from tertimuss.cubed_space_thermal_simulator import Dimensions, Location, Model, Cuboid, TMExternal, TMInternal
+from tertimuss.cubed_space_thermal_simulator.materials_pack import SMCooper, SMSilicon, FEAirForced
+from tertimuss.simulation_lib.simulator import SimulationConfiguration, execute_scheduler_simulation_simple
+from tertimuss.simulation_lib.system_definition import PeriodicTask, PreemptiveExecution, Criticality, TaskSet
+from tertimuss.simulation_lib.system_definition.utils import generate_default_cpu, default_environment_specification
+from tertimuss.schedulers.g_edf import SGEDF
+
+
+class ReducedOrderModelTest(unittest.TestCase):
+    @staticmethod
+    def __model_definition(simulation_precision: str):
+        # Silicon core over a copper board
+        return dict(
+            material_cubes={
+                0: (SMSilicon(), Cuboid(location=Location(x=1, y=1, z=2), dimensions=Dimensions(x=2, y=3, z=1))),
+                1: (SMCooper(), Cuboid(location=Location(x=0, y=0, z=0), dimensions=Dimensions(x=4, y=5, z=2)))
+            },
+            cube_edge_size=0.001,
+            environment_properties=FEAirForced(),
+            external_temperature_booster_points={
+                0: TMExternal(cuboid=Cuboid(location=Location(x=1, y=1, z=2), dimensions=Dimensions(x=2, y=3, z=1)),
+                              boostRate=20.0)
+            },
+            internal_temperature_booster_points={
+                0: TMInternal(cuboid=Cuboid(location=Location(x=1, y=1, z=2), dimensions=Dimensions(x=2, y=3, z=1)),
+                              boostRateMultiplier=0.001)
+            },
+            simulation_precision=simulation_precision)
+
+    def test_reduced_order_model(self):
+        reference_model = Model(**self.__model_definition("EXACT"))
+        full_number_of_places = len(reference_model.create_initial_state(default_temperature=300).places_mo_vector)
+
+        for reduced_order_modes in [3, 10]:
+            model = Model(**self.__model_definition("HIGH"), reduced_order_modes=reduced_order_modes)
+            state = model.create_initial_state(default_temperature=300, environment_temperature=290)
+            expected_state = reference_model.create_initial_state(default_temperature=300,
+                                                                  environment_temperature=290)
+
+            assert len(state.places_mo_vector) < full_number_of_places
+
+            for step, external_points, internal_points in [(0.5, set(), set()), (0.25, {0}, {0}), (0.01, {0}, set()),
+                                                           (1.0, set(), {0})]:
+                state = model.apply_energy(state, step, external_energy_application_points=external_points,
+                                           internal_energy_application_points=internal_points)
+                expected_state = reference_model.apply_energy(expected_state, step,
+                                                              external_energy_application_points=external_points,
+                                                              internal_energy_application_points=internal_points)
+
+                temperature = model.obtain_temperature(state)
+                expected_temperature = reference_model.obtain_temperature(expected_state)
+
+                error = max(numpy.abs(temperature[i].temperature.temperatureMatrix -
+                                      expected_temperature[i].temperature.temperatureMatrix).max()
+                            for i in expected_temperature.keys())
+                error_bound = model.obtain_reduction_error_bound(state)
+
+                assert error <= error_bound < 1.0
+
+            # A state of the full model is projected in the reduced model
+            assert len(model.restore_state(expected_state).places_mo_vector) == len(state.places_mo_vector)
+
+        self.assertRaises(Exception, lambda: reference_model.obtain_reduction_error_bound(expected_state))
+
+    def test_reduced_order_model_save_load(self):
+        model = Model(**self.__model_definition("HIGH"), reduced_order_modes=5)
+        state = model.apply_energy(model.create_initial_state(default_temperature=300), 0.5,
+                                   external_energy_application_points={0}, internal_energy_application_points={0})
+
+        with tempfile.TemporaryDirectory() as directory:
+            model.save(os.path.join(directory, "model.npz"))
+            loaded_model = Model.load(os.path.join(directory, "model.npz"),
+                                      self.__model_definition("HIGH")["material_cubes"])
+
+        state_loaded = loaded_model.apply_energy(loaded_model.restore_state(state), 0.5)
+        state = model.apply_energy(model.restore_state(state), 0.5)
+
+        assert numpy.allclose(state_loaded.places_mo_vector, state.places_mo_vector)
+
+    def test_simulation_with_reduced_order_model(self):
+        periodic_tasks = [PeriodicTask(identifier=i, worst_case_execution_time=j, relative_deadline=k,
+                                       best_case_execution_time=None, execution_time_distribution=None,
+                                       memory_footprint=None, priority=None,
+                                       preemptive_execution=PreemptiveExecution.FULLY_PREEMPTIVE,
+                                       deadline_criteria=Criticality.HARD, energy_consumption=None, phase=None,
+                                       period=k) for i, (j, k) in enumerate([(3000, 7.0), (4000, 7.0), (4000, 14.0)])]
+
+        simulation_results = [execute_scheduler_simulation_simple(
+            tasks=TaskSet(periodic_tasks=periodic_tasks, aperiodic_tasks=[], sporadic_tasks=[]),
+            aperiodic_tasks_jobs=[],
+            sporadic_tasks_jobs=[],
+            processor_definition=generate_default_cpu(2, {1000}),
+            environment_specification=default_environment_specification(),
+            simulation_options=SimulationConfiguration(simulate_thermal_behaviour=True,
+                                                       thermal_simulation_precision="EXACT",
+                                                       thermal_reduced_order_modes=thermal_reduced_order_modes),
+            scheduler=SGEDF(False)
+        )[0] for thermal_reduced_order_modes in [None, 20]]
+
+        assert list(simulation_results[1].temperature_measures.keys()) == \
+               list(simulation_results[0].temperature_measures.keys())
+        assert all(numpy.allclose(simulation_results[1].temperature_measures[i][j].temperature.temperatureMatrix,
+                                  simulation_results[0].temperature_measures[i][j].temperature.temperatureMatrix,
+                                  rtol=0, atol=1e-1)
+                   for i in simulation_results[0].temperature_measures.keys()
+                   for j in simulation_results[0].temperature_measures[i].keys())
+
+
+if __name__ == '__main__':
+    unittest.main()
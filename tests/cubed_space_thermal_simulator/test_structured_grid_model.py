@@ -0,0 +1,117 @@
+import unittest
+
+import numpy
+
+from tertimuss.cubed_space_thermal_simulator import Dimensions, Location, Model, Cuboid, TMExternal, TMInternal, \
+    StructuredGridModel
+from tertimuss.cubed_space_thermal_simulator.materials_pack import SMCooper, SMSilicon, FEAirForced
+from tertimuss.simulation_lib.simulator import SimulationConfiguration, execute_scheduler_simulation_simple
+from tertimuss.simulation_lib.system_definition import PeriodicTask, PreemptiveExecution, Criticality, TaskSet
+from tertimuss.simulation_lib.system_definition.utils import generate_default_cpu, default_environment_specification
+from tertimuss.schedulers.g_edf import SGEDF
+
+
+class StructuredGridModelTest(unittest.TestCase):
+    @staticmethod
+    def __model_definition(simulation_precision: str):
+        # Silicon core over a copper board
+        return dict(
+            material_cubes={
+                0: (SMSilicon(), Cuboid(location=Location(x=1, y=1, z=2), dimensions=Dimensions(x=2, y=3, z=1))),
+                1: (SMCooper(), Cuboid(location=Location(x=0, y=0, z=0), dimensions=Dimensions(x=4, y=5, z=2)))
+            },
+            cube_edge_size=0.001,
+            environment_properties=FEAirForced(),
+            external_temperature_booster_points={
+                0: TMExternal(cuboid=Cuboid(location=Location(x=1, y=1, z=2), dimensions=Dimensions(x=2, y=3, z=1)),
+                              boostRate=20.0)
+            },
+            internal_temperature_booster_points={
+                0: TMInternal(cuboid=Cuboid(location=Location(x=1, y=1, z=2), dimensions=Dimensions(x=2, y=3, z=1)),
+                              boostRateMultiplier=0.001)
+            },
+            simulation_precision=simulation_precision)
+
+    def test_structured_grid_model(self):
+        reference_model = Model(**self.__model_definition("EXACT"))
+        reference_state = reference_model.create_initial_state(default_temperature=300, environment_temperature=290)
+
+        for simulation_precision, error in [("LOW", 0.5), ("MIDDLE", 0.1), ("HIGH", 1e-3)]:
+            model = StructuredGridModel(**self.__model_definition(simulation_precision))
+            state = model.create_initial_state(default_temperature=300, environment_temperature=290)
+            expected_state = reference_model.restore_state(reference_state)
+
+            # The states have the same places than the ones of Model
+            assert numpy.allclose(state.places_mo_vector, expected_state.places_mo_vector)
+
+            for step, external_points, internal_points in [(0.5, set(), set()), (0.25, {0}, {0}), (0.01, {0}, set()),
+                                                           (1.0, set(), {0})]:
+                state = model.apply_energy(state, step, external_energy_application_points=external_points,
+                                           internal_energy_application_points=internal_points)
+                expected_state = reference_model.apply_energy(expected_state, step,
+                                                              external_energy_application_points=external_points,
+                                                              internal_energy_application_points=internal_points)
+
+                temperature = model.obtain_temperature(state)
+                expected_temperature = reference_model.obtain_temperature(expected_state)
+
+                assert all(numpy.allclose(temperature[i].temperature.temperatureMatrix,
+                                          expected_temperature[i].temperature.temperatureMatrix, rtol=0, atol=error)
+                           for i in expected_temperature.keys())
+
+    def test_structured_grid_model_batch(self):
+        model = StructuredGridModel(**self.__model_definition("HIGH"))
+
+        initial_states = [model.create_initial_state(default_temperature=i, environment_temperature=290) for i in
+                          [300, 320]]
+        external_points_usage = [{0: 0.25}, {0: 1.0}]
+
+        batch_state = model.apply_energy_batch(model.create_batch_state(initial_states), 0.5, external_points_usage,
+                                               {0})
+
+        for state, initial_state, usage in zip(model.split_batch_state(batch_state), initial_states,
+                                               external_points_usage):
+            expected_state = model.apply_energy(initial_state, 0.5, internal_energy_application_points={0},
+                                                external_energy_application_points_usage=usage)
+            # The step sizes are selected with the error of all the simulations of the batch, so the results only agree
+            # within the tolerance of the integration
+            assert numpy.allclose(state.places_mo_vector, expected_state.places_mo_vector, rtol=0, atol=1e-3)
+
+    def test_structured_grid_model_overlap(self):
+        definition = self.__model_definition("HIGH")
+        definition["material_cubes"][0][1].location.z = 0
+
+        self.assertRaises(Exception, lambda: StructuredGridModel(**definition))
+
+    def test_simulation_with_structured_grid_model(self):
+        periodic_tasks = [PeriodicTask(identifier=i, worst_case_execution_time=j, relative_deadline=k,
+                                       best_case_execution_time=None, execution_time_distribution=None,
+                                       memory_footprint=None, priority=None,
+                                       preemptive_execution=PreemptiveExecution.FULLY_PREEMPTIVE,
+                                       deadline_criteria=Criticality.HARD, energy_consumption=None, phase=None,
+                                       period=k) for i, (j, k) in enumerate([(3000, 7.0), (4000, 7.0), (4000, 14.0)])]
+
+        simulation_results = [execute_scheduler_simulation_simple(
+            tasks=TaskSet(periodic_tasks=periodic_tasks, aperiodic_tasks=[], sporadic_tasks=[]),
+            aperiodic_tasks_jobs=[],
+            sporadic_tasks_jobs=[],
+            processor_definition=generate_default_cpu(2, {1000}),
+            environment_specification=default_environment_specification(),
+            simulation_options=SimulationConfiguration(simulate_thermal_behaviour=True,
+                                                       thermal_simulation_precision=thermal_simulation_precision,
+                                                       thermal_simulation_engine=thermal_simulation_engine),
+            scheduler=SGEDF(False)
+        )[0] for thermal_simulation_precision, thermal_simulation_engine in [("EXACT", "TCPN"),
+                                                                             ("HIGH", "STRUCTURED_GRID")]]
+
+        assert list(simulation_results[1].temperature_measures.keys()) == \
+               list(simulation_results[0].temperature_measures.keys())
+        assert all(numpy.allclose(simulation_results[1].temperature_measures[i][j].temperature.temperatureMatrix,
+                                  simulation_results[0].temperature_measures[i][j].temperature.temperatureMatrix,
+                                  rtol=0, atol=1e-2)
+                   for i in simulation_results[0].temperature_measures.keys()
+                   for j in simulation_results[0].temperature_measures[i].keys())
+
+
+if __name__ == '__main__':
+    unittest.main()
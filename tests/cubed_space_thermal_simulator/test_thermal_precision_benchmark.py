@@ -0,0 +1,120 @@
+import time
+import unittest
+
+import numpy
+
+from tertimuss.cubed_space_thermal_simulator import Model, Cuboid, Location, Dimensions, TMInternal, TMExternal, \
+    StructuredGridModel
+from tertimuss.cubed_space_thermal_simulator.materials_pack import SMSilicon, FEAirForced, SMCooper
+
+
+class ThermalPrecisionBenchmark(unittest.TestCase):
+    @staticmethod
+    def __run_benchmark(simulation_precision: str, number_of_steps: int, step: float):
+        cubed_space = Model(material_cubes={0: (SMSilicon(), Cuboid(location=Location(x=0, z=0, y=0),
+                                                                    dimensions=Dimensions(x=10, z=10, y=2)))},
+                            cube_edge_size=0.001, environment_properties=FEAirForced(),
+                            simulation_precision=simulation_precision)
+
+        actual_state = cubed_space.create_initial_state(default_temperature=273.15 + 25,
+                                                        material_cubes_temperatures={0: 273.15 + 65},
+                                                        environment_temperature=273.15 + 25)
+
+        start_time = time.perf_counter()
+        for _ in range(number_of_steps):
+            actual_state = cubed_space.apply_energy(actual_state=actual_state, amount_of_time=step)
+
+        elapsed_time = time.perf_counter() - start_time
+
+        return elapsed_time, cubed_space.obtain_temperature(actual_state)[0].temperature.temperatureMatrix
+
+    @unittest.skip("Manual benchmark test")
+    def test_thermal_precision(self):
+        for number_of_steps, step in [(10, 0.1), (100, 0.01), (1000, 0.001)]:
+            _, reference_temperature = self.__run_benchmark("EXACT", number_of_steps, step)
+            for simulation_precision in ["LOW", "MIDDLE", "HIGH", "EXACT"]:
+                elapsed_time, temperature = self.__run_benchmark(simulation_precision, number_of_steps, step)
+                print(number_of_steps, "steps of", step, "seconds,", simulation_precision, ":", elapsed_time,
+                      "seconds, max difference with EXACT",
+                      numpy.abs(temperature - reference_temperature).max(), "K")
+
+    @staticmethod
+    def __run_alternating_benchmark(simulation_precision: str, number_of_steps: int, step: float):
+        internal_heat_generators = {i: TMInternal(cuboid=Cuboid(location=Location(x=5 * i, z=0, y=0),
+                                                                dimensions=Dimensions(x=5, z=1, y=10)),
+                                                  boostRateMultiplier=0.001) for i in range(2)}
+
+        cubed_space = Model(material_cubes={0: (SMSilicon(), Cuboid(location=Location(x=0, z=0, y=0),
+                                                                    dimensions=Dimensions(x=10, z=10, y=2)))},
+                            cube_edge_size=0.001, environment_properties=FEAirForced(),
+                            internal_temperature_booster_points=internal_heat_generators,
+                            simulation_precision=simulation_precision)
+
+        actual_state = cubed_space.create_initial_state(default_temperature=273.15 + 25,
+                                                        material_cubes_temperatures={0: 273.15 + 65},
+                                                        environment_temperature=273.15 + 25)
+
+        start_time = time.perf_counter()
+        for i in range(number_of_steps):
+            # Periodic pattern of active energy application points and step sizes
+            actual_state = cubed_space.apply_energy(actual_state=actual_state, amount_of_time=step * (1 + i % 2),
+                                                    internal_energy_application_points={i % 2})
+
+        elapsed_time = time.perf_counter() - start_time
+
+        return elapsed_time, cubed_space.obtain_temperature(actual_state)[0].temperature.temperatureMatrix
+
+    @unittest.skip("Manual benchmark test")
+    def test_thermal_precision_alternating_control(self):
+        for number_of_steps, step in [(100, 0.01), (1000, 0.001)]:
+            _, reference_temperature = self.__run_alternating_benchmark("EXACT", number_of_steps, step)
+            for simulation_precision in ["LOW", "HIGH", "EXACT"]:
+                elapsed_time, temperature = self.__run_alternating_benchmark(simulation_precision, number_of_steps,
+                                                                             step)
+                print(number_of_steps, "alternating steps of", step, "seconds,", simulation_precision, ":",
+                      elapsed_time, "seconds, max difference with EXACT",
+                      numpy.abs(temperature - reference_temperature).max(), "K")
+
+    @staticmethod
+    def __run_mesh_benchmark(model_class, simulation_precision: str, mesh_division: int):
+        # Four silicon cores over a copper board, with a mesh of mesh_division cubes by millimeter
+        cores_cuboids = {i: Cuboid(location=Location(x=mesh_division * (2 + 12 * (i % 2)),
+                                                     y=mesh_division * (2 + 12 * (i // 2)), z=mesh_division),
+                                   dimensions=Dimensions(x=10 * mesh_division, y=10 * mesh_division, z=mesh_division))
+                         for i in range(4)}
+
+        material_cubes = {i: (SMSilicon(), j) for i, j in cores_cuboids.items()}
+        material_cubes[4] = (SMCooper(), Cuboid(location=Location(x=0, y=0, z=0),
+                                                dimensions=Dimensions(x=26 * mesh_division, y=26 * mesh_division,
+                                                                      z=mesh_division)))
+
+        cubed_space = model_class(material_cubes=material_cubes, cube_edge_size=0.001 / mesh_division,
+                                  environment_properties=FEAirForced(),
+                                  external_temperature_booster_points={i: TMExternal(cuboid=j, boostRate=50.0) for
+                                                                       i, j in cores_cuboids.items()},
+                                  simulation_precision=simulation_precision)
+
+        actual_state = cubed_space.create_initial_state(default_temperature=273.15 + 25)
+
+        start_time = time.perf_counter()
+        for i in range(100):
+            actual_state = cubed_space.apply_energy(actual_state=actual_state, amount_of_time=0.01,
+                                                    external_energy_application_points={i % 4, (i + 1) % 4})
+
+        elapsed_time = time.perf_counter() - start_time
+
+        return elapsed_time, numpy.asarray(actual_state.places_mo_vector, dtype=numpy.float64)
+
+    @unittest.skip("Manual benchmark test")
+    def test_structured_grid_precision(self):
+        for mesh_division in [1, 2, 4]:
+            _, reference_marking = self.__run_mesh_benchmark(Model, "EXACT", mesh_division)
+            for model_class, simulation_precision in [(Model, "HIGH"), (StructuredGridModel, "LOW"),
+                                                      (StructuredGridModel, "MIDDLE"), (StructuredGridModel, "HIGH")]:
+                elapsed_time, marking = self.__run_mesh_benchmark(model_class, simulation_precision, mesh_division)
+                print("Mesh division", mesh_division, model_class.__name__, simulation_precision, ":", elapsed_time,
+                      "seconds, max difference with EXACT", numpy.abs(marking - reference_marking).max(), "K")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import csv
+import functools
+import os
+import signal
+import tempfile
+import time
+import unittest
+
+from tertimuss.experiments import ExperimentGrid, execute_experiment, generate_experiment_runs, execute_experiment_run
+from tertimuss.schedulers.g_edf import SGEDF
+from tertimuss.simulation_lib.schedulers_definition import CentralizedScheduler
+
+
+def _failing_scheduler_factory() -> CentralizedScheduler:
+    raise Exception("Scheduler creation failed")
+
+
+def _endless_scheduler_factory() -> CentralizedScheduler:
+    # The exceptions are caught, so only the timeout can stop it
+    while True:
+        try:
+            time.sleep(0.01)
+        except Exception:
+            pass
+
+
+def _crashing_scheduler_factory() -> CentralizedScheduler:
+    os._exit(1)
+
+
+class ExperimentRunnerTest(unittest.TestCase):
+    def test_execute_experiment(self):
+        experiment_grid = ExperimentGrid(utilizations=[1.0, 1.5],
+                                         numbers_of_tasks=[4],
+                                         schedulers={"G-EDF": functools.partial(SGEDF, False),
+                                                     "FAILING": _failing_scheduler_factory},
+                                         number_of_task_sets=2,
+                                         number_of_cores=2)
+
+        experiment_runs = generate_experiment_runs(experiment_grid)
+
+        # Each task set is evaluated with every scheduler
+        assert len(experiment_runs) == 8
+        assert len({i.seed for i in experiment_runs}) == 4
+        assert all(len({j.seed for j in experiment_runs if j.scheduler_name == i}) == 4
+                   for i in experiment_grid.schedulers.keys())
+
+        with tempfile.TemporaryDirectory() as temporal_directory:
+            summary_file_path = os.path.join(temporal_directory, "summary.csv")
+            experiment_run_results = execute_experiment(experiment_grid, summary_file_path=summary_file_path,
+                                                        max_workers=2, chunk_size=5, run_timeout=60)
+
+            with open(summary_file_path, newline="") as summary_file:
+                summary_rows = list(csv.DictReader(summary_file))
+
+        assert [i.run for i in experiment_run_results] == experiment_runs
+        assert len(summary_rows) == 8
+        assert sorted(int(i["run_id"]) for i in summary_rows) == list(range(8))
+
+        # A failing run doesn't stop the experiment
+        assert all(i.status == "ERROR" for i in experiment_run_results if i.run.scheduler_name == "FAILING")
+        assert all(i.status == "OK" and i.have_been_scheduled for i in experiment_run_results if
+                   i.run.scheduler_name != "FAILING")
+
+        # The same task sets are generated in each execution
+        assert [(i.number_of_preemptions, i.number_of_migrations) for i in experiment_run_results] == [
+            (i.number_of_preemptions, i.number_of_migrations) for i in
+            execute_experiment(experiment_grid, max_workers=1)]
+
+    @unittest.skipIf(not hasattr(signal, "SIGALRM"), "SIGALRM is not available in this platform")
+    def test_execute_experiment_run_timeout(self):
+        experiment_grid = ExperimentGrid(utilizations=[1.0],
+                                         numbers_of_tasks=[4],
+                                         schedulers={"ENDLESS": _endless_scheduler_factory},
+                                         number_of_task_sets=1,
+                                         number_of_cores=2)
+
+        def previous_handler(signum, frame):
+            pass
+
+        signal.signal(signal.SIGALRM, previous_handler)
+        try:
+            experiment_run = generate_experiment_runs(experiment_grid)[0]
+            experiment_run_result = execute_experiment_run(experiment_grid, experiment_run, run_timeout=0.2)
+
+            # The timeout isn't caught by the scheduler, and the previous handler is restored without pending timers
+            assert experiment_run_result.status == "TIMEOUT"
+            assert signal.getsignal(signal.SIGALRM) is previous_handler
+            assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+        finally:
+            signal.signal(signal.SIGALRM, signal.SIG_DFL)
+
+    def test_execute_experiment_process_crash(self):
+        experiment_grid = ExperimentGrid(utilizations=[1.0, 1.5],
+                                         numbers_of_tasks=[4],
+                                         schedulers={"G-EDF": functools.partial(SGEDF, False),
+                                                     "CRASHING": _crashing_scheduler_factory},
+                                         number_of_task_sets=2,
+                                         number_of_cores=2)
+
+        experiment_runs = generate_experiment_runs(experiment_grid)
+        experiment_run_results = execute_experiment(experiment_grid, max_workers=2, chunk_size=3, run_timeout=60)
+
+        # Only the runs that kill its process are marked as crashed
+        assert [i.run for i in experiment_run_results] == experiment_runs
+        assert all(i.status == "CRASH" for i in experiment_run_results if i.run.scheduler_name == "CRASHING")
+        assert all(i.status == "OK" and i.have_been_scheduled for i in experiment_run_results if
+                   i.run.scheduler_name != "CRASHING")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from tertimuss.schedulers.c_edf import SCEDF
+from tertimuss.simulation_lib.simulator import execute_scheduler_simulation_simple, SimulationConfiguration
+from tertimuss.simulation_lib.system_definition import TaskSet
+from tertimuss.simulation_lib.system_definition.utils import generate_default_cpu, default_environment_specification
+from tests.schedulers._common_scheduler_tests_utils import create_implicit_deadline_periodic_task_h_rt, \
+    periodic_implicit_deadline_tasks
+
+
+class CEDFTest(unittest.TestCase):
+    def test_clustered_task_set(self):
+        task_set = TaskSet(periodic_tasks=[create_implicit_deadline_periodic_task_h_rt(j, i[0], i[1]) for j, i in
+                                           enumerate(periodic_implicit_deadline_tasks)],
+                           sporadic_tasks=[],
+                           aperiodic_tasks=[])
+
+        number_of_cores = 4
+        available_frequencies = {1000}
+
+        simulation_result, periodic_jobs, major_cycle = execute_scheduler_simulation_simple(
+            tasks=task_set,
+            aperiodic_tasks_jobs=[],
+            sporadic_tasks_jobs=[],
+            processor_definition=generate_default_cpu(number_of_cores, available_frequencies),
+            environment_specification=default_environment_specification(),
+            simulation_options=SimulationConfiguration(id_debug=True),
+            scheduler=SCEDF(activate_debug=True, cluster_size=2)
+        )
+
+        # Correct execution
+        assert simulation_result.have_been_scheduled
+        assert simulation_result.hard_real_time_deadline_missed_stack_trace is None
+
+        # All the jobs of a task are executed in the same cluster
+        tasks_clusters = {}
+        for cpu_id, sections in simulation_result.job_sections_execution.items():
+            for section in sections:
+                assert tasks_clusters.setdefault(section.task_id, cpu_id // 2) == cpu_id // 2
+
+    def test_cluster_size_not_dividing_cpus(self):
+        simulation_result, _, _ = execute_scheduler_simulation_simple(
+            tasks=TaskSet(periodic_tasks=[create_implicit_deadline_periodic_task_h_rt(0, 3000, 10.0)],
+                          aperiodic_tasks=[], sporadic_tasks=[]),
+            aperiodic_tasks_jobs=[],
+            sporadic_tasks_jobs=[],
+            processor_definition=generate_default_cpu(3, {1000}),
+            environment_specification=default_environment_specification(),
+            scheduler=SCEDF(activate_debug=False, cluster_size=2)
+        )
+
+        assert not simulation_result.have_been_scheduled
+
+
+if __name__ == '__main__':
+    unittest.main()
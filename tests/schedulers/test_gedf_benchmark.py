@@ -0,0 +1,154 @@
+import time
+import unittest
+from typing import Dict, Optional, Set, List, Tuple
+
+from tertimuss.schedulers.c_edf import SCEDF
+from tertimuss.schedulers.g_edf import SGEDF
+from tertimuss.schedulers.p_edf import SPEDF
+from tertimuss.simulation_lib.schedulers_definition import CentralizedScheduler
+from tertimuss.simulation_lib.simulator import execute_scheduler_simulation, SimulationConfiguration, \
+    RawSimulationResult
+from tertimuss.simulation_lib.system_definition import PeriodicTask, PreemptiveExecution, Criticality, \
+    Environment, Processor, Job, TaskSet
+from tertimuss.simulation_lib.system_definition.utils import generate_default_cpu, default_environment_specification
+
+
+class GEDFBenchmark(unittest.TestCase):
+    @staticmethod
+    def __sorted_ready_queue_gedf_definition() -> CentralizedScheduler:
+        # G-EDF that sorts all the active jobs in each invocation, used as reference
+        class SortedReadyQueueGEDF(CentralizedScheduler):
+            def __init__(self):
+                super().__init__(False)
+                self.__m = 0
+                self.__tasks_relative_deadline: Dict[int, float] = {}
+                self.__active_jobs_priority: Dict[int, float] = {}
+
+            def check_schedulability(self, processor_definition: Processor,
+                                     environment_specification: Environment, task_set: TaskSet) \
+                    -> [bool, Optional[str]]:
+                return True, None
+
+            def offline_stage(self, processor_definition: Processor,
+                              environment_specification: Environment, task_set: TaskSet) -> int:
+                self.__m = len(processor_definition.cores_definition)
+                self.__tasks_relative_deadline = {i.identifier: i.relative_deadline for i in
+                                                  task_set.periodic_tasks + task_set.aperiodic_tasks +
+                                                  task_set.sporadic_tasks}
+                return max(Set.intersection(*[i.core_type.available_frequencies for i
+                                              in processor_definition.cores_definition.values()]))
+
+            def schedule_policy(self, global_time: float, active_jobs_id: Set[int],
+                                jobs_being_executed_id: Dict[int, int], cores_frequency: int,
+                                cores_max_temperature: Optional[Dict[int, float]]) \
+                    -> Tuple[Dict[int, int], Optional[int], Optional[int]]:
+                tasks_that_can_be_executed = sorted(self.__active_jobs_priority.items(), key=lambda j: j[1])
+
+                if len(tasks_that_can_be_executed) <= self.__m:
+                    tasks_to_execute = [i for (i, j) in tasks_that_can_be_executed]
+                else:
+                    last_priority = tasks_that_can_be_executed[self.__m - 1][1]
+                    height_priority = [i for (i, j) in tasks_that_can_be_executed if j < last_priority]
+                    middle_priority = [i for (i, j) in tasks_that_can_be_executed if
+                                       j == last_priority and i in jobs_being_executed_id.values()]
+                    lowest_priority = [i for (i, j) in tasks_that_can_be_executed if
+                                       j == last_priority and i not in jobs_being_executed_id.values()]
+                    tasks_to_execute = (height_priority + middle_priority + lowest_priority)[0:self.__m]
+
+                jobs_running = {i: j for (i, j) in jobs_being_executed_id.items() if j in tasks_to_execute}
+                remaining_tasks_to_execute = [i for i in tasks_to_execute if i not in jobs_running.values()]
+                remaining_cpus = [i for i in range(self.__m) if i not in jobs_running.keys()]
+                jobs_running.update({i: j for (i, j) in zip(remaining_cpus, remaining_tasks_to_execute)})
+
+                return jobs_running, None, None
+
+            def on_major_cycle_start(self, global_time: float) -> bool:
+                return True
+
+            def on_jobs_activation(self, global_time: float, activation_time: float,
+                                   jobs_id_tasks_ids: List[Tuple[int, int]]) -> bool:
+                self.__active_jobs_priority.update(
+                    {i: self.__tasks_relative_deadline[j] + activation_time for i, j in jobs_id_tasks_ids})
+                return True
+
+            def on_jobs_deadline_missed(self, global_time: float, jobs_id: List[int]) -> bool:
+                for i in jobs_id:
+                    del self.__active_jobs_priority[i]
+                return True
+
+            def on_job_execution_finished(self, global_time: float, jobs_id: List[int]) -> bool:
+                for i in jobs_id:
+                    del self.__active_jobs_priority[i]
+                return True
+
+        return SortedReadyQueueGEDF()
+
+    @staticmethod
+    def __run_simulation(scheduler: CentralizedScheduler, number_of_tasks: int, number_of_cores: int,
+                         number_of_periods: int, utilization_per_core: float = 1.5) \
+            -> Tuple[RawSimulationResult, float]:
+        frequency = 1000
+
+        # Soft real time tasks, with an utilization of 1.5 per core by default, so the active jobs accumulate. Groups
+        # of tasks share the period to have jobs with the same deadline
+        periodic_tasks = [PeriodicTask(identifier=i,
+                                       worst_case_execution_time=round(utilization_per_core * number_of_cores *
+                                                                       frequency * (1 + i % 3) / number_of_tasks) +
+                                       i % 7,
+                                       relative_deadline=(1 + i % 3) * 2.0,
+                                       best_case_execution_time=None,
+                                       execution_time_distribution=None,
+                                       memory_footprint=None,
+                                       priority=None,
+                                       preemptive_execution=PreemptiveExecution.FULLY_PREEMPTIVE,
+                                       deadline_criteria=Criticality.SOFT,
+                                       energy_consumption=None,
+                                       phase=None,
+                                       period=(1 + i % 3) * 2.0) for i in range(number_of_tasks)]
+
+        jobs = [Job(identifier=k * number_of_tasks + i.identifier, task=i, activation_time=k * i.period)
+                for i in periodic_tasks for k in range(round(number_of_periods * 6.0 / i.period))]
+
+        start_time = time.perf_counter()
+        simulation_result = execute_scheduler_simulation(
+            jobs=jobs,
+            tasks=TaskSet(periodic_tasks=periodic_tasks, aperiodic_tasks=[], sporadic_tasks=[]),
+            processor_definition=generate_default_cpu(number_of_cores, {frequency}),
+            environment_specification=default_environment_specification(),
+            scheduler=scheduler,
+            simulation_options=SimulationConfiguration(id_debug=False, scheduler_selections_check=False),
+            simulation_start_time=0,
+            simulation_end_time=number_of_periods * 6.0)
+
+        return simulation_result, time.perf_counter() - start_time
+
+    def test_same_schedule_than_sorted_ready_queue(self):
+        simulation_result, _ = self.__run_simulation(SGEDF(False), 60, 8, 3)
+        expected_simulation_result, _ = self.__run_simulation(self.__sorted_ready_queue_gedf_definition(), 60, 8, 3)
+
+        assert simulation_result.job_sections_execution == expected_simulation_result.job_sections_execution
+        assert simulation_result.scheduling_points == expected_simulation_result.scheduling_points
+
+    @unittest.skip("Manual benchmark test")
+    def test_schedule_policy_throughput(self):
+        for number_of_tasks, number_of_cores in [(256, 16), (1024, 64), (4096, 64)]:
+            _, elapsed_time = self.__run_simulation(SGEDF(False), number_of_tasks, number_of_cores, 2)
+            _, reference_elapsed_time = self.__run_simulation(self.__sorted_ready_queue_gedf_definition(),
+                                                              number_of_tasks, number_of_cores, 2)
+            print(number_of_tasks, "tasks and", number_of_cores, "cores:", elapsed_time, "seconds with the heap,",
+                  reference_elapsed_time, "seconds sorting the active jobs")
+
+    @unittest.skip("Manual benchmark test")
+    def test_partitioned_schedule_policy_throughput(self):
+        for number_of_tasks, number_of_cores in [(256, 16), (1024, 64), (4096, 64)]:
+            for scheduler_name, scheduler in [("G-EDF", lambda: SGEDF(False)),
+                                              ("C-EDF with clusters of 4 CPUs", lambda: SCEDF(False, 4)),
+                                              ("P-EDF", lambda: SPEDF(False))]:
+                simulation_result, elapsed_time = self.__run_simulation(scheduler(), number_of_tasks, number_of_cores,
+                                                                        2, 0.9)
+                print(number_of_tasks, "tasks and", number_of_cores, "cores with", scheduler_name, ":",
+                      len(simulation_result.scheduling_points), "scheduling points in", elapsed_time, "seconds")
+
+
+if __name__ == '__main__':
+    unittest.main()
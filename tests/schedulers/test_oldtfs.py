@@ -1,6 +1,8 @@
 import unittest
 from typing import Dict
 
+import numpy
+
 from tertimuss.schedulers.oldtfs import SOLDTFS
 from tertimuss.simulation_lib.simulator import execute_scheduler_simulation_simple, SimulationConfiguration
 from tertimuss.simulation_lib.system_definition import TaskSet, PeriodicTask, PreemptiveExecution, Criticality
@@ -70,3 +72,93 @@ class OLDTFSTest(unittest.TestCase):
         # In this task set it only accomplish a 70% of execution in all tasks (It should be reviewed)
         all((executed_cycles_by_task[i] / cycles_per_task_in_major_cycle[i]) > 0.7 for i in
             cycles_per_task_in_major_cycle.keys())
+
+    def test_simulation_frequency_independence(self):
+        # The sliding mode control only simulates the TCPN when the control changes, so high frequencies are feasible.
+        # The fluid schedule doesn't depend on the frequency
+        execution_sections = []
+
+        for frequency in [100, 1000000]:
+            periodic_tasks = [
+                self.create_implicit_deadline_periodic_task_s_rt(0, 10 * frequency, 20.0),
+                self.create_implicit_deadline_periodic_task_s_rt(1, 5 * frequency, 10.0),
+                self.create_implicit_deadline_periodic_task_s_rt(2, 7 * frequency, 10.0),
+                self.create_implicit_deadline_periodic_task_s_rt(3, 7 * frequency, 10.0),
+                self.create_implicit_deadline_periodic_task_s_rt(4, 7 * frequency, 10.0),
+                self.create_implicit_deadline_periodic_task_s_rt(5, 14 * frequency, 20.0)
+            ]
+
+            simulation_result, _, _ = execute_scheduler_simulation_simple(
+                tasks=TaskSet(periodic_tasks=periodic_tasks, aperiodic_tasks=[], sporadic_tasks=[]),
+                aperiodic_tasks_jobs=[],
+                sporadic_tasks_jobs=[],
+                processor_definition=generate_default_cpu(5, {frequency}, 0),
+                environment_specification=default_environment_specification(),
+                simulation_options=SimulationConfiguration(id_debug=True),
+                scheduler=SOLDTFS(240, simulate_thermal=False)
+            )
+
+            assert simulation_result.have_been_scheduled
+
+            execution_sections.append(sorted((j.task_id, j.execution_start_time, j.execution_end_time)
+                                             for i in simulation_result.job_sections_execution.values() for j in i))
+
+        assert execution_sections[0] == execution_sections[1]
+
+    def test_sliding_surface_sign_change_detection(self):
+        # The sign of a task-processor pair is reversed every 7 cycles, so the sign changes and recovers between
+        # cycles where the sliding surface is far from zero. The schedule must be the one obtained checking the sign
+        # in every cycle
+        class SOLDTFSReversedSign(SOLDTFS):
+            def _SOLDTFS__obtain_sliding_surface_sign(self, mo: numpy.ndarray, time: float) -> numpy.ndarray:
+                sliding_surface_sign = super()._SOLDTFS__obtain_sliding_surface_sign(mo, time)
+                if round(time * 100) % 7 == 3:
+                    sliding_surface_sign[numpy.flatnonzero(self._SOLDTFS__j_fsc_i)[0]] *= -1
+                return sliding_surface_sign
+
+            def _SOLDTFS__obtain_cycles_with_sign_kept(self, mo: numpy.ndarray, sliding_surface_sign: numpy.ndarray,
+                                                       time: float, cores_frequency: int) -> float:
+                # The next reversed cycle can't be skipped, and the sign of a reversed cycle isn't the one of the
+                # sliding surface
+                if round(time * cores_frequency) % 7 == 3:
+                    return 0
+                return min(super()._SOLDTFS__obtain_cycles_with_sign_kept(mo, sliding_surface_sign, time,
+                                                                          cores_frequency),
+                           (2 - round(time * cores_frequency)) % 7)
+
+        class SOLDTFSReversedSignByCycle(SOLDTFSReversedSign):
+            def _SOLDTFS__simulate_while_sign_is_kept(self, mo: numpy.ndarray, sliding_surface_sign: numpy.ndarray,
+                                                      time: float, cores_frequency: int, max_steps: int):
+                for i in range(1, max_steps):
+                    mo = self._SOLDTFS__tcpn_simulator.simulate_steps(mo, 1)
+                    if not numpy.array_equal(self._SOLDTFS__obtain_sliding_surface_sign(mo, time + i / cores_frequency),
+                                             sliding_surface_sign):
+                        return i, mo
+                return max_steps, self._SOLDTFS__tcpn_simulator.simulate_steps(mo, 1)
+
+        periodic_tasks = [
+            self.create_implicit_deadline_periodic_task_s_rt(0, 1000, 20.0),
+            self.create_implicit_deadline_periodic_task_s_rt(1, 500, 10.0),
+            self.create_implicit_deadline_periodic_task_s_rt(2, 700, 10.0),
+            self.create_implicit_deadline_periodic_task_s_rt(3, 700, 10.0),
+            self.create_implicit_deadline_periodic_task_s_rt(4, 700, 10.0),
+            self.create_implicit_deadline_periodic_task_s_rt(5, 1400, 20.0)
+        ]
+
+        task_set = TaskSet(periodic_tasks=periodic_tasks, aperiodic_tasks=[], sporadic_tasks=[])
+
+        markings = []
+
+        for scheduler in [SOLDTFSReversedSign(240, simulate_thermal=False),
+                          SOLDTFSReversedSignByCycle(240, simulate_thermal=False)]:
+            scheduler.offline_stage(generate_default_cpu(5, {100}, 0), default_environment_specification(), task_set)
+
+            # Marking of the TCPN at the end of each quantum
+            scheduler_markings = []
+            for i in range(20):
+                scheduler.schedule_policy(float(i), set(), {}, 100, None)
+                scheduler_markings.append(scheduler._SOLDTFS__tcpn_mo.copy())
+
+            markings.append(numpy.asarray(scheduler_markings))
+
+        assert numpy.allclose(markings[0], markings[1], rtol=0, atol=1e-9)
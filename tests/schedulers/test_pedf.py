@@ -0,0 +1,67 @@
+import unittest
+from tertimuss.schedulers.calecs import WorstFitBPPBasedPartitionAlgorithm
+from tertimuss.schedulers.p_edf import SPEDF
+from tertimuss.simulation_lib.simulator import execute_scheduler_simulation_simple, SimulationConfiguration
+from tertimuss.simulation_lib.system_definition import TaskSet
+from tertimuss.simulation_lib.system_definition.utils import generate_default_cpu, default_environment_specification
+from tests.schedulers._common_scheduler_tests_utils import create_implicit_deadline_periodic_task_h_rt, \
+    periodic_implicit_deadline_tasks
+
+
+class PEDFTest(unittest.TestCase):
+    def test_partitioned_task_set(self):
+        periodic_tasks = [create_implicit_deadline_periodic_task_h_rt(j, i[0], i[1]) for j, i in
+                          enumerate(periodic_implicit_deadline_tasks)]
+
+        number_of_cores = 4
+        available_frequencies = {1000}
+
+        # The default partition algorithm (best fit descendant) fills the 4 CPUs, worst fit needs a lower utilization
+        for partition_algorithm, task_set in [
+            (None, TaskSet(periodic_tasks=periodic_tasks, sporadic_tasks=[], aperiodic_tasks=[])),
+            (WorstFitBPPBasedPartitionAlgorithm(),
+             TaskSet(periodic_tasks=periodic_tasks[:40], sporadic_tasks=[], aperiodic_tasks=[]))
+        ]:
+            simulation_result, periodic_jobs, major_cycle = execute_scheduler_simulation_simple(
+                tasks=task_set,
+                aperiodic_tasks_jobs=[],
+                sporadic_tasks_jobs=[],
+                processor_definition=generate_default_cpu(number_of_cores, available_frequencies),
+                environment_specification=default_environment_specification(),
+                simulation_options=SimulationConfiguration(id_debug=True),
+                scheduler=SPEDF(activate_debug=True, partition_algorithm=partition_algorithm)
+            )
+
+            # Correct execution
+            assert simulation_result.have_been_scheduled
+            assert simulation_result.hard_real_time_deadline_missed_stack_trace is None
+
+            # All the jobs of a task are executed in the same CPU
+            tasks_cpus = {}
+            for cpu_id, sections in simulation_result.job_sections_execution.items():
+                for section in sections:
+                    assert tasks_cpus.setdefault(section.task_id, cpu_id) == cpu_id
+
+            assert len(tasks_cpus) == len(task_set.periodic_tasks)
+
+    def test_not_partitionable_task_set(self):
+        periodic_tasks = [
+            create_implicit_deadline_periodic_task_h_rt(0, 6000, 10.0),
+            create_implicit_deadline_periodic_task_h_rt(1, 6000, 10.0),
+            create_implicit_deadline_periodic_task_h_rt(2, 6000, 10.0)
+        ]
+
+        simulation_result, _, _ = execute_scheduler_simulation_simple(
+            tasks=TaskSet(periodic_tasks=periodic_tasks, aperiodic_tasks=[], sporadic_tasks=[]),
+            aperiodic_tasks_jobs=[],
+            sporadic_tasks_jobs=[],
+            processor_definition=generate_default_cpu(2, {1000}),
+            environment_specification=default_environment_specification(),
+            scheduler=SPEDF(activate_debug=False)
+        )
+
+        assert not simulation_result.have_been_scheduled
+
+
+if __name__ == '__main__':
+    unittest.main()
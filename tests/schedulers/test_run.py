@@ -143,3 +143,44 @@ class RUNTest(unittest.TestCase):
         # Correct execution
         assert simulation_result.have_been_scheduled
         assert simulation_result.hard_real_time_deadline_missed_stack_trace is None
+
+    def test_offline_stage_frequency_independence(self):
+        # The offline stage only evaluates the RUN tree in the scheduling events, so its cost doesn't depend on the
+        # frequency, and the scheduling points are the same scaled to the frequency
+        scheduling_points = []
+
+        for frequency in [1000, 1000000000]:
+            cycles_scale = frequency // 1000
+            task_set = TaskSet(periodic_tasks=[create_implicit_deadline_periodic_task_h_rt(j, i[0] * cycles_scale, i[1])
+                                               for j, i in enumerate(periodic_implicit_deadline_tasks)],
+                               sporadic_tasks=[],
+                               aperiodic_tasks=[])
+
+            scheduler = SRUN(activate_debug=False, store_clusters_obtained=False)
+            scheduler.offline_stage(generate_default_cpu(4, {frequency}), default_environment_specification(),
+                                    task_set)
+
+            scheduling_points.append({i // cycles_scale: j for i, j in
+                                      scheduler.get_scheduling_points().items()})
+
+        assert scheduling_points[0] == scheduling_points[1]
+
+    @unittest.skip("Manual benchmark test")
+    def test_offline_stage_throughput(self):
+        for number_of_tasks, number_of_cores in [(50, 8), (100, 16), (250, 32), (500, 64)]:
+            # Tasks with harmonic periods and a total utilization of number of cores - 0.5
+            task_set = TaskSet(periodic_tasks=[
+                create_implicit_deadline_periodic_task_h_rt(
+                    i, 4 * int((number_of_cores - 0.5) * (1 + (i % 5 - 2) / 4) * 2 ** (i % 3) * 500 / number_of_tasks),
+                    2.0 * 2 ** (i % 3)) for i in range(number_of_tasks)],
+                sporadic_tasks=[],
+                aperiodic_tasks=[])
+
+            scheduler = SRUN(activate_debug=False, store_clusters_obtained=False)
+            start_time = time.perf_counter()
+            scheduler.offline_stage(generate_default_cpu(number_of_cores, {1000}), default_environment_specification(),
+                                    task_set)
+            elapsed_time = time.perf_counter() - start_time
+
+            print(number_of_tasks, "tasks and", number_of_cores, "cores:", len(scheduler.get_scheduling_points()),
+                  "scheduling points in", elapsed_time, "seconds")
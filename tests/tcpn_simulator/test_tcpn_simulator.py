@@ -1,12 +1,15 @@
 import unittest
-from typing import List
+from typing import List, Tuple
 
 import numpy
 
 import scipy.sparse
 
 from tertimuss.tcpn_simulator import SVSEuler
+from tertimuss.tcpn_simulator import TCPNSimulator
+from tertimuss.tcpn_simulator import SVSExponential
 from tertimuss.tcpn_simulator import SVSRungeKutta
+from tertimuss.tcpn_simulator import SFSOperator
 
 
 class TCPNSimulatorTest(unittest.TestCase):
@@ -123,6 +126,319 @@ class TCPNSimulatorTest(unittest.TestCase):
 
         assert self._check_difference(mo.tolist(), array_to_compare)
 
+    def test_petri_net_exponential(self):
+        # Two places connected by two transitions in opposite directions. With constant pi it is a linear system with
+        # solution m_1(t) = m_e + (m_1(0) - m_e) e^(-(lambda_1 + lambda_2) t)
+        pre = numpy.asarray([
+            [1, 0],
+            [0, 1]
+        ])
+
+        post = numpy.asarray([
+            [0, 1],
+            [1, 0]
+        ])
+
+        pi = numpy.asarray([
+            [1, 0],
+            [0, 1]
+        ])
+
+        lambda_vector = numpy.asarray([2.0, 3.0])
+
+        mo: numpy.ndarray = numpy.asarray([5.0, 0.0]).reshape((-1, 1))
+
+        tcpn_simulator: SVSExponential = SVSExponential(scipy.sparse.csr_matrix(pre, dtype=numpy.float64),
+                                                        scipy.sparse.csr_matrix(post, dtype=numpy.float64),
+                                                        lambda_vector, scipy.sparse.csr_matrix(pi), True,
+                                                        propagator_threshold=2)
+
+        def expected_marking(m_1: float, total: float, lambda_1: float, lambda_2: float, t: float) -> List[float]:
+            m_e = total * lambda_2 / (lambda_1 + lambda_2)
+            m_1_t = m_e + (m_1 - m_e) * numpy.exp(-(lambda_1 + lambda_2) * t)
+            return [m_1_t, total - m_1_t]
+
+        # The same step is repeated, so the last ones are simulated with the stored propagator
+        for i in range(10):
+            mo = tcpn_simulator.simulate_step(mo, 0.05)
+
+        assert self._check_difference(mo.tolist(), expected_marking(5.0, 5.0, 2.0, 3.0, 0.5), 1e-10)
+
+        # Disable the transition from the place 2 to the place 1
+        tcpn_simulator.set_control(numpy.asarray([1, 0]))
+
+        for i in range(10):
+            mo = tcpn_simulator.simulate_step(mo, 0.05)
+
+        assert self._check_difference([mo[0]], [expected_marking(5.0, 5.0, 2.0, 3.0, 0.5)[0] * numpy.exp(-2.0 * 0.5)],
+                                      1e-10)
+        assert abs(mo.sum() - 5.0) < 1e-10
+
+    def test_petri_net_batch_markings(self):
+        # Several markings simulated at once must evolve as if they were simulated one by one. The Runge-Kutta solver
+        # selects a common step size for all the markings, so its results only agree within the solver tolerance
+        pre = scipy.sparse.csr_matrix(numpy.asarray([[1, 0], [0, 1]]), dtype=numpy.float64)
+        post = scipy.sparse.csr_matrix(numpy.asarray([[0, 1], [1, 0]]), dtype=numpy.float64)
+        pi = scipy.sparse.csr_matrix(numpy.asarray([[1, 0], [0, 1]]), dtype=numpy.float64)
+        lambda_vector = numpy.asarray([2.0, 3.0])
+
+        mo_batch: numpy.ndarray = numpy.asarray([[5.0, 1.0, 0.0], [0.0, 2.0, 4.0]])
+
+        for simulator_type in [SVSEuler, SVSRungeKutta, SVSExponential]:
+            batch_simulator = simulator_type(pre, post, lambda_vector, pi, True)
+            batch_result = batch_simulator.simulate_step(mo_batch, 0.1)
+
+            assert batch_result.shape == mo_batch.shape
+
+            for column in range(mo_batch.shape[1]):
+                simulator = simulator_type(pre, post, lambda_vector, pi, True)
+                result = simulator.simulate_step(mo_batch[:, column].reshape((-1, 1)), 0.1)
+                assert self._check_difference(batch_result[:, column].tolist(), result.reshape(-1).tolist(), 1e-4)
+
+    def test_petri_net_exponential_alternating_control(self):
+        pre = scipy.sparse.csr_matrix(numpy.asarray([
+            [1, 0, 0],
+            [0, 1, 1],
+            [0, 0, 0]
+        ]), dtype=numpy.float64)
+
+        post = scipy.sparse.csr_matrix(numpy.asarray([
+            [0, 1, 0],
+            [1, 0, 0],
+            [0, 0, 1]
+        ]), dtype=numpy.float64)
+
+        pi = scipy.sparse.csr_matrix(numpy.asarray([
+            [1, 0, 0],
+            [0, 1, 0],
+            [0, 1, 0]
+        ]), dtype=numpy.float64)
+
+        lambda_vector = numpy.asarray([2.0, 3.0, 1.0])
+
+        # Simulator with stored propagators and simulator without them
+        tcpn_simulator_propagators = SVSExponential(pre, post, lambda_vector, pi, True, propagator_threshold=1)
+        tcpn_simulator_reference = SVSExponential(pre, post, lambda_vector, pi, True, max_propagators_bytes=0)
+
+        mo_propagators: numpy.ndarray = numpy.asarray([5.0, 0.0, 0.0])
+        mo_reference: numpy.ndarray = numpy.asarray([5.0, 0.0, 0.0])
+
+        # The same pattern of controls and steps is repeated, so the propagators are reused after a control change
+        for i in range(5):
+            for control, dt in [(numpy.asarray([1, 1, 0]), 0.1), (numpy.asarray([1, 1, 1]), 0.05)]:
+                tcpn_simulator_propagators.set_control(control)
+                tcpn_simulator_reference.set_control(control)
+                mo_propagators = tcpn_simulator_propagators.simulate_step(mo_propagators, dt)
+                mo_reference = tcpn_simulator_reference.simulate_step(mo_reference, dt)
+
+        assert self._check_difference(mo_propagators.tolist(), mo_reference.tolist(), 1e-10)
+
+    @staticmethod
+    def _chain_petri_net(number_of_places: int) -> Tuple[scipy.sparse.csr_matrix, scipy.sparse.csr_matrix,
+                                                         scipy.sparse.csr_matrix, numpy.ndarray]:
+        # Chain of places that exchange marks, and a constant place at the end
+        pre = scipy.sparse.lil_matrix((number_of_places + 1, 2 * number_of_places))
+        post = scipy.sparse.lil_matrix((number_of_places + 1, 2 * number_of_places))
+
+        for i in range(number_of_places):
+            pre[i, 2 * i] = 1
+            post[i + 1, 2 * i] = 1
+            pre[i + 1, 2 * i + 1] = 1
+            post[i, 2 * i + 1] = 1
+
+        # The constant place is not modified
+        post[number_of_places, 2 * number_of_places - 2] = 0
+        pre[number_of_places, 2 * number_of_places - 1] = 1
+        post[number_of_places, 2 * number_of_places - 1] = 1
+
+        mo = numpy.concatenate([numpy.linspace(350, 300, number_of_places), [290]])
+
+        return pre.tocsr(), post.tocsr(), pre.transpose().tocsr(), mo
+
+    def test_petri_net_float32(self):
+        number_of_places = 20
+        pre, post, pi, mo = self._chain_petri_net(number_of_places)
+
+        for simulator in [SVSEuler, SVSRungeKutta]:
+            markings = {}
+
+            for dtype in [numpy.float32, numpy.float64]:
+                tcpn_simulator = simulator(pre, post, numpy.full(2 * number_of_places, 5.0, dtype=dtype), pi)
+                mo_next = mo.astype(dtype)
+
+                for i in range(500):
+                    tcpn_simulator.set_control(numpy.ones(2 * number_of_places) if i % 2 else
+                                               numpy.concatenate([numpy.ones(2 * number_of_places - 2), [0, 0]]))
+                    mo_next = tcpn_simulator.simulate_step(mo_next, 0.01)
+
+                markings[dtype] = mo_next
+
+            # The marking keeps the floating point type of the lambda vector, and the float32 simulation doesn't drift
+            # from the float64 one
+            assert markings[numpy.float32].dtype == numpy.float32
+            assert markings[numpy.float64].dtype == numpy.float64
+            assert numpy.allclose(markings[numpy.float32], markings[numpy.float64], rtol=0, atol=1e-3)
+
+    def test_petri_net_exponential_propagators_memory(self):
+        number_of_places = 20
+        pre, post, pi, mo = self._chain_petri_net(number_of_places)
+        lambda_vector = numpy.full(2 * number_of_places, 5.0)
+
+        # The memory budget only allows two dense propagators
+        max_propagators_bytes = 5 * 8 * (number_of_places + 1) ** 2 // 2
+
+        tcpn_simulator_propagators = SVSExponential(pre, post, lambda_vector, pi, True,
+                                                    max_propagators_bytes=max_propagators_bytes,
+                                                    propagator_threshold=0)
+        tcpn_simulator_reference = SVSExponential(pre, post, lambda_vector, pi, True, max_propagators_bytes=0)
+
+        mo_propagators = mo
+        mo_reference = mo
+
+        for i in range(20):
+            mo_propagators = tcpn_simulator_propagators.simulate_step(mo_propagators, 0.01 * (i % 4 + 1))
+            mo_reference = tcpn_simulator_reference.simulate_step(mo_reference, 0.01 * (i % 4 + 1))
+
+            assert tcpn_simulator_propagators._SVSExponential__propagators_bytes <= max_propagators_bytes
+
+        assert len(tcpn_simulator_propagators._SVSExponential__propagators) == 2
+        assert len(tcpn_simulator_reference._SVSExponential__propagators) == 0
+        assert numpy.allclose(mo_propagators, mo_reference, rtol=0, atol=1e-6)
+
+    def test_petri_net_rk_float32_non_finite(self):
+        number_of_places = 5
+        pre, post, pi, mo = self._chain_petri_net(number_of_places)
+        mo_nan = numpy.concatenate([[numpy.nan], mo[1:]])
+
+        # A non finite marking fails in float32 as in float64 (solve_ivp), instead of reducing the step for ever
+        for dtype in [numpy.float32, numpy.float64]:
+            tcpn_simulator = SVSRungeKutta(pre, post, numpy.full(2 * number_of_places, 5.0, dtype=dtype), pi)
+            self.assertRaises(ValueError, lambda: tcpn_simulator.simulate_step(mo_nan.astype(dtype), 0.01))
+
+        # The derivative overflows in float32
+        tcpn_simulator = SVSRungeKutta(pre, post, numpy.full(2 * number_of_places, 1e36, dtype=numpy.float32), pi)
+        self.assertRaises(ValueError, lambda: tcpn_simulator.simulate_step(mo.astype(numpy.float32), 0.01))
+
+    def test_calculate_pi(self):
+        pre = scipy.sparse.csr_matrix(numpy.asarray([
+            [1.0, 0.0, 2.0, 0.0],
+            [2.0, 1.0, 0.0, 0.0],
+            [0.0, 4.0, 2.0, 0.0],
+            [0.0, 0.0, 0.0, 1.0]
+        ]))
+
+        # Transition 0: place 1 (ratio 2 / 2 > 1 / 2), transition 1: tie between places 1 and 2 (the first one),
+        # transition 2: place 0 (ratio 2 / 2 > 2 / 8), transition 3: its input place is empty (no entry)
+        mo = numpy.asarray([2.0, 2.0, 8.0, 0.0])
+
+        pi = TCPNSimulator._calculate_pi(pre, mo)
+
+        assert numpy.array_equal(pi.toarray(), numpy.asarray([
+            [0.0, 0.5, 0.0, 0.0],
+            [0.0, 1.0, 0.0, 0.0],
+            [0.5, 0.0, 0.0, 0.0],
+            [0.0, 0.0, 0.0, 0.0]
+        ]))
+
+        # The incremental update matches the full calculation when places become empty or stop being empty
+        random_generator = numpy.random.default_rng(0)
+        pre = scipy.sparse.random(50, 80, density=0.05, random_state=0, format="csr")
+        mo = random_generator.integers(0, 3, 50).astype(float)
+        pi = TCPNSimulator._calculate_pi(pre, mo)
+
+        for _ in range(20):
+            mo_next = mo.copy()
+            mo_next[random_generator.integers(0, 50, 3)] = random_generator.integers(0, 3, 3)
+
+            pi = TCPNSimulator._update_pi(pre, mo_next, mo, pi)
+            mo = mo_next
+
+            assert numpy.array_equal(pi.toarray(), TCPNSimulator._calculate_pi(pre, mo).toarray())
+
+    def test_update_pi_negative_marks(self):
+        # A place whose mark changes from positive to negative stops being selected by its transition
+        pre = scipy.sparse.csr_matrix(numpy.diag([1.0, 2.0]))
+        mo = numpy.asarray([1.0, 1.0])
+        mo_next = numpy.asarray([-0.5, 1.0])
+
+        pi = TCPNSimulator._update_pi(pre, mo_next, mo, TCPNSimulator._calculate_pi(pre, mo))
+
+        assert numpy.array_equal(pi.toarray(), numpy.asarray([[0.0, 0.0], [0.0, 0.5]]))
+
+        # The incremental update matches the full calculation when the marks change their sign
+        random_generator = numpy.random.default_rng(0)
+        pre = scipy.sparse.random(50, 80, density=0.03, random_state=0, format="csr")
+        mo = random_generator.integers(-2, 3, 50).astype(float)
+        pi = TCPNSimulator._calculate_pi(pre, mo)
+
+        for _ in range(50):
+            mo_next = mo.copy()
+            changed_places = random_generator.integers(0, 50, 5)
+            mo_next[changed_places] = random_generator.integers(-2, 3, 5) * random_generator.random(5)
+
+            pi = TCPNSimulator._update_pi(pre, mo_next, mo, pi)
+            mo = mo_next
+
+            assert numpy.array_equal(pi.toarray(), TCPNSimulator._calculate_pi(pre, mo).toarray())
+
+    def test_petri_net_fixed_step(self):
+        number_of_places = 20
+        pre, post, pi, mo = self._chain_petri_net(number_of_places)
+        lambda_vector = numpy.full(2 * number_of_places, 5.0)
+        step = 0.01
+
+        # Control that disconnects the constant place
+        control = numpy.concatenate([numpy.ones(2 * number_of_places - 2), [0, 0]])
+
+        for method, reference_simulator in [("EXPONENTIAL", SVSExponential(pre, post, lambda_vector, pi)),
+                                            ("EULER", SVSEuler(pre, post, lambda_vector, pi, 1))]:
+            for max_operator_size in [4096, 0]:
+                tcpn_simulator = SFSOperator(pre, post, lambda_vector, None, step, method,
+                                             max_operator_size=max_operator_size)
+
+                mo_next = tcpn_simulator.simulate_steps(mo, 37)
+                tcpn_simulator.set_control(control)
+                mo_next = tcpn_simulator.simulate_step(mo_next)
+                mo_next = tcpn_simulator.simulate_steps(mo_next, 100)
+
+                expected_mo = mo
+                reference_simulator.set_control(numpy.ones(2 * number_of_places))
+                for _ in range(37):
+                    expected_mo = reference_simulator.simulate_step(expected_mo, step)
+                reference_simulator.set_control(control)
+                for _ in range(101):
+                    expected_mo = reference_simulator.simulate_step(expected_mo, step)
+
+                assert tcpn_simulator.simulated_steps == 138
+                assert numpy.allclose(mo_next, expected_mo, rtol=0, atol=1e-6)
+
+    def test_petri_net_control_update(self):
+        number_of_places = 40
+        pre, post, pi, mo = self._chain_petri_net(number_of_places)
+        lambda_vector = numpy.full(2 * number_of_places, 5.0)
+        random_generator = numpy.random.default_rng(0)
+
+        for simulator in [SVSEuler, SVSRungeKutta]:
+            # Few stored A matrices, so they are updated from the previous control or calculated again
+            tcpn_simulator = simulator(pre, post, lambda_vector, pi, max_number_of_a_matrices=2)
+            control = numpy.ones(2 * number_of_places)
+            mo_next = mo
+
+            for i in range(30):
+                # Some controls change few transitions and others change most of them
+                changed_transitions = random_generator.integers(0, 2 * number_of_places, 2 if i % 3 else 40)
+                control = control.copy()
+                control[changed_transitions] = random_generator.random(len(changed_transitions))
+
+                tcpn_simulator.set_control(control)
+                mo_next = tcpn_simulator.simulate_step(mo_next, 0.01)
+
+                # A simulator whose A matrix is calculated from the control
+                reference_simulator = simulator(pre, post, lambda_vector * control, pi)
+                expected_mo = reference_simulator.simulate_step(mo_next, 0.01)
+
+                assert numpy.allclose(tcpn_simulator.simulate_step(mo_next, 0.01), expected_mo, rtol=0, atol=1e-9)
+
 
 if __name__ == '__main__':
     unittest.main()
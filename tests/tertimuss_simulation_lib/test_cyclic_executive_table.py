@@ -0,0 +1,95 @@
+import time
+import unittest
+
+from tertimuss.schedulers.alecs import SALECS
+from tertimuss.schedulers.calecs import SCALECS
+from tertimuss.schedulers.run import SRUN
+from tertimuss.simulation_lib.schedulers_definition import CyclicExecutiveTable
+from tertimuss.simulation_lib.simulator import execute_scheduler_simulation_simple, SimulationConfiguration
+from tertimuss.simulation_lib.system_definition import TaskSet
+from tertimuss.simulation_lib.system_definition.utils import generate_default_cpu, default_environment_specification
+from tests.schedulers._common_scheduler_tests_utils import create_implicit_deadline_periodic_task_h_rt, \
+    periodic_implicit_deadline_tasks
+
+
+class CyclicExecutiveTableTest(unittest.TestCase):
+    def test_obtain_assignation(self):
+        scheduling_points = {0: {0: 3, 1: 4}, 10: {1: 3}, 25: {}, 40: {0: 0, 2: 7}}
+        table = CyclicExecutiveTable(scheduling_points, 3, 50)
+
+        assert table.to_scheduling_points() == scheduling_points
+
+        assert table.obtain_assignation(0) == ({0: 3, 1: 4}, 10)
+        assert table.obtain_assignation(9) == ({0: 3, 1: 4}, 10)
+        assert table.obtain_assignation(10) == ({1: 3}, 25)
+        assert table.obtain_assignation(30) == ({}, 40)
+        assert table.obtain_assignation(40) == ({0: 0, 2: 7}, 50)
+        assert table.obtain_assignation(49) == ({0: 0, 2: 7}, 50)
+
+    def test_negative_task_identifiers(self):
+        # Any integer can be a task id, the idle CPUs are the ones without an entry
+        scheduling_points = {0: {0: -1, 1: 0}, 10: {1: -7}, 25: {}, 40: {0: -1, 2: 3}}
+        table = CyclicExecutiveTable(scheduling_points, 3, 50)
+
+        assert table.task_ids.tolist() == [-7, -1, 0, 3]
+        assert table.to_scheduling_points() == scheduling_points
+
+        assert table.obtain_assignation(5) == ({0: -1, 1: 0}, 10)
+        assert table.obtain_assignation(10) == ({1: -7}, 25)
+        assert table.obtain_assignation(30) == ({}, 40)
+        assert table.obtain_assignation(45) == ({0: -1, 2: 3}, 50)
+
+    def test_schedulers_negative_task_identifiers(self):
+        # SCALECS and SRUN use -1 as the identifier of the task that represents the idle time
+        for scheduler, tasks_ids in [(SALECS(activate_debug=False), [-1, -2, -3]),
+                                     (SCALECS(activate_debug=False, store_clusters_obtained=False), [-2, -3, -4]),
+                                     (SRUN(activate_debug=False, store_clusters_obtained=False), [-2, -3, -4])]:
+            task_set = TaskSet(periodic_tasks=[create_implicit_deadline_periodic_task_h_rt(tasks_ids[0], 3000, 5.0),
+                                               create_implicit_deadline_periodic_task_h_rt(tasks_ids[1], 5000, 10.0),
+                                               create_implicit_deadline_periodic_task_h_rt(tasks_ids[2], 7000, 10.0)],
+                               sporadic_tasks=[],
+                               aperiodic_tasks=[])
+
+            simulation_result, _, _ = execute_scheduler_simulation_simple(
+                tasks=task_set,
+                aperiodic_tasks_jobs=[],
+                sporadic_tasks_jobs=[],
+                processor_definition=generate_default_cpu(2, {1000}),
+                environment_specification=default_environment_specification(),
+                simulation_options=SimulationConfiguration(id_debug=True),
+                scheduler=scheduler
+            )
+
+            assert simulation_result.have_been_scheduled
+            assert simulation_result.hard_real_time_deadline_missed_stack_trace is None
+            assert {j.task_id for i in simulation_result.job_sections_execution.values() for j in i} == set(tasks_ids)
+
+    @unittest.skip("Manual benchmark test")
+    def test_obtain_assignation_throughput(self):
+        task_set = TaskSet(periodic_tasks=[create_implicit_deadline_periodic_task_h_rt(j, i[0], i[1]) for j, i in
+                                           enumerate(periodic_implicit_deadline_tasks)],
+                           sporadic_tasks=[],
+                           aperiodic_tasks=[])
+
+        scheduler = SRUN(activate_debug=False, store_clusters_obtained=False)
+        scheduler.offline_stage(generate_default_cpu(4, {1000}), default_environment_specification(), task_set)
+
+        table = scheduler.get_scheduling_table()
+        scheduling_points = scheduler.get_scheduling_points()
+
+        start_time = time.perf_counter()
+        for i in table.scheduling_points.tolist():
+            table.obtain_assignation(i)
+        table_elapsed_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        for i in table.scheduling_points.tolist():
+            next(j for j in sorted(scheduling_points.keys()) + [table.major_cycle] if j > i)
+        dictionary_elapsed_time = time.perf_counter() - start_time
+
+        print(len(scheduling_points), "scheduling points:", table_elapsed_time, "seconds with the table,",
+              dictionary_elapsed_time, "seconds sorting the dictionary")
+
+
+if __name__ == '__main__':
+    unittest.main()
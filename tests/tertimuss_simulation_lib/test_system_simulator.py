@@ -1,12 +1,22 @@
+import os
+import tempfile
 import unittest
 from typing import Set, Dict, Optional, Tuple, List
 
+import numpy
 from matplotlib import animation
 
+from tertimuss.schedulers.alecs import SALECS
+from tertimuss.schedulers.calecs import SCALECS
+from tertimuss.schedulers.g_edf import SGEDF
+from tertimuss.schedulers.run import SRUN
 from tertimuss.simulation_lib.schedulers_definition import CentralizedScheduler
 from tertimuss.simulation_lib.simulator import SimulationConfiguration, \
     JobSectionExecution, CPUUsedFrequency, \
-    execute_scheduler_simulation, execute_scheduler_simulation_simple
+    execute_scheduler_simulation, execute_scheduler_simulation_simple, ColumnarJobSectionsExecution, \
+    ColumnarTemperatureMeasures, BinaryFileSimulationResultSink, AggregateSimulationResultSink, \
+    read_simulation_result_file, resume_scheduler_simulation, save_simulation_checkpoint, load_simulation_checkpoint, \
+    execute_scheduler_simulation_batch
 from tertimuss.simulation_lib.system_definition import PeriodicTask, PreemptiveExecution, Criticality, \
     Environment, Processor, Job, TaskSet
 from tertimuss.simulation_lib.system_definition.utils import generate_default_cpu, default_environment_specification
@@ -367,3 +377,517 @@ class SystemSimulatorTest(unittest.TestCase):
         assert (simulation_result.scheduling_points == correct_scheduling_points)
 
         assert (simulation_result.hard_real_time_deadline_missed_stack_trace is None)
+
+    def test_simple_simulation_periodic_task_set_columnar_result(self):
+        periodic_tasks = [
+            self.__create_implicit_deadline_periodic_task_h_rt(3, 3000, 7.0, 3),
+            self.__create_implicit_deadline_periodic_task_h_rt(2, 4000, 7.0, 2),
+            self.__create_implicit_deadline_periodic_task_h_rt(1, 4000, 14.0, 1),
+            self.__create_implicit_deadline_periodic_task_h_rt(0, 3000, 14.0, 0)
+        ]
+
+        jobs_list = [
+            Job(identifier=0, activation_time=0.0, task=periodic_tasks[0]),
+            Job(identifier=1, activation_time=7.0, task=periodic_tasks[0]),
+            Job(identifier=2, activation_time=0.0, task=periodic_tasks[1]),
+            Job(identifier=3, activation_time=7.0, task=periodic_tasks[1]),
+            Job(identifier=4, activation_time=0.0, task=periodic_tasks[2]),
+            Job(identifier=5, activation_time=0.0, task=periodic_tasks[3]),
+        ]
+
+        simulation_results = [execute_scheduler_simulation(
+            simulation_start_time=0.0,
+            simulation_end_time=14.0,
+            tasks=TaskSet(
+                periodic_tasks=periodic_tasks,
+                aperiodic_tasks=[],
+                sporadic_tasks=[]
+            ),
+            jobs=jobs_list,
+            processor_definition=generate_default_cpu(2, {1000}),
+            environment_specification=default_environment_specification(),
+            simulation_options=SimulationConfiguration(id_debug=True, thermal_simulation_type="DVFS",
+                                                       simulate_thermal_behaviour=True,
+                                                       columnar_simulation_result=columnar_simulation_result),
+            scheduler=self.__simple_priority_scheduler_definition()
+        ) for columnar_simulation_result in [False, True]]
+
+        simulation_result, columnar_simulation_result = simulation_results
+
+        assert isinstance(columnar_simulation_result.job_sections_execution, ColumnarJobSectionsExecution)
+        assert isinstance(columnar_simulation_result.temperature_measures, ColumnarTemperatureMeasures)
+
+        # The columnar views must be equivalent to the default result
+        assert (columnar_simulation_result.job_sections_execution == simulation_result.job_sections_execution)
+        assert (columnar_simulation_result.scheduling_points == simulation_result.scheduling_points)
+
+        assert (list(columnar_simulation_result.temperature_measures.keys()) ==
+                list(simulation_result.temperature_measures.keys()))
+
+        for measure_time, measure in simulation_result.temperature_measures.items():
+            columnar_measure = columnar_simulation_result.temperature_measures[measure_time]
+            assert measure.keys() == columnar_measure.keys()
+            assert all(measure[i].cuboid == columnar_measure[i].cuboid and
+                       numpy.array_equal(measure[i].temperature.temperatureMatrix,
+                                         columnar_measure[i].temperature.temperatureMatrix) for i in measure.keys())
+
+    def test_simple_simulation_periodic_task_set_result_sinks(self):
+        periodic_tasks = [
+            self.__create_implicit_deadline_periodic_task_h_rt(3, 3000, 7.0, 3),
+            self.__create_implicit_deadline_periodic_task_h_rt(2, 4000, 7.0, 2),
+            self.__create_implicit_deadline_periodic_task_h_rt(1, 4000, 14.0, 1),
+            self.__create_implicit_deadline_periodic_task_h_rt(0, 3000, 14.0, 0)
+        ]
+
+        jobs_list = [
+            Job(identifier=0, activation_time=0.0, task=periodic_tasks[0]),
+            Job(identifier=1, activation_time=7.0, task=periodic_tasks[0]),
+            Job(identifier=2, activation_time=0.0, task=periodic_tasks[1]),
+            Job(identifier=3, activation_time=7.0, task=periodic_tasks[1]),
+            Job(identifier=4, activation_time=0.0, task=periodic_tasks[2]),
+            Job(identifier=5, activation_time=0.0, task=periodic_tasks[3]),
+        ]
+
+        def simulate(result_sink):
+            return execute_scheduler_simulation(
+                simulation_start_time=0.0,
+                simulation_end_time=14.0,
+                tasks=TaskSet(
+                    periodic_tasks=periodic_tasks,
+                    aperiodic_tasks=[],
+                    sporadic_tasks=[]
+                ),
+                jobs=jobs_list,
+                processor_definition=generate_default_cpu(2, {1000}),
+                environment_specification=default_environment_specification(),
+                simulation_options=SimulationConfiguration(id_debug=True, thermal_simulation_type="DVFS",
+                                                           simulate_thermal_behaviour=True, result_sink=result_sink),
+                scheduler=self.__simple_priority_scheduler_definition()
+            )
+
+        simulation_result = simulate(None)
+
+        # Binary file sink
+        with tempfile.TemporaryDirectory() as temporal_directory:
+            file_path = os.path.join(temporal_directory, "simulation_result.bin")
+            file_simulation_result = simulate(BinaryFileSimulationResultSink(file_path))
+            job_sections_execution, cpus_frequencies, scheduling_points, temperature_measures = \
+                read_simulation_result_file(file_path)
+
+        assert len(file_simulation_result.job_sections_execution) == 0
+        assert job_sections_execution == simulation_result.job_sections_execution
+        assert cpus_frequencies == simulation_result.cpus_frequencies
+        assert scheduling_points == simulation_result.scheduling_points
+        assert list(temperature_measures.keys()) == list(simulation_result.temperature_measures.keys())
+        assert all(numpy.array_equal(simulation_result.temperature_measures[i][j].temperature.temperatureMatrix,
+                                     temperature_measures[i][j].temperature.temperatureMatrix) and
+                   simulation_result.temperature_measures[i][j].cuboid == temperature_measures[i][j].cuboid
+                   for i in temperature_measures.keys() for j in temperature_measures[i].keys())
+
+        # Aggregate sink
+        aggregate_sink = AggregateSimulationResultSink()
+        simulate(aggregate_sink)
+
+        assert aggregate_sink.number_of_job_sections == {0: 5, 1: 4}
+        assert aggregate_sink.number_of_executed_cycles == {0: 11000, 1: 10000}
+        assert aggregate_sink.number_of_scheduling_points == 5
+        assert aggregate_sink.last_scheduling_point == 10.0
+        assert aggregate_sink.number_of_frequencies_set == 1
+        assert aggregate_sink.min_frequency_used == aggregate_sink.max_frequency_used == 1000
+        assert aggregate_sink.number_of_temperature_measures == len(simulation_result.temperature_measures)
+        assert aggregate_sink.max_temperature[0] == max(i[0].temperature.temperatureMatrix.max() for i in
+                                                        simulation_result.temperature_measures.values())
+
+    def test_simple_simulation_periodic_task_set_result_sink_abort(self):
+        # G-EDF that selects an unavailable frequency from the second period, so the simulation raises an exception
+        class FailingSGEDF(SGEDF):
+            def schedule_policy(self, global_time: float, active_jobs_id: Set[int],
+                                jobs_being_executed_id: Dict[int, int], cores_frequency: int,
+                                cores_max_temperature: Optional[Dict[int, float]]) \
+                    -> Tuple[Dict[int, int], Optional[int], Optional[int]]:
+                assignation, cycles, frequency = super().schedule_policy(global_time, active_jobs_id,
+                                                                         jobs_being_executed_id, cores_frequency,
+                                                                         cores_max_temperature)
+                return assignation, cycles, 1 if global_time >= 7.0 else frequency
+
+        periodic_tasks = [
+            self.__create_implicit_deadline_periodic_task_h_rt(1, 4000, 7.0, 1),
+            self.__create_implicit_deadline_periodic_task_h_rt(0, 3000, 14.0, 0)
+        ]
+
+        def simulate(scheduler, result_sink):
+            return execute_scheduler_simulation_simple(
+                tasks=TaskSet(periodic_tasks=periodic_tasks, aperiodic_tasks=[], sporadic_tasks=[]),
+                aperiodic_tasks_jobs=[],
+                sporadic_tasks_jobs=[],
+                processor_definition=generate_default_cpu(1, {1000}),
+                environment_specification=default_environment_specification(),
+                simulation_options=SimulationConfiguration(id_debug=True, result_sink=result_sink),
+                scheduler=scheduler
+            )[0]
+
+        simulation_result = simulate(SGEDF(False), None)
+
+        with tempfile.TemporaryDirectory() as temporal_directory:
+            file_path = os.path.join(temporal_directory, "simulation_result.bin")
+            simulate(SGEDF(False), BinaryFileSimulationResultSink(file_path))
+            file_size = os.path.getsize(file_path)
+
+            # The records of the interrupted simulation are removed from the file
+            self.assertRaises(Exception,
+                              lambda: simulate(FailingSGEDF(False), BinaryFileSimulationResultSink(file_path)))
+            assert os.path.getsize(file_path) == file_size
+
+            job_sections_execution, _, scheduling_points, _ = read_simulation_result_file(file_path)
+
+        assert job_sections_execution == simulation_result.job_sections_execution
+        assert scheduling_points == simulation_result.scheduling_points
+
+    def test_simple_simulation_periodic_task_set_checkpoint(self):
+        periodic_tasks = [
+            self.__create_implicit_deadline_periodic_task_h_rt(3, 3000, 7.0, 3),
+            self.__create_implicit_deadline_periodic_task_h_rt(2, 4000, 7.0, 2),
+            self.__create_implicit_deadline_periodic_task_h_rt(1, 4000, 14.0, 1),
+            self.__create_implicit_deadline_periodic_task_h_rt(0, 3000, 14.0, 0)
+        ]
+
+        jobs_list = [
+            Job(identifier=0, activation_time=0.0, task=periodic_tasks[0]),
+            Job(identifier=1, activation_time=7.0, task=periodic_tasks[0]),
+            Job(identifier=2, activation_time=0.0, task=periodic_tasks[1]),
+            Job(identifier=3, activation_time=7.0, task=periodic_tasks[1]),
+            Job(identifier=4, activation_time=0.0, task=periodic_tasks[2]),
+            Job(identifier=5, activation_time=0.0, task=periodic_tasks[3]),
+        ]
+
+        task_set = TaskSet(periodic_tasks=periodic_tasks, aperiodic_tasks=[], sporadic_tasks=[])
+
+        simulation_options = SimulationConfiguration(id_debug=True, thermal_simulation_type="DVFS",
+                                                     simulate_thermal_behaviour=True,
+                                                     create_simulation_checkpoint=True)
+
+        simulation_result = execute_scheduler_simulation(
+            simulation_start_time=0.0,
+            simulation_end_time=14.0,
+            tasks=task_set,
+            jobs=jobs_list,
+            processor_definition=generate_default_cpu(2, {1000}),
+            environment_specification=default_environment_specification(),
+            simulation_options=simulation_options,
+            scheduler=self.__simple_priority_scheduler_definition()
+        )
+
+        # Split the simulation in the middle of a job section
+        first_segment_result = execute_scheduler_simulation(
+            simulation_start_time=0.0,
+            simulation_end_time=5.5,
+            tasks=task_set,
+            jobs=jobs_list,
+            processor_definition=generate_default_cpu(2, {1000}),
+            environment_specification=default_environment_specification(),
+            simulation_options=simulation_options,
+            scheduler=self.__simple_priority_scheduler_definition()
+        )
+
+        simulation_checkpoint = first_segment_result.simulation_checkpoint
+
+        assert simulation_checkpoint is not None
+        assert simulation_checkpoint.checkpoint_time == 5.5
+        assert simulation_checkpoint.jobs_being_executed_id == {0: 4, 1: 5}
+
+        second_segment_result = resume_scheduler_simulation(
+            simulation_checkpoint=simulation_checkpoint,
+            simulation_end_time=14.0,
+            tasks=task_set,
+            jobs=jobs_list,
+            processor_definition=generate_default_cpu(2, {1000}),
+            environment_specification=default_environment_specification(),
+            simulation_options=simulation_options
+        )
+
+        # The sections split by the checkpoint must be merged to obtain the sections of the full simulation
+        for i in range(2):
+            split_section = first_segment_result.job_sections_execution[i][-1]
+            merged_sections = first_segment_result.job_sections_execution[i][:-1] + [
+                JobSectionExecution(job_id=split_section.job_id, task_id=split_section.task_id,
+                                    execution_start_time=split_section.execution_start_time,
+                                    execution_end_time=second_segment_result.job_sections_execution[i][0]
+                                    .execution_end_time,
+                                    number_of_executed_cycles=split_section.number_of_executed_cycles +
+                                    second_segment_result.job_sections_execution[i][0].number_of_executed_cycles)
+            ] + second_segment_result.job_sections_execution[i][1:]
+
+            assert merged_sections == simulation_result.job_sections_execution[i]
+
+        assert (first_segment_result.scheduling_points + second_segment_result.scheduling_points ==
+                simulation_result.scheduling_points)
+
+        # The thermal state is kept between segments
+        checkpoint_temperature = first_segment_result.temperature_measures[5.5]
+        assert all(numpy.array_equal(checkpoint_temperature[i].temperature.temperatureMatrix,
+                                     second_segment_result.temperature_measures[5.5][i].temperature.temperatureMatrix)
+                   for i in checkpoint_temperature.keys())
+
+        # The split adds an integration step, so the temperatures only match up to the solver tolerance
+        last_temperature = simulation_result.temperature_measures[14.0]
+        segmented_last_temperature = second_segment_result.temperature_measures[14.0]
+        assert all(numpy.allclose(last_temperature[i].temperature.temperatureMatrix,
+                                  segmented_last_temperature[i].temperature.temperatureMatrix, rtol=1e-2)
+                   for i in last_temperature.keys())
+
+        # A checkpoint can be resumed several times and the thermal state can be used to start other simulations
+        warm_started_result = execute_scheduler_simulation(
+            simulation_start_time=0.0,
+            simulation_end_time=14.0,
+            tasks=task_set,
+            jobs=jobs_list,
+            processor_definition=generate_default_cpu(2, {1000}),
+            environment_specification=default_environment_specification(),
+            simulation_options=simulation_options,
+            scheduler=self.__simple_priority_scheduler_definition(),
+            initial_thermal_state=resume_scheduler_simulation(
+                simulation_checkpoint=simulation_checkpoint,
+                simulation_end_time=14.0,
+                tasks=task_set,
+                jobs=jobs_list,
+                processor_definition=generate_default_cpu(2, {1000}),
+                environment_specification=default_environment_specification(),
+                simulation_options=simulation_options
+            ).simulation_checkpoint.thermal_state
+        )
+
+        assert warm_started_result.job_sections_execution == simulation_result.job_sections_execution
+        assert all(numpy.array_equal(warm_started_result.temperature_measures[0.0][i].temperature.temperatureMatrix,
+                                     segmented_last_temperature[i].temperature.temperatureMatrix)
+                   for i in last_temperature.keys())
+
+    def test_simple_simulation_periodic_task_set_thermal_measure_rate(self):
+        periodic_tasks = [
+            self.__create_implicit_deadline_periodic_task_h_rt(3, 3000, 7.0, 3),
+            self.__create_implicit_deadline_periodic_task_h_rt(2, 4000, 7.0, 2),
+            self.__create_implicit_deadline_periodic_task_h_rt(1, 4000, 14.0, 1),
+            self.__create_implicit_deadline_periodic_task_h_rt(0, 3000, 14.0, 0)
+        ]
+
+        jobs_list = [
+            Job(identifier=0, activation_time=0.0, task=periodic_tasks[0]),
+            Job(identifier=1, activation_time=7.0, task=periodic_tasks[0]),
+            Job(identifier=2, activation_time=0.0, task=periodic_tasks[1]),
+            Job(identifier=3, activation_time=7.0, task=periodic_tasks[1]),
+            Job(identifier=4, activation_time=0.0, task=periodic_tasks[2]),
+            Job(identifier=5, activation_time=0.0, task=periodic_tasks[3]),
+        ]
+
+        task_set = TaskSet(periodic_tasks=periodic_tasks, aperiodic_tasks=[], sporadic_tasks=[])
+
+        simulation_results = {}
+
+        # A thermal step of 1 / 3 seconds (333 cycles) doesn't divide the scheduling intervals
+        for thermal_measure_rate, thermal_measure_mode in [(None, "FULL"), (4, "FULL"), (4, "MAX"), (3, "FULL")]:
+            simulation_results[(thermal_measure_rate, thermal_measure_mode)] = execute_scheduler_simulation(
+                simulation_start_time=0.0,
+                simulation_end_time=14.0,
+                tasks=task_set,
+                jobs=jobs_list,
+                processor_definition=generate_default_cpu(2, {1000}),
+                environment_specification=default_environment_specification(),
+                simulation_options=SimulationConfiguration(id_debug=True, thermal_simulation_type="DVFS",
+                                                           simulate_thermal_behaviour=True,
+                                                           thermal_measure_rate=thermal_measure_rate,
+                                                           thermal_measure_mode=thermal_measure_mode,
+                                                           thermal_simulation_precision="EXACT"),
+                scheduler=self.__simple_priority_scheduler_definition()
+            )
+
+        events_result = simulation_results[(None, "FULL")]
+        rate_result = simulation_results[(4, "FULL")]
+        max_result = simulation_results[(4, "MAX")]
+        unaligned_rate_result = simulation_results[(3, "FULL")]
+
+        # The thermal measure rate doesn't change the schedule
+        assert rate_result.job_sections_execution == events_result.job_sections_execution
+        assert rate_result.scheduling_points == events_result.scheduling_points
+        assert unaligned_rate_result.job_sections_execution == events_result.job_sections_execution
+        assert unaligned_rate_result.scheduling_points == events_result.scheduling_points
+
+        # The temperature is measured each thermal step, and at the end of the simulation
+        last_measure_time = max(events_result.temperature_measures.keys())
+        measures_times = sorted(rate_result.temperature_measures.keys())
+        assert measures_times == [i / 4 for i in range(round(last_measure_time * 4) + 1)]
+        assert sorted(unaligned_rate_result.temperature_measures.keys()) == \
+               [i * 333 / 1000 for i in range(round(last_measure_time * 1000) // 333 + 1)] + [last_measure_time]
+
+        # Temperature rise over the environment of each cuboid
+        def temperature_rise(simulation_result, measure_time: float) -> Dict[int, numpy.ndarray]:
+            return {i: j.temperature.temperatureMatrix - default_environment_specification().temperature for i, j in
+                    simulation_result.temperature_measures[measure_time].items()}
+
+        assert max(i.max() for i in temperature_rise(events_result, last_measure_time).values()) > 100
+
+        # The power is constant between scheduling points, so the average power of each thermal step is the exact one
+        # if the steps divide the scheduling intervals
+        for i in events_result.temperature_measures.keys():
+            events_rise = temperature_rise(events_result, i)
+            rate_rise = temperature_rise(rate_result, i)
+            assert all(numpy.allclose(events_rise[j], rate_rise[j], rtol=0, atol=1e-6) for j in events_rise.keys())
+
+        # Otherwise the power of the steps that contain a scheduling point is averaged, which changes the temperature
+        # a few mK
+        events_rise = temperature_rise(events_result, last_measure_time)
+        unaligned_rate_rise = temperature_rise(unaligned_rate_result, last_measure_time)
+        assert all(numpy.allclose(events_rise[j], unaligned_rate_rise[j], rtol=0, atol=1e-2)
+                   for j in events_rise.keys())
+
+        # The maximum temperature of each cuboid is recorded in the MAX mode
+        assert events_result.max_temperature_measures is None
+        assert len(max_result.temperature_measures) == 0
+        assert max_result.max_temperature_measures.keys() == rate_result.temperature_measures.keys()
+        assert all(max_result.max_temperature_measures[i][j] ==
+                   rate_result.temperature_measures[i][j].temperature.temperatureMatrix.max()
+                   for i in measures_times for j in rate_result.temperature_measures[i].keys())
+
+    def test_simulation_batch(self):
+        periodic_tasks = [
+            self.__create_implicit_deadline_periodic_task_h_rt(3, 3000, 7.0, 3),
+            self.__create_implicit_deadline_periodic_task_h_rt(2, 4000, 7.0, 2),
+            self.__create_implicit_deadline_periodic_task_h_rt(1, 4000, 14.0, 1),
+            self.__create_implicit_deadline_periodic_task_h_rt(0, 3000, 14.0, 0)
+        ]
+
+        task_sets = [TaskSet(periodic_tasks=periodic_tasks, aperiodic_tasks=[], sporadic_tasks=[]),
+                     TaskSet(periodic_tasks=periodic_tasks[:2], aperiodic_tasks=[], sporadic_tasks=[])]
+
+        jobs_lists = [[Job(identifier=2 * i.identifier + k, activation_time=7.0 * k, task=i) for i in
+                       j.periodic_tasks for k in range(round(14.0 / i.period))] for j in task_sets]
+
+        simulation_options = SimulationConfiguration(id_debug=True, thermal_simulation_type="DVFS",
+                                                     simulate_thermal_behaviour=True, thermal_measure_rate=4)
+
+        batch_results = execute_scheduler_simulation_batch(
+            simulations=[(i, j, SGEDF(False)) for i, j in zip(task_sets, jobs_lists)],
+            processor_definition=generate_default_cpu(2, {1000}),
+            environment_specification=default_environment_specification(),
+            simulation_options=simulation_options,
+            simulation_end_time=14.0
+        )
+
+        for task_set, jobs, batch_result in zip(task_sets, jobs_lists, batch_results):
+            simulation_result = execute_scheduler_simulation(
+                simulation_start_time=0.0,
+                simulation_end_time=14.0,
+                tasks=task_set,
+                jobs=jobs,
+                processor_definition=generate_default_cpu(2, {1000}),
+                environment_specification=default_environment_specification(),
+                simulation_options=simulation_options,
+                scheduler=SGEDF(False)
+            )
+
+            assert batch_result.job_sections_execution == simulation_result.job_sections_execution
+            assert isinstance(batch_result.temperature_measures, ColumnarTemperatureMeasures)
+
+            # The batch simulation applies the same energy in the same steps as a simulation with thermal measure rate
+            assert all(numpy.allclose(batch_result.temperature_measures[i][j].temperature.temperatureMatrix,
+                                      simulation_result.temperature_measures[i][j].temperature.temperatureMatrix,
+                                      rtol=1e-6)
+                       for i in simulation_result.temperature_measures.keys()
+                       for j in simulation_result.temperature_measures[i].keys())
+
+        # The MAX mode records the maximum temperature of each cuboid in each step
+        max_batch_results = execute_scheduler_simulation_batch(
+            simulations=[(i, j, SGEDF(False)) for i, j in zip(task_sets, jobs_lists)],
+            processor_definition=generate_default_cpu(2, {1000}),
+            environment_specification=default_environment_specification(),
+            simulation_options=SimulationConfiguration(id_debug=True, thermal_simulation_type="DVFS",
+                                                       simulate_thermal_behaviour=True, thermal_measure_rate=4,
+                                                       thermal_measure_mode="MAX"),
+            simulation_end_time=14.0
+        )
+
+        for batch_result, max_batch_result in zip(batch_results, max_batch_results):
+            assert len(max_batch_result.temperature_measures) == 0
+            assert max_batch_result.max_temperature_measures == {
+                i: {k: float(l.temperature.temperatureMatrix.max()) for k, l in j.items()} for i, j in
+                batch_result.temperature_measures.items()}
+
+    def test_simple_simulation_checkpoint_file(self):
+        periodic_tasks = [
+            self.__create_implicit_deadline_periodic_task_h_rt(0, 3000, 7.0, None),
+            self.__create_implicit_deadline_periodic_task_h_rt(1, 4000, 7.0, None),
+            self.__create_implicit_deadline_periodic_task_h_rt(2, 4000, 14.0, None)
+        ]
+
+        task_set = TaskSet(periodic_tasks=periodic_tasks, aperiodic_tasks=[], sporadic_tasks=[])
+
+        simulation_result, jobs_list, _ = execute_scheduler_simulation_simple(
+            tasks=task_set,
+            aperiodic_tasks_jobs=[],
+            sporadic_tasks_jobs=[],
+            processor_definition=generate_default_cpu(2, {1000}),
+            environment_specification=default_environment_specification(),
+            scheduler=SGEDF(False)
+        )
+
+        first_segment_result = execute_scheduler_simulation(
+            simulation_start_time=0.0,
+            simulation_end_time=8.0,
+            tasks=task_set,
+            jobs=jobs_list,
+            processor_definition=generate_default_cpu(2, {1000}),
+            environment_specification=default_environment_specification(),
+            simulation_options=SimulationConfiguration(create_simulation_checkpoint=True),
+            scheduler=SGEDF(False)
+        )
+
+        with tempfile.TemporaryDirectory() as temporal_directory:
+            file_path = os.path.join(temporal_directory, "simulation_checkpoint.pickle")
+            save_simulation_checkpoint(first_segment_result.simulation_checkpoint, file_path)
+            simulation_checkpoint = load_simulation_checkpoint(file_path)
+
+        second_segment_result = resume_scheduler_simulation(
+            simulation_checkpoint=simulation_checkpoint,
+            tasks=task_set,
+            jobs=jobs_list,
+            processor_definition=generate_default_cpu(2, {1000}),
+            environment_specification=default_environment_specification()
+        )
+
+        assert simulation_checkpoint.thermal_state is None
+        assert (first_segment_result.scheduling_points + second_segment_result.scheduling_points ==
+                simulation_result.scheduling_points)
+        assert all(sum(j.number_of_executed_cycles for j in first_segment_result.job_sections_execution[i] +
+                       second_segment_result.job_sections_execution[i]) ==
+                   sum(j.number_of_executed_cycles for j in simulation_result.job_sections_execution[i])
+                   for i in range(2))
+
+    def test_cyclic_executive_fast_path(self):
+        periodic_tasks = [
+            self.__create_implicit_deadline_periodic_task_h_rt(0, 3000, 7.0, None),
+            self.__create_implicit_deadline_periodic_task_h_rt(1, 4000, 7.0, None),
+            self.__create_implicit_deadline_periodic_task_h_rt(2, 4000, 14.0, None)
+        ]
+
+        task_set = TaskSet(periodic_tasks=periodic_tasks, aperiodic_tasks=[], sporadic_tasks=[])
+
+        # Jobs of three major cycles, starting the simulation in the second one
+        jobs_list = [Job(identifier=3 * i + j, activation_time=14.0 + i * periodic_tasks[j].period,
+                         task=periodic_tasks[j]) for i in range(6) for j in range(3)
+                     if 14.0 + i * periodic_tasks[j].period < 56.0]
+
+        for scheduler in [lambda: SALECS(False), lambda: SCALECS(False, False), lambda: SRUN(False, False)]:
+            simulation_results = [execute_scheduler_simulation(
+                simulation_start_time=14.0,
+                simulation_end_time=56.0,
+                tasks=task_set,
+                jobs=jobs_list,
+                processor_definition=generate_default_cpu(2, {1000}),
+                environment_specification=default_environment_specification(),
+                simulation_options=SimulationConfiguration(cyclic_executive_fast_path=cyclic_executive_fast_path),
+                scheduler=scheduler()
+            ) for cyclic_executive_fast_path in [True, False]]
+
+            assert all(i.have_been_scheduled and i.hard_real_time_deadline_missed_stack_trace is None
+                       for i in simulation_results)
+            assert simulation_results[0].job_sections_execution == simulation_results[1].job_sections_execution
+            assert simulation_results[0].scheduling_points == simulation_results[1].scheduling_points
+            assert simulation_results[0].cpus_frequencies == simulation_results[1].cpus_frequencies
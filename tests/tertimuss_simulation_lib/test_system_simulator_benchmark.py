@@ -0,0 +1,180 @@
+import time
+import unittest
+from collections import deque
+from typing import Set, Dict, Optional, Tuple, List
+
+from tertimuss.simulation_lib.schedulers_definition import CentralizedScheduler
+from tertimuss.simulation_lib.simulator import SimulationConfiguration, execute_scheduler_simulation, \
+    execute_scheduler_simulation_batch
+from tertimuss.simulation_lib.system_definition import PeriodicTask, PreemptiveExecution, Criticality, \
+    Environment, Processor, Job, TaskSet
+from tertimuss.simulation_lib.system_definition.utils import generate_default_cpu, default_environment_specification
+
+
+class SystemSimulatorBenchmark(unittest.TestCase):
+    @staticmethod
+    def __fifo_scheduler_definition() -> CentralizedScheduler:
+        # Scheduler with O(1) decisions, so the simulation time is dominated by the simulator
+        class FIFOScheduler(CentralizedScheduler):
+            def __init__(self):
+                super().__init__(False)
+                self.__m = 0
+                self.__ready_jobs: deque = deque()
+                self.__removed_jobs: Set[int] = set()
+
+            def check_schedulability(self, processor_definition: Processor,
+                                     environment_specification: Environment, task_set: TaskSet) \
+                    -> [bool, Optional[str]]:
+                return True, None
+
+            def offline_stage(self, processor_definition: Processor,
+                              environment_specification: Environment, task_set: TaskSet) -> int:
+                self.__m = len(processor_definition.cores_definition)
+                return max(Set.intersection(*[i.core_type.available_frequencies for i
+                                              in processor_definition.cores_definition.values()]))
+
+            def schedule_policy(self, global_time: float, active_jobs_id: Set[int],
+                                jobs_being_executed_id: Dict[int, int], cores_frequency: int,
+                                cores_max_temperature: Optional[Dict[int, float]]) \
+                    -> Tuple[Dict[int, int], Optional[int], Optional[int]]:
+                assignation = {i: j for i, j in jobs_being_executed_id.items() if j not in self.__removed_jobs}
+                free_cpus = [i for i in range(self.__m) if i not in assignation]
+                for cpu in free_cpus:
+                    while len(self.__ready_jobs) > 0 and self.__ready_jobs[0] in self.__removed_jobs:
+                        self.__ready_jobs.popleft()
+                    if len(self.__ready_jobs) == 0:
+                        break
+                    assignation[cpu] = self.__ready_jobs.popleft()
+                return assignation, None, None
+
+            def on_jobs_activation(self, global_time: float, activation_time: float,
+                                   jobs_id_tasks_ids: List[Tuple[int, int]]) -> bool:
+                self.__ready_jobs.extend(i for i, _ in jobs_id_tasks_ids)
+                return True
+
+            def on_jobs_deadline_missed(self, global_time: float, jobs_id: List[int]) -> bool:
+                return False
+
+            def on_job_execution_finished(self, global_time: float, jobs_id: List[int]) -> bool:
+                self.__removed_jobs.update(jobs_id)
+                return True
+
+        return FIFOScheduler()
+
+    def __run_benchmark(self, number_of_jobs: int, simulation_options: Optional[SimulationConfiguration] = None) \
+            -> Tuple[int, float, int]:
+        number_of_tasks = 100
+        number_of_cores = 4
+        frequency = 1000
+        period = 1.0
+
+        # Utilization of 0.8 per core
+        periodic_tasks = [PeriodicTask(identifier=i,
+                                       worst_case_execution_time=round(0.8 * number_of_cores * frequency * period /
+                                                                       number_of_tasks),
+                                       relative_deadline=period,
+                                       best_case_execution_time=None,
+                                       execution_time_distribution=None,
+                                       memory_footprint=None,
+                                       priority=None,
+                                       preemptive_execution=PreemptiveExecution.FULLY_PREEMPTIVE,
+                                       deadline_criteria=Criticality.SOFT,
+                                       energy_consumption=None,
+                                       phase=None,
+                                       period=period) for i in range(number_of_tasks)]
+
+        number_of_major_cycles = number_of_jobs // number_of_tasks
+
+        jobs = [Job(identifier=k * number_of_tasks + i.identifier, task=i, activation_time=k * period)
+                for k in range(number_of_major_cycles) for i in periodic_tasks]
+
+        start_time = time.perf_counter()
+        simulation_result = execute_scheduler_simulation(
+            jobs=jobs,
+            tasks=TaskSet(periodic_tasks=periodic_tasks, aperiodic_tasks=[], sporadic_tasks=[]),
+            processor_definition=generate_default_cpu(number_of_cores, {frequency}),
+            environment_specification=default_environment_specification(),
+            scheduler=self.__fifo_scheduler_definition(),
+            simulation_options=simulation_options if simulation_options is not None else
+            SimulationConfiguration(id_debug=False, scheduler_selections_check=False),
+            simulation_start_time=0,
+            simulation_end_time=number_of_major_cycles * period)
+        elapsed_time = time.perf_counter() - start_time
+
+        return len(simulation_result.scheduling_points), elapsed_time, len(simulation_result.temperature_measures)
+
+    @unittest.skip("Manual benchmark test")
+    def test_scheduling_points_throughput(self):
+        for number_of_jobs in [10000, 100000, 1000000]:
+            number_of_scheduling_points, elapsed_time, _ = self.__run_benchmark(number_of_jobs)
+            print(number_of_jobs, "jobs:", number_of_scheduling_points, "scheduling points in", elapsed_time,
+                  "seconds (", number_of_scheduling_points / elapsed_time, "scheduling points per second )")
+
+    @unittest.skip("Manual benchmark test")
+    def test_thermal_measure_rate_throughput(self):
+        for thermal_simulation_precision in ["HIGH", "EXACT"]:
+            for thermal_measure_rate in [None, 100, 10]:
+                number_of_scheduling_points, elapsed_time, number_of_temperature_measures = self.__run_benchmark(
+                    1000, SimulationConfiguration(id_debug=False, scheduler_selections_check=False,
+                                                  simulate_thermal_behaviour=True,
+                                                  thermal_simulation_precision=thermal_simulation_precision,
+                                                  thermal_measure_rate=thermal_measure_rate))
+                print(thermal_simulation_precision, "precision, thermal measure rate", thermal_measure_rate, ":",
+                      number_of_scheduling_points, "scheduling points and", number_of_temperature_measures,
+                      "temperature measures in", elapsed_time, "seconds")
+
+    @unittest.skip("Manual benchmark test")
+    def test_batch_thermal_simulation_throughput(self):
+        number_of_tasks = 10
+        number_of_cores = 4
+        frequency = 1000
+        period = 1.0
+
+        periodic_tasks = [PeriodicTask(identifier=i,
+                                       worst_case_execution_time=round(0.8 * number_of_cores * frequency * period /
+                                                                       number_of_tasks),
+                                       relative_deadline=period,
+                                       best_case_execution_time=None,
+                                       execution_time_distribution=None,
+                                       memory_footprint=None,
+                                       priority=None,
+                                       preemptive_execution=PreemptiveExecution.FULLY_PREEMPTIVE,
+                                       deadline_criteria=Criticality.SOFT,
+                                       energy_consumption=None,
+                                       phase=None,
+                                       period=period) for i in range(number_of_tasks)]
+
+        jobs = [Job(identifier=k * number_of_tasks + i.identifier, task=i, activation_time=k * period)
+                for k in range(10) for i in periodic_tasks]
+
+        task_set = TaskSet(periodic_tasks=periodic_tasks, aperiodic_tasks=[], sporadic_tasks=[])
+
+        simulation_options = SimulationConfiguration(id_debug=False, scheduler_selections_check=False,
+                                                     simulate_thermal_behaviour=True, thermal_measure_rate=20)
+
+        for number_of_simulations in [1, 8, 32]:
+            start_time = time.perf_counter()
+            for _ in range(number_of_simulations):
+                execute_scheduler_simulation(jobs=jobs, tasks=task_set,
+                                             processor_definition=generate_default_cpu(number_of_cores, {frequency}),
+                                             environment_specification=default_environment_specification(),
+                                             scheduler=self.__fifo_scheduler_definition(),
+                                             simulation_options=simulation_options, simulation_start_time=0,
+                                             simulation_end_time=10 * period)
+            individual_time = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            execute_scheduler_simulation_batch(
+                simulations=[(task_set, jobs, self.__fifo_scheduler_definition()) for _ in
+                             range(number_of_simulations)],
+                processor_definition=generate_default_cpu(number_of_cores, {frequency}),
+                environment_specification=default_environment_specification(),
+                simulation_options=simulation_options, simulation_start_time=0, simulation_end_time=10 * period)
+            batch_time = time.perf_counter() - start_time
+
+            print(number_of_simulations, "simulations:", individual_time, "seconds one by one,", batch_time,
+                  "seconds in batch")
+
+
+if __name__ == '__main__':
+    unittest.main()